@@ -5,8 +5,42 @@ Esta biblioteca fornece acesso às províncias, municípios e comunas de Angola
 de acordo com a Lei n.º 14/24 (vigente desde 1 de Janeiro de 2025).
 """
 
-from .core import AngolaGeo
-from .excecoes import ProvinciaInexistente, MunicipioInexistente
-
 __version__ = "0.2.0"
-__all__ = ["AngolaGeo", "ProvinciaInexistente", "MunicipioInexistente"]
+__all__ = [
+    "AngolaGeo",
+    "ProvinciaInexistente",
+    "MunicipioInexistente",
+    "ComunaInexistente",
+    "DivisaoAmbigua",
+    "CodigoInexistente",
+    "LimitesIndisponiveis",
+    "OperacaoIndisponivel",
+]
+
+# Os nomes públicos são importados só quando usados (PEP 562), para que
+# importar o pacote (por exemplo, pela CLI) não carregue o núcleo e os índices.
+_MODULOS = {
+    "AngolaGeo": "core",
+    "ProvinciaInexistente": "excecoes",
+    "MunicipioInexistente": "excecoes",
+    "ComunaInexistente": "excecoes",
+    "DivisaoAmbigua": "excecoes",
+    "CodigoInexistente": "excecoes",
+    "LimitesIndisponiveis": "excecoes",
+    "OperacaoIndisponivel": "excecoes",
+}
+
+
+def __getattr__(nome):
+    modulo = _MODULOS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    from importlib import import_module
+    
+    valor = getattr(import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
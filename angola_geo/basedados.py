@@ -0,0 +1,972 @@
+"""
+Exportação das divisões para SQLite e consultas sobre o ficheiro exportado.
+
+:func:`exportar_sqlite` escreve os dados num ficheiro SQLite normalizado:
+
+* ``provincias``, ``municipios`` e ``comunas``, uma tabela por nível, com
+  chave estrangeira para o pai (``municipios.provincia``,
+  ``comunas.municipio``). A chave primária de cada registo é o seu
+  identificador em ``ConjuntoDados.entradas`` (ver :mod:`angola_geo.dados`),
+  pelo que ordenar por ela dá a ordem dos dados; cada registo guarda ainda
+  o código hierárquico na forma inteira (ver :mod:`angola_geo.codigos`) e
+  o nome normalizado em ``chave`` (ver :func:`normalizar`);
+* índices de cobertura para as consultas da API: os filhos de um pai
+  (``(pai, identificador, nome)``) e os registos de um nome normalizado
+  (``(chave, pai)``) leem-se só do índice, sem aceder à tabela;
+* ``nomes``, uma tabela FTS5 com o tokenizador ``trigram`` sobre os nomes
+  normalizados de todos os níveis, para a pesquisa por substring;
+* ``metadados``, com cada entrada dos metadados em JSON, pela ordem
+  original.
+
+A versão do esquema fica em ``PRAGMA user_version``.
+
+``AngolaGeo(backend="sqlite", caminho=...)`` cria um :class:`AngolaGeoSQLite`,
+que responde aos métodos públicos com consultas ao ficheiro, através de um
+conjunto de ligações só de leitura reutilizadas entre chamadas e threads
+(:class:`PoolLigacoes`), em vez de carregar e indexar os dados em memória.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .codigos import Codigo, decodificar, formatar as formatar_codigo, interpretar as interpretar_codigo
+from .core import MAX_SUGESTOES, AngolaGeo
+from .dados import (
+    NIVEIS,
+    NIVEL_COMUNA,
+    NIVEL_MUNICIPIO,
+    NIVEL_PROVINCIA,
+    ConjuntoDados,
+    obter_conjunto,
+)
+from .excecoes import (
+    CodigoInexistente,
+    ComunaInexistente,
+    DadosInvalidos,
+    DivisaoAmbigua,
+    MunicipioInexistente,
+    OperacaoIndisponivel,
+    ProvinciaInexistente,
+)
+from .indices import distancia_edicao
+from .instrumentacao import CARREGAMENTO
+from .modelos import Provincia, Registo, construir_provincia
+from .normalizacao import normalizar
+from .resumo import CAMINHO_LIMITES, CAMINHO_SEDES, PROVINCIAS_NOVAS
+from .vistas import (
+    DicionarioImutavel,
+    congelar,
+    copiar as copiar_vista,
+    serializar_json,
+    vista_ascendente,
+    vista_divisao,
+    vista_municipio,
+    vista_provincia,
+    vista_resultado_comuna,
+    vista_resultado_municipio,
+    vista_resumo_provincia,
+)
+
+# Versão do esquema (``PRAGMA user_version``); muda quando o esquema muda
+VERSAO_ESQUEMA = 1
+
+# Ligações livres guardadas por cada PoolLigacoes
+TAMANHO_POOL = 8
+
+# Identificadores por consulta ``IN (...)`` (abaixo do limite de 999
+# parâmetros das versões antigas do SQLite)
+BLOCO_IDENTIFICADORES = 500
+
+# Resultados do primeiro lote de pesquisar_iter; cada lote seguinte tem o
+# dobro, até ao máximo
+LOTE_INICIAL_PESQUISA = 8
+LOTE_MAXIMO_PESQUISA = 512
+
+ESQUEMA = """
+CREATE TABLE metadados (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE provincias (
+    identificador INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL UNIQUE,
+    codigo INTEGER NOT NULL UNIQUE,
+    nome TEXT NOT NULL,
+    chave TEXT NOT NULL UNIQUE,
+    capital TEXT NOT NULL,
+    total_municipios INTEGER NOT NULL,
+    observacoes TEXT
+);
+CREATE TABLE municipios (
+    identificador INTEGER PRIMARY KEY,
+    provincia INTEGER NOT NULL REFERENCES provincias (identificador),
+    codigo INTEGER NOT NULL UNIQUE,
+    nome TEXT NOT NULL,
+    chave TEXT NOT NULL
+);
+CREATE TABLE comunas (
+    identificador INTEGER PRIMARY KEY,
+    municipio INTEGER NOT NULL REFERENCES municipios (identificador),
+    codigo INTEGER NOT NULL UNIQUE,
+    nome TEXT NOT NULL,
+    chave TEXT NOT NULL
+);
+CREATE INDEX municipios_por_provincia ON municipios (provincia, identificador, codigo, nome);
+CREATE INDEX municipios_por_chave ON municipios (chave, provincia, codigo, nome);
+CREATE INDEX comunas_por_municipio ON comunas (municipio, identificador, codigo, nome);
+CREATE INDEX comunas_por_chave ON comunas (chave, municipio, codigo, nome);
+CREATE VIRTUAL TABLE nomes USING fts5 (chave, nivel UNINDEXED, tokenize = 'trigram');
+"""
+
+# Colunas das províncias na forma dos argumentos de construir_provincia
+_PROVINCIA = "p.id, p.nome, p.capital, p.total_municipios, p.observacoes"
+
+# Registos de cada nível: identificador, códigos da província ao registo,
+# colunas da província e nomes do município e da comuna; ``{onde}`` filtra
+_CONSULTAS = {
+    NIVEL_PROVINCIA: (
+        f"SELECT p.identificador, p.codigo, {_PROVINCIA} FROM provincias p "
+        "{onde} ORDER BY p.identificador LIMIT ? OFFSET ?"
+    ),
+    NIVEL_MUNICIPIO: (
+        f"SELECT m.identificador, p.codigo, m.codigo, {_PROVINCIA}, m.nome "
+        "FROM municipios m JOIN provincias p ON p.identificador = m.provincia "
+        "{onde} ORDER BY m.identificador LIMIT ? OFFSET ?"
+    ),
+    NIVEL_COMUNA: (
+        f"SELECT c.identificador, p.codigo, m.codigo, c.codigo, {_PROVINCIA}, m.nome, c.nome "
+        "FROM comunas c JOIN municipios m ON m.identificador = c.municipio "
+        "JOIN provincias p ON p.identificador = m.provincia "
+        "{onde} ORDER BY c.identificador LIMIT ? OFFSET ?"
+    ),
+}
+
+# Prefixo das colunas de cada nível nas consultas acima
+_ALIAS = {NIVEL_PROVINCIA: "p", NIVEL_MUNICIPIO: "m", NIVEL_COMUNA: "c"}
+
+# Registo parcial (ver AngolaGeoSQLite) com o identificador e os códigos
+# da província até ele
+_Linha = Tuple[int, Tuple[int, ...], Registo]
+
+
+def exportar_sqlite(destino: str, conjunto: Optional[ConjuntoDados] = None) -> str:
+    """
+    Escreve as divisões num ficheiro SQLite (ver o esquema em
+    :mod:`angola_geo.basedados`).
+
+    O ficheiro é escrito ao lado do destino e só depois o substitui, pelo
+    que leitores do ficheiro anterior nunca veem um ficheiro incompleto.
+
+    Args:
+        destino: Caminho do ficheiro SQLite.
+        conjunto: Dados a exportar (por omissão, os dados distribuídos).
+
+    Returns:
+        O caminho escrito.
+
+    Raises:
+        sqlite3.OperationalError: Se o SQLite não tiver o FTS5 com o
+            tokenizador ``trigram`` (SQLite 3.34 ou posterior).
+
+    Example:
+        >>> import os, tempfile
+        >>> with tempfile.TemporaryDirectory() as pasta:
+        ...     destino = exportar_sqlite(os.path.join(pasta, "divisoes.db"))
+        ...     os.path.basename(destino)
+        'divisoes.db'
+    """
+    if conjunto is None:
+        conjunto = obter_conjunto()
+
+    provincias, municipios, comunas, nomes = [], [], [], []
+    for identificador, (registo, chave) in enumerate(
+        zip(conjunto.entradas, conjunto.indice_trigramas.nomes)
+    ):
+        codigo = conjunto.codigos[identificador]
+        if registo.nivel == NIVEL_PROVINCIA:
+            provincias.append((
+                identificador, registo.id, codigo, registo.nome, chave,
+                registo.capital, registo.total_municipios, registo.observacoes
+            ))
+        else:
+            linha = (identificador, conjunto.pais[identificador], codigo, registo.nome, chave)
+            (municipios if registo.nivel == NIVEL_MUNICIPIO else comunas).append(linha)
+        nomes.append((identificador, chave, registo.nivel))
+
+    temporario = f"{destino}.tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    ligacao = sqlite3.connect(temporario)
+    try:
+        ligacao.execute("PRAGMA foreign_keys = ON")
+        ligacao.executescript(ESQUEMA)
+        with ligacao:
+            ligacao.executemany(
+                "INSERT INTO metadados (chave, valor) VALUES (?, ?)",
+                [(chave, json.dumps(valor, ensure_ascii=False))
+                 for chave, valor in copiar_vista(conjunto.metadados).items()]
+            )
+            ligacao.executemany("INSERT INTO provincias VALUES (?, ?, ?, ?, ?, ?, ?, ?)", provincias)
+            ligacao.executemany("INSERT INTO municipios VALUES (?, ?, ?, ?, ?)", municipios)
+            ligacao.executemany("INSERT INTO comunas VALUES (?, ?, ?, ?, ?)", comunas)
+            ligacao.executemany("INSERT INTO nomes (rowid, chave, nivel) VALUES (?, ?, ?)", nomes)
+            ligacao.execute("INSERT INTO nomes (nomes) VALUES ('optimize')")
+            ligacao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+        # Estatísticas para o planeador escolher os índices de cobertura
+        ligacao.execute("ANALYZE")
+        ligacao.execute("VACUUM")
+    except BaseException:
+        ligacao.close()
+        os.remove(temporario)
+        raise
+    ligacao.close()
+    os.replace(temporario, destino)
+    return destino
+
+
+class PoolLigacoes:
+    """
+    Ligações só de leitura a um ficheiro SQLite, reutilizadas entre chamadas.
+
+    Cada chamada usa uma ligação livre (ou abre uma nova, se não houver) e
+    devolve-a no fim; guardam-se até ``tamanho`` ligações livres, o que
+    chega para as threads que consultam ao mesmo tempo. As ligações são
+    abertas em modo só de leitura (``mode=ro`` e ``query_only``) e podem
+    passar de uma thread para outra, mas só uma thread usa cada ligação
+    de cada vez. A lista de ligações livres é um ``deque``, cujas
+    operações nas pontas são atómicas, por isso a reutilização não toma
+    travas.
+    """
+
+    def __init__(self, caminho: str, tamanho: int = TAMANHO_POOL):
+        """
+        Args:
+            caminho: Ficheiro SQLite (ver :func:`exportar_sqlite`).
+            tamanho: Número máximo de ligações livres guardadas.
+        """
+        self.uri = Path(caminho).resolve().as_uri() + "?mode=ro"
+        self.tamanho = tamanho
+        self._livres: deque = deque()
+
+    def _abrir(self) -> sqlite3.Connection:
+        """Abre uma ligação nova, só de leitura."""
+        ligacao = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        ligacao.execute("PRAGMA query_only = ON")
+        return ligacao
+
+    @contextmanager
+    def ligacao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma ligação durante o bloco ``with``."""
+        try:
+            ligacao = self._livres.pop()
+        except IndexError:
+            ligacao = self._abrir()
+        try:
+            yield ligacao
+        finally:
+            if len(self._livres) < self.tamanho:
+                self._livres.append(ligacao)
+            else:
+                ligacao.close()
+
+    def fechar(self) -> None:
+        """Fecha as ligações livres (as emprestadas fecham ao ser devolvidas)."""
+        self.tamanho = 0
+        while self._livres:
+            try:
+                self._livres.pop().close()
+            except IndexError:
+                break
+
+
+class AngolaGeoSQLite(AngolaGeo):
+    """
+    AngolaGeo sobre um ficheiro exportado com :func:`exportar_sqlite`.
+
+    Criado com ``AngolaGeo(backend="sqlite", caminho=...)``. Só os
+    metadados são lidos no construtor; as consultas por nome, código e
+    hierarquia, as listagens, os iteradores (com ``offset`` e ``limite``
+    aplicados no SQL) e a pesquisa por substring (com o índice FTS5) são
+    respondidos pelo SQLite em cada chamada, com os mesmos resultados e
+    exceções do backend em memória. Os resultados são construídos em cada
+    chamada (continuam a ser vistas só de leitura).
+
+    ``pesquisar_aproximado``, ``autocompletar``, ``normalizar_lote``,
+    ``migrar_lote``, ``localizar`` e as consultas de proximidade usam
+    índices que o ficheiro não tem (árvore BK, prefixos ordenados, a cache
+    do resolvedor, a grelha dos limites, as árvores k-d das sedes); na
+    primeira chamada a um deles, os dados são lidos do ficheiro e
+    indexados em memória, como no outro backend. A recarga automática
+    (:meth:`vigiar_dados`) não está disponível: depois de substituir o
+    ficheiro, chame :meth:`verificar_dados` ou :meth:`recarregar`.
+    """
+
+    def __init__(
+        self,
+        usar_cache: bool = True,
+        caminho: Optional[str] = None,
+        instrumentar: bool = False,
+        precarregar: bool = False,
+        backend: str = "sqlite",
+        limites: Optional[str] = None,
+        sedes: Optional[str] = None
+    ):
+        """
+        Args:
+            usar_cache: Sem efeito (os dados lidos do ficheiro são sempre
+                privados da instância).
+            caminho: Ficheiro SQLite (obrigatório).
+            instrumentar: Ver :class:`~angola_geo.core.AngolaGeo`.
+            precarregar: Se ``True``, lê já também os dados em memória
+                para os métodos que precisam deles.
+            backend: ``"sqlite"``.
+            limites: Ver :class:`~angola_geo.core.AngolaGeo`.
+            sedes: Ver :class:`~angola_geo.core.AngolaGeo`.
+
+        Raises:
+            ValueError: Se ``caminho`` não for indicado.
+            FileNotFoundError: Se o ficheiro não existir.
+            DadosInvalidos: Se o ficheiro não for uma exportação válida.
+        """
+        if caminho is None:
+            raise ValueError("backend='sqlite' precisa do caminho do ficheiro (ver exportar_sqlite)")
+        self._usar_cache = False
+        self._caminho = caminho
+        self._limites = limites or CAMINHO_LIMITES
+        self._sedes = sedes or CAMINHO_SEDES
+        self._metricas = None
+        self._vigilante = None
+        # Sem ``_conjunto``: os dados em memória são lidos na primeira
+        # consulta que precisa deles (ver AngolaGeo.__getattr__)
+        self._fragmentos = None
+        self._abrir()
+        if instrumentar:
+            self.ativar_instrumentacao()
+        if precarregar:
+            self._conjunto
+
+    def _abrir(self) -> None:
+        """Abre o pool, valida o esquema e lê os metadados do ficheiro."""
+        if not os.path.isfile(self._caminho):
+            raise FileNotFoundError(f"Ficheiro SQLite não encontrado: {self._caminho}")
+        # Lida antes de abrir: se o ficheiro for substituído entretanto, a
+        # próxima verificar_dados volta a abri-lo
+        assinatura = _assinatura(self._caminho)
+        pool = PoolLigacoes(self._caminho)
+        try:
+            with pool.ligacao() as ligacao:
+                versao = ligacao.execute("PRAGMA user_version").fetchone()[0]
+                if versao != VERSAO_ESQUEMA:
+                    raise DadosInvalidos(
+                        f"Versão do esquema {versao} em {self._caminho}; esperada {VERSAO_ESQUEMA}"
+                    )
+                metadados = congelar({
+                    chave: json.loads(valor) for chave, valor in ligacao.execute(
+                        "SELECT chave, valor FROM metadados ORDER BY rowid"
+                    )
+                })
+        except sqlite3.DatabaseError as erro:
+            pool.fechar()
+            raise DadosInvalidos(f"{self._caminho} não é uma exportação válida: {erro}") from erro
+        self._metadados: DicionarioImutavel = metadados
+        self._pool = pool
+        self._assinatura = assinatura
+
+    def recarregar(self) -> None:
+        """
+        Volta a abrir o ficheiro SQLite (por exemplo, depois de o
+        substituir por uma exportação nova).
+        """
+        anterior = self._pool
+        self._abrir()
+        anterior.fechar()
+        self.__dict__.pop("_conjunto", None)
+        self._fragmentos = None
+
+    @property
+    def versao_dados(self) -> Optional[str]:
+        """Versão (``data_version`` dos metadados) dos dados do ficheiro."""
+        return self._metadados.get("data_version")
+
+    def vigiar_dados(
+        self,
+        intervalo: float = 2.0,
+        observador: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Any:
+        """
+        Não disponível com o backend SQLite: chame :meth:`verificar_dados`
+        (ou :meth:`recarregar`) depois de substituir o ficheiro.
+
+        Raises:
+            OperacaoIndisponivel: Sempre.
+        """
+        raise OperacaoIndisponivel("vigiar_dados", "sqlite", "verificar_dados() ou recarregar()")
+
+    def verificar_dados(self) -> bool:
+        """
+        Volta a abrir o ficheiro se a data de modificação ou o tamanho
+        mudaram desde que foi aberto (por exemplo, depois de uma nova
+        exportação para o mesmo caminho).
+
+        Returns:
+            ``True`` se o ficheiro foi reaberto.
+
+        Raises:
+            DadosInvalidos: Se o ficheiro novo não for uma exportação
+                válida (a instância continua com o anterior).
+        """
+        try:
+            if _assinatura(self._caminho) == self._assinatura:
+                return False
+        except OSError:
+            return False
+        self.recarregar()
+        return True
+
+    def obter_metadados(self, copiar: bool = False) -> Dict[str, Any]:
+        """Metadados guardados na exportação."""
+        return self._devolver(self._metadados, copiar)
+
+    def listar_provincias(
+        self,
+        copiar: bool = False,
+        resumo: bool = False
+    ) -> Sequence[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.listar_provincias`, com uma consulta ao ficheiro."""
+        return self._devolver(self._lista_provincias(resumo), copiar)
+
+    def iterar_provincias(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.iterar_provincias`, paginado no SQL."""
+        limite_sql, offset = _pagina(offset, limite)
+        with self._pool.ligacao() as ligacao:
+            provincias = self._provincias(
+                ligacao,
+                "WHERE p.identificador IN (SELECT identificador FROM provincias "
+                "ORDER BY identificador LIMIT ? OFFSET ?)",
+                (limite_sql, offset)
+            )
+        return self._paginar([_vista_provincia(p) for p in provincias], 0, None, copiar)
+
+    def obter_provincia(self, nome: str, copiar: bool = False) -> Dict[str, Any]:
+        """Como :meth:`AngolaGeo.obter_provincia`, com uma consulta ao ficheiro."""
+        return self._devolver(self._vista_provincia_nome(nome), copiar)
+
+    def listar_municipios(
+        self,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Sequence[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.listar_municipios`, com uma consulta ao ficheiro."""
+        return self._devolver(self._vistas_municipios(provincia, -1, 0), copiar)
+
+    def iterar_municipios(
+        self,
+        provincia: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.iterar_municipios`, paginado no SQL."""
+        limite_sql, offset = _pagina(offset, limite)
+        return self._paginar(self._vistas_municipios(provincia, limite_sql, offset), 0, None, copiar)
+
+    def obter_municipio(
+        self,
+        nome: str,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Dict[str, Any]:
+        """Como :meth:`AngolaGeo.obter_municipio`, pela chave normalizada."""
+        onde, parametros = "WHERE m.chave = ?", (normalizar(nome),)
+        with self._pool.ligacao() as ligacao:
+            if provincia is not None:
+                onde += " AND m.provincia = ?"
+                parametros += (self._identificador_provincia(ligacao, provincia),)
+            linhas = self._registos(ligacao, NIVEL_MUNICIPIO, onde, parametros, comunas=True)
+        if not linhas:
+            raise MunicipioInexistente(nome)
+        return self._devolver(self._unica_linha(nome, linhas), copiar)
+
+    def obter_comuna(
+        self,
+        nome: str,
+        municipio: Optional[str] = None,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Dict[str, Any]:
+        """Como :meth:`AngolaGeo.obter_comuna`, pela chave normalizada."""
+        onde, parametros = "WHERE c.chave = ?", (normalizar(nome),)
+        with self._pool.ligacao() as ligacao:
+            if municipio is not None:
+                chave = normalizar(municipio)
+                if ligacao.execute(
+                    "SELECT 1 FROM municipios WHERE chave = ? LIMIT 1", (chave,)
+                ).fetchone() is None:
+                    raise MunicipioInexistente(municipio)
+                onde += " AND m.chave = ?"
+                parametros += (chave,)
+            if provincia is not None:
+                onde += " AND m.provincia = ?"
+                parametros += (self._identificador_provincia(ligacao, provincia),)
+            linhas = self._registos(ligacao, NIVEL_COMUNA, onde, parametros)
+        if not linhas:
+            raise ComunaInexistente(nome)
+        return self._devolver(self._unica_linha(nome, linhas), copiar)
+
+    def iterar_comunas(
+        self,
+        municipio: Optional[str] = None,
+        provincia: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.iterar_comunas`, paginado no SQL."""
+        limite_sql, offset = _pagina(offset, limite)
+        condicoes: List[str] = []
+        parametros: Tuple[Any, ...] = ()
+        with self._pool.ligacao() as ligacao:
+            if provincia is not None:
+                condicoes.append("m.provincia = ?")
+                parametros += (self._identificador_provincia(ligacao, provincia),)
+            if municipio is not None:
+                condicoes.insert(0, "m.chave = ?")
+                parametros = (normalizar(municipio),) + parametros
+                if ligacao.execute(
+                    "SELECT 1 FROM municipios m WHERE " + " AND ".join(condicoes) + " LIMIT 1",
+                    parametros
+                ).fetchone() is None:
+                    raise MunicipioInexistente(municipio)
+            onde = "WHERE " + " AND ".join(condicoes) if condicoes else ""
+            linhas = self._registos(ligacao, NIVEL_COMUNA, onde, parametros, limite_sql, offset)
+        return self._paginar([vista_resultado_comuna(c) for _, _, c in linhas], 0, None, copiar)
+
+    def contar_municipios(self, provincia: Optional[str] = None) -> int:
+        """Como :meth:`AngolaGeo.contar_municipios`, sem ler os municípios."""
+        if not provincia:
+            return self._metadados["total_municipalities"]
+        with self._pool.ligacao() as ligacao:
+            linha = ligacao.execute(
+                "SELECT total_municipios FROM provincias WHERE chave = ?", (normalizar(provincia),)
+            ).fetchone()
+            if linha is None:
+                raise ProvinciaInexistente(provincia, self._sugerir(ligacao, provincia))
+        return linha[0]
+
+    def pesquisar(self, termo: str, copiar: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Como :meth:`AngolaGeo.pesquisar`, com o índice FTS5 de trigramas."""
+        resultados: Dict[str, List[Dict[str, Any]]] = {
+            "provincias": [],
+            "municipios": [],
+            "comunas": []
+        }
+        chaves = {
+            NIVEL_PROVINCIA: resultados["provincias"],
+            NIVEL_MUNICIPIO: resultados["municipios"],
+            NIVEL_COMUNA: resultados["comunas"]
+        }
+        for _, nivel, vista in self._pesquisar(normalizar(termo), None, -1, 0):
+            chaves[nivel].append(vista)
+        return self._devolver(resultados, copiar)
+
+    def pesquisar_iter(
+        self,
+        termo: str,
+        nivel: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Como :meth:`AngolaGeo.pesquisar_iter`, paginado no SQL."""
+        if nivel is not None and nivel not in NIVEIS:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        limite_sql, offset = _pagina(offset, limite)
+        pares = self._iterar_pesquisa(normalizar(termo), nivel, limite_sql, offset)
+        if copiar:
+            return ((n, copiar_vista(vista)) for n, vista in pares)
+        return pares
+
+    def obter_por_codigo(self, codigo: Codigo) -> Dict[str, Any]:
+        """Como :meth:`AngolaGeo.obter_por_codigo`, pelo código inteiro indexado."""
+        inteiro = interpretar_codigo(codigo)
+        _, municipio, comuna = decodificar(inteiro)
+        nivel = NIVEL_COMUNA if comuna else NIVEL_MUNICIPIO if municipio else NIVEL_PROVINCIA
+        with self._pool.ligacao() as ligacao:
+            linhas = self._registos(
+                ligacao, nivel, f"WHERE {_ALIAS[nivel]}.codigo = ?", (inteiro,)
+            )
+        if not linhas:
+            raise CodigoInexistente(codigo)
+        resultado = {"codigo": formatar_codigo(inteiro), "codigo_inteiro": inteiro}
+        resultado.update(self._formatar_entrada(linhas[0][2]))
+        return resultado
+
+    def codigo_de(
+        self,
+        nome: str,
+        provincia: Optional[str] = None,
+        nivel: Optional[str] = None,
+        inteiro: bool = False
+    ) -> Optional[Union[str, int]]:
+        """Como :meth:`AngolaGeo.codigo_de`, pela chave normalizada."""
+        if nivel is not None and nivel not in NIVEIS:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        chave = normalizar(nome)
+        with self._pool.ligacao() as ligacao:
+            alvo = None
+            if provincia is not None:
+                alvo = self._identificador_provincia(ligacao, provincia)
+            for nivel_atual in NIVEIS:
+                if nivel is not None and nivel_atual != nivel:
+                    continue
+                onde, parametros = f"WHERE {_ALIAS[nivel_atual]}.chave = ?", (chave,)
+                if alvo is not None:
+                    if nivel_atual == NIVEL_PROVINCIA:
+                        continue
+                    onde += " AND p.identificador = ?"
+                    parametros += (alvo,)
+                linhas = self._registos(
+                    ligacao, nivel_atual, onde, parametros,
+                    comunas=nivel_atual == NIVEL_MUNICIPIO
+                )
+                if linhas:
+                    break
+            else:
+                return None
+        self._unica_linha(nome, linhas)
+        codigo = linhas[0][1][-1]
+        return codigo if inteiro else formatar_codigo(codigo)
+
+    def obter_nomes_provincias(self) -> List[str]:
+        """Nomes das províncias, pela ordem do identificador."""
+        with self._pool.ligacao() as ligacao:
+            return [
+                nome for nome, in ligacao.execute(
+                    "SELECT nome FROM provincias ORDER BY identificador"
+                )
+            ]
+
+    def obter_provincias_novas(self, copiar: bool = False) -> List[Dict[str, Any]]:
+        """Como :meth:`AngolaGeo.obter_provincias_novas`."""
+        return self._devolver(self._provincias_novas(), copiar)
+
+    def obter_metadados_json(self) -> bytes:
+        """Metadados em JSON (UTF-8), serializados em cada chamada."""
+        return serializar_json(self._metadados)
+
+    def listar_provincias_json(self) -> bytes:
+        """Todas as províncias em JSON (UTF-8), serializadas em cada chamada."""
+        return serializar_json(self._lista_provincias(False))
+
+    def obter_provincia_json(self, nome: str) -> bytes:
+        """Uma província em JSON (UTF-8), serializada em cada chamada."""
+        return serializar_json(self._vista_provincia_nome(nome))
+
+    def listar_municipios_json(self, provincia: Optional[str] = None) -> bytes:
+        """Municípios em JSON (UTF-8), serializados em cada chamada."""
+        return serializar_json(self._vistas_municipios(provincia, -1, 0))
+
+    def obter_provincias_novas_json(self) -> bytes:
+        """As três novas províncias em JSON (UTF-8)."""
+        return serializar_json(self._provincias_novas())
+
+    def _carregar(self) -> ConjuntoDados:
+        """Lê todo o ficheiro e indexa-o em memória."""
+        metricas = self._metricas
+        inicio = time.perf_counter_ns()
+        with self._pool.ligacao() as ligacao:
+            conjunto = ConjuntoDados(self._provincias(ligacao), self._metadados)
+        if metricas is not None:
+            metricas.registar(CARREGAMENTO, time.perf_counter_ns() - inicio)
+        return conjunto
+
+    def _lista_provincias(self, resumo: bool) -> Tuple[DicionarioImutavel, ...]:
+        """Vistas de todas as províncias (só os dados básicos com ``resumo``)."""
+        with self._pool.ligacao() as ligacao:
+            if resumo:
+                return tuple(
+                    vista_resumo_provincia(*linha) for linha in ligacao.execute(
+                        f"SELECT {_PROVINCIA} FROM provincias p ORDER BY p.identificador"
+                    )
+                )
+            return tuple(_vista_provincia(p) for p in self._provincias(ligacao))
+
+    def _vista_provincia_nome(self, nome: str) -> DicionarioImutavel:
+        """Vista de uma província pelo nome, ou ProvinciaInexistente."""
+        with self._pool.ligacao() as ligacao:
+            provincias = self._provincias(ligacao, "WHERE p.chave = ?", (normalizar(nome),))
+            if not provincias:
+                raise ProvinciaInexistente(nome, self._sugerir(ligacao, nome))
+        return _vista_provincia(provincias[0])
+
+    def _vistas_municipios(
+        self,
+        provincia: Optional[str],
+        limite: int,
+        offset: int
+    ) -> Tuple[DicionarioImutavel, ...]:
+        """Vistas dos municípios (de uma província), paginadas no SQL."""
+        with self._pool.ligacao() as ligacao:
+            onde, parametros = "", ()
+            if provincia:
+                onde = "WHERE m.provincia = ?"
+                parametros = (self._identificador_provincia(ligacao, provincia),)
+            linhas = self._registos(
+                ligacao, NIVEL_MUNICIPIO, onde, parametros, limite, offset, comunas=True
+            )
+        return tuple(vista_municipio(m) for _, _, m in linhas)
+
+    def _provincias_novas(self) -> List[DicionarioImutavel]:
+        """Vistas das províncias criadas pela Lei 14/24."""
+        with self._pool.ligacao() as ligacao:
+            provincias = self._provincias(
+                ligacao,
+                f"WHERE p.nome IN ({', '.join('?' * len(PROVINCIAS_NOVAS))})",
+                tuple(PROVINCIAS_NOVAS)
+            )
+        return [_vista_provincia(p) for p in provincias]
+
+    def _pesquisar(
+        self,
+        termo: str,
+        nivel: Optional[str],
+        limite: int,
+        offset: int,
+        depois: int = -1
+    ) -> List[Tuple[int, str, DicionarioImutavel]]:
+        """
+        Triplos ``(identificador, nivel, vista)`` dos nomes que contêm
+        ``termo`` (já normalizado), pela ordem dos dados, a partir do
+        identificador seguinte a ``depois``.
+
+        Termos com três ou mais caracteres usam o índice de trigramas da
+        tabela FTS5; os mais curtos não têm trigramas e são comparados com
+        ``LIKE`` em todos os nomes, como no índice em memória. Os registos
+        encontrados são lidos por nível, em blocos de
+        :data:`BLOCO_IDENTIFICADORES`.
+        """
+        if len(termo) >= 3:
+            filtro = "chave MATCH ?"
+            parametros: Tuple[Any, ...] = ('"' + termo.replace('"', '""') + '"',)
+        else:
+            escapado = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            filtro = "chave LIKE ? ESCAPE '\\'"
+            parametros = (f"%{escapado}%",)
+        if nivel is not None:
+            filtro += " AND nivel = ?"
+            parametros += (nivel,)
+
+        encontrados: List[Tuple[int, str, DicionarioImutavel]] = []
+        with self._pool.ligacao() as ligacao:
+            identificadores: Dict[str, List[int]] = {}
+            for identificador, nivel_encontrado in ligacao.execute(
+                f"SELECT rowid, nivel FROM nomes WHERE {filtro} AND rowid > ? "
+                "ORDER BY rowid LIMIT ? OFFSET ?", parametros + (depois, limite, offset)
+            ):
+                identificadores.setdefault(nivel_encontrado, []).append(identificador)
+
+            for nivel_encontrado, todos in identificadores.items():
+                for inicio in range(0, len(todos), BLOCO_IDENTIFICADORES):
+                    bloco = tuple(todos[inicio:inicio + BLOCO_IDENTIFICADORES])
+                    onde = (
+                        f"WHERE {_ALIAS[nivel_encontrado]}.identificador "
+                        f"IN ({', '.join('?' * len(bloco))})"
+                    )
+                    if nivel_encontrado == NIVEL_PROVINCIA:
+                        encontrados.extend(
+                            (i, nivel_encontrado, _vista_provincia(p))
+                            for i, p in zip(bloco, self._provincias(ligacao, onde, bloco))
+                        )
+                        continue
+                    vista = (
+                        vista_resultado_municipio if nivel_encontrado == NIVEL_MUNICIPIO
+                        else vista_resultado_comuna
+                    )
+                    encontrados.extend(
+                        (i, nivel_encontrado, vista(registo))
+                        for i, _, registo in self._registos(
+                            ligacao, nivel_encontrado, onde, bloco
+                        )
+                    )
+        encontrados.sort(key=lambda encontrado: encontrado[0])
+        return encontrados
+
+    def _iterar_pesquisa(
+        self,
+        termo: str,
+        nivel: Optional[str],
+        limite: int,
+        offset: int
+    ) -> Iterator[Tuple[str, DicionarioImutavel]]:
+        """
+        Resultados de :meth:`_pesquisar` lidos em lotes crescentes, a
+        partir do último identificador do lote anterior, pelo que o primeiro
+        resultado não espera pelos restantes.
+        """
+        lote = LOTE_INICIAL_PESQUISA
+        depois = -1
+        while limite != 0:
+            pedido = lote if limite < 0 else min(lote, limite)
+            encontrados = self._pesquisar(termo, nivel, pedido, offset, depois)
+            for _, nivel_encontrado, vista in encontrados:
+                yield nivel_encontrado, vista
+            if len(encontrados) < pedido:
+                return
+            depois = encontrados[-1][0]
+            offset = 0
+            if limite > 0:
+                limite -= pedido
+            lote = min(lote * 2, LOTE_MAXIMO_PESQUISA)
+
+    def _provincias(
+        self,
+        ligacao: sqlite3.Connection,
+        onde: str = "",
+        parametros: Tuple[Any, ...] = ()
+    ) -> List[Provincia]:
+        """Registos completos (com municípios e comunas) das províncias filtradas por ``onde``."""
+        linhas = ligacao.execute(
+            f"SELECT p.identificador, {_PROVINCIA} FROM provincias p {onde} "
+            "ORDER BY p.identificador", parametros
+        ).fetchall()
+        if not linhas:
+            return []
+        municipios: Dict[int, List[Tuple[str, List[str]]]] = {linha[0]: [] for linha in linhas}
+        filhos = ligacao.execute(
+            "SELECT m.provincia, m.identificador, m.nome, c.nome FROM provincias p "
+            "JOIN municipios m ON m.provincia = p.identificador "
+            f"LEFT JOIN comunas c ON c.municipio = m.identificador {onde} "
+            "ORDER BY m.identificador, c.identificador", parametros
+        )
+        for (provincia, _, nome), linhas_comunas in groupby(filhos, key=lambda linha: linha[:3]):
+            municipios[provincia].append(
+                (nome, [c for *_, c in linhas_comunas if c is not None])
+            )
+        return [construir_provincia(*linha[1:], municipios[linha[0]]) for linha in linhas]
+
+    def _registos(
+        self,
+        ligacao: sqlite3.Connection,
+        nivel: str,
+        onde: str = "",
+        parametros: Tuple[Any, ...] = (),
+        limite: int = -1,
+        offset: int = 0,
+        comunas: bool = False
+    ) -> List[_Linha]:
+        """
+        Registos de um nível filtrados por ``onde``, pela ordem dos dados.
+
+        Os registos são parciais: cada um tem a sua cadeia de ascendentes,
+        mas cada ascendente só tem esse filho. Chega para as vistas de
+        resultados, de divisão (:func:`vista_divisao`) e, com ``comunas``,
+        de município (que então incluem todas as suas comunas).
+        """
+        profundidade = NIVEIS.index(nivel) + 1
+        linhas = ligacao.execute(
+            _CONSULTAS[nivel].format(onde=onde), parametros + (limite, offset)
+        ).fetchall()
+
+        comunas_municipios: Dict[int, List[str]] = {}
+        if comunas and linhas:
+            for municipio, nome in ligacao.execute(
+                "SELECT municipio, nome FROM comunas WHERE municipio BETWEEN ? AND ? "
+                "ORDER BY identificador", (linhas[0][0], linhas[-1][0])
+            ):
+                comunas_municipios.setdefault(municipio, []).append(nome)
+
+        resultado = []
+        for linha in linhas:
+            identificador = linha[0]
+            codigos = linha[1:1 + profundidade]
+            provincia = linha[1 + profundidade:6 + profundidade]
+            nomes = linha[6 + profundidade:]
+            if nivel == NIVEL_PROVINCIA:
+                registo: Registo = construir_provincia(*provincia, ())
+            elif nivel == NIVEL_MUNICIPIO:
+                registo = construir_provincia(
+                    *provincia, [(nomes[0], comunas_municipios.get(identificador, ()))]
+                ).municipios[0]
+            else:
+                registo = construir_provincia(*provincia, [(nomes[0], nomes[1:])]).municipios[0].comunas[0]
+            resultado.append((identificador, codigos, registo))
+        return resultado
+
+    def _unica_linha(self, nome: str, linhas: List[_Linha]) -> DicionarioImutavel:
+        """Vista de divisão do único registo, ou DivisaoAmbigua se houver vários."""
+        if len(linhas) > 1:
+            raise DivisaoAmbigua(nome, [_vista_divisao(r, c) for _, c, r in linhas])
+        _, codigos, registo = linhas[0]
+        return _vista_divisao(registo, codigos)
+
+    def _identificador_provincia(self, ligacao: sqlite3.Connection, nome: str) -> int:
+        """Identificador de uma província pelo nome, ou ProvinciaInexistente com sugestões."""
+        linha = ligacao.execute(
+            "SELECT identificador FROM provincias WHERE chave = ?", (normalizar(nome),)
+        ).fetchone()
+        if linha is None:
+            raise ProvinciaInexistente(nome, self._sugerir(ligacao, nome))
+        return linha[0]
+
+    @staticmethod
+    def _sugerir(ligacao: sqlite3.Connection, nome: str) -> List[str]:
+        """
+        Nomes de províncias a uma distância de edição até 2, pela mesma
+        ordem que a pesquisa aproximada (distância e nome).
+        """
+        termo = normalizar(nome)
+        proximas = []
+        for chave, nome_provincia in ligacao.execute("SELECT chave, nome FROM provincias"):
+            distancia = distancia_edicao(termo, chave)
+            if distancia <= 2:
+                proximas.append((distancia, chave, nome_provincia))
+        proximas.sort()
+        return [nome for _, _, nome in proximas[:MAX_SUGESTOES]]
+
+
+def _assinatura(caminho: str) -> Tuple[int, int]:
+    """Data de modificação (ns) e tamanho de um ficheiro."""
+    estado = os.stat(caminho)
+    return estado.st_mtime_ns, estado.st_size
+
+
+def _vista_provincia(provincia: Provincia) -> DicionarioImutavel:
+    """Vista de uma província lida do ficheiro."""
+    return vista_provincia(provincia, tuple(vista_municipio(m) for m in provincia.municipios))
+
+
+def _vista_divisao(registo: Registo, codigos: Tuple[int, ...]) -> DicionarioImutavel:
+    """Vista com a cadeia de ascendentes de um registo parcial."""
+    ascendentes: List[Registo] = []
+    if registo.nivel != NIVEL_PROVINCIA:
+        ascendentes.append(registo.provincia)
+    if registo.nivel == NIVEL_COMUNA:
+        ascendentes.append(registo.municipio)
+    return vista_divisao(
+        registo,
+        formatar_codigo(codigos[-1]),
+        tuple(vista_ascendente(a, formatar_codigo(c)) for a, c in zip(ascendentes, codigos))
+    )
+
+
+def _pagina(offset: int, limite: Optional[int]) -> Tuple[int, int]:
+    """``(limite, offset)`` para ``LIMIT ? OFFSET ?`` (``-1`` sem limite)."""
+    if offset < 0 or (limite is not None and limite < 0):
+        raise ValueError("offset e limite não podem ser negativos")
+    return (-1 if limite is None else limite), offset
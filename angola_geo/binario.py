@@ -0,0 +1,197 @@
+"""
+Instantâneo binário pré-compilado dos dados das divisões.
+
+Ler ``divisions.json`` exige interpretar o JSON completo em cada arranque
+do processo. O passo de compilação (``python -m angola_geo.binario``)
+converte-o num ficheiro ``divisions.bin`` compacto, que se lê bastante
+mais depressa:
+
+* cabeçalho: assinatura, versão do formato e SHA-256 do JSON de origem
+  (ver :mod:`angola_geo.resumo`);
+* resumo (``marshal``): metadados e dados básicos de cada província, que
+  se podem ler sem o resto do ficheiro;
+* corpo (``marshal``): tabela de strings sem repetições e três
+  arrays de inteiros empacotados (little-endian) que descrevem, por ordem,
+  as províncias, os municípios e as comunas através de índices na tabela
+  de strings e do número de filhos de cada nó;
+* o índice de trigramas já construído: nomes normalizados, trigramas,
+  um array de limites e um único array com todas as listas concatenadas.
+
+O carregador só usa o instantâneo se o hash corresponder ao JSON atual;
+caso contrário (ou se o ficheiro faltar ou estiver corrompido) devolve
+``None`` e os dados são lidos do JSON.
+"""
+
+import json
+import marshal
+import sys
+from array import array
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .indices import IndiceTrigramas
+from .modelos import Provincia, construir_provincia
+from .resumo import abrir_instantaneo, caminho_binario, criar_cabecalho, hash_conteudo
+from .vistas import copiar
+
+if TYPE_CHECKING:
+    from .dados import ConjuntoDados
+
+# Campos por província: id, nome, capital, total de municípios,
+# observações (-1 se não houver) e número de municípios listados
+CAMPOS_PROVINCIA = 6
+# Campos por município: nome e número de comunas
+CAMPOS_MUNICIPIO = 2
+SEM_VALOR = -1
+
+
+def _array_inteiros(valores: List[int]) -> bytes:
+    """Empacota inteiros de 32 bits em little-endian."""
+    dados = array("i", valores)
+    if sys.byteorder != "little":
+        dados.byteswap()
+    return dados.tobytes()
+
+
+def _ler_inteiros(conteudo: bytes) -> array:
+    """Operação inversa de :func:`_array_inteiros`."""
+    dados = array("i")
+    dados.frombytes(conteudo)
+    if sys.byteorder != "little":
+        dados.byteswap()
+    return dados
+
+
+def compilar_dados(conjunto: "ConjuntoDados", hash_origem: bytes) -> bytes:
+    """
+    Serializa um conjunto de dados no formato binário.
+    
+    Além da hierarquia, guarda os nomes normalizados e o índice de
+    trigramas, que de outro modo seriam reconstruídos em cada arranque.
+    
+    Args:
+        conjunto: Conjunto carregado a partir do JSON de origem.
+        hash_origem: SHA-256 dos bytes do JSON de origem.
+    """
+    strings: Dict[str, int] = {}
+    
+    def indice(texto: Optional[str]) -> int:
+        if texto is None:
+            return SEM_VALOR
+        return strings.setdefault(texto, len(strings))
+    
+    provincias: List[int] = []
+    municipios: List[int] = []
+    comunas: List[int] = []
+    for p in conjunto.provincias:
+        provincias += [
+            p.id,
+            indice(p.nome),
+            indice(p.capital),
+            p.total_municipios,
+            indice(p.observacoes),
+            len(p.municipios),
+        ]
+        for m in p.municipios:
+            municipios += [indice(m.nome), len(m.comunas)]
+            comunas += [indice(c.nome) for c in m.comunas]
+    
+    nomes, trigramas, limites, valores = conjunto.indice_trigramas.exportar()
+    
+    resumo = marshal.dumps((
+        # marshal só aceita dict e list, não as vistas só de leitura
+        copiar(conjunto.metadados),
+        tuple(
+            (p.id, p.nome, p.capital, p.total_municipios, p.observacoes)
+            for p in conjunto.provincias
+        ),
+    ))
+    corpo = marshal.dumps((
+        tuple(strings),
+        _array_inteiros(provincias),
+        _array_inteiros(municipios),
+        _array_inteiros(comunas),
+        tuple(nomes),
+        tuple(trigramas),
+        _array_inteiros(limites),
+        _array_inteiros(valores),
+    ))
+    return criar_cabecalho(hash_origem, resumo) + corpo
+
+
+def ler_dados(
+    conteudo: bytes,
+    hash_esperado: bytes
+) -> Optional[Tuple[Tuple[Provincia, ...], Dict[str, Any], IndiceTrigramas]]:
+    """
+    Reconstrói os registos e o índice de trigramas a partir do formato binário.
+    
+    Returns:
+        ``(provincias, metadados, indice_trigramas)``, ou ``None`` se o
+        instantâneo não corresponder ao hash esperado ou não puder ser lido.
+    """
+    aberto = abrir_instantaneo(conteudo, hash_esperado)
+    if aberto is None:
+        return None
+    metadados, _, inicio_corpo = aberto
+    try:
+        (
+            strings, bytes_prov, bytes_mun, bytes_com,
+            nomes, trigramas, bytes_limites, bytes_valores
+        ) = marshal.loads(conteudo[inicio_corpo:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    
+    dados_prov = _ler_inteiros(bytes_prov)
+    dados_mun = _ler_inteiros(bytes_mun)
+    dados_com = _ler_inteiros(bytes_com)
+    
+    # Municípios e comunas estão pela ordem das províncias: basta consumi-los
+    pares_municipios = zip(dados_mun[0::CAMPOS_MUNICIPIO], dados_mun[1::CAMPOS_MUNICIPIO])
+    indices_comunas = iter(dados_com)
+    
+    def ler_municipios(quantidade: int) -> Iterator[Tuple[str, List[str]]]:
+        for nome, n_comunas in islice(pares_municipios, quantidade):
+            yield strings[nome], [strings[c] for c in islice(indices_comunas, n_comunas)]
+    
+    provincias = []
+    for i in range(0, len(dados_prov), CAMPOS_PROVINCIA):
+        id_, nome, capital, total, observacoes, n_municipios = dados_prov[i:i + CAMPOS_PROVINCIA]
+        provincias.append(construir_provincia(
+            id_,
+            strings[nome],
+            strings[capital],
+            total,
+            None if observacoes == SEM_VALOR else strings[observacoes],
+            ler_municipios(n_municipios)
+        ))
+    
+    indice = IndiceTrigramas.importar(
+        nomes, trigramas, _ler_inteiros(bytes_limites), _ler_inteiros(bytes_valores)
+    )
+    return tuple(provincias), metadados, indice
+
+
+def compilar(caminho_json: str, caminho_saida: Optional[str] = None) -> str:
+    """
+    Compila um ficheiro JSON de divisões para o formato binário.
+    
+    Returns:
+        Caminho do instantâneo escrito.
+    """
+    from .dados import ConjuntoDados
+    
+    with open(caminho_json, "rb") as f:
+        conteudo = f.read()
+    caminho_saida = caminho_saida or caminho_binario(caminho_json)
+    conjunto = ConjuntoDados.de_json(json.loads(conteudo.decode("utf-8")))
+    with open(caminho_saida, "wb") as f:
+        f.write(compilar_dados(conjunto, hash_conteudo(conteudo)))
+    return caminho_saida
+
+
+if __name__ == "__main__":
+    from .resumo import CAMINHO_DADOS
+    
+    for origem in sys.argv[1:] or [CAMINHO_DADOS]:
+        print(f"Compilado: {compilar(origem)}")
@@ -8,13 +8,37 @@ Uso:
     angola-geo listar municipios [--provincia <nome>]
     angola-geo pesquisar <termo>
     angola-geo info
+    angola-geo enriquecer [ficheiro] --coluna <nome> [--workers N]
+    angola-geo servir [--host <host>] [--porta <porta>] [--recarregar]
+    angola-geo bench [--gravar <json>] [--comparar <json>]
+    angola-geo exportar sqlite <ficheiro> [--dados <json>]
 """
 
+import io
 import sys
 import argparse
-import json
-from typing import Optional
-from angola_geo import AngolaGeo, ProvinciaInexistente
+
+from angola_geo.excecoes import ProvinciaInexistente
+from angola_geo.resumo import PROVINCIAS_NOVAS, carregar_resumo
+
+# O núcleo (e com ele os dados e índices) só é importado pelos comandos que
+# o usam; ``info`` e ``--help`` não precisam dele. Ver ``main``.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, Sequence
+
+    from angola_geo.core import AngolaGeo
+
+
+def escrever_json(dados: bytes):
+    """Escreve bytes JSON (das variantes ``*_json`` de AngolaGeo) no stdout."""
+    saida = getattr(sys.stdout, 'buffer', None)
+    if saida is None:
+        sys.stdout.write(dados.decode('utf-8') + '\n')
+    else:
+        sys.stdout.flush()
+        saida.write(dados + b'\n')
+        saida.flush()
 
 
 def formatar_provincia(provincia: dict, detalhado: bool = False) -> str:
@@ -39,8 +63,12 @@ def formatar_municipio(municipio: dict) -> str:
     return f"  • {municipio['nome']} ({municipio['provincia']})"
 
 
-def cmd_listar_provincias(args, geo: AngolaGeo):
+def cmd_listar_provincias(args, geo: "AngolaGeo"):
     """Lista todas as províncias."""
+    if getattr(args, 'json', False):
+        escrever_json(geo.listar_provincias_json())
+        return
+    
     provincias = geo.listar_provincias()
     
     print(f"\n🇦🇴 Angola - {len(provincias)} Províncias\n")
@@ -53,9 +81,13 @@ def cmd_listar_provincias(args, geo: AngolaGeo):
     print(f"Total: {len(provincias)} províncias, {geo.contar_municipios()} municípios")
 
 
-def cmd_obter_provincia(args, geo: AngolaGeo):
+def cmd_obter_provincia(args, geo: "AngolaGeo"):
     """Obtém detalhes de uma província específica."""
     try:
+        if getattr(args, 'json', False):
+            escrever_json(geo.obter_provincia_json(args.nome))
+            return
+        
         provincia = geo.obter_provincia(args.nome)
         
         print(f"\n🇦🇴 Província de {provincia['nome']}")
@@ -69,9 +101,13 @@ def cmd_obter_provincia(args, geo: AngolaGeo):
         sys.exit(1)
 
 
-def cmd_listar_municipios(args, geo: AngolaGeo):
+def cmd_listar_municipios(args, geo: "AngolaGeo"):
     """Lista municípios, opcionalmente filtrados por província."""
     try:
+        if getattr(args, 'json', False):
+            escrever_json(geo.listar_municipios_json(args.provincia))
+            return
+        
         if args.provincia:
             municipios = geo.listar_municipios(provincia=args.provincia)
             titulo = f"Municípios de {args.provincia}"
@@ -104,9 +140,14 @@ def cmd_listar_municipios(args, geo: AngolaGeo):
         sys.exit(1)
 
 
-def cmd_pesquisar(args, geo: AngolaGeo):
+def cmd_pesquisar(args, geo: "AngolaGeo"):
     """Pesquisa por termo em todas as divisões."""
     resultados = geo.pesquisar(args.termo)
+    if getattr(args, 'json', False):
+        from angola_geo.vistas import serializar_json
+        
+        escrever_json(serializar_json(resultados))
+        return
     
     print(f"\n🔍 Resultados para '{args.termo}'")
     print("=" * 60)
@@ -135,9 +176,20 @@ def cmd_pesquisar(args, geo: AngolaGeo):
     print(f"Total: {total} resultados encontrados")
 
 
-def cmd_info(args, geo: AngolaGeo):
-    """Exibe informações sobre o dataset."""
-    meta = geo.obter_metadados()
+def cmd_info(args, geo: "AngolaGeo" = None):
+    """
+    Exibe informações sobre o dataset.
+    
+    Usa apenas a secção de resumo do instantâneo de dados (ver
+    :mod:`angola_geo.resumo`), sem carregar a hierarquia nem os índices;
+    ``geo`` é ignorado.
+    """
+    meta, provincias = carregar_resumo()
+    if getattr(args, 'json', False):
+        import json
+        
+        escrever_json(json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        return
     
     print("\n🇦🇴 Angola Geo - Informações do Dataset")
     print("=" * 60)
@@ -154,7 +206,7 @@ def cmd_info(args, geo: AngolaGeo):
     print(f"   • Municípios anteriores: {meta['previous_municipalities']}")
     
     # Mostrar províncias novas
-    novas = geo.obter_provincias_novas()
+    novas = [p for p in provincias if p['nome'] in PROVINCIAS_NOVAS]
     print(f"\n🆕 Novas Províncias ({len(novas)}):")
     for prov in novas:
         print(f"   • {prov['nome']} (Capital: {prov['capital']})")
@@ -169,8 +221,12 @@ def cmd_info(args, geo: AngolaGeo):
     print("\n" + "=" * 60)
 
 
-def cmd_provincias_novas(args, geo: AngolaGeo):
+def cmd_provincias_novas(args, geo: "AngolaGeo"):
     """Lista as três novas províncias criadas pela Lei 14/24."""
+    if getattr(args, 'json', False):
+        escrever_json(geo.obter_provincias_novas_json())
+        return
+    
     novas = geo.obter_provincias_novas()
     
     print("\n🆕 Novas Províncias - Lei 14/24")
@@ -183,8 +239,122 @@ def cmd_provincias_novas(args, geo: AngolaGeo):
     print(f"Total: {len(novas)} novas províncias")
 
 
-def main():
-    """Função principal da CLI."""
+def cmd_enriquecer(args, geo: "AngolaGeo"):
+    """Enriquece um CSV ou JSONL (ficheiro ou stdin) e escreve-o no stdout."""
+    from angola_geo.enriquecimento import enriquecer
+    
+    formato = args.formato
+    if formato is None:
+        extensao = args.ficheiro.rsplit('.', 1)[-1].lower()
+        formato = 'jsonl' if extensao in ('jsonl', 'ndjson') else 'csv'
+    
+    if args.ficheiro == '-':
+        entrada = sys.stdin
+        if hasattr(entrada, 'buffer'):
+            entrada = io.TextIOWrapper(entrada.buffer, encoding='utf-8', newline='')
+    else:
+        try:
+            entrada = open(args.ficheiro, 'r', encoding='utf-8', newline='')
+        except OSError as e:
+            print(f"❌ Erro: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    try:
+        enriquecer(
+            entrada,
+            sys.stdout,
+            args.coluna,
+            formato=formato,
+            workers=args.workers,
+            tamanho_bloco=args.tamanho_bloco,
+            prefixo=args.prefixo,
+            geo=geo
+        )
+    except ValueError as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+
+
+def cmd_servir(args, geo: "AngolaGeo"):
+    """Inicia o serviço HTTP de consultas."""
+    from angola_geo.servidor import servir
+    
+    if args.recarregar is not None:
+        def anunciar(evento):
+            if evento['erro'] is not None:
+                print(f"⚠️  Recarga falhou ({evento['erro']}); mantém-se a versão {evento['versao']}",
+                      flush=True)
+            else:
+                print(f"🔄 Dados recarregados: versão {evento['versao_anterior']} → {evento['versao']}"
+                      f" ({evento['duracao_s'] * 1000:.1f} ms)", flush=True)
+        
+        geo.vigiar_dados(args.recarregar, observador=anunciar)
+    
+    servir(geo, host=args.host, porta=args.porta)
+
+
+def cmd_bench(args):
+    """Corre a suite de benchmarks e compara-a com uma linha de base."""
+    from angola_geo.desempenho import correr_comando
+    
+    codigo = correr_comando(args)
+    if codigo:
+        sys.exit(codigo)
+
+
+def cmd_exportar_sqlite(args):
+    """Exporta os dados para um ficheiro SQLite."""
+    import sqlite3
+    
+    from angola_geo.basedados import exportar_sqlite
+    from angola_geo.dados import carregar_conjunto
+    
+    try:
+        conjunto = carregar_conjunto(args.dados) if args.dados else None
+        destino = exportar_sqlite(args.destino, conjunto)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ Dados exportados para {destino}")
+
+
+def _inteiro_positivo(valor: str) -> int:
+    """Tipo argparse para inteiros maiores ou iguais a 1."""
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {valor!r}")
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"tem de ser pelo menos 1: {numero}")
+    return numero
+
+
+def _real_positivo(valor: str) -> float:
+    """Tipo argparse para números reais maiores do que 0."""
+    try:
+        numero = float(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido: {valor!r}")
+    if not numero > 0:
+        raise argparse.ArgumentTypeError(f"tem de ser positivo: {valor}")
+    return numero
+
+
+def criar_parser(argv: "Optional[Sequence[str]]" = None) -> argparse.ArgumentParser:
+    """
+    Constrói o parser de argumentos da CLI.
+    
+    Args:
+        argv: Argumentos que vão ser interpretados (padrão:
+            ``sys.argv[1:]``). As opções de ``bench`` só são registadas
+            quando o comando é ``bench``, para não importar
+            :mod:`angola_geo.desempenho` no arranque dos outros comandos.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
     parser = argparse.ArgumentParser(
         description='Angola Geo - Consultas sobre divisões administrativas de Angola',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -196,80 +366,149 @@ Exemplos:
   angola-geo pesquisar Bengo
   angola-geo info
   angola-geo novas
+  angola-geo obter provincia Luanda --json
+  angola-geo enriquecer clientes.csv --coluna morada --workers 4
+  angola-geo servir --porta 8080
+  angola-geo bench --comparar linha_base.json
+  angola-geo exportar sqlite divisoes.db
         """
     )
     
+    parser.set_defaults(ajuda=parser.print_help)
+    
+    # Opção --json partilhada pelos comandos de consulta
+    opcoes_json = argparse.ArgumentParser(add_help=False)
+    opcoes_json.add_argument('--json', action='store_true',
+                             help='Escrever o resultado em JSON (UTF-8)')
     subparsers = parser.add_subparsers(dest='comando', help='Comandos disponíveis')
     
     # Comando: listar
     listar_parser = subparsers.add_parser('listar', help='Lista províncias ou municípios')
+    listar_parser.set_defaults(ajuda=listar_parser.print_help)
     listar_subparsers = listar_parser.add_subparsers(dest='tipo')
     
     # listar provincias
-    provincias_parser = listar_subparsers.add_parser('provincias', help='Lista todas as províncias')
+    provincias_parser = listar_subparsers.add_parser('provincias', help='Lista todas as províncias',
+                                                 parents=[opcoes_json])
     provincias_parser.add_argument('-d', '--detalhado', action='store_true',
                                    help='Mostrar lista de municípios para cada província')
     
     # listar municipios
-    municipios_parser = listar_subparsers.add_parser('municipios', help='Lista municípios')
+    municipios_parser = listar_subparsers.add_parser('municipios', help='Lista municípios',
+                                                 parents=[opcoes_json])
     municipios_parser.add_argument('-p', '--provincia', type=str,
                                    help='Filtrar por província')
     
     # Comando: obter
     obter_parser = subparsers.add_parser('obter', help='Obtém detalhes de uma província')
+    obter_parser.set_defaults(ajuda=obter_parser.print_help)
     obter_subparsers = obter_parser.add_subparsers(dest='tipo')
     
     # obter provincia
-    provincia_parser = obter_subparsers.add_parser('provincia', help='Obtém detalhes de uma província')
+    provincia_parser = obter_subparsers.add_parser('provincia', help='Obtém detalhes de uma província',
+                                                 parents=[opcoes_json])
     provincia_parser.add_argument('nome', type=str, help='Nome da província')
     
     # Comando: pesquisar
-    pesquisar_parser = subparsers.add_parser('pesquisar', help='Pesquisa por termo')
+    pesquisar_parser = subparsers.add_parser('pesquisar', help='Pesquisa por termo',
+                                             parents=[opcoes_json])
     pesquisar_parser.add_argument('termo', type=str, help='Termo de pesquisa')
     
     # Comando: info
-    subparsers.add_parser('info', help='Informações sobre o dataset')
+    subparsers.add_parser('info', help='Informações sobre o dataset', parents=[opcoes_json])
     
     # Comando: novas
-    subparsers.add_parser('novas', help='Lista as novas províncias criadas pela Lei 14/24')
+    subparsers.add_parser('novas', help='Lista as novas províncias criadas pela Lei 14/24',
+                          parents=[opcoes_json])
     
-    # Parse argumentos
+    # Comando: enriquecer
+    enriquecer_parser = subparsers.add_parser(
+        'enriquecer',
+        help='Acrescenta província, município e comuna canónicos a um CSV ou JSONL'
+    )
+    enriquecer_parser.add_argument('ficheiro', nargs='?', default='-',
+                                   help='Ficheiro de entrada (padrão: stdin)')
+    enriquecer_parser.add_argument('-c', '--coluna', required=True,
+                                   help='Coluna (CSV) ou chave (JSONL) com a localização')
+    enriquecer_parser.add_argument('-f', '--formato', choices=['csv', 'jsonl'],
+                                   help='Formato da entrada (padrão: pela extensão, ou csv)')
+    enriquecer_parser.add_argument('-w', '--workers', type=_inteiro_positivo, default=1,
+                                   help='Número de processos (padrão: 1)')
+    enriquecer_parser.add_argument('--tamanho-bloco', type=_inteiro_positivo, default=1000,
+                                   help='Linhas por bloco processado (padrão: 1000)')
+    enriquecer_parser.add_argument('--prefixo', default='geo_',
+                                   help='Prefixo dos campos acrescentados (padrão: geo_)')
+    
+    # Comando: servir
+    servir_parser = subparsers.add_parser('servir', help='Inicia o serviço HTTP de consultas em JSON')
+    servir_parser.add_argument('--host', default='127.0.0.1',
+                               help='Endereço de escuta (padrão: 127.0.0.1)')
+    servir_parser.add_argument('-p', '--porta', type=int, default=8080,
+                               help='Porta de escuta (padrão: 8080)')
+    servir_parser.add_argument('--recarregar', type=_real_positivo, nargs='?', const=2.0, metavar='SEGUNDOS',
+                               help='Recarregar os dados quando o ficheiro mudar, verificando a '
+                                    'cada SEGUNDOS (padrão: 2)')
+    
+    # Comando: bench
+    bench_parser = subparsers.add_parser('bench', help='Corre os benchmarks de desempenho')
+    if argv[:1] == ['bench']:
+        from angola_geo.desempenho import adicionar_argumentos
+        adicionar_argumentos(bench_parser)
+    
+    # Comando: exportar
+    exportar_parser = subparsers.add_parser('exportar', help='Exporta os dados para outro formato')
+    exportar_parser.set_defaults(ajuda=exportar_parser.print_help)
+    exportar_subparsers = exportar_parser.add_subparsers(dest='tipo')
+    
+    # exportar sqlite
+    sqlite_parser = exportar_subparsers.add_parser(
+        'sqlite', help='Ficheiro SQLite para AngolaGeo(backend="sqlite")'
+    )
+    sqlite_parser.add_argument('destino', help='Ficheiro SQLite a escrever')
+    sqlite_parser.add_argument('--dados', metavar='JSON',
+                               help='Ficheiro de divisões a exportar (padrão: os dados distribuídos)')
+    
+    return parser
+
+
+def main():
+    """Função principal da CLI."""
+    parser = criar_parser()
     args = parser.parse_args()
     
     if not args.comando:
         parser.print_help()
         sys.exit(0)
     
-    # Inicializar AngolaGeo
-    geo = AngolaGeo()
+    # Comandos por (comando, tipo); os que não precisam dos dados completos
+    # correm sem importar o núcleo nem criar AngolaGeo
+    comandos = {
+        ('listar', 'provincias'): cmd_listar_provincias,
+        ('listar', 'municipios'): cmd_listar_municipios,
+        ('obter', 'provincia'): cmd_obter_provincia,
+        ('pesquisar', None): cmd_pesquisar,
+        ('info', None): cmd_info,
+        ('novas', None): cmd_provincias_novas,
+        ('enriquecer', None): cmd_enriquecer,
+        ('servir', None): cmd_servir,
+        ('bench', None): cmd_bench,
+        ('exportar', 'sqlite'): cmd_exportar_sqlite,
+    }
+    sem_dados = {cmd_info, cmd_bench, cmd_exportar_sqlite}
+    
+    comando = comandos.get((args.comando, getattr(args, 'tipo', None)))
+    if comando is None:
+        # Falta o tipo em 'listar' ou 'obter': mostrar a ajuda do subcomando
+        args.ajuda()
+        return
     
     # Executar comando
     try:
-        if args.comando == 'listar':
-            if args.tipo == 'provincias':
-                cmd_listar_provincias(args, geo)
-            elif args.tipo == 'municipios':
-                cmd_listar_municipios(args, geo)
-            else:
-                listar_parser.print_help()
-        
-        elif args.comando == 'obter':
-            if args.tipo == 'provincia':
-                cmd_obter_provincia(args, geo)
-            else:
-                obter_parser.print_help()
-        
-        elif args.comando == 'pesquisar':
-            cmd_pesquisar(args, geo)
-        
-        elif args.comando == 'info':
-            cmd_info(args, geo)
-        
-        elif args.comando == 'novas':
-            cmd_provincias_novas(args, geo)
-        
+        if comando in sem_dados:
+            comando(args)
         else:
-            parser.print_help()
+            from angola_geo.core import AngolaGeo
+            comando(args, AngolaGeo())
     
     except KeyboardInterrupt:
         print("\n\n👋 Operação cancelada pelo usuário.")
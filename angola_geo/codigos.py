@@ -0,0 +1,128 @@
+"""
+Códigos hierárquicos estáveis das divisões administrativas.
+
+Cada divisão tem um código ``PP.MMM.CCC``: o ``id`` da província, a
+posição (a partir de 1) do município na sua província e a posição da
+comuna no seu município, pela ordem de ``divisions.json``. Províncias e
+municípios usam só os primeiros níveis (``"12"``, ``"12.003"``).
+
+O mesmo código tem uma forma inteira compacta, ``PPMMMCCC`` em decimal
+(``"12.003.001"`` → ``12003001``; ``"12"`` → ``12000000``), que cabe num
+inteiro de 32 bits e preserva a hierarquia: os descendentes de uma divisão
+ocupam um intervalo contíguo de inteiros (ver :func:`intervalo`), o que
+serve bem o armazenamento colunar e os índices de bases de dados.
+
+Os códigos só se mantêm estáveis se a ordem dos dados também se mantiver:
+divisões novas são acrescentadas no fim da lista do seu pai, nunca
+inseridas a meio nem reordenadas.
+"""
+
+from typing import Tuple, Union
+
+# Máximo de municípios por província e de comunas por município
+MAXIMO_FILHOS = 999
+_BASE_MUNICIPIO = MAXIMO_FILHOS + 1
+_BASE_PROVINCIA = _BASE_MUNICIPIO * _BASE_MUNICIPIO
+# Maior id de província que ainda cabe num inteiro de 32 bits com sinal
+MAXIMO_PROVINCIA = (2 ** 31 - 1) // _BASE_PROVINCIA - 1
+
+Codigo = Union[str, int]
+
+
+def codificar(provincia: int, municipio: int = 0, comuna: int = 0) -> int:
+    """
+    Forma inteira do código de uma divisão.
+
+    Args:
+        provincia: Id da província.
+        municipio: Posição do município na província (0 para a província).
+        comuna: Posição da comuna no município (0 para o município).
+
+    Raises:
+        ValueError: Se algum componente estiver fora dos limites.
+
+    Example:
+        >>> codificar(12, 3, 1)
+        12003001
+    """
+    if not 0 < provincia <= MAXIMO_PROVINCIA:
+        raise ValueError(f"Id de província fora dos limites: {provincia}")
+    if not (0 <= municipio <= MAXIMO_FILHOS and 0 <= comuna <= MAXIMO_FILHOS):
+        raise ValueError(f"Posição fora dos limites (máximo {MAXIMO_FILHOS})")
+    if comuna and not municipio:
+        raise ValueError("Uma comuna precisa de um município")
+    return (provincia * _BASE_MUNICIPIO + municipio) * _BASE_MUNICIPIO + comuna
+
+
+def decodificar(codigo: int) -> Tuple[int, int, int]:
+    """
+    Componentes ``(provincia, municipio, comuna)`` de um código inteiro.
+
+    Example:
+        >>> decodificar(12003000)
+        (12, 3, 0)
+    """
+    provincia, resto = divmod(codigo, _BASE_PROVINCIA)
+    municipio, comuna = divmod(resto, _BASE_MUNICIPIO)
+    return provincia, municipio, comuna
+
+
+def formatar(codigo: int) -> str:
+    """
+    Forma textual de um código inteiro.
+
+    Example:
+        >>> formatar(12003000)
+        '12.003'
+    """
+    provincia, municipio, comuna = decodificar(codigo)
+    if comuna:
+        return f"{provincia:02d}.{municipio:03d}.{comuna:03d}"
+    if municipio:
+        return f"{provincia:02d}.{municipio:03d}"
+    return f"{provincia:02d}"
+
+
+def interpretar(codigo: Codigo) -> int:
+    """
+    Converte um código, textual ou inteiro, na forma inteira.
+
+    A forma textual aceita componentes sem zeros à esquerda (``"12.3.1"``).
+
+    Raises:
+        ValueError: Se o código não for válido.
+
+    Example:
+        >>> interpretar("12.3")
+        12003000
+    """
+    if isinstance(codigo, bool):
+        raise ValueError(f"Código inválido: {codigo!r}")
+    if isinstance(codigo, int):
+        if codigo < 0:
+            raise ValueError(f"Código inválido: {codigo!r}")
+        return codificar(*decodificar(codigo))
+    partes = str(codigo).strip().split(".")
+    if len(partes) > 3 or not all(p.isdigit() and p.isascii() for p in partes):
+        raise ValueError(f"Código inválido: {codigo!r}")
+    componentes = [int(p) for p in partes]
+    if 0 in componentes[1:]:
+        raise ValueError(f"Código inválido: {codigo!r}")
+    return codificar(*componentes)
+
+
+def intervalo(codigo: int) -> Tuple[int, int]:
+    """
+    Intervalo ``[inicio, fim)`` dos códigos inteiros de uma divisão e de
+    todos os seus descendentes.
+
+    Example:
+        >>> intervalo(12000000)
+        (12000000, 13000000)
+    """
+    _, municipio, comuna = decodificar(codigo)
+    if comuna:
+        return codigo, codigo + 1
+    if municipio:
+        return codigo, codigo + _BASE_MUNICIPIO
+    return codigo, codigo + _BASE_PROVINCIA
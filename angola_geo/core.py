@@ -5,10 +5,48 @@ Este módulo fornece a classe AngolaGeo com métodos para acessar
 os dados das divisões administrativas de Angola.
 """
 
-import json
-import os
-from typing import List, Dict, Optional, Any
-from .excecoes import ProvinciaInexistente, MunicipioInexistente
+import inspect
+import time
+from itertools import islice
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Callable, Iterable, Iterator, Sequence, Tuple, Union
+from .codigos import Codigo, formatar as formatar_codigo, interpretar as interpretar_codigo
+from .dados import (
+    NIVEIS,
+    NIVEL_COMUNA,
+    NIVEL_MUNICIPIO,
+    NIVEL_PROVINCIA,
+    ConjuntoDados,
+    carregar_conjunto,
+    conjunto_partilhado,
+    invalidar_cache,
+    obter_conjunto,
+    substituir_conjunto,
+)
+from .excecoes import (
+    CodigoInexistente,
+    ComunaInexistente,
+    DivisaoAmbigua,
+    MunicipioInexistente,
+    ProvinciaInexistente,
+)
+from .fragmentos import ConjuntoFragmentado, FragmentoProvincia, obter_fragmentos
+from .instrumentacao import CARREGAMENTO, Metricas, Observador
+from .migracao import RegistoAnterior
+from .modelos import Provincia, Registo
+from .normalizacao import normalizar
+from .resumo import CAMINHO_DADOS, CAMINHO_LIMITES, CAMINHO_SEDES, PROVINCIAS_NOVAS
+from .sedes import IndiceSedes
+from .vistas import copiar as copiar_vista
+from .vistas import serializar_json
+
+if TYPE_CHECKING:
+    from .recarga import VigilanteDados
+
+# Número máximo de sugestões incluídas em ProvinciaInexistente
+MAX_SUGESTOES = 3
+
+# Backends aceites pelo construtor de AngolaGeo
+BACKENDS = ("memoria", "sqlite")
 
 
 class AngolaGeo:
@@ -19,27 +57,208 @@ class AngolaGeo:
     e comunas de acordo com a Lei n.º 14/24.
     """
     
-    def __init__(self):
-        """Inicializa a instância AngolaGeo e carrega os dados."""
-        self._dados = self._carregar_dados()
-        self._provincias = self._dados["provinces"]
-        self._metadados = self._dados["metadata"]
-    
-    def _carregar_dados(self) -> Dict[str, Any]:
-        """Carrega os dados das divisões do arquivo JSON."""
-        caminho_dados = os.path.join(
-            os.path.dirname(__file__),
-            "data",
-            "divisions.json"
-        )
+    # Métodos que não são instrumentados (gerem a própria instrumentação)
+    _NAO_INSTRUMENTADOS = frozenset({
+        "ativar_instrumentacao", "desativar_instrumentacao", "estatisticas"
+    })
+    
+    def __new__(cls, *args: Any, backend: str = "memoria", **kwargs: Any) -> "AngolaGeo":
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Backend inválido: {backend!r}. Use um de: {', '.join(BACKENDS)}"
+            )
+        if backend == "sqlite" and cls is AngolaGeo:
+            from .basedados import AngolaGeoSQLite
+            
+            cls = AngolaGeoSQLite
+        return super().__new__(cls)
+    
+    def __init__(
+        self,
+        usar_cache: bool = True,
+        caminho: Optional[str] = None,
+        instrumentar: bool = False,
+        precarregar: bool = False,
+        backend: str = "memoria",
+        limites: Optional[str] = None,
+        sedes: Optional[str] = None
+    ):
+        """
+        Inicializa a instância AngolaGeo.
+        
+        Com os dados distribuídos, a instância começa por ler só o
+        manifesto das províncias (ver :mod:`angola_geo.fragmentos`): os
+        metadados, os nomes e contagens das províncias e
+        ``listar_provincias(resumo=True)`` respondem-se a partir dele, e
+        ``obter_provincia``, ``listar_municipios`` e ``contar_municipios``
+        com uma província leem só o fragmento dessa província, na primeira
+        vez que é pedida. Os dados completos, com todos os índices, são
+        carregados na primeira consulta que precise deles (pesquisa,
+        autocompletar, códigos, ...).
+        
+        Args:
+            usar_cache: Se ``True`` (padrão), partilha com as restantes
+                instâncias do processo os dados já carregados e indexados,
+                em vez de voltar a ler ``divisions.json``. Use ``False``
+                para obter uma cópia privada (por exemplo, em testes).
+            caminho: Ficheiro de divisões alternativo, no formato de
+                ``divisions.json`` (com o instantâneo ``.bin`` ao lado, se
+                existir). Os dados de um ficheiro alternativo são sempre
+                privados da instância.
+            instrumentar: Se ``True``, ativa desde já a instrumentação
+                (ver :meth:`ativar_instrumentacao`), incluindo a medição do
+                carregamento dos dados.
+            precarregar: Se ``True``, carrega já os dados completos e todos
+                os índices, em vez de os ler a pedido (útil em serviços que
+                preferem pagar o custo no arranque). Também é o que acontece
+                com ``caminho`` ou se os dados completos já tiverem sido
+                carregados no processo.
+            backend: ``"memoria"`` (padrão) ou ``"sqlite"``. Com
+                ``"sqlite"``, ``caminho`` é um ficheiro criado com
+                :func:`~angola_geo.basedados.exportar_sqlite` (ou
+                ``angola-geo exportar sqlite``) e a instância é um
+                :class:`~angola_geo.basedados.AngolaGeoSQLite`, que responde
+                com consultas a esse ficheiro em vez de carregar os dados em
+                memória.
+            limites: Ficheiro de limites geográficos alternativo para
+                :meth:`localizar` (ver :mod:`angola_geo.geometria`). Padrão:
+                ``data/limites.bin``.
+            sedes: Ficheiro alternativo com as coordenadas das sedes para
+                :meth:`mais_proximos` e :meth:`dentro_do_raio` (ver
+                :mod:`angola_geo.sedes`). Padrão: ``data/sedes.json``.
+            
+        Raises:
+            ValueError: Se o backend não for válido.
+        """
+        self._usar_cache = usar_cache and caminho is None
+        self._caminho = caminho
+        self._limites = limites or CAMINHO_LIMITES
+        self._sedes = sedes or CAMINHO_SEDES
+        self._metricas: Optional[Metricas] = None
+        self._vigilante: Optional["VigilanteDados"] = None
+        self._fragmentos: Optional[ConjuntoFragmentado] = None
+        if instrumentar:
+            self.ativar_instrumentacao()
+        if not precarregar and caminho is None and (
+            not self._usar_cache or conjunto_partilhado() is None
+        ):
+            inicio = time.perf_counter_ns()
+            self._fragmentos = obter_fragmentos(self._usar_cache)
+            if self._metricas is not None and self._fragmentos is not None:
+                self._metricas.registar(CARREGAMENTO, time.perf_counter_ns() - inicio)
+        if self._fragmentos is None:
+            self._conjunto = self._carregar()
+    
+    def __getattr__(self, nome: str) -> Any:
+        # Só é chamado para atributos em falta: enquanto a instância só
+        # usa os fragmentos, ``_conjunto`` não existe e é carregado aqui na
+        # primeira consulta que precisa dos dados completos
+        if nome == "_conjunto" and "_fragmentos" in self.__dict__:
+            conjunto = self._conjunto = self._carregar()
+            self._fragmentos = None
+            return conjunto
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{nome}'")
+    
+    def recarregar(self) -> None:
+        """
+        Volta a ler o ficheiro de dados e reconstrói os índices.
+        
+        Quando a instância usa a cache partilhada, a cache é invalidada,
+        pelo que as instâncias criadas depois também veem os dados novos.
+        
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.recarregar()
+        """
+        if self._usar_cache:
+            invalidar_cache()
+        self._conjunto = self._carregar()
+        self._fragmentos = None
+    
+    @property
+    def versao_dados(self) -> Optional[str]:
+        """
+        Versão (``data_version`` dos metadados) dos dados ativos.
         
-        with open(caminho_dados, "r", encoding="utf-8") as f:
-            return json.load(f)
+        Example:
+            >>> AngolaGeo().versao_dados
+            '0.1.0'
+        """
+        return (self._fragmentos or self._conjunto).metadados.get("data_version")
     
-    def obter_metadados(self) -> Dict[str, Any]:
+    def vigiar_dados(
+        self,
+        intervalo: float = 2.0,
+        observador: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> "VigilanteDados":
+        """
+        Ativa a recarga automática do ficheiro de dados.
+        
+        Uma thread de vigilância verifica o ficheiro a cada ``intervalo``
+        segundos (data de modificação e tamanho, depois o SHA-256 do
+        conteúdo) e, quando o conteúdo muda, constrói os índices novos e
+        publica-os nesta instância com uma única troca de referência. As
+        consultas nunca esperam por travas: cada chamada usa a versão que
+        estava ativa quando começou. Ver :mod:`angola_geo.recarga`.
+        
+        Se a instância usar a cache partilhada, os dados novos passam
+        também a ser os das instâncias criadas depois. Os dados completos
+        são carregados já, se ainda não o tiverem sido.
+        
+        Args:
+            intervalo: Segundos entre verificações.
+            observador: Função chamada após cada recarga (ou tentativa
+                falhada, por exemplo com JSON inválido) com um dicionário com
+                'caminho', 'versao_anterior', 'versao', 'duracao_s' e 'erro'.
+            
+        Returns:
+            O vigilante ativo (ver :class:`angola_geo.recarga.VigilanteDados`).
+            
+        Raises:
+            ValueError: Se ``intervalo`` não for positivo.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> _ = geo.vigiar_dados(observador=lambda e: print(e['versao']))
+        """
+        from .recarga import VigilanteDados
+        
+        vigilante = VigilanteDados(self, self._caminho or CAMINHO_DADOS, intervalo, observador)
+        self.parar_vigilancia()
+        self._vigilante = vigilante
+        self._vigilante.iniciar()
+        return self._vigilante
+    
+    def parar_vigilancia(self) -> None:
+        """Para a recarga automática iniciada com :meth:`vigiar_dados`."""
+        if self._vigilante is not None:
+            self._vigilante.parar()
+    
+    def verificar_dados(self) -> bool:
+        """
+        Verifica já o ficheiro de dados e recarrega-o se o conteúdo mudou.
+        
+        Útil para recarregar a pedido (por exemplo, ao receber um sinal)
+        em vez de, ou além de, periodicamente. As consultas concorrentes
+        continuam a ser servidas com a versão anterior até à troca.
+        
+        Returns:
+            ``True`` se foram publicados dados novos.
+        """
+        if self._vigilante is None:
+            from .recarga import VigilanteDados
+            
+            self._vigilante = VigilanteDados(self, self._caminho or CAMINHO_DADOS)
+        return self._vigilante.verificar()
+    
+    def obter_metadados(self, copiar: bool = False) -> Dict[str, Any]:
         """
         Obtém os metadados sobre o conjunto de dados.
         
+        Args:
+            copiar: Se ``True``, devolve um dicionário mutável em vez da
+                vista só de leitura partilhada (ver :mod:`angola_geo.vistas`).
+        
         Returns:
             Dicionário contendo metadados como referência da lei, datas, totais, etc.
             
@@ -49,14 +268,25 @@ class AngolaGeo:
             >>> print(meta['total_provinces'])
             21
         """
-        return self._metadados.copy()
+        return self._devolver((self._fragmentos or self._conjunto).metadados, copiar)
     
-    def listar_provincias(self) -> List[Dict[str, Any]]:
+    def listar_provincias(
+        self,
+        copiar: bool = False,
+        resumo: bool = False
+    ) -> Sequence[Dict[str, Any]]:
         """
         Lista todas as províncias.
         
+        Args:
+            copiar: Se ``True``, devolve listas e dicionários mutáveis em vez
+                das vistas só de leitura partilhadas (ver :mod:`angola_geo.vistas`).
+            resumo: Se ``True``, cada província tem só 'id', 'nome',
+                'capital', 'total_municipios' e, se houver, 'observacoes',
+                sem os municípios; não obriga a carregar os dados completos.
+        
         Returns:
-            Lista com todas as 21 províncias e seus dados completos.
+            Tuplo com todas as 21 províncias e seus dados completos.
             
         Example:
             >>> geo = AngolaGeo()
@@ -64,20 +294,54 @@ class AngolaGeo:
             >>> print(len(provincias))
             21
         """
-        return [self._formatar_provincia(p) for p in self._provincias]
+        if resumo:
+            fragmentos = self._fragmentos
+            if fragmentos is not None:
+                return self._devolver(fragmentos.resumos, copiar)
+            return self._devolver(self._conjunto.resumos_provincias, copiar)
+        return self._devolver(self._conjunto.lista_provincias, copiar)
     
-    def obter_provincia(self, nome: str) -> Dict[str, Any]:
+    def iterar_provincias(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera as províncias, como :meth:`listar_provincias`, sem construir
+        uma lista.
+        
+        Args:
+            offset: Número de províncias a saltar.
+            limite: Número máximo de províncias (``None`` para todas).
+            copiar: Se ``True``, cada província é uma cópia mutável.
+            
+        Raises:
+            ValueError: Se ``offset`` ou ``limite`` forem negativos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> [p['nome'] for p in geo.iterar_provincias(offset=1, limite=2)]
+            ['Benguela', 'Bié']
+        """
+        return self._paginar(self._conjunto.lista_provincias, offset, limite, copiar)
+    
+    def obter_provincia(self, nome: str, copiar: bool = False) -> Dict[str, Any]:
         """
         Obtém uma província específica pelo nome.
         
         Args:
-            nome: Nome da província (não diferencia maiúsculas/minúsculas).
+            nome: Nome da província (não diferencia maiúsculas/minúsculas
+                nem acentos: "Uige" encontra "Uíge").
+            copiar: Se ``True``, devolve uma cópia mutável em vez da vista
+                só de leitura partilhada.
             
         Returns:
             Dicionário contendo os dados da província.
             
         Raises:
-            ProvinciaInexistente: Se a província não for encontrada.
+            ProvinciaInexistente: Se a província não for encontrada. A exceção
+                inclui sugestões de nomes próximos em ``sugestoes``.
             
         Example:
             >>> geo = AngolaGeo()
@@ -85,20 +349,30 @@ class AngolaGeo:
             >>> print(luanda['capital'])
             'Ingombota'
         """
-        provincia = self._encontrar_provincia(nome)
-        if not provincia:
-            raise ProvinciaInexistente(nome)
-        return self._formatar_provincia(provincia)
+        fragmentos = self._fragmentos
+        if fragmentos is not None:
+            return self._devolver(self._fragmento_ou_erro(nome, fragmentos).vista, copiar)
+        conjunto = self._conjunto
+        return self._devolver(
+            conjunto.vistas_provincias[self._obter_provincia_ou_erro(nome, conjunto)],
+            copiar
+        )
     
-    def listar_municipios(self, provincia: Optional[str] = None) -> List[Dict[str, Any]]:
+    def listar_municipios(
+        self,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Sequence[Dict[str, Any]]:
         """
         Lista municípios, opcionalmente filtrados por província.
         
         Args:
             provincia: Nome da província para filtrar (opcional).
+            copiar: Se ``True``, devolve listas e dicionários mutáveis em vez
+                das vistas só de leitura partilhadas.
             
         Returns:
-            Lista de municípios. Se província for especificada, retorna apenas
+            Tuplo de municípios. Se província for especificada, retorna apenas
             os municípios dessa província.
             
         Raises:
@@ -113,22 +387,225 @@ class AngolaGeo:
             >>> print(len(luanda_munis))
             16
         """
+        fragmentos = self._fragmentos
+        if provincia and fragmentos is not None:
+            return self._devolver(
+                self._fragmento_ou_erro(provincia, fragmentos).vistas_municipios, copiar
+            )
+        conjunto = self._conjunto
         if provincia:
-            dados_provincia = self._encontrar_provincia(provincia)
-            if not dados_provincia:
-                raise ProvinciaInexistente(provincia)
-            return self._formatar_municipios(
-                dados_provincia["municipalities"],
-                dados_provincia["name"]
+            return self._devolver(
+                conjunto.vistas_municipios[self._obter_provincia_ou_erro(provincia, conjunto)],
+                copiar
             )
+        return self._devolver(conjunto.lista_municipios, copiar)
+    
+    def iterar_municipios(
+        self,
+        provincia: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera os municípios, como :meth:`listar_municipios`, sem construir
+        uma lista.
+        
+        A província é validada já na chamada; os municípios são produzidos
+        à medida que são pedidos, pelo que parar a iteração cedo não tem
+        custo para os restantes.
+        
+        Args:
+            provincia: Nome da província para filtrar (opcional).
+            offset: Número de municípios a saltar.
+            limite: Número máximo de municípios (``None`` para todos).
+            copiar: Se ``True``, cada município é uma cópia mutável.
+            
+        Raises:
+            ProvinciaInexistente: Se a província especificada não for encontrada.
+            ValueError: Se ``offset`` ou ``limite`` forem negativos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> next(geo.iterar_municipios("Luanda"))['nome']
+            'Belas'
+        """
+        fragmentos = self._fragmentos
+        if provincia and fragmentos is not None:
+            vistas = self._fragmento_ou_erro(provincia, fragmentos).vistas_municipios
+        elif provincia:
+            conjunto = self._conjunto
+            vistas = conjunto.vistas_municipios[self._obter_provincia_ou_erro(provincia, conjunto)]
+        else:
+            vistas = self._conjunto.lista_municipios
+        return self._paginar(vistas, offset, limite, copiar)
+    
+    def obter_municipio(
+        self,
+        nome: str,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Obtém um município pelo nome, com a sua província.
         
-        # Obter todos os municípios de todas as províncias
-        todos_municipios = []
-        for prov in self._provincias:
-            todos_municipios.extend(
-                self._formatar_municipios(prov["municipalities"], prov["name"])
+        Args:
+            nome: Nome do município (não diferencia maiúsculas/minúsculas
+                nem acentos).
+            provincia: Província do município; necessária quando houver
+                municípios com o mesmo nome em províncias diferentes.
+            copiar: Se ``True``, devolve uma cópia mutável em vez da vista
+                só de leitura partilhada.
+            
+        Returns:
+            Dicionário com 'codigo', 'nivel', 'nome', 'provincia', 'comunas'
+            e 'ancestrais' (a cadeia de divisões acima do município, cada
+            uma com 'codigo', 'nivel' e 'nome').
+            
+        Raises:
+            MunicipioInexistente: Se o município não for encontrado.
+            ProvinciaInexistente: Se ``provincia`` não existir.
+            DivisaoAmbigua: Se o nome corresponder a vários municípios; a
+                exceção inclui os candidatos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.obter_municipio("Dande")['provincia']
+            'Bengo'
+        """
+        conjunto = self._conjunto
+        entradas = conjunto.entradas
+        candidatos = [
+            i for i in conjunto.identificadores_nomes.get(normalizar(nome), ())
+            if entradas[i].nivel == NIVEL_MUNICIPIO
+        ]
+        if provincia is not None:
+            alvo = self._obter_provincia_ou_erro(provincia, conjunto)
+            candidatos = [i for i in candidatos if entradas[i].provincia is alvo]
+        if not candidatos:
+            raise MunicipioInexistente(nome)
+        return self._devolver(self._unica_divisao(nome, candidatos, conjunto), copiar)
+    
+    def obter_comuna(
+        self,
+        nome: str,
+        municipio: Optional[str] = None,
+        provincia: Optional[str] = None,
+        copiar: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Obtém uma comuna pelo nome, com o seu município e província.
+        
+        Args:
+            nome: Nome da comuna (não diferencia maiúsculas/minúsculas nem
+                acentos).
+            municipio: Município da comuna; necessário quando houver comunas
+                com o mesmo nome em municípios diferentes.
+            provincia: Província da comuna, para distinguir municípios
+                homónimos.
+            copiar: Se ``True``, devolve uma cópia mutável em vez da vista
+                só de leitura partilhada.
+            
+        Returns:
+            Dicionário com 'codigo', 'nivel', 'nome', 'municipio',
+            'provincia' e 'ancestrais' (província e município, cada um com
+            'codigo', 'nivel' e 'nome').
+            
+        Raises:
+            ComunaInexistente: Se a comuna não for encontrada.
+            MunicipioInexistente: Se ``municipio`` não existir.
+            ProvinciaInexistente: Se ``provincia`` não existir.
+            DivisaoAmbigua: Se o nome corresponder a várias comunas; a
+                exceção inclui os candidatos.
+            
+        Example:
+            Os dados distribuídos ainda não têm comunas; com um ficheiro
+            que as inclua (ilustrativo):
+            
+            >>> geo = AngolaGeo(caminho="divisoes_com_comunas.json")  # doctest: +SKIP
+            >>> geo.obter_comuna("Mabubas", municipio="Dande")['provincia']  # doctest: +SKIP
+            'Bengo'
+            >>> AngolaGeo().obter_comuna("Mabubas", municipio="Dande")
+            Traceback (most recent call last):
+                ...
+            angola_geo.excecoes.ComunaInexistente: Comuna 'Mabubas' não encontrada
+        """
+        conjunto = self._conjunto
+        entradas = conjunto.entradas
+        candidatos = [
+            i for i in conjunto.identificadores_nomes.get(normalizar(nome), ())
+            if entradas[i].nivel == NIVEL_COMUNA
+        ]
+        if municipio is not None:
+            chave = normalizar(municipio)
+            if chave not in conjunto.indice_municipios:
+                raise MunicipioInexistente(municipio)
+            candidatos = [
+                i for i in candidatos if normalizar(entradas[i].municipio.nome) == chave
+            ]
+        if provincia is not None:
+            alvo = self._obter_provincia_ou_erro(provincia, conjunto)
+            candidatos = [i for i in candidatos if entradas[i].provincia is alvo]
+        if not candidatos:
+            raise ComunaInexistente(nome)
+        return self._devolver(self._unica_divisao(nome, candidatos, conjunto), copiar)
+    
+    def iterar_comunas(
+        self,
+        municipio: Optional[str] = None,
+        provincia: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera as comunas, opcionalmente de um município ou de uma província.
+        
+        Cada comuna tem 'nome', 'municipio' e 'provincia', como nos
+        resultados de :meth:`pesquisar`, e é produzida à medida que é
+        pedida, pela ordem dos dados.
+        
+        Args:
+            municipio: Nome do município (opcional; com municípios
+                homónimos, inclui as comunas de todos, a menos que
+                ``provincia`` também seja indicada).
+            provincia: Nome da província (opcional).
+            offset: Número de comunas a saltar.
+            limite: Número máximo de comunas (``None`` para todas).
+            copiar: Se ``True``, cada comuna é uma cópia mutável.
+            
+        Raises:
+            MunicipioInexistente: Se ``municipio`` não existir (na
+                província indicada, se houver).
+            ProvinciaInexistente: Se ``provincia`` não existir.
+            ValueError: Se ``offset`` ou ``limite`` forem negativos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> for comuna in geo.iterar_comunas(provincia="Bengo", limite=10):
+            ...     print(comuna['nome'], comuna['municipio'])
+        """
+        conjunto = self._conjunto
+        if municipio is None and provincia is None:
+            entradas = conjunto.entradas
+            identificadores: Iterable[int] = (
+                i for i in range(len(entradas)) if entradas[i].nivel == NIVEL_COMUNA
             )
-        return todos_municipios
+        else:
+            if municipio is not None:
+                municipios: Sequence[Any] = conjunto.indice_municipios.get(normalizar(municipio), ())
+                if provincia is not None:
+                    alvo = self._obter_provincia_ou_erro(provincia, conjunto)
+                    municipios = [m for m in municipios if m.provincia is alvo]
+                if not municipios:
+                    raise MunicipioInexistente(municipio)
+            else:
+                municipios = self._obter_provincia_ou_erro(provincia, conjunto).municipios
+            identificadores = self._identificadores_comunas(municipios, conjunto)
+        vistas = conjunto.vistas_resultados
+        return self._paginar(
+            (vistas[i] for i in identificadores), offset, limite, copiar
+        )
     
     def contar_municipios(self, provincia: Optional[str] = None) -> int:
         """
@@ -153,20 +630,28 @@ class AngolaGeo:
             >>> print(luanda_total)
             16
         """
+        fragmentos = self._fragmentos
         if provincia:
-            dados_provincia = self._encontrar_provincia(provincia)
-            if not dados_provincia:
-                raise ProvinciaInexistente(provincia)
-            return dados_provincia["municipality_count"]
+            if fragmentos is not None:
+                resumo = fragmentos.resumo(provincia)
+                if resumo is None:
+                    raise ProvinciaInexistente(
+                        provincia, fragmentos.sugerir(provincia, MAX_SUGESTOES)
+                    )
+                return resumo["total_municipios"]
+            return self._obter_provincia_ou_erro(provincia).total_municipios
         
-        return self._metadados["total_municipalities"]
+        return (fragmentos or self._conjunto).metadados["total_municipalities"]
     
-    def pesquisar(self, termo: str) -> Dict[str, List[Dict[str, Any]]]:
+    def pesquisar(self, termo: str, copiar: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """
         Pesquisa localizações em províncias, municípios e comunas.
         
         Args:
-            termo: Termo de pesquisa (não diferencia maiúsculas/minúsculas).
+            termo: Termo de pesquisa (não diferencia maiúsculas/minúsculas
+                nem acentos).
+            copiar: Se ``True``, os resultados são cópias mutáveis em vez
+                das vistas só de leitura partilhadas.
             
         Returns:
             Dicionário com chaves 'provincias', 'municipios' e 'comunas',
@@ -178,38 +663,588 @@ class AngolaGeo:
             >>> print(len(resultados['provincias']))
             2  # Bengo e Icolo e Bengo
         """
-        termo_lower = termo.lower()
         resultados = {
             "provincias": [],
             "municipios": [],
             "comunas": []
         }
+        chaves = {
+            NIVEL_PROVINCIA: resultados["provincias"],
+            NIVEL_MUNICIPIO: resultados["municipios"],
+            NIVEL_COMUNA: resultados["comunas"]
+        }
+        
+        conjunto = self._conjunto
+        for identificador in conjunto.indice_trigramas.pesquisar(normalizar(termo)):
+            chaves[conjunto.entradas[identificador].nivel].append(
+                conjunto.vistas_resultados[identificador]
+            )
+        
+        return self._devolver(resultados, copiar)
+    
+    def pesquisar_iter(
+        self,
+        termo: str,
+        nivel: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        copiar: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Pesquisa como :meth:`pesquisar`, produzindo os resultados um a um.
+        
+        Os resultados vêm pela ordem dos dados (cada província seguida das
+        suas divisões), e não agrupados por nível; cada nome só é comparado
+        com o termo quando o resultado seguinte é pedido, pelo que parar
+        cedo (por exemplo, só o primeiro resultado) evita o resto da
+        verificação.
+        
+        Args:
+            termo: Termo de pesquisa (não diferencia maiúsculas/minúsculas
+                nem acentos).
+            nivel: Restringe a 'provincia', 'municipio' ou 'comuna' (opcional).
+            offset: Número de resultados a saltar.
+            limite: Número máximo de resultados (``None`` para todos).
+            copiar: Se ``True``, cada resultado é uma cópia mutável.
+            
+        Returns:
+            Iterador de pares ``(nivel, resultado)``, em que ``resultado``
+            é a mesma vista que aparece nas listas de :meth:`pesquisar`.
+            
+        Raises:
+            ValueError: Se o nível não for válido, ou ``offset`` ou
+                ``limite`` forem negativos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> nivel, resultado = next(geo.pesquisar_iter("bengo"))
+            >>> nivel, resultado['nome']
+            ('provincia', 'Bengo')
+        """
+        if nivel is not None and nivel not in NIVEIS:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        conjunto = self._conjunto
+        entradas = conjunto.entradas
+        vistas = conjunto.vistas_resultados
+        identificadores = conjunto.indice_trigramas.iterar(normalizar(termo))
+        if nivel is not None:
+            identificadores = (i for i in identificadores if entradas[i].nivel == nivel)
+        pagina = self._paginar(
+            ((entradas[i].nivel, vistas[i]) for i in identificadores), offset, limite, False
+        )
+        if copiar:
+            return ((n, copiar_vista(vista)) for n, vista in pagina)
+        return pagina
+    
+    def pesquisar_aproximado(
+        self,
+        termo: str,
+        max_distancia: int = 2,
+        limite: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Pesquisa aproximada tolerante a erros de digitação.
         
-        # Pesquisar províncias
-        for provincia in self._provincias:
-            if termo_lower in provincia["name"].lower():
-                resultados["provincias"].append(self._formatar_provincia(provincia))
-            
-            # Pesquisar municípios
-            for municipio in provincia["municipalities"]:
-                if termo_lower in municipio["name"].lower():
-                    resultados["municipios"].append({
-                        "nome": municipio["name"],
-                        "provincia": provincia["name"],
-                        "capital_provincia": provincia["capital"]
-                    })
-                
-                # Pesquisar comunas
-                for comuna in municipio.get("communes", []):
-                    if isinstance(comuna, dict) and termo_lower in comuna.get("name", "").lower():
-                        resultados["comunas"].append({
-                            "nome": comuna["name"],
-                            "municipio": municipio["name"],
-                            "provincia": provincia["name"]
-                        })
+        Compara o termo normalizado (sem acentos nem espaços extra) com os
+        nomes de todas as divisões através de uma árvore BK, sem calcular a
+        distância de edição contra cada nome.
         
+        Args:
+            termo: Termo de pesquisa.
+            max_distancia: Distância de edição (Levenshtein) máxima aceite.
+            limite: Número máximo de resultados.
+            
+        Returns:
+            Lista de correspondências ordenada pela distância. Cada resultado
+            contém 'nivel' ('provincia', 'municipio' ou 'comuna'), 'nome',
+            'distancia' e os nomes dos níveis superiores ('provincia' e,
+            para comunas, 'municipio').
+            
+        Raises:
+            ValueError: Se ``max_distancia`` ou ``limite`` forem negativos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> resultados = geo.pesquisar_aproximado("Benguella")
+            >>> print(resultados[0]['nome'], resultados[0]['distancia'])
+            Benguela 1
+        """
+        if max_distancia < 0:
+            raise ValueError("max_distancia não pode ser negativa")
+        if limite < 0:
+            raise ValueError("limite não pode ser negativo")
+        if limite == 0:
+            return []
+        conjunto = self._conjunto
+        resultados = []
+        for distancia, _, identificadores in conjunto.arvore_bk.pesquisar(
+            normalizar(termo), max_distancia
+        ):
+            for identificador in identificadores:
+                resultado = self._formatar_entrada(conjunto.entradas[identificador])
+                resultado["distancia"] = distancia
+                resultados.append(resultado)
+                if len(resultados) >= limite:
+                    return resultados
         return resultados
     
+    def autocompletar(
+        self,
+        prefixo: str,
+        nivel: Optional[str] = None,
+        limite: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Sugere nomes que começam pelo prefixo indicado.
+        
+        Usa um índice de prefixos ordenado, pelo que o custo depende do
+        tamanho do prefixo e do limite, não do tamanho do conjunto de dados.
+        
+        Args:
+            prefixo: Início do nome (não diferencia maiúsculas/minúsculas
+                nem acentos).
+            nivel: Restringe a 'provincia', 'municipio' ou 'comuna' (opcional).
+            limite: Número máximo de sugestões.
+            
+        Returns:
+            Lista de até ``limite`` sugestões por ordem alfabética, cada uma
+            com 'nivel', 'nome' e os nomes dos níveis superiores.
+            
+        Raises:
+            ValueError: Se o nível não for válido ou ``limite`` for negativo.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> [s['nome'] for s in geo.autocompletar("Cuan", nivel="provincia")]
+            ['Cuando', 'Cuanza Norte', 'Cuanza Sul']
+        """
+        if limite < 0:
+            raise ValueError("limite não pode ser negativo")
+        conjunto = self._conjunto
+        if nivel not in conjunto.indices_prefixos:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        return [
+            self._formatar_entrada(conjunto.entradas[identificador])
+            for identificador in conjunto.indices_prefixos[nivel].pesquisar(
+                normalizar(prefixo), limite
+            )
+        ]
+    
+    def normalizar_lote(self, textos: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Converte textos livres nos registos canónicos correspondentes.
+        
+        Pensado para grandes volumes de localizações escritas por
+        utilizadores ("luanda", "Prov. de Benguela", "mun. Cazenga"): os
+        resultados são gerados à medida que ``textos`` é consumido, e cada
+        texto normalizado é resolvido uma única vez graças a uma cache LRU
+        limitada, partilhada por todas as instâncias que usam os mesmos
+        dados (ver :meth:`estatisticas_cache`).
+        
+        Prefixos como "prov.", "província de", "mun.", "município de" ou
+        "comuna de" indicam o nível pretendido. Sem prefixo prefere-se a
+        província, depois o município e depois a comuna. Nomes com erros de
+        digitação são aceites com confiança menor.
+        
+        Args:
+            textos: Iterável de textos a normalizar.
+            
+        Yields:
+            Um dicionário por texto, pela mesma ordem, com 'entrada' (o
+            texto original), 'confianca' (de 0 a 1) e, como em
+            :meth:`autocompletar`, 'nivel', 'nome' e os nomes dos níveis
+            superiores. Sem correspondência, 'nivel' e 'nome' são ``None`` e
+            'confianca' é 0.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> for r in geo.normalizar_lote(["luanda", "Prov. de Benguela"]):
+            ...     print(r['nome'], r['nivel'], r['confianca'])
+            Luanda provincia 1.0
+            Benguela provincia 1.0
+        """
+        conjunto = self._conjunto
+        resolver = conjunto.resolver
+        entradas = conjunto.entradas
+        for texto in textos:
+            resolucao = resolver(normalizar(texto))
+            if resolucao is None:
+                yield {"entrada": texto, "nivel": None, "nome": None, "confianca": 0.0}
+                continue
+            identificador, confianca = resolucao
+            resultado = {"entrada": texto}
+            resultado.update(self._formatar_entrada(entradas[identificador]))
+            resultado["confianca"] = confianca
+            yield resultado
+    
+    def migrar_lote(self, registos: Iterable[RegistoAnterior]) -> Iterator[Dict[str, Any]]:
+        """
+        Converte registos da divisão anterior à Lei n.º 14/24 para a atual.
+        
+        Pensado para migrar grandes volumes de registos históricos (18
+        províncias, 164 municípios): a correspondência de cada unidade
+        anterior é pré-calculada uma vez (ver :mod:`angola_geo.migracao`) e
+        cada registo custa uma consulta a uma tabela, memorizada numa cache
+        LRU. Os resultados são gerados à medida que ``registos`` é consumido.
+        
+        Args:
+            registos: Iterável de registos anteriores, cada um o nome da
+                província, um par ``(provincia, municipio)`` ou um
+                dicionário com 'provincia' e, opcionalmente, 'municipio'.
+                Qualquer dos nomes pode faltar (``None``).
+            
+        Yields:
+            Um dicionário só de leitura por registo, pela mesma ordem, com
+            'nivel' (o nível da unidade anterior reconhecida), 'provincia',
+            'municipio' e 'codigo' do sucessor principal na divisão atual,
+            'exato' (``False`` quando a unidade foi dividida) e
+            'candidatos' (todos os sucessores). Sem correspondência, todos
+            os campos são ``None`` e 'candidatos' é vazio.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> for r in geo.migrar_lote(["Cuando Cubango", ("Luanda", "Quiçama")]):
+            ...     print(r['provincia'], r['municipio'], r['exato'])
+            Cubango None False
+            Icolo e Bengo Quiçama False
+        """
+        return self._conjunto.tabela_migracao.migrar_lote(registos)
+    
+    def estatisticas_cache(self) -> Dict[str, int]:
+        """
+        Estatísticas da cache de :meth:`normalizar_lote`.
+        
+        Returns:
+            Dicionário com 'acertos', 'falhas', 'tamanho' (entradas em
+            cache) e 'capacidade'.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> _ = list(geo.normalizar_lote(["Luanda", "luanda"]))
+            >>> geo.estatisticas_cache()['acertos']
+            1
+        """
+        info = self._conjunto.resolver.cache_info()
+        return {
+            "acertos": info.hits,
+            "falhas": info.misses,
+            "tamanho": info.currsize,
+            "capacidade": info.maxsize
+        }
+    
+    def obter_por_codigo(self, codigo: Codigo) -> Dict[str, Any]:
+        """
+        Obtém uma divisão pelo seu código hierárquico.
+        
+        Os códigos têm a forma ``PP.MMM.CCC`` (id da província, posição do
+        município na província e da comuna no município) ou a forma
+        inteira equivalente ``PPMMMCCC`` (ver :mod:`angola_geo.codigos`).
+        
+        Args:
+            codigo: Código textual (``"12.003"``, também sem zeros à
+                esquerda: ``"12.3"``) ou inteiro (``12003000``).
+            
+        Returns:
+            Dicionário com 'codigo', 'codigo_inteiro' e, como em
+            :meth:`autocompletar`, 'nivel', 'nome' e os nomes dos níveis
+            superiores.
+            
+        Raises:
+            ValueError: Se o código estiver mal formado.
+            CodigoInexistente: Se nenhuma divisão tiver o código.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.obter_por_codigo("1.1")['nome']
+            'Dande'
+        """
+        conjunto = self._conjunto
+        inteiro = interpretar_codigo(codigo)
+        identificador = conjunto.identificadores_codigos.get(inteiro)
+        if identificador is None:
+            raise CodigoInexistente(codigo)
+        return self._formatar_codigo(inteiro, conjunto.entradas[identificador])
+    
+    def codigo_de(
+        self,
+        nome: str,
+        provincia: Optional[str] = None,
+        nivel: Optional[str] = None,
+        inteiro: bool = False
+    ) -> Optional[Union[str, int]]:
+        """
+        Obtém o código hierárquico de uma divisão pelo nome.
+        
+        O mesmo nome pode existir em vários níveis ("Benguela" é província e
+        município) e em várias províncias. Sem outras indicações prefere-se
+        o nível mais alto; com ``provincia`` procuram-se só os municípios e
+        comunas dessa província.
+        
+        Args:
+            nome: Nome da divisão (não diferencia maiúsculas/minúsculas nem
+                acentos).
+            provincia: Província onde procurar o município ou comuna.
+            nivel: 'provincia', 'municipio' ou 'comuna', para escolher o nível.
+            inteiro: Se ``True``, devolve a forma inteira do código.
+            
+        Returns:
+            O código, ou ``None`` se nenhuma divisão corresponder.
+            
+        Raises:
+            ProvinciaInexistente: Se ``provincia`` não existir.
+            ValueError: Se ``nivel`` for inválido.
+            DivisaoAmbigua: Se o nome for ambíguo (homónimos no mesmo nível
+                em províncias diferentes).
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.codigo_de("Bengo")
+            '01'
+            >>> geo.codigo_de("Dande", provincia="Bengo")
+            '01.001'
+        """
+        conjunto = self._conjunto
+        if nivel is not None and nivel not in NIVEIS:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        entradas = conjunto.entradas
+        candidatos = conjunto.identificadores_nomes.get(normalizar(nome), ())
+        if provincia is not None:
+            alvo = self._obter_provincia_ou_erro(provincia, conjunto)
+            candidatos = [
+                i for i in candidatos
+                if entradas[i].nivel != NIVEL_PROVINCIA and entradas[i].provincia is alvo
+            ]
+        if nivel is not None:
+            candidatos = [i for i in candidatos if entradas[i].nivel == nivel]
+        if not candidatos:
+            return None
+        
+        nivel_escolhido = min(NIVEIS.index(entradas[i].nivel) for i in candidatos)
+        candidatos = [i for i in candidatos if NIVEIS.index(entradas[i].nivel) == nivel_escolhido]
+        if len(candidatos) > 1:
+            raise DivisaoAmbigua(nome, [conjunto.vista_divisao(i) for i in candidatos])
+        codigo = conjunto.codigos[candidatos[0]]
+        return codigo if inteiro else formatar_codigo(codigo)
+    
+    def localizar(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
+        """
+        Obtém a divisão que contém um ponto (geocodificação inversa).
+        
+        Usa os limites geográficos opcionais (ver
+        :mod:`angola_geo.geometria`), indexados numa grelha na primeira
+        chamada: a maioria dos pontos cai numa célula inteiramente dentro
+        de uma divisão e dispensa o teste exato; nos restantes só os
+        poucos polígonos que atravessam a célula são testados.
+        
+        Args:
+            latitude: Latitude em graus (WGS 84).
+            longitude: Longitude em graus (WGS 84).
+            
+        Returns:
+            A divisão mais profunda com limites que contém o ponto (a
+            comuna, se os limites a incluírem, senão o município ou a
+            província), no formato de :meth:`obter_por_codigo`, ou ``None``
+            se o ponto não estiver dentro de nenhum limite.
+            
+        Raises:
+            LimitesIndisponiveis: Se não houver um ficheiro de limites.
+            DadosInvalidos: Se o ficheiro de limites não for válido.
+            
+        Example:
+            O pacote não traz limites; com um ficheiro compilado por
+            ``python -m angola_geo.geometria`` (ilustrativo):
+            
+            >>> geo = AngolaGeo(limites="limites.bin")  # doctest: +SKIP
+            >>> geo.localizar(-8.8383, 13.2344)['provincia']  # doctest: +SKIP
+            'Luanda'
+        """
+        conjunto = self._conjunto
+        codigo = conjunto.localizador(self._limites).localizar(latitude, longitude)
+        if codigo is None:
+            return None
+        return self._formatar_codigo(
+            codigo, conjunto.entradas[conjunto.identificadores_codigos[codigo]]
+        )
+    
+    def localizar_lote(
+        self,
+        pontos: Iterable[Sequence[float]]
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Localiza muitos pontos, como :meth:`localizar`.
+        
+        O índice é carregado uma vez, já nesta chamada (os erros de
+        :meth:`localizar` surgem aqui e não no primeiro resultado), e os
+        resultados são gerados à medida que ``pontos`` é consumido.
+        
+        Args:
+            pontos: Iterável de pares ``(latitude, longitude)``, por
+                exemplo uma lista de tuplos ou as linhas de um array N×2.
+            
+        Yields:
+            O resultado de :meth:`localizar` para cada ponto, pela ordem.
+            
+        Example:
+            Com um ficheiro de limites, como em :meth:`localizar` (ilustrativo):
+            
+            >>> geo = AngolaGeo(limites="limites.bin")  # doctest: +SKIP
+            >>> pontos = [(-8.84, 13.23), (0, 0)]
+            >>> [r and r['nome'] for r in geo.localizar_lote(pontos)]  # doctest: +SKIP
+            ['Luanda', None]
+        """
+        conjunto = self._conjunto
+        codigos = conjunto.localizador(self._limites).localizar_lote(pontos)
+        return self._formatar_codigos(codigos, conjunto)
+    
+    def mais_proximos(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        nivel: Optional[str] = NIVEL_MUNICIPIO
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtém as divisões cujas sedes estão mais próximas de um ponto.
+        
+        As sedes (capitais de província e sedes de município com posição
+        conhecida, ver :mod:`angola_geo.sedes`) estão indexadas numa árvore
+        k-d por nível, pelo que a consulta não calcula a distância a todas.
+        As divisões sem coordenadas não são consideradas.
+        
+        Args:
+            latitude: Latitude em graus (WGS 84).
+            longitude: Longitude em graus (WGS 84).
+            k: Número máximo de resultados.
+            nivel: 'provincia', 'municipio' (padrão) ou 'comuna', ou
+                ``None`` para todos os níveis.
+            
+        Returns:
+            Lista com até ``k`` divisões, da mais próxima para a mais
+            afastada, no formato de :meth:`obter_por_codigo`, com
+            'latitude' e 'longitude' da sede e 'distancia_km' (ao longo da
+            superfície).
+            
+        Raises:
+            ValueError: Se as coordenadas, ``k`` ou ``nivel`` forem
+                inválidos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> [s['nome'] for s in geo.mais_proximos(-8.58, 13.66, k=1)]
+            ['Dande']
+        """
+        if k < 0:
+            raise ValueError("k não pode ser negativo")
+        conjunto = self._conjunto
+        indice = self._indice_sedes(nivel, conjunto)
+        return self._formatar_sedes(
+            indice.mais_proximos(latitude, longitude, k, nivel), indice, conjunto
+        )
+    
+    def dentro_do_raio(
+        self,
+        latitude: float,
+        longitude: float,
+        raio_km: float,
+        nivel: Optional[str] = NIVEL_MUNICIPIO
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtém as divisões cujas sedes estão a até ``raio_km`` de um ponto.
+        
+        Como :meth:`mais_proximos`, percorre só os ramos da árvore k-d que
+        podem ter sedes dentro do raio.
+        
+        Args:
+            latitude: Latitude em graus (WGS 84).
+            longitude: Longitude em graus (WGS 84).
+            raio_km: Distância máxima, em quilómetros, ao longo da superfície.
+            nivel: 'provincia', 'municipio' (padrão) ou 'comuna', ou
+                ``None`` para todos os níveis.
+            
+        Returns:
+            As divisões dentro do raio, da mais próxima para a mais
+            afastada, no formato de :meth:`mais_proximos`.
+            
+        Raises:
+            ValueError: Se as coordenadas, ``raio_km`` ou ``nivel`` forem
+                inválidos.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> [s['nome'] for s in geo.dentro_do_raio(-8.58, 13.66, 30)]
+            ['Dande', 'Panguila']
+        """
+        if raio_km < 0:
+            raise ValueError("raio_km não pode ser negativo")
+        conjunto = self._conjunto
+        indice = self._indice_sedes(nivel, conjunto)
+        return self._formatar_sedes(
+            indice.dentro_do_raio(latitude, longitude, raio_km, nivel), indice, conjunto
+        )
+    
+    def mais_proximos_lote(
+        self,
+        pontos: Iterable[Sequence[float]],
+        k: int = 5,
+        nivel: Optional[str] = NIVEL_MUNICIPIO
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        :meth:`mais_proximos` para muitos pontos.
+        
+        Os argumentos são validados e o índice carregado uma vez, já nesta
+        chamada; os resultados são gerados à medida que ``pontos`` é
+        consumido.
+        
+        Args:
+            pontos: Iterável de pares ``(latitude, longitude)``, por
+                exemplo as linhas de um array N×2.
+            k: Número máximo de resultados por ponto.
+            nivel: Ver :meth:`mais_proximos`.
+            
+        Yields:
+            A lista de :meth:`mais_proximos` de cada ponto, pela ordem.
+        """
+        if k < 0:
+            raise ValueError("k não pode ser negativo")
+        conjunto = self._conjunto
+        indice = self._indice_sedes(nivel, conjunto)
+        return (
+            self._formatar_sedes(
+                indice.mais_proximos(latitude, longitude, k, nivel), indice, conjunto
+            )
+            for latitude, longitude in pontos
+        )
+    
+    def dentro_do_raio_lote(
+        self,
+        pontos: Iterable[Sequence[float]],
+        raio_km: float,
+        nivel: Optional[str] = NIVEL_MUNICIPIO
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        :meth:`dentro_do_raio` para muitos pontos, como
+        :meth:`mais_proximos_lote`.
+        
+        Yields:
+            A lista de :meth:`dentro_do_raio` de cada ponto, pela ordem.
+        """
+        if raio_km < 0:
+            raise ValueError("raio_km não pode ser negativo")
+        conjunto = self._conjunto
+        indice = self._indice_sedes(nivel, conjunto)
+        return (
+            self._formatar_sedes(
+                indice.dentro_do_raio(latitude, longitude, raio_km, nivel), indice, conjunto
+            )
+            for latitude, longitude in pontos
+        )
+    
     def obter_nomes_provincias(self) -> List[str]:
         """
         Obtém uma lista simples com os nomes de todas as províncias.
@@ -223,12 +1258,19 @@ class AngolaGeo:
             >>> print(nomes[0])
             'Bengo'
         """
-        return [p["name"] for p in self._provincias]
+        fragmentos = self._fragmentos
+        if fragmentos is not None:
+            return list(fragmentos.nomes)
+        return [p.nome for p in self._conjunto.provincias]
     
-    def obter_provincias_novas(self) -> List[Dict[str, Any]]:
+    def obter_provincias_novas(self, copiar: bool = False) -> List[Dict[str, Any]]:
         """
         Obtém as três novas províncias criadas pela Lei 14/24.
         
+        Args:
+            copiar: Se ``True``, devolve cópias mutáveis em vez das vistas
+                só de leitura partilhadas.
+        
         Returns:
             Lista com as três novas províncias: Icolo e Bengo, Cuando e Moxico Leste.
             
@@ -238,50 +1280,328 @@ class AngolaGeo:
             >>> print(len(novas))
             3
         """
-        nomes_provincias_novas = ["Icolo e Bengo", "Cuando", "Moxico Leste"]
-        return [
-            self._formatar_provincia(p)
-            for p in self._provincias
-            if p["name"] in nomes_provincias_novas
+        conjunto = self._conjunto
+        novas = [
+            conjunto.vistas_provincias[p]
+            for p in conjunto.provincias
+            if p.nome in PROVINCIAS_NOVAS
         ]
+        return self._devolver(novas, copiar)
     
-    def _encontrar_provincia(self, nome: str) -> Optional[Dict[str, Any]]:
-        """Encontra uma província pelo nome (não diferencia maiúsculas/minúsculas)."""
-        nome_lower = nome.lower()
-        for provincia in self._provincias:
-            if provincia["name"].lower() == nome_lower:
-                return provincia
-        return None
-    
-    def _formatar_provincia(self, provincia: Dict[str, Any]) -> Dict[str, Any]:
-        """Formata os dados da província para saída."""
-        formatado = {
-            "id": provincia["id"],
-            "nome": provincia["name"],
-            "capital": provincia["capital"],
-            "total_municipios": provincia["municipality_count"],
-            "municipios": self._formatar_municipios(
-                provincia["municipalities"],
-                provincia["name"]
+    def obter_metadados_json(self) -> bytes:
+        """
+        Metadados em JSON (UTF-8), como :meth:`obter_metadados`.
+        
+        Tal como as restantes variantes ``*_json``, a serialização é feita
+        uma única vez e os mesmos bytes são devolvidos até os dados serem
+        recarregados.
+        
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.obter_metadados_json()[:8]
+            b'{"law":"'
+        """
+        conjunto = self._fragmentos or self._conjunto
+        return self._em_json(conjunto, ("metadados",), lambda: conjunto.metadados)
+    
+    def listar_provincias_json(self) -> bytes:
+        """
+        Todas as províncias em JSON (UTF-8), como :meth:`listar_provincias`.
+        
+        Example:
+            >>> import json
+            >>> geo = AngolaGeo()
+            >>> dados = geo.listar_provincias_json()
+            >>> len(json.loads(dados))
+            21
+        """
+        conjunto = self._conjunto
+        return self._em_json(conjunto, ("provincias",), lambda: conjunto.lista_provincias)
+    
+    def obter_provincia_json(self, nome: str) -> bytes:
+        """
+        Uma província em JSON (UTF-8), como :meth:`obter_provincia`.
+        
+        A cache é indexada pela província encontrada, pelo que "Uíge" e
+        "uige" devolvem os mesmos bytes.
+        
+        Raises:
+            ProvinciaInexistente: Se a província não for encontrada.
+        """
+        fragmentos = self._fragmentos
+        if fragmentos is not None:
+            fragmento = self._fragmento_ou_erro(nome, fragmentos)
+            return self._em_json(
+                fragmentos, ("provincia", fragmento.provincia), lambda: fragmento.vista
             )
-        }
+        conjunto = self._conjunto
+        provincia = self._obter_provincia_ou_erro(nome, conjunto)
+        return self._em_json(
+            conjunto, ("provincia", provincia), lambda: conjunto.vistas_provincias[provincia]
+        )
+    
+    def listar_municipios_json(self, provincia: Optional[str] = None) -> bytes:
+        """
+        Municípios em JSON (UTF-8), como :meth:`listar_municipios`.
+        
+        Raises:
+            ProvinciaInexistente: Se a província especificada não for encontrada.
+        """
+        fragmentos = self._fragmentos
+        if provincia and fragmentos is not None:
+            fragmento = self._fragmento_ou_erro(provincia, fragmentos)
+            return self._em_json(
+                fragmentos, ("municipios", fragmento.provincia),
+                lambda: fragmento.vistas_municipios
+            )
+        conjunto = self._conjunto
+        if not provincia:
+            return self._em_json(
+                conjunto, ("municipios", None), lambda: conjunto.lista_municipios
+            )
+        registo = self._obter_provincia_ou_erro(provincia, conjunto)
+        return self._em_json(
+            conjunto, ("municipios", registo), lambda: conjunto.vistas_municipios[registo]
+        )
+    
+    def obter_provincias_novas_json(self) -> bytes:
+        """Novas províncias em JSON (UTF-8), como :meth:`obter_provincias_novas`."""
+        conjunto = self._conjunto
+        return self._em_json(conjunto, ("novas",), lambda: [
+            conjunto.vistas_provincias[p]
+            for p in conjunto.provincias
+            if p.nome in PROVINCIAS_NOVAS
+        ])
+    
+    def ativar_instrumentacao(self, observador: Optional[Observador] = None) -> None:
+        """
+        Ativa a medição das chamadas aos métodos públicos desta instância.
         
-        if "notes" in provincia:
-            formatado["observacoes"] = provincia["notes"]
+        Cada chamada passa a registar o número de chamadas, erros, tempo
+        acumulado e um histograma de latências em intervalos de potências
+        de 2 µs (ver :meth:`estatisticas`). Sem instrumentação os métodos
+        não têm qualquer custo adicional.
         
-        return formatado
+        Args:
+            observador: Função chamada após cada medição com ``(nome,
+                duracao_s)``, por exemplo para enviar os dados para um
+                sistema de métricas. Pode ser chamada várias vezes para
+                registar vários observadores.
+            
+        Example:
+            >>> geo = AngolaGeo()
+            >>> geo.ativar_instrumentacao(lambda nome, s: print(nome))
+            >>> _ = geo.obter_provincia("Luanda")
+            obter_provincia
+        """
+        if self._metricas is None:
+            self._metricas = Metricas()
+        if observador is not None:
+            self._metricas.adicionar_observador(observador)
+        if "obter_provincia" in self.__dict__:
+            return
+        for nome, metodo in inspect.getmembers(type(self), inspect.isfunction):
+            if not nome.startswith("_") and nome not in self._NAO_INSTRUMENTADOS:
+                setattr(self, nome, self._metricas.medir(nome, metodo.__get__(self)))
     
-    def _formatar_municipios(
+    def desativar_instrumentacao(self) -> None:
+        """
+        Desativa a instrumentação; os métodos voltam a ser os da classe.
+        
+        As medições já feitas continuam disponíveis em :meth:`estatisticas`.
+        """
+        for nome, _ in inspect.getmembers(type(self), inspect.isfunction):
+            self.__dict__.pop(nome, None)
+    
+    def estatisticas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Métricas das chamadas registadas pela instrumentação.
+        
+        Returns:
+            Dicionário por método (e ``"carregamento"`` para a leitura dos
+            dados) com 'chamadas', 'erros', 'tempo_total_s',
+            'tempo_medio_us', 'tempo_maximo_us' e 'histograma_us' (limite
+            superior de cada intervalo em µs → número de chamadas). Vazio se
+            a instrumentação nunca foi ativada.
+            
+        Example:
+            >>> geo = AngolaGeo(instrumentar=True)
+            >>> _ = geo.obter_provincia("Luanda")
+            >>> geo.estatisticas()['obter_provincia']['chamadas']
+            1
+        """
+        if self._metricas is None:
+            return {}
+        return self._metricas.estatisticas()
+    
+    def _publicar(self, conjunto: ConjuntoDados) -> ConjuntoDados:
+        """
+        Torna ``conjunto`` o conjunto ativo com uma única troca de
+        referência e devolve o anterior.
+        """
+        anterior = self._conjunto
+        self._conjunto = conjunto
+        self._fragmentos = None
+        if self._usar_cache:
+            substituir_conjunto(conjunto)
+        return anterior
+    
+    def _carregar(self) -> ConjuntoDados:
+        """Obtém o conjunto de dados desta instância."""
+        metricas = self._metricas
+        inicio = time.perf_counter_ns()
+        if self._caminho is not None:
+            conjunto = carregar_conjunto(self._caminho)
+        else:
+            conjunto = obter_conjunto(self._usar_cache)
+        if metricas is not None:
+            metricas.registar(CARREGAMENTO, time.perf_counter_ns() - inicio)
+        return conjunto
+    
+    def _obter_provincia_ou_erro(
+        self,
+        nome: str,
+        conjunto: Optional[ConjuntoDados] = None
+    ) -> Provincia:
+        """
+        Encontra uma província pelo nome (ignora maiúsculas e acentos) ou
+        lança ProvinciaInexistente com sugestões.
+        """
+        conjunto = conjunto or self._conjunto
+        provincia = conjunto.indice_provincias.get(normalizar(nome))
+        if provincia is None:
+            raise ProvinciaInexistente(nome, self._sugerir_provincias(nome, conjunto))
+        return provincia
+    
+    def _fragmento_ou_erro(self, nome: str, fragmentos: ConjuntoFragmentado) -> FragmentoProvincia:
+        """Como :meth:`_obter_provincia_ou_erro`, mas só com os fragmentos."""
+        fragmento = fragmentos.fragmento(nome, self._metricas)
+        if fragmento is None:
+            raise ProvinciaInexistente(nome, fragmentos.sugerir(nome, MAX_SUGESTOES))
+        return fragmento
+    
+    def _sugerir_provincias(self, nome: str, conjunto: ConjuntoDados) -> List[str]:
+        """Sugere nomes de províncias próximos de um nome inexistente."""
+        sugestoes = []
+        for _, _, identificadores in conjunto.arvore_bk.pesquisar(normalizar(nome), 2):
+            for identificador in identificadores:
+                registo = conjunto.entradas[identificador]
+                if registo.nivel == NIVEL_PROVINCIA:
+                    sugestoes.append(registo.nome)
+            if len(sugestoes) >= MAX_SUGESTOES:
+                break
+        return sugestoes[:MAX_SUGESTOES]
+    
+    def _formatar_codigo(self, codigo: int, registo: Registo) -> Dict[str, Any]:
+        """Resultado de :meth:`obter_por_codigo` para um registo."""
+        resultado = {"codigo": formatar_codigo(codigo), "codigo_inteiro": codigo}
+        resultado.update(self._formatar_entrada(registo))
+        return resultado
+    
+    def _formatar_codigos(
+        self,
+        codigos: Iterable[Optional[int]],
+        conjunto: ConjuntoDados
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """Formata os códigos de :meth:`localizar_lote` (``None`` mantém-se)."""
+        entradas = conjunto.entradas
+        identificadores = conjunto.identificadores_codigos
+        for codigo in codigos:
+            if codigo is None:
+                yield None
+            else:
+                yield self._formatar_codigo(codigo, entradas[identificadores[codigo]])
+    
+    def _indice_sedes(self, nivel: Optional[str], conjunto: ConjuntoDados) -> IndiceSedes:
+        """Valida ``nivel`` e obtém o índice das sedes do conjunto."""
+        if nivel is not None and nivel not in NIVEIS:
+            raise ValueError(
+                f"Nível inválido: {nivel!r}. Use um de: {', '.join(NIVEIS)}"
+            )
+        return conjunto.indice_sedes(self._sedes)
+    
+    def _formatar_sedes(
         self,
-        municipios: List[Dict[str, Any]],
-        nome_provincia: str
+        vizinhos: List[Tuple[int, float]],
+        indice: IndiceSedes,
+        conjunto: ConjuntoDados
     ) -> List[Dict[str, Any]]:
-        """Formata os dados dos municípios para saída."""
-        return [
-            {
-                "nome": m["name"],
-                "provincia": nome_provincia,
-                "comunas": m.get("communes", [])
+        """Formata os vizinhos ``(identificador, distância)`` com as coordenadas."""
+        resultados = []
+        for identificador, distancia in vizinhos:
+            resultado = self._formatar_codigo(
+                conjunto.codigos[identificador], conjunto.entradas[identificador]
+            )
+            resultado["latitude"], resultado["longitude"] = indice.coordenadas[identificador]
+            resultado["distancia_km"] = distancia
+            resultados.append(resultado)
+        return resultados
+    
+    def _formatar_entrada(self, registo: Registo) -> Dict[str, Any]:
+        """Formata um registo dos índices com a sua hierarquia."""
+        if registo.nivel == NIVEL_PROVINCIA:
+            return {"nivel": registo.nivel, "nome": registo.nome}
+        if registo.nivel == NIVEL_MUNICIPIO:
+            return {
+                "nivel": registo.nivel,
+                "nome": registo.nome,
+                "provincia": registo.provincia.nome
             }
-            for m in municipios
-        ]
+        return {
+            "nivel": registo.nivel,
+            "nome": registo.nome,
+            "municipio": registo.municipio.nome,
+            "provincia": registo.provincia.nome
+        }
+    
+    @staticmethod
+    def _unica_divisao(
+        nome: str,
+        candidatos: List[int],
+        conjunto: ConjuntoDados
+    ) -> Dict[str, Any]:
+        """Vista do único candidato, ou DivisaoAmbigua se houver vários."""
+        if len(candidatos) > 1:
+            raise DivisaoAmbigua(nome, [conjunto.vista_divisao(i) for i in candidatos])
+        return conjunto.vista_divisao(candidatos[0])
+    
+    @staticmethod
+    def _em_json(
+        conjunto: Union[ConjuntoDados, ConjuntoFragmentado],
+        chave: Any,
+        produzir: Callable[[], Any]
+    ) -> bytes:
+        """Bytes JSON de uma consulta, serializados na primeira utilização."""
+        corpo = conjunto.cache_json.get(chave)
+        if corpo is None:
+            corpo = conjunto.cache_json.setdefault(chave, serializar_json(produzir()))
+        return corpo
+    
+    @staticmethod
+    def _paginar(
+        itens: Iterable[Any],
+        offset: int,
+        limite: Optional[int],
+        copiar: bool
+    ) -> Iterator[Any]:
+        """Iterador dos ``itens`` a partir de ``offset``, até ``limite`` itens."""
+        if offset < 0 or (limite is not None and limite < 0):
+            raise ValueError("offset e limite não podem ser negativos")
+        pagina = islice(itens, offset, None if limite is None else offset + limite)
+        return map(copiar_vista, pagina) if copiar else pagina
+    
+    @staticmethod
+    def _identificadores_comunas(
+        municipios: Iterable[Any],
+        conjunto: ConjuntoDados
+    ) -> Iterator[int]:
+        """Identificadores das comunas, que seguem o do seu município."""
+        identificadores = conjunto.identificadores_registos
+        for municipio in municipios:
+            inicio = identificadores[municipio] + 1
+            yield from range(inicio, inicio + len(municipio.comunas))
+    
+    @staticmethod
+    def _devolver(vista: Any, copiar: bool) -> Any:
+        """Devolve a vista partilhada ou, se pedido, uma cópia mutável."""
+        return copiar_vista(vista) if copiar else vista
@@ -0,0 +1,420 @@
+"""
+Carregamento dos dados das divisões e cache partilhada entre instâncias.
+
+O ficheiro ``data/divisions.json`` é lido e indexado uma única vez por
+processo: todas as instâncias de AngolaGeo partilham o mesmo
+:class:`ConjuntoDados`, até que a cache seja invalidada com
+:func:`invalidar_cache` (ou ``AngolaGeo.recarregar()``).
+"""
+
+import json
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import binario, fragmentos
+from .codigos import codificar, formatar
+from .excecoes import DadosInvalidos
+from .geometria import Localizador, carregar_limites
+from .indices import ArvoreBK, IndicePrefixos, IndiceTrigramas
+from .migracao import TabelaMigracao
+from .modelos import Comuna, Municipio, Provincia, Registo
+from .normalizacao import normalizar
+from .resolucao import criar_resolvedor
+from .sedes import IndiceSedes
+from .resumo import CAMINHO_DADOS, CAMINHO_DADOS_ANTERIORES, CAMINHO_LIMITES, CAMINHO_SEDES
+from .vistas import (
+    DicionarioImutavel,
+    congelar,
+    vista_ascendente,
+    vista_divisao,
+    vista_municipio,
+    vista_provincia,
+    vista_resultado_comuna,
+    vista_resumo_provincia,
+    vista_resultado_municipio,
+)
+
+# Níveis da hierarquia administrativa usados nas entradas dos índices
+NIVEL_PROVINCIA = Provincia.nivel
+NIVEL_MUNICIPIO = Municipio.nivel
+NIVEL_COMUNA = Comuna.nivel
+NIVEIS = (NIVEL_PROVINCIA, NIVEL_MUNICIPIO, NIVEL_COMUNA)
+
+# Valor de ``ConjuntoDados.pais`` nas províncias
+SEM_PAI = -1
+
+
+def carregar_json(caminho: str = CAMINHO_DADOS) -> Dict[str, Any]:
+    """Carrega os dados das divisões do arquivo JSON."""
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def carregar_conjunto(caminho: str = CAMINHO_DADOS) -> "ConjuntoDados":
+    """
+    Carrega e indexa os dados das divisões.
+    
+    Usa o instantâneo binário ao lado do JSON (ver :mod:`angola_geo.binario`)
+    quando o seu hash corresponde ao conteúdo atual do JSON; caso contrário
+    interpreta o JSON.
+    """
+    with open(caminho, "rb") as f:
+        return conjunto_de_conteudo(f.read(), caminho)
+
+
+def conjunto_de_conteudo(conteudo: bytes, caminho: str = CAMINHO_DADOS) -> "ConjuntoDados":
+    """
+    Indexa os bytes já lidos de um ficheiro de divisões.
+    
+    Como :func:`carregar_conjunto`, mas sem voltar a ler o JSON (usado
+    pela recarga automática, que já leu o ficheiro para calcular o hash).
+    O hash do conteúdo fica em ``hash_origem`` do conjunto devolvido.
+    """
+    hash_origem = binario.hash_conteudo(conteudo)
+    try:
+        with open(binario.caminho_binario(caminho), "rb") as f:
+            instantaneo = binario.ler_dados(f.read(), hash_origem)
+    except OSError:
+        instantaneo = None
+    
+    if instantaneo is not None:
+        conjunto = ConjuntoDados(*instantaneo)
+    else:
+        conjunto = ConjuntoDados.de_json(json.loads(conteudo.decode("utf-8")))
+    conjunto.hash_origem = hash_origem
+    return conjunto
+
+
+class ConjuntoDados:
+    """
+    Dados das divisões carregados e os índices derivados deles.
+    
+    As divisões são convertidas em registos imutáveis (ver
+    :mod:`angola_geo.modelos`) e os índices de nomes normalizados (ver
+    :func:`normalizar`) são construídos uma vez, no construtor. As
+    províncias têm nomes únicos; municípios e comunas podem repetir o
+    mesmo nome em pais diferentes, por isso guardam listas.
+    
+    Todos os registos são ainda guardados em ``entradas``, por ordem do
+    ficheiro; a posição de cada registo é o seu identificador no índice de
+    trigramas e na árvore BK usada pela pesquisa aproximada. Alinhados
+    com ``entradas`` há dois arrays de inteiros (expostos como vistas
+    ``memoryview`` só de leitura): ``codigos``, com a forma
+    inteira do código hierárquico de cada registo (ver
+    :mod:`angola_geo.codigos`), e ``pais``, com o identificador do pai
+    (:data:`SEM_PAI` nas províncias); ``identificadores_codigos`` faz o
+    caminho inverso, do código ao identificador, e
+    ``identificadores_registos`` dá o identificador de cada registo (as
+    comunas de um município ocupam as posições seguintes à dele). Os índices de
+    prefixos (um global e um por nível) servem o autocompletar, e
+    ``identificadores_nomes`` (nome normalizado → identificadores, em todos
+    os níveis) e o resolvedor memorizado ``resolver`` (ver
+    :mod:`angola_geo.resolucao`) servem a normalização em lote.
+    
+    A árvore BK é o índice mais caro de construir e só serve a pesquisa
+    aproximada, por isso é construída na primeira utilização e não no
+    arranque (ver :attr:`arvore_bk`); o mesmo acontece com a tabela de
+    migração da divisão anterior (ver :attr:`tabela_migracao`) e com os
+    índices espaciais dos limites geográficos e das sedes (ver
+    :meth:`localizador` e :meth:`indice_sedes`).
+    
+    As vistas só de leitura devolvidas pela API (ver :mod:`angola_geo.vistas`)
+    também são construídas aqui, uma vez: ``vistas_resultados`` está
+    alinhada com ``entradas`` e guarda a vista de cada registo tal como
+    aparece nos resultados de ``pesquisar``; as vistas com a cadeia de
+    ascendentes (ver :meth:`vista_divisao`) são construídas só quando
+    pedidas e guardadas em ``vistas_divisoes``. ``cache_json`` guarda, à
+    medida que são pedidos, os bytes JSON das consultas determinísticas
+    (ver os métodos ``*_json`` de AngolaGeo); como pertence ao conjunto, só
+    é descartada quando os dados são recarregados.
+    
+    Depois do construtor, o conjunto é imutável em profundidade: registos,
+    vistas, metadados (ver :func:`~angola_geo.vistas.congelar`), as
+    listas dos índices (guardadas como tuplos) e os arrays ``codigos`` e
+    ``pais`` (vistas só de leitura) não mudam mais, por isso
+    podem ser partilhados entre threads e devolvidos sem cópias defensivas.
+    As leituras não tomam travas. As únicas escritas posteriores são
+    preenchimentos idempotentes: as estruturas preguiçosas são publicadas
+    sob ``_trava`` (verificação dupla) e as caches de vistas e de JSON
+    guardam valores que qualquer thread calcularia iguais.
+    """
+    
+    def __init__(
+        self,
+        provincias: Sequence[Provincia],
+        metadados: Dict[str, Any],
+        indice_trigramas: Optional[IndiceTrigramas] = None
+    ):
+        """
+        Args:
+            provincias: Registos das províncias, com toda a hierarquia.
+            metadados: Metadados do conjunto de dados.
+            indice_trigramas: Índice de trigramas já construído sobre os
+                nomes normalizados de ``entradas`` (por exemplo, lido do
+                instantâneo binário). Se omitido, é construído aqui.
+        """
+        self.provincias: Tuple[Provincia, ...] = tuple(provincias)
+        self.metadados: DicionarioImutavel = congelar(metadados)
+        
+        entradas: List[Registo] = []
+        codigos = array("i")
+        pais = array("i")
+        for provincia in self.provincias:
+            id_provincia = len(entradas)
+            entradas.append(provincia)
+            codigos.append(codificar(provincia.id))
+            pais.append(SEM_PAI)
+            for posicao_municipio, municipio in enumerate(provincia.municipios, 1):
+                id_municipio = len(entradas)
+                entradas.append(municipio)
+                codigos.append(codificar(provincia.id, posicao_municipio))
+                pais.append(id_provincia)
+                for posicao_comuna, comuna in enumerate(municipio.comunas, 1):
+                    entradas.append(comuna)
+                    codigos.append(codificar(provincia.id, posicao_municipio, posicao_comuna))
+                    pais.append(id_municipio)
+        # Vistas só de leitura sobre os arrays: indexação igual, sem escritas
+        self.codigos: memoryview = memoryview(codigos).toreadonly()
+        self.pais: memoryview = memoryview(pais).toreadonly()
+        self.entradas: Tuple[Registo, ...] = tuple(entradas)
+        self.identificadores_registos: Dict[Registo, int] = {
+            registo: identificador for identificador, registo in enumerate(self.entradas)
+        }
+        self.identificadores_codigos: Dict[int, int] = {
+            codigo: identificador for identificador, codigo in enumerate(self.codigos)
+        }
+        if len(self.identificadores_codigos) != len(self.entradas):
+            raise DadosInvalidos("Há províncias com o mesmo id")
+        
+        if indice_trigramas is None or len(indice_trigramas) != len(self.entradas):
+            indice_trigramas = IndiceTrigramas()
+            for registo in self.entradas:
+                indice_trigramas.adicionar(normalizar(registo.nome))
+        self.indice_trigramas = indice_trigramas
+        self._arvore_bk: Optional[ArvoreBK] = None
+        self._tabela_migracao: Optional[TabelaMigracao] = None
+        self._localizadores: Dict[str, Localizador] = {}
+        self._indices_sedes: Dict[str, IndiceSedes] = {}
+        self._trava = threading.Lock()
+        
+        self.indice_provincias: Dict[str, Provincia] = {}
+        self.indice_municipios: Dict[str, Tuple[Municipio, ...]] = {}
+        self.indice_comunas: Dict[str, Tuple[Comuna, ...]] = {}
+        indices_nomes = {
+            NIVEL_MUNICIPIO: self.indice_municipios,
+            NIVEL_COMUNA: self.indice_comunas,
+        }
+        self.identificadores_nomes: Dict[str, Tuple[int, ...]] = {}
+        pares_prefixos: Dict[str, List[Tuple[str, int]]] = {nivel: [] for nivel in NIVEIS}
+        
+        for identificador, (registo, chave) in enumerate(
+            zip(self.entradas, indice_trigramas.nomes)
+        ):
+            if registo.nivel == NIVEL_PROVINCIA:
+                self.indice_provincias[chave] = registo
+            else:
+                indices_nomes[registo.nivel].setdefault(chave, []).append(registo)
+            self.identificadores_nomes.setdefault(chave, []).append(identificador)
+            pares_prefixos[registo.nivel].append((chave, identificador))
+        # Congelar as listas: os índices são partilhados sem cópias
+        for indice in (self.indice_municipios, self.indice_comunas, self.identificadores_nomes):
+            for chave, valores in indice.items():
+                indice[chave] = tuple(valores)
+        
+        self.indices_prefixos: Dict[Optional[str], IndicePrefixos] = {
+            nivel: IndicePrefixos(pares) for nivel, pares in pares_prefixos.items()
+        }
+        self.indices_prefixos[None] = IndicePrefixos(
+            par for pares in pares_prefixos.values() for par in pares
+        )
+        
+        self.vistas_municipios: Dict[Provincia, Tuple[DicionarioImutavel, ...]] = {
+            p: tuple(vista_municipio(m) for m in p.municipios) for p in self.provincias
+        }
+        self.vistas_provincias: Dict[Provincia, DicionarioImutavel] = {
+            p: vista_provincia(p, self.vistas_municipios[p]) for p in self.provincias
+        }
+        self.lista_provincias: Tuple[DicionarioImutavel, ...] = tuple(
+            self.vistas_provincias.values()
+        )
+        self.resumos_provincias: Tuple[DicionarioImutavel, ...] = tuple(
+            vista_resumo_provincia(
+                p.id, p.nome, p.capital, p.total_municipios, p.observacoes
+            )
+            for p in self.provincias
+        )
+        self.lista_municipios: Tuple[DicionarioImutavel, ...] = tuple(
+            vista for vistas in self.vistas_municipios.values() for vista in vistas
+        )
+        self.vistas_resultados: Tuple[DicionarioImutavel, ...] = tuple(
+            self.vistas_provincias[r] if r.nivel == NIVEL_PROVINCIA
+            else vista_resultado_municipio(r) if r.nivel == NIVEL_MUNICIPIO
+            else vista_resultado_comuna(r)
+            for r in self.entradas
+        )
+        
+        self.vistas_divisoes: Dict[int, DicionarioImutavel] = {}
+        self.resolver = criar_resolvedor(self)
+        self.cache_json: Dict[Any, bytes] = {}
+        # SHA-256 do ficheiro de origem, quando carregado de um ficheiro
+        self.hash_origem: Optional[bytes] = None
+
+    
+    @property
+    def arvore_bk(self) -> ArvoreBK:
+        """Árvore BK sobre todos os nomes, construída na primeira utilização."""
+        arvore = self._arvore_bk
+        if arvore is None:
+            with self._trava:
+                if self._arvore_bk is None:
+                    arvore = ArvoreBK()
+                    for identificador, nome in enumerate(self.indice_trigramas.nomes):
+                        arvore.adicionar(nome, identificador)
+                    self._arvore_bk = arvore
+                arvore = self._arvore_bk
+        return arvore
+    
+    @property
+    def tabela_migracao(self) -> TabelaMigracao:
+        """
+        Correspondência com a divisão anterior à Lei n.º 14/24 (ver
+        :mod:`angola_geo.migracao`), construída na primeira utilização.
+        """
+        tabela = self._tabela_migracao
+        if tabela is None:
+            with self._trava:
+                if self._tabela_migracao is None:
+                    self._tabela_migracao = TabelaMigracao(
+                        carregar_json(CAMINHO_DADOS_ANTERIORES), self
+                    )
+                tabela = self._tabela_migracao
+        return tabela
+    
+    def localizador(self, caminho: str = CAMINHO_LIMITES) -> Localizador:
+        """
+        Índice espacial dos limites em ``caminho`` (ver
+        :mod:`angola_geo.geometria`), construído na primeira utilização.
+        
+        Raises:
+            LimitesIndisponiveis: Se o ficheiro não existir.
+            DadosInvalidos: Se o ficheiro não for válido ou tiver códigos
+                que não existem neste conjunto.
+        """
+        localizador = self._localizadores.get(caminho)
+        if localizador is None:
+            with self._trava:
+                localizador = self._localizadores.get(caminho)
+                if localizador is None:
+                    limites = carregar_limites(caminho)
+                    desconhecidos = sorted(
+                        set(limites.codigos) - self.identificadores_codigos.keys()
+                    )
+                    if desconhecidos:
+                        raise DadosInvalidos(
+                            f"Limites com códigos que não existem nos dados: "
+                            f"{', '.join(formatar(c) for c in desconhecidos[:5])}"
+                        )
+                    localizador = self._localizadores[caminho] = Localizador(limites)
+        return localizador
+    
+    def indice_sedes(self, caminho: str = CAMINHO_SEDES) -> IndiceSedes:
+        """
+        Coordenadas das sedes em ``caminho`` e as árvores k-d de cada nível
+        (ver :mod:`angola_geo.sedes`), construídas na primeira utilização.
+        
+        Raises:
+            DadosInvalidos: Se uma sede não corresponder aos dados.
+        """
+        indice = self._indices_sedes.get(caminho)
+        if indice is None:
+            with self._trava:
+                indice = self._indices_sedes.get(caminho)
+                if indice is None:
+                    indice = self._indices_sedes[caminho] = IndiceSedes(
+                        carregar_json(caminho), self
+                    )
+        return indice
+    
+    def vista_divisao(self, identificador: int) -> DicionarioImutavel:
+        """
+        Vista de um registo com o código e a cadeia de ascendentes (seguida
+        pelo array ``pais``), construída na primeira utilização.
+        """
+        vista = self.vistas_divisoes.get(identificador)
+        if vista is None:
+            ancestrais = []
+            pai = self.pais[identificador]
+            while pai != SEM_PAI:
+                ancestrais.append(vista_ascendente(self.entradas[pai], formatar(self.codigos[pai])))
+                pai = self.pais[pai]
+            vista = self.vistas_divisoes.setdefault(identificador, vista_divisao(
+                self.entradas[identificador],
+                formatar(self.codigos[identificador]),
+                tuple(reversed(ancestrais))
+            ))
+        return vista
+    
+    @classmethod
+    def de_json(cls, dados: Dict[str, Any]) -> "ConjuntoDados":
+        """Constrói o conjunto a partir do conteúdo de ``divisions.json``."""
+        return cls([Provincia.de_json(p) for p in dados["provinces"]], dados["metadata"])
+
+
+_conjunto_partilhado: Optional[ConjuntoDados] = None
+_trava = threading.Lock()
+
+
+def obter_conjunto(usar_cache: bool = True) -> ConjuntoDados:
+    """
+    Obtém o conjunto de dados, carregando-o se necessário.
+    
+    Args:
+        usar_cache: Se ``True`` devolve o conjunto partilhado pelo processo,
+            carregado no máximo uma vez mesmo com várias threads. Se
+            ``False`` carrega um conjunto novo, privado de quem o pediu.
+    """
+    global _conjunto_partilhado
+    
+    if not usar_cache:
+        return carregar_conjunto()
+    
+    conjunto = _conjunto_partilhado
+    if conjunto is None:
+        with _trava:
+            if _conjunto_partilhado is None:
+                _conjunto_partilhado = carregar_conjunto()
+            conjunto = _conjunto_partilhado
+    return conjunto
+
+
+def substituir_conjunto(conjunto: ConjuntoDados) -> None:
+    """
+    Publica ``conjunto`` como o conjunto partilhado pelo processo.
+    
+    Usado pela recarga automática (ver :mod:`angola_geo.recarga`): as
+    instâncias criadas a seguir passam a usá-lo.
+    """
+    global _conjunto_partilhado
+    with _trava:
+        _conjunto_partilhado = conjunto
+
+
+def invalidar_cache() -> None:
+    """
+    Descarta o conjunto partilhado (e os fragmentos por província já
+    lidos, ver :mod:`angola_geo.fragmentos`); o próximo pedido volta a ler
+    os ficheiros.
+    
+    Instâncias já criadas mantêm o conjunto que tinham até chamarem
+    ``AngolaGeo.recarregar()``.
+    """
+    global _conjunto_partilhado
+    with _trava:
+        _conjunto_partilhado = None
+    fragmentos.invalidar_cache()
+
+
+def conjunto_partilhado() -> Optional[ConjuntoDados]:
+    """O conjunto partilhado pelo processo, se já tiver sido carregado."""
+    return _conjunto_partilhado
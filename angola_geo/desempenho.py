@@ -0,0 +1,319 @@
+"""
+Suite de benchmarks (``angola-geo bench``).
+
+Mede o carregamento dos dados (completos e só de uma província, ver
+:mod:`angola_geo.fragmentos`), ``obter_provincia``, ``listar_municipios``
+(todos e por província), ``pesquisar`` com termos que existem e que não
+existem (e só o primeiro resultado de ``pesquisar_iter``), ``migrar_lote`` e o arranque a frio da CLI. As medições de dados correm sobre o
+conjunto distribuído e sobre um conjunto sintético ampliado (ver
+:func:`gerar_dados_sinteticos`).
+
+Os resultados podem ser gravados em JSON e comparados com uma linha de
+base gravada antes: um benchmark regride quando o seu melhor tempo
+(``min_us``, menos sensível ao ruído da máquina do que a mediana) excede
+o da linha de base em mais do que a tolerância (global, ou por benchmark
+no campo ``"tolerancia"`` da linha de base).
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .resumo import CAMINHO_DADOS
+
+VERSAO_FORMATO = 1
+
+# As importações mais pesadas são feitas dentro das funções, para que
+# registar o comando na CLI não atrase o arranque dos restantes comandos
+
+# Tempo mínimo (s) de cada amostra; o número de execuções por amostra é
+# calibrado para o atingir
+DURACAO_AMOSTRA = 0.02
+AMOSTRAS = 5
+FATOR_SINTETICO = 10
+# Regressão quando o melhor tempo excede o da linha de base em mais de 25%
+TOLERANCIA = 0.25
+
+Benchmark = Tuple[str, Callable[[], Any], int]
+
+
+def gerar_dados_sinteticos(fator: int, comunas_por_municipio: int = 3) -> Dict[str, Any]:
+    """
+    Gera um conjunto ampliado no formato de ``divisions.json``.
+
+    Todas as províncias são preenchidas com ``fator`` vezes os municípios
+    declarados, cada um com ``comunas_por_municipio`` comunas fictícias.
+    """
+    with open(CAMINHO_DADOS, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    for provincia in base["provinces"]:
+        total = provincia["municipality_count"] * fator
+        provincia["municipalities"] = [
+            {
+                "name": f"{provincia['name']} Município {i}",
+                "communes": [
+                    {"name": f"{provincia['name']} Comuna {i}.{j}"}
+                    for j in range(comunas_por_municipio)
+                ]
+            }
+            for i in range(total)
+        ]
+    return base
+
+
+def medir(funcao: Callable[[], Any], amostras: int = AMOSTRAS, execucoes: int = 0) -> Dict[str, Any]:
+    """
+    Mede o tempo por execução de ``funcao``.
+
+    Args:
+        funcao: Função sem argumentos a medir.
+        amostras: Número de amostras.
+        execucoes: Execuções por amostra; ``0`` calibra automaticamente para
+            que cada amostra dure pelo menos :data:`DURACAO_AMOSTRA`.
+
+    Returns:
+        Dicionário com 'mediana_us', 'min_us', 'amostras' e 'execucoes'.
+    """
+    import statistics
+
+    if execucoes <= 0:
+        execucoes = 1
+        while True:
+            inicio = time.perf_counter()
+            for _ in range(execucoes):
+                funcao()
+            if time.perf_counter() - inicio >= DURACAO_AMOSTRA:
+                break
+            execucoes *= 2
+
+    tempos = []
+    for _ in range(amostras):
+        inicio = time.perf_counter()
+        for _ in range(execucoes):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / execucoes * 1e6)
+    return {
+        "mediana_us": round(statistics.median(tempos), 3),
+        "min_us": round(min(tempos), 3),
+        "amostras": amostras,
+        "execucoes": execucoes,
+    }
+
+
+def _benchmarks_dados(prefixo: str, caminho: str) -> Iterator[Benchmark]:
+    """Benchmarks da API sobre um ficheiro de dados."""
+    from collections import deque
+    
+    from .core import AngolaGeo
+    from .dados import carregar_conjunto
+
+    yield f"{prefixo}/carregamento", lambda: carregar_conjunto(caminho), 0
+    if caminho == CAMINHO_DADOS:
+        from .fragmentos import ConjuntoFragmentado
+        
+        # Arranque a pedido: manifesto e o fragmento de uma província
+        yield (
+            f"{prefixo}/carregamento_provincia",
+            lambda: ConjuntoFragmentado().fragmento("Luanda"),
+            0,
+        )
+
+    geo = AngolaGeo(caminho=caminho)
+    yield f"{prefixo}/obter_provincia", lambda: geo.obter_provincia("Luanda"), 0
+    yield f"{prefixo}/obter_provincia_acentos", lambda: geo.obter_provincia("uige"), 0
+    yield f"{prefixo}/listar_municipios", geo.listar_municipios, 0
+    yield f"{prefixo}/listar_municipios_provincia", lambda: geo.listar_municipios("Luanda"), 0
+    yield f"{prefixo}/pesquisar_encontrado", lambda: geo.pesquisar("bengo"), 0
+    yield f"{prefixo}/pesquisar_inexistente", lambda: geo.pesquisar("xyzw"), 0
+    yield f"{prefixo}/pesquisar_curto", lambda: geo.pesquisar("an"), 0
+    yield f"{prefixo}/pesquisar_iter_primeiro", lambda: next(geo.pesquisar_iter("an")), 0
+    
+    registos = [("Luanda", "Viana"), "Cuando Cubango", ("bengo", "dande"), ("Moxico", None)] * 250
+    yield f"{prefixo}/migrar_lote_1000", lambda: deque(geo.migrar_lote(registos), 0), 0
+
+
+def _benchmarks_cli() -> Iterator[Benchmark]:
+    """Arranque a frio da CLI, num processo novo por execução."""
+    import subprocess
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ambiente = dict(os.environ)
+    ambiente["PYTHONPATH"] = os.pathsep.join(filter(None, [raiz, ambiente.get("PYTHONPATH")]))
+
+    def correr(*argumentos):
+        return lambda: subprocess.run(
+            [sys.executable, "-m", "angola_geo.cli", *argumentos],
+            stdout=subprocess.DEVNULL, env=ambiente, check=True
+        )
+
+    yield "cli/info", correr("info"), 1
+    yield "cli/obter_provincia", correr("obter", "provincia", "Luanda"), 1
+
+
+def executar(
+    fator: int = FATOR_SINTETICO,
+    amostras: int = AMOSTRAS,
+    filtro: Optional[str] = None,
+    progresso: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Corre a suite de benchmarks.
+
+    Args:
+        fator: Fator de ampliação do conjunto sintético (``0`` omite-o).
+        amostras: Amostras por benchmark.
+        filtro: Só corre os benchmarks cujo nome contém este texto.
+        progresso: Função chamada com ``(nome, resultado)`` após cada benchmark.
+
+    Returns:
+        Dicionário com o ambiente ('python', 'plataforma', 'fator') e os
+        resultados por nome em 'resultados'.
+    """
+    import platform
+    import tempfile
+
+    from .binario import compilar
+
+    resultados: Dict[str, Any] = {}
+
+    def correr(benchmarks: Iterator[Benchmark]) -> None:
+        for nome, funcao, execucoes in benchmarks:
+            if filtro and filtro not in nome:
+                continue
+            resultados[nome] = medir(funcao, amostras, execucoes)
+            if progresso is not None:
+                progresso(nome, resultados[nome])
+
+    correr(_benchmarks_dados("distribuido", CAMINHO_DADOS))
+    if fator > 0:
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "divisions.json")
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(gerar_dados_sinteticos(fator), f, ensure_ascii=False)
+            compilar(caminho)
+            correr(_benchmarks_dados(f"sintetico_x{fator}", caminho))
+    correr(_benchmarks_cli())
+
+    return {
+        "versao_formato": VERSAO_FORMATO,
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "fator": fator,
+        "resultados": resultados,
+    }
+
+
+def comparar(
+    resultados: Dict[str, Any],
+    linha_base: Dict[str, Any],
+    tolerancia: float = TOLERANCIA
+) -> List[Dict[str, Any]]:
+    """
+    Compara resultados com uma linha de base.
+
+    Só são comparados os benchmarks presentes em ambos. A tolerância de
+    cada benchmark é a do campo ``"tolerancia"`` na linha de base, se
+    existir, ou ``tolerancia``.
+
+    Returns:
+        Uma entrada por benchmark comparado, com 'nome', 'base_us',
+        'atual_us', 'razao', 'tolerancia' e 'regressao'.
+    """
+    comparacoes = []
+    base = linha_base.get("resultados", {})
+    for nome, atual in resultados.get("resultados", {}).items():
+        if nome not in base:
+            continue
+        limite = base[nome].get("tolerancia", tolerancia)
+        razao = atual["min_us"] / base[nome]["min_us"]
+        comparacoes.append({
+            "nome": nome,
+            "base_us": base[nome]["min_us"],
+            "atual_us": atual["min_us"],
+            "razao": round(razao, 3),
+            "tolerancia": limite,
+            "regressao": razao > 1 + limite,
+        })
+    return comparacoes
+
+
+def _formatar_tempo(microssegundos: float) -> str:
+    if microssegundos >= 1000:
+        return f"{microssegundos / 1000:10.2f} ms"
+    return f"{microssegundos:10.2f} µs"
+
+
+def adicionar_argumentos(parser) -> None:
+    """Acrescenta as opções do comando ``bench`` a um parser."""
+    parser.add_argument("--fator", type=int, default=FATOR_SINTETICO,
+                        help=f"Ampliação do conjunto sintético; 0 omite-o (padrão: {FATOR_SINTETICO})")
+    parser.add_argument("--amostras", type=int, default=AMOSTRAS,
+                        help=f"Amostras por benchmark (padrão: {AMOSTRAS})")
+    parser.add_argument("--filtro", help="Só benchmarks cujo nome contém este texto")
+    parser.add_argument("--gravar", metavar="FICHEIRO",
+                        help="Gravar os resultados em JSON (para usar como linha de base)")
+    parser.add_argument("--comparar", metavar="FICHEIRO",
+                        help="Comparar com uma linha de base em JSON")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help=f"Abrandamento relativo aceite (padrão: {TOLERANCIA})")
+
+
+def correr_comando(args) -> int:
+    """Executa o comando ``bench`` com argumentos já interpretados."""
+    linha_base = None
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            linha_base = json.load(f)
+
+    def progresso(nome, resultado):
+        print(
+            f"{nome:45s} min {_formatar_tempo(resultado['min_us'])}"
+            f"  mediana {_formatar_tempo(resultado['mediana_us'])}",
+            flush=True
+        )
+
+    resultados = executar(args.fator, args.amostras, args.filtro, progresso)
+
+    if args.gravar:
+        with open(args.gravar, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\nResultados gravados em {args.gravar}")
+
+    if linha_base is None:
+        return 0
+
+    comparacoes = comparar(resultados, linha_base, args.tolerancia)
+    regressoes = [c for c in comparacoes if c["regressao"]]
+    print(f"\nComparação com {args.comparar}:")
+    for c in comparacoes:
+        estado = "REGRESSÃO" if c["regressao"] else "ok"
+        print(f"{c['nome']:45s} {c['razao']:6.2f}x (limite {1 + c['tolerancia']:.2f}x)  {estado}")
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) de desempenho")
+        return 1
+    return 0
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada de ``angola-geo bench``.
+
+    Returns:
+        Código de saída: 1 se houver regressões face à linha de base.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="angola-geo bench",
+        description="Benchmarks de desempenho de Angola Geo"
+    )
+    adicionar_argumentos(parser)
+    return correr_comando(parser.parse_args(argumentos))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
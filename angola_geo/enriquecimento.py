@@ -0,0 +1,237 @@
+"""
+Enriquecimento em streaming de ficheiros CSV e JSONL.
+
+Resolve uma coluna de texto livre de cada linha (ver
+:meth:`angola_geo.core.AngolaGeo.normalizar_lote`) e acrescenta os campos
+canónicos: nível, província, município, comuna e confiança. As linhas são
+lidas e escritas por blocos, pelo que a memória usada não depende do
+tamanho da entrada.
+
+Com ``workers > 1`` os blocos são processados num conjunto de processos;
+só um número limitado de blocos está em curso em cada momento e os
+resultados são escritos pela ordem da entrada.
+"""
+
+import csv
+import io
+import json
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+if TYPE_CHECKING:
+    from .core import AngolaGeo
+
+FORMATOS = ("csv", "jsonl")
+
+# Campos acrescentados a cada linha (com o prefixo escolhido)
+CAMPOS = ("nivel", "provincia", "municipio", "comuna", "confianca")
+PREFIXO_PADRAO = "geo_"
+
+TAMANHO_BLOCO = 1000
+# Blocos em curso por processo: mantém os processos ocupados sem deixar a
+# memória crescer com a entrada
+BLOCOS_POR_WORKER = 2
+
+# Instância de cada processo do conjunto de workers, criada no primeiro bloco
+_geo_worker: Optional["AngolaGeo"] = None
+
+
+def campos_canonicos(resultado: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Converte um resultado de ``normalizar_lote`` nos valores de :data:`CAMPOS`.
+
+    Example:
+        >>> campos_canonicos({'nivel': 'municipio', 'nome': 'Belas',
+        ...                   'provincia': 'Luanda', 'confianca': 1.0})
+        ('municipio', 'Luanda', 'Belas', None, 1.0)
+    """
+    nivel = resultado["nivel"]
+    nome = resultado["nome"]
+    return (
+        nivel,
+        nome if nivel == "provincia" else resultado.get("provincia"),
+        nome if nivel == "municipio" else resultado.get("municipio"),
+        nome if nivel == "comuna" else None,
+        resultado["confianca"],
+    )
+
+
+def _blocos(linhas: Iterable[Any], tamanho: int) -> Iterator[List[Any]]:
+    """Agrupa um iterável em listas de até ``tamanho`` elementos."""
+    iterador = iter(linhas)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def processar_bloco(
+    geo: "AngolaGeo",
+    formato: str,
+    coluna: Any,
+    prefixo: str,
+    bloco: List[Any],
+    primeira_linha: int = 1
+) -> Tuple[str, int]:
+    """
+    Enriquece um bloco de linhas.
+
+    Args:
+        geo: Instância usada para resolver os nomes.
+        formato: 'csv' (linhas são listas de campos e ``coluna`` um índice)
+            ou 'jsonl' (linhas são texto JSON e ``coluna`` uma chave).
+        coluna: Coluna com o texto a resolver.
+        prefixo: Prefixo dos campos acrescentados (só usado em JSONL).
+        bloco: Linhas a enriquecer.
+        primeira_linha: Número, na entrada, da primeira linha do bloco
+            (usado nas mensagens de erro de JSONL).
+
+    Returns:
+        ``(texto, linhas)``: o texto de saída do bloco e o número de linhas
+        de dados que contém (linhas JSONL em branco são ignoradas).
+
+    Raises:
+        ValueError: Se uma linha JSONL não for JSON válido ou não for um
+            objeto.
+    """
+    saida = io.StringIO()
+    if formato == "csv":
+        textos = (linha[coluna] if coluna < len(linha) else "" for linha in bloco)
+        escritor = csv.writer(saida, lineterminator="\n")
+        for linha, resultado in zip(bloco, geo.normalizar_lote(textos)):
+            campos = campos_canonicos(resultado)
+            escritor.writerow(linha + ["" if valor is None else valor for valor in campos])
+        return saida.getvalue(), len(bloco)
+
+    registos = []
+    for numero, linha in enumerate(bloco, primeira_linha):
+        if not linha.strip():
+            continue
+        try:
+            registo = json.loads(linha)
+        except ValueError as erro:
+            raise ValueError(f"Linha {numero}: JSON inválido ({erro})") from None
+        if not isinstance(registo, dict):
+            raise ValueError(f"Linha {numero}: esperado um objeto JSON")
+        registos.append(registo)
+    textos = (
+        valor if isinstance(valor, str) else ""
+        for valor in (registo.get(coluna) for registo in registos)
+    )
+    for registo, resultado in zip(registos, geo.normalizar_lote(textos)):
+        for campo, valor in zip(CAMPOS, campos_canonicos(resultado)):
+            registo[prefixo + campo] = valor
+        saida.write(json.dumps(registo, ensure_ascii=False))
+        saida.write("\n")
+    return saida.getvalue(), len(registos)
+
+
+def _processar_bloco_worker(tarefa: Tuple[str, Any, str, List[Any], int]) -> Tuple[str, int]:
+    """Ponto de entrada dos processos do conjunto de workers."""
+    global _geo_worker
+    if _geo_worker is None:
+        from .core import AngolaGeo
+
+        _geo_worker = AngolaGeo()
+    return processar_bloco(_geo_worker, *tarefa)
+
+
+def _processar_em_paralelo(
+    tarefas: Iterator[Tuple[str, Any, str, List[Any], int]],
+    workers: int
+) -> Iterator[Tuple[str, int]]:
+    """Processa as tarefas em ``workers`` processos, mantendo a ordem."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        em_curso = deque()
+        for tarefa in tarefas:
+            em_curso.append(executor.submit(_processar_bloco_worker, tarefa))
+            if len(em_curso) >= workers * BLOCOS_POR_WORKER:
+                yield em_curso.popleft().result()
+        while em_curso:
+            yield em_curso.popleft().result()
+
+
+def enriquecer(
+    entrada: TextIO,
+    saida: TextIO,
+    coluna: str,
+    formato: str = "csv",
+    workers: int = 1,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+    prefixo: str = PREFIXO_PADRAO,
+    geo: Optional["AngolaGeo"] = None
+) -> int:
+    """
+    Enriquece um ficheiro CSV ou JSONL, escrevendo as linhas à medida.
+
+    Em CSV a primeira linha é o cabeçalho; as colunas :data:`CAMPOS`, com
+    o prefixo indicado, são acrescentadas ao fim. Em JSONL os campos são
+    acrescentados a cada objeto. Sem correspondência, os campos ficam
+    vazios (``null`` em JSONL) e a confiança é 0.
+
+    Args:
+        entrada: Texto de entrada (abrir ficheiros CSV com ``newline=''``).
+        saida: Destino das linhas enriquecidas.
+        coluna: Nome da coluna (CSV) ou chave (JSONL) a resolver.
+        formato: 'csv' ou 'jsonl'.
+        workers: Número de processos (pelo menos 1); ``1`` processa no
+            processo atual.
+        tamanho_bloco: Linhas por bloco enviado a cada processo (pelo
+            menos 1).
+        prefixo: Prefixo dos campos acrescentados.
+        geo: Instância usada quando ``workers`` é 1 (criada se omitida).
+
+    Returns:
+        Número de linhas de dados escritas.
+
+    Raises:
+        ValueError: Se o formato não for suportado, ``workers`` ou
+            ``tamanho_bloco`` forem menores que 1, a coluna não existir no
+            cabeçalho CSV ou uma linha JSONL não for um objeto JSON.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato!r}. Use um de: {', '.join(FORMATOS)}")
+    if workers < 1:
+        raise ValueError("workers tem de ser pelo menos 1")
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco tem de ser pelo menos 1")
+
+    if formato == "csv":
+        leitor = csv.reader(entrada)
+        cabecalho = next(leitor, None)
+        if cabecalho is None:
+            return 0
+        if coluna not in cabecalho:
+            raise ValueError(f"Coluna '{coluna}' não encontrada no cabeçalho")
+        csv.writer(saida, lineterminator="\n").writerow(
+            cabecalho + [prefixo + campo for campo in CAMPOS]
+        )
+        linhas: Iterable[Any] = leitor
+        chave: Any = cabecalho.index(coluna)
+    else:
+        linhas = entrada
+        chave = coluna
+
+    total = 0
+    # Cada tarefa leva o número da sua primeira linha na entrada
+    tarefas = (
+        (formato, chave, prefixo, bloco, 1 + i * tamanho_bloco)
+        for i, bloco in enumerate(_blocos(linhas, tamanho_bloco))
+    )
+    if workers > 1:
+        resultados = _processar_em_paralelo(tarefas, workers)
+    else:
+        if geo is None:
+            from .core import AngolaGeo
+
+            geo = AngolaGeo()
+        resultados = (processar_bloco(geo, *tarefa) for tarefa in tarefas)
+
+    for texto, quantidade in resultados:
+        saida.write(texto)
+        total += quantidade
+    return total
@@ -1,5 +1,7 @@
 """Exceções customizadas para a biblioteca angola_geo."""
 
+from typing import Any, Dict, List, Optional
+
 
 class ErroAngolaGeo(Exception):
     """Exceção base para a biblioteca angola_geo."""
@@ -7,11 +9,20 @@ class ErroAngolaGeo(Exception):
 
 
 class ProvinciaInexistente(ErroAngolaGeo):
-    """Lançada quando uma província não é encontrada."""
+    """
+    Lançada quando uma província não é encontrada.
+    
+    ``sugestoes`` contém os nomes de províncias mais próximos do nome
+    pedido (por distância de edição), quando existirem.
+    """
     
-    def __init__(self, nome_provincia: str):
+    def __init__(self, nome_provincia: str, sugestoes: Optional[List[str]] = None):
         self.nome_provincia = nome_provincia
-        super().__init__(f"Província '{nome_provincia}' não encontrada")
+        self.sugestoes = list(sugestoes or [])
+        mensagem = f"Província '{nome_provincia}' não encontrada"
+        if self.sugestoes:
+            mensagem += f". Quis dizer: {', '.join(self.sugestoes)}?"
+        super().__init__(mensagem)
 
 
 class MunicipioInexistente(ErroAngolaGeo):
@@ -22,6 +33,70 @@ class MunicipioInexistente(ErroAngolaGeo):
         super().__init__(f"Município '{nome_municipio}' não encontrado")
 
 
+class ComunaInexistente(ErroAngolaGeo):
+    """Lançada quando uma comuna não é encontrada."""
+    
+    def __init__(self, nome_comuna: str):
+        self.nome_comuna = nome_comuna
+        super().__init__(f"Comuna '{nome_comuna}' não encontrada")
+
+
+class DivisaoAmbigua(ErroAngolaGeo, ValueError):
+    """
+    Lançada quando um nome corresponde a várias divisões do mesmo nível.
+    
+    ``candidatos`` contém as divisões encontradas (com 'codigo', 'nome' e
+    os nomes dos níveis superiores); indicar a província ou o município
+    desfaz a ambiguidade.
+    """
+    
+    def __init__(self, nome: str, candidatos: List[Dict[str, Any]]):
+        self.nome = nome
+        self.candidatos = list(candidatos)
+        descricoes = ", ".join(
+            f"{c['codigo']} ({c.get('municipio', c.get('provincia'))})"
+            for c in self.candidatos
+        )
+        super().__init__(f"'{nome}' é ambíguo: {descricoes}")
+
+
+class CodigoInexistente(ErroAngolaGeo):
+    """Lançada quando nenhuma divisão tem o código pedido."""
+    
+    def __init__(self, codigo):
+        self.codigo = codigo
+        super().__init__(f"Código '{codigo}' não encontrado")
+
+
+class LimitesIndisponiveis(ErroAngolaGeo, FileNotFoundError):
+    """
+    Lançada quando se pede a localização de um ponto sem um ficheiro de
+    limites geográficos (ver :mod:`angola_geo.geometria`).
+    """
+    
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        super().__init__(
+            f"Limites geográficos não encontrados em '{caminho}'. Compile-os a "
+            f"partir de um GeoJSON com 'python -m angola_geo.geometria'"
+        )
+
+
+class OperacaoIndisponivel(ErroAngolaGeo, NotImplementedError):
+    """
+    Lançada quando um método não é suportado pelo backend da instância
+    (por exemplo, ``vigiar_dados`` com ``backend="sqlite"``).
+    """
+    
+    def __init__(self, operacao: str, backend: str, alternativa: Optional[str] = None):
+        self.operacao = operacao
+        self.backend = backend
+        mensagem = f"'{operacao}' não está disponível com backend='{backend}'"
+        if alternativa:
+            mensagem += f"; use {alternativa}"
+        super().__init__(mensagem)
+
+
 class DadosInvalidos(ErroAngolaGeo):
     """Lançada quando a validação de dados falha."""
     pass
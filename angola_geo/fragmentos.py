@@ -0,0 +1,268 @@
+"""
+Dados das divisões fragmentados por província, carregados a pedido.
+
+Um serviço que só responde sobre uma ou duas províncias não precisa de
+interpretar e indexar o país inteiro. O passo de compilação
+(``python -m angola_geo.fragmentos``) divide ``divisions.json`` em
+``data/provincias/``:
+
+* ``manifesto.json``: os metadados, o SHA-256 do JSON de origem e, por
+  província, os dados básicos ('id', 'name', 'capital',
+  'municipality_count', 'notes') e o nome do fragmento;
+* um fragmento por província (``13.json`` para Luanda, pelo id), com a
+  província no mesmo formato que em ``divisions.json``.
+
+:class:`ConjuntoFragmentado` lê só o manifesto; cada fragmento é lido e
+convertido em registos e vistas (ver :mod:`angola_geo.vistas`) na primeira
+vez que a sua província é pedida. As consultas que precisam de todas as
+divisões (pesquisa, autocompletar, códigos, ...) usam o
+:class:`~angola_geo.dados.ConjuntoDados` completo, que AngolaGeo carrega
+nesse momento. Tal como ``divisions.bin``, os fragmentos são gerados a
+partir de ``divisions.json`` e só são usados enquanto o SHA-256 guardado no
+manifesto corresponder ao conteúdo atual deste; depois de o editar, os
+dados são carregados por inteiro até os fragmentos serem recompilados.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .indices import distancia_edicao
+from .instrumentacao import CARREGAMENTO, Metricas
+from .modelos import Provincia
+from .normalizacao import normalizar
+from .resumo import CAMINHO_DADOS, hash_conteudo
+from .vistas import (
+    DicionarioImutavel,
+    congelar,
+    vista_municipio,
+    vista_provincia,
+    vista_resumo_provincia,
+)
+
+DIRETORIO_FRAGMENTOS = os.path.join(os.path.dirname(__file__), "data", "provincias")
+MANIFESTO = "manifesto.json"
+
+
+class FragmentoProvincia:
+    """Registos e vistas de uma província lida do seu fragmento."""
+
+    __slots__ = ("provincia", "vista", "vistas_municipios")
+
+    def __init__(self, provincia: Provincia):
+        self.provincia = provincia
+        self.vistas_municipios: Tuple[DicionarioImutavel, ...] = tuple(
+            vista_municipio(m) for m in provincia.municipios
+        )
+        self.vista = vista_provincia(provincia, self.vistas_municipios)
+
+
+class ConjuntoFragmentado:
+    """
+    Manifesto das províncias e os fragmentos já carregados.
+
+    O manifesto é lido no construtor; os fragmentos, em :meth:`fragmento`.
+    Como no :class:`~angola_geo.dados.ConjuntoDados`, o que é publicado
+    nunca muda depois, por isso as leituras não tomam travas: só a leitura
+    de um fragmento novo é feita sob ``_trava`` (com verificação dupla),
+    para que cada fragmento seja lido uma única vez.
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_FRAGMENTOS):
+        """
+        Args:
+            diretorio: Pasta com ``manifesto.json`` e os fragmentos.
+
+        Raises:
+            OSError: Se o manifesto não existir ou não puder ser lido.
+        """
+        self.diretorio = diretorio
+        with open(os.path.join(diretorio, MANIFESTO), "r", encoding="utf-8") as f:
+            manifesto = json.load(f)
+        self.metadados: DicionarioImutavel = congelar(manifesto["metadata"])
+        self.hash_origem: str = manifesto["source_sha256"]
+
+        self._ficheiros: Dict[str, str] = {}
+        self._resumos: Dict[str, DicionarioImutavel] = {}
+        for p in manifesto["provinces"]:
+            chave = normalizar(p["name"])
+            self._ficheiros[chave] = p["file"]
+            self._resumos[chave] = vista_resumo_provincia(
+                p["id"], p["name"], p["capital"], p["municipality_count"], p.get("notes")
+            )
+        self.resumos: Tuple[DicionarioImutavel, ...] = tuple(self._resumos.values())
+        self.nomes: Tuple[str, ...] = tuple(r["nome"] for r in self.resumos)
+
+        self._fragmentos: Dict[str, FragmentoProvincia] = {}
+        self._trava = threading.Lock()
+        self.cache_json: Dict[Any, bytes] = {}
+
+    def resumo(self, nome: str) -> Optional[DicionarioImutavel]:
+        """Dados básicos de uma província pelo nome, ou ``None``."""
+        return self._resumos.get(normalizar(nome))
+
+    def fragmento(
+        self,
+        nome: str,
+        metricas: Optional[Metricas] = None
+    ) -> Optional[FragmentoProvincia]:
+        """
+        Província pelo nome (ignora maiúsculas e acentos), lendo o seu
+        fragmento na primeira utilização.
+
+        Args:
+            nome: Nome da província.
+            metricas: Se indicadas, a leitura do fragmento (quando
+                acontece nesta chamada) é registada como ``"carregamento"``.
+
+        Returns:
+            O fragmento, ou ``None`` se a província não existir.
+        """
+        chave = normalizar(nome)
+        fragmento = self._fragmentos.get(chave)
+        if fragmento is None:
+            ficheiro = self._ficheiros.get(chave)
+            if ficheiro is None:
+                return None
+            with self._trava:
+                fragmento = self._fragmentos.get(chave)
+                if fragmento is None:
+                    inicio = time.perf_counter_ns()
+                    caminho = os.path.join(self.diretorio, ficheiro)
+                    with open(caminho, "r", encoding="utf-8") as f:
+                        fragmento = FragmentoProvincia(Provincia.de_json(json.load(f)))
+                    self._fragmentos[chave] = fragmento
+                    if metricas is not None:
+                        metricas.registar(CARREGAMENTO, time.perf_counter_ns() - inicio)
+        return fragmento
+
+    def carregados(self) -> List[str]:
+        """Nomes das províncias cujos fragmentos já foram lidos."""
+        return [f.provincia.nome for f in list(self._fragmentos.values())]
+
+    def sugerir(self, nome: str, maximo: int) -> List[str]:
+        """
+        Nomes de províncias a uma distância de edição até 2 de ``nome``,
+        pela mesma ordem que a pesquisa aproximada (distância e nome).
+        """
+        termo = normalizar(nome)
+        proximas = []
+        for chave, resumo in self._resumos.items():
+            distancia = distancia_edicao(termo, chave)
+            if distancia <= 2:
+                proximas.append((distancia, chave, resumo["nome"]))
+        proximas.sort()
+        return [nome for _, _, nome in proximas[:maximo]]
+
+
+def compilar(
+    caminho_json: str = CAMINHO_DADOS,
+    diretorio: str = DIRETORIO_FRAGMENTOS
+) -> List[str]:
+    """
+    Divide um ficheiro JSON de divisões no manifesto e num fragmento por
+    província.
+
+    Fragmentos de províncias que já não existam na origem são removidos.
+
+    Returns:
+        Caminhos dos ficheiros escritos, começando pelo manifesto.
+    """
+    with open(caminho_json, "rb") as f:
+        conteudo = f.read()
+    dados = json.loads(conteudo.decode("utf-8"))
+
+    os.makedirs(diretorio, exist_ok=True)
+    escritos = []
+    provincias = []
+    for provincia in dados["provinces"]:
+        ficheiro = f"{provincia['id']:02d}.json"
+        resumo = {
+            chave: provincia[chave]
+            for chave in ("id", "name", "capital", "municipality_count", "notes")
+            if chave in provincia
+        }
+        resumo["file"] = ficheiro
+        provincias.append(resumo)
+        escritos.append(_escrever_json(os.path.join(diretorio, ficheiro), provincia))
+
+    for ficheiro in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, ficheiro)
+        if ficheiro.endswith(".json") and ficheiro != MANIFESTO and caminho not in escritos:
+            os.remove(caminho)
+
+    manifesto = {
+        "metadata": dados["metadata"],
+        "source_sha256": hash_conteudo(conteudo).hex(),
+        "provinces": provincias,
+    }
+    return [_escrever_json(os.path.join(diretorio, MANIFESTO), manifesto)] + escritos
+
+
+def _escrever_json(caminho: str, valor: Any) -> str:
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(valor, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return caminho
+
+
+_fragmentos_partilhados: Optional[ConjuntoFragmentado] = None
+_trava = threading.Lock()
+
+
+def obter_fragmentos(usar_cache: bool = True) -> Optional[ConjuntoFragmentado]:
+    """
+    Obtém o manifesto dos dados distribuídos, lendo-o se necessário.
+
+    Args:
+        usar_cache: Se ``True`` devolve o conjunto partilhado pelo processo
+            (com os fragmentos que qualquer instância já tenha lido); se
+            ``False`` lê um conjunto novo, privado de quem o pediu.
+
+    Returns:
+        O conjunto fragmentado, ou ``None`` se os fragmentos não existirem
+        ou tiverem sido compilados a partir de outra versão de
+        ``divisions.json`` (nesse caso os dados são carregados por inteiro).
+    """
+    global _fragmentos_partilhados
+
+    if not usar_cache:
+        return _abrir()
+
+    fragmentos = _fragmentos_partilhados
+    if fragmentos is None:
+        with _trava:
+            if _fragmentos_partilhados is None:
+                _fragmentos_partilhados = _abrir()
+            fragmentos = _fragmentos_partilhados
+    return fragmentos
+
+
+def _abrir() -> Optional[ConjuntoFragmentado]:
+    try:
+        fragmentos = ConjuntoFragmentado(DIRETORIO_FRAGMENTOS)
+        with open(CAMINHO_DADOS, "rb") as f:
+            hash_atual = hash_conteudo(f.read()).hex()
+    except OSError:
+        return None
+    # Como no instantâneo .bin: fragmentos de outra versão do JSON (por
+    # exemplo, depois de o editar) seriam respostas desatualizadas
+    if fragmentos.hash_origem != hash_atual:
+        return None
+    return fragmentos
+
+
+def invalidar_cache() -> None:
+    """Descarta o manifesto e os fragmentos partilhados."""
+    global _fragmentos_partilhados
+    with _trava:
+        _fragmentos_partilhados = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    for caminho in compilar(*sys.argv[1:3]):
+        print(f"Escrito: {caminho}")
@@ -0,0 +1,409 @@
+"""
+Limites geográficos das divisões e geocodificação inversa.
+
+Os limites não fazem parte dos dados das divisões e são opcionais: são
+lidos de ``data/limites.bin`` (ou do ficheiro indicado em
+``AngolaGeo(limites=...)``), gerado a partir de um GeoJSON com o passo de
+compilação ``python -m angola_geo.geometria limites.geojson [destino]``.
+Cada elemento do GeoJSON é um ``Polygon`` ou ``MultiPolygon`` com a
+propriedade ``codigo``, o código hierárquico da divisão (ver
+:mod:`angola_geo.codigos`); podem coexistir limites de vários níveis.
+
+As coordenadas são guardadas em arrays empacotados de inteiros de 32 bits
+(graus × 10⁷, cerca de 1 cm), sem um objeto Python por vértice:
+
+* ``codigos``: forma inteira do código de cada polígono (as partes de um
+  MultiPolygon são polígonos separados com o mesmo código);
+* ``aneis``: posição do primeiro anel de cada polígono (o exterior; os
+  seguintes são buracos), com um elemento final;
+* ``vertices``: posição em ``coordenadas`` do primeiro vértice de cada
+  anel, com um elemento final;
+* ``coordenadas``: longitude e latitude intercaladas, sem repetir o
+  primeiro vértice no fim do anel.
+
+:class:`Localizador` indexa os polígonos numa grelha uniforme sobre a
+caixa envolvente de todos eles. Cada célula guarda os polígonos que lhe
+tocam, marcados como *interiores* quando a célula fica inteiramente dentro
+do polígono (nenhuma aresta lhe toca e o centro está dentro): aí a
+resposta dispensa o teste exato. Só nas células atravessadas por arestas
+é feito o teste ponto-em-polígono (regra par-ímpar, que trata os buracos),
+depois de comparar o ponto com a caixa do polígono; como o raio
+horizontal que parte do ponto não sai da sua fila, o teste percorre só as
+arestas do polígono que cruzam essa fila, guardadas na construção.
+"""
+
+import json
+import marshal
+import math
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .codigos import decodificar, interpretar
+from .excecoes import DadosInvalidos, LimitesIndisponiveis
+from .resumo import CAMINHO_LIMITES
+
+ASSINATURA = b"AGEOLIM"
+VERSAO_FORMATO = 1
+# Coordenadas guardadas em graus × ESCALA
+ESCALA = 10 ** 7
+# Células da grelha em cada eixo
+CELULAS_POR_EIXO = 256
+
+# Uma entrada de uma célula: (polígono, arestas do polígono que cruzam a
+# fila da célula), com ``None`` em vez das arestas nas células interiores
+_Entrada = Tuple[int, Optional[array]]
+
+
+def _empacotar(valores: array) -> bytes:
+    """Bytes de um array de inteiros, em little-endian."""
+    if sys.byteorder != "little":
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+
+def _desempacotar(typecode: str, conteudo: bytes) -> array:
+    """Operação inversa de :func:`_empacotar`."""
+    valores = array(typecode)
+    valores.frombytes(conteudo)
+    if sys.byteorder != "little":
+        valores.byteswap()
+    return valores
+
+
+def _nivel(codigo: int) -> int:
+    """Profundidade de um código: 1 província, 2 município, 3 comuna."""
+    _, municipio, comuna = decodificar(codigo)
+    return 1 + (municipio > 0) + (comuna > 0)
+
+
+class Limites:
+    """Polígonos dos limites das divisões, em arrays empacotados."""
+
+    __slots__ = ("codigos", "aneis", "vertices", "coordenadas")
+
+    def __init__(self, codigos: array, aneis: array, vertices: array, coordenadas: array):
+        """
+        Args:
+            codigos: Código inteiro de cada polígono.
+            aneis: Posição do primeiro anel de cada polígono, mais o fim.
+            vertices: Posição do primeiro vértice de cada anel em
+                ``coordenadas``, mais o fim.
+            coordenadas: Longitudes e latitudes intercaladas, em graus ×
+                :data:`ESCALA`.
+        """
+        self.codigos = codigos
+        self.aneis = aneis
+        self.vertices = vertices
+        self.coordenadas = coordenadas
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    @classmethod
+    def de_geojson(cls, dados: Dict[str, Any]) -> "Limites":
+        """
+        Constrói os limites a partir de uma ``FeatureCollection``.
+
+        Raises:
+            DadosInvalidos: Se um elemento não tiver um código válido, não
+                for um polígono ou tiver um anel com menos de 3 vértices ou
+                coordenadas fora dos limites.
+        """
+        codigos = array("i")
+        aneis = array("i", [0])
+        vertices = array("i", [0])
+        coordenadas = array("i")
+        for elemento in dados.get("features", ()):
+            propriedades = elemento.get("properties") or {}
+            try:
+                codigo = interpretar(propriedades["codigo"])
+            except (KeyError, ValueError) as erro:
+                raise DadosInvalidos(
+                    f"Elemento sem código válido: {propriedades!r}"
+                ) from erro
+            geometria = elemento.get("geometry") or {}
+            if geometria.get("type") == "Polygon":
+                poligonos = [geometria["coordinates"]]
+            elif geometria.get("type") == "MultiPolygon":
+                poligonos = geometria["coordinates"]
+            else:
+                raise DadosInvalidos(
+                    f"Geometria do código {propriedades['codigo']!r} não é um polígono"
+                )
+            for poligono in poligonos:
+                for anel in poligono:
+                    if len(anel) > 1 and anel[0] == anel[-1]:
+                        anel = anel[:-1]
+                    if len(anel) < 3:
+                        raise DadosInvalidos(
+                            f"Anel com menos de 3 vértices no código {propriedades['codigo']!r}"
+                        )
+                    for longitude, latitude, *_ in anel:
+                        if not (-180 <= longitude <= 180 and -90 <= latitude <= 90):
+                            raise DadosInvalidos(
+                                f"Coordenadas fora dos limites: {longitude}, {latitude}"
+                            )
+                        coordenadas.append(round(longitude * ESCALA))
+                        coordenadas.append(round(latitude * ESCALA))
+                    vertices.append(len(coordenadas))
+                codigos.append(codigo)
+                aneis.append(len(vertices) - 1)
+        return cls(codigos, aneis, vertices, coordenadas)
+
+    def serializar(self) -> bytes:
+        """Conteúdo do ficheiro de limites (ver :func:`compilar`)."""
+        return ASSINATURA + bytes([VERSAO_FORMATO]) + marshal.dumps(tuple(
+            _empacotar(valores)
+            for valores in (self.codigos, self.aneis, self.vertices, self.coordenadas)
+        ))
+
+    @classmethod
+    def ler(cls, conteudo: bytes) -> "Limites":
+        """
+        Operação inversa de :meth:`serializar`.
+
+        Raises:
+            DadosInvalidos: Se o conteúdo não for um ficheiro de limites
+                desta versão.
+        """
+        inicio = len(ASSINATURA) + 1
+        if conteudo[:inicio] != ASSINATURA + bytes([VERSAO_FORMATO]):
+            raise DadosInvalidos("Ficheiro de limites inválido ou de outra versão")
+        try:
+            codigos, aneis, vertices, coordenadas = marshal.loads(conteudo[inicio:])
+        except (EOFError, ValueError, TypeError) as erro:
+            raise DadosInvalidos("Ficheiro de limites corrompido") from erro
+        return cls(*(
+            _desempacotar("i", valores)
+            for valores in (codigos, aneis, vertices, coordenadas)
+        ))
+
+
+class Localizador:
+    """
+    Índice espacial dos limites: a divisão que contém cada ponto.
+
+    Depois do construtor, nada muda: as consultas podem ser feitas em
+    paralelo por várias threads, sem travas.
+    """
+
+    def __init__(self, limites: Limites, celulas_por_eixo: int = CELULAS_POR_EIXO):
+        """
+        Args:
+            limites: Polígonos a indexar.
+            celulas_por_eixo: Divisões da grelha em cada eixo. Células mais
+                pequenas deixam menos pontos nas células de fronteira, à
+                custa de mais memória e de um arranque mais lento.
+        """
+        self.limites = limites
+        coordenadas = limites.coordenadas
+        self._caixas = array("i")
+        self._niveis = array("b", (_nivel(codigo) for codigo in limites.codigos))
+        for poligono in range(len(limites)):
+            inicio = limites.vertices[limites.aneis[poligono]]
+            fim = limites.vertices[limites.aneis[poligono + 1]]
+            xs = coordenadas[inicio:fim:2]
+            ys = coordenadas[inicio + 1:fim:2]
+            self._caixas.extend((min(xs), min(ys), max(xs), max(ys)))
+
+        self._n = celulas_por_eixo
+        if len(limites):
+            self._x0 = min(self._caixas[0::4])
+            self._y0 = min(self._caixas[1::4])
+            self._x1 = max(self._caixas[2::4])
+            self._y1 = max(self._caixas[3::4])
+        else:
+            self._x0 = self._y0 = 0
+            self._x1 = self._y1 = -1
+        self._largura = max(self._x1 - self._x0, 1) / self._n
+        self._altura = max(self._y1 - self._y0, 1) / self._n
+        self._grelha = self._construir_grelha()
+
+    def _celula(self, valor: float, origem: int, tamanho: float) -> int:
+        """Fila ou coluna da grelha de uma coordenada, limitada à grelha."""
+        return min(max(math.floor((valor - origem) / tamanho), 0), self._n - 1)
+
+    def _construir_grelha(self) -> List[Tuple[_Entrada, ...]]:
+        limites = self.limites
+        coordenadas = limites.coordenadas
+        n = self._n
+        x0, y0, largura, altura = self._x0, self._y0, self._largura, self._altura
+        celulas: Dict[int, List[_Entrada]] = {}
+
+        for poligono in range(len(limites)):
+            fronteira = set()
+            arestas_filas: Dict[int, array] = {}
+            cruzamentos: Dict[int, List[float]] = {}
+            for anel in range(limites.aneis[poligono], limites.aneis[poligono + 1]):
+                inicio, fim = limites.vertices[anel], limites.vertices[anel + 1]
+                xs = coordenadas[inicio:fim:2]
+                ys = coordenadas[inicio + 1:fim:2]
+                xa, ya = xs[-1], ys[-1]
+                for xb, yb in zip(xs, ys):
+                    baixo, cima = min(ya, yb), max(ya, yb)
+                    # Células tocadas pela aresta, fila a fila, com uma
+                    # margem de uma unidade contra erros de arredondamento
+                    for fila in range(
+                        self._celula(baixo - 1, y0, altura),
+                        self._celula(cima + 1, y0, altura) + 1
+                    ):
+                        if ya == yb:
+                            xs_fila = (xa, xb)
+                        else:
+                            xs_fila = tuple(
+                                xa + (y - ya) * (xb - xa) / (yb - ya)
+                                for y in (
+                                    max(y0 + fila * altura, baixo),
+                                    min(y0 + (fila + 1) * altura, cima),
+                                )
+                            )
+                            arestas_filas.setdefault(fila, array("i")).extend((xa, ya, xb, yb))
+                        fronteira.update(range(
+                            fila * n + self._celula(min(xs_fila) - 1, x0, largura),
+                            fila * n + self._celula(max(xs_fila) + 1, x0, largura) + 1
+                        ))
+                    # Cruzamentos com a linha horizontal que passa no
+                    # centro de cada fila, com a regra do teste exato
+                    if ya != yb:
+                        for fila in range(
+                            max(math.ceil((baixo - y0) / altura - 0.5), 0),
+                            min(math.ceil((cima - y0) / altura - 0.5), n)
+                        ):
+                            y = y0 + (fila + 0.5) * altura
+                            cruzamentos.setdefault(fila, []).append(
+                                xa + (y - ya) * (xb - xa) / (yb - ya)
+                            )
+                    xa, ya = xb, yb
+
+            # Entre cada par de cruzamentos, os centros estão dentro
+            interior = set()
+            for fila, xs_cruzamento in cruzamentos.items():
+                xs_cruzamento.sort()
+                for entrada, saida in zip(xs_cruzamento[0::2], xs_cruzamento[1::2]):
+                    primeira = max(math.ceil((entrada - x0) / largura - 0.5), 0)
+                    ultima = min(math.floor((saida - x0) / largura - 0.5), n - 1)
+                    interior.update(range(fila * n + primeira, fila * n + ultima + 1))
+
+            # Nas células de fronteira, o teste exato só precisa das arestas
+            # que cruzam a fila: o raio horizontal do ponto não sai dela
+            vazias = array("i")
+            for celula in fronteira:
+                celulas.setdefault(celula, []).append(
+                    (poligono, arestas_filas.get(celula // n, vazias))
+                )
+            for celula in interior - fronteira:
+                celulas.setdefault(celula, []).append((poligono, None))
+
+        # Divisões mais profundas primeiro: a primeira que contém o ponto é
+        # a resposta. Células com as mesmas entradas partilham o tuplo.
+        niveis = self._niveis
+        grelha: List[Tuple[_Entrada, ...]] = [()] * (n * n)
+        partilhadas: Dict[Tuple[Tuple[int, int], ...], Tuple[_Entrada, ...]] = {}
+        for celula, entradas in celulas.items():
+            entradas.sort(key=lambda e: (-niveis[e[0]], e[0]))
+            chave = tuple((p, id(arestas)) for p, arestas in entradas)
+            grelha[celula] = partilhadas.setdefault(chave, tuple(entradas))
+        return grelha
+
+    @staticmethod
+    def _cruza_arestas(arestas: array, x: float, y: float) -> bool:
+        """Paridade dos cruzamentos do raio horizontal com ``arestas``."""
+        dentro = False
+        valores = iter(arestas)
+        for xa, ya, xb, yb in zip(valores, valores, valores, valores):
+            if (ya > y) != (yb > y) and x < xa + (y - ya) * (xb - xa) / (yb - ya):
+                dentro = not dentro
+        return dentro
+
+    def _contem(self, poligono: int, x: float, y: float) -> bool:
+        """Teste ponto-em-polígono (par-ímpar), em coordenadas escaladas."""
+        limites = self.limites
+        coordenadas = limites.coordenadas
+        vertices = limites.vertices
+        dentro = False
+        for anel in range(limites.aneis[poligono], limites.aneis[poligono + 1]):
+            inicio, fim = vertices[anel], vertices[anel + 1]
+            xs = coordenadas[inicio:fim:2]
+            ys = coordenadas[inicio + 1:fim:2]
+            xa, ya = xs[-1], ys[-1]
+            for xb, yb in zip(xs, ys):
+                if (ya > y) != (yb > y) and x < xa + (y - ya) * (xb - xa) / (yb - ya):
+                    dentro = not dentro
+                xa, ya = xb, yb
+        return dentro
+
+    def localizar(self, latitude: float, longitude: float) -> Optional[int]:
+        """
+        Código inteiro da divisão mais profunda que contém o ponto, ou
+        ``None`` se nenhum polígono o contiver.
+        """
+        x = longitude * ESCALA
+        y = latitude * ESCALA
+        if not (self._x0 <= x <= self._x1 and self._y0 <= y <= self._y1):
+            return None
+        n = self._n
+        celula = (
+            min(int((y - self._y0) / self._altura), n - 1) * n
+            + min(int((x - self._x0) / self._largura), n - 1)
+        )
+        caixas = self._caixas
+        for poligono, arestas in self._grelha[celula]:
+            if arestas is None:
+                return self.limites.codigos[poligono]
+            i = poligono * 4
+            if (
+                caixas[i] <= x <= caixas[i + 2] and caixas[i + 1] <= y <= caixas[i + 3]
+                and self._cruza_arestas(arestas, x, y)
+            ):
+                return self.limites.codigos[poligono]
+        return None
+
+    def localizar_lote(self, pontos: Iterable[Sequence[float]]) -> Iterator[Optional[int]]:
+        """
+        :meth:`localizar` para cada par ``(latitude, longitude)``, pela
+        ordem (por exemplo, as linhas de um array N×2).
+        """
+        localizar = self.localizar
+        for latitude, longitude in pontos:
+            yield localizar(latitude, longitude)
+
+
+def carregar_limites(caminho: str = CAMINHO_LIMITES) -> Limites:
+    """
+    Lê um ficheiro de limites compilado.
+
+    Raises:
+        LimitesIndisponiveis: Se o ficheiro não existir.
+        DadosInvalidos: Se o ficheiro não for válido.
+    """
+    try:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+    except FileNotFoundError:
+        raise LimitesIndisponiveis(caminho) from None
+    return Limites.ler(conteudo)
+
+
+def compilar(caminho_geojson: str, caminho_saida: str = CAMINHO_LIMITES) -> str:
+    """
+    Compila um GeoJSON de limites para o formato empacotado.
+
+    Returns:
+        Caminho do ficheiro escrito.
+    """
+    with open(caminho_geojson, "r", encoding="utf-8") as f:
+        limites = Limites.de_geojson(json.load(f))
+    temporario = caminho_saida + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(limites.serializar())
+    os.replace(temporario, caminho_saida)
+    return caminho_saida
+
+
+if __name__ == "__main__":
+    if not 2 <= len(sys.argv) <= 3:
+        sys.exit("Uso: python -m angola_geo.geometria <limites.geojson> [destino]")
+    print(f"Compilado: {compilar(*sys.argv[1:3])}")
@@ -0,0 +1,279 @@
+"""
+Estruturas de índice usadas pela classe AngolaGeo.
+
+Todos os índices trabalham sobre nomes já normalizados (ver
+:func:`angola_geo.normalizacao.normalizar`) e devolvem identificadores
+inteiros atribuídos por ordem de inserção, que o chamador usa para
+recuperar o registo correspondente.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, MutableSequence, Optional, Sequence, Tuple
+
+TAMANHO_NGRAMA = 3
+
+
+def _trigramas(texto: str) -> set:
+    """Devolve o conjunto de trigramas de um texto."""
+    return {
+        texto[i:i + TAMANHO_NGRAMA]
+        for i in range(len(texto) - TAMANHO_NGRAMA + 1)
+    }
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para pesquisa por substring.
+    
+    Cada trigrama aponta para a lista ordenada dos identificadores dos nomes
+    que o contêm. Uma pesquisa intersecta as listas dos trigramas do termo
+    e só verifica a substring nos candidatos resultantes.
+    """
+    
+    def __init__(self):
+        self._nomes: List[str] = []
+        self._listas: Dict[str, MutableSequence[int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._nomes)
+    
+    @property
+    def nomes(self) -> List[str]:
+        """Nomes indexados; a posição de cada nome é o seu identificador."""
+        return self._nomes
+    
+    def adicionar(self, nome: str) -> int:
+        """
+        Adiciona um nome normalizado ao índice.
+        
+        Returns:
+            Identificador atribuído ao nome (sequencial, a partir de 0).
+        """
+        identificador = len(self._nomes)
+        self._nomes.append(nome)
+        for trigrama in _trigramas(nome):
+            self._listas.setdefault(trigrama, []).append(identificador)
+        return identificador
+    
+    def exportar(self) -> Tuple[List[str], List[str], array, array]:
+        """
+        Exporta o índice numa forma compacta, para serialização.
+        
+        Returns:
+            ``(nomes, trigramas, limites, valores)``: todas as listas de
+            identificadores concatenadas num único array (``valores``); a
+            lista do trigrama ``trigramas[i]`` ocupa as posições
+            ``limites[i]:limites[i + 1]``.
+        """
+        trigramas = list(self._listas)
+        limites = array("i", [0])
+        valores = array("i")
+        for trigrama in trigramas:
+            valores.extend(self._listas[trigrama])
+            limites.append(len(valores))
+        return self._nomes, trigramas, limites, valores
+    
+    @classmethod
+    def importar(
+        cls,
+        nomes: Sequence[str],
+        trigramas: Sequence[str],
+        limites: Sequence[int],
+        valores: array
+    ) -> "IndiceTrigramas":
+        """Reconstrói um índice a partir do resultado de :meth:`exportar`."""
+        indice = cls()
+        indice._nomes = list(nomes)
+        indice._listas = {
+            trigrama: valores[limites[i]:limites[i + 1]]
+            for i, trigrama in enumerate(trigramas)
+        }
+        return indice
+    
+    def pesquisar(self, termo: str) -> List[int]:
+        """
+        Pesquisa os nomes que contêm o termo normalizado.
+        
+        Termos com menos de três caracteres não têm trigramas; nesse caso
+        todos os nomes são candidatos (sem custo de normalização, que já
+        foi feita na inserção).
+        
+        Returns:
+            Identificadores correspondentes, por ordem de inserção.
+        """
+        nomes = self._nomes
+        return [i for i in self._candidatos(termo) if termo in nomes[i]]
+    
+    def iterar(self, termo: str) -> Iterator[int]:
+        """
+        Como :meth:`pesquisar`, mas verifica a substring em cada candidato
+        só quando o identificador seguinte é pedido.
+        """
+        nomes = self._nomes
+        return (i for i in self._candidatos(termo) if termo in nomes[i])
+    
+    def _candidatos(self, termo: str) -> Sequence[int]:
+        """Identificadores que contêm todos os trigramas do termo, por ordem."""
+        trigramas = _trigramas(termo)
+        if not trigramas:
+            return range(len(self._nomes))
+        
+        listas = []
+        for trigrama in trigramas:
+            lista = self._listas.get(trigrama)
+            if not lista:
+                return ()
+            listas.append(lista)
+        listas.sort(key=len)
+        conjunto = set(listas[0])
+        for lista in listas[1:]:
+            conjunto.intersection_update(lista)
+            if not conjunto:
+                return ()
+        return sorted(conjunto)
+
+
+def distancia_edicao(a: str, b: str) -> int:
+    """
+    Calcula a distância de Levenshtein entre duas strings.
+    
+    Usa o algoritmo paralelo de bits de Myers/Hyyrö: cada coluna da matriz
+    de programação dinâmica é representada por vetores de bits (inteiros
+    Python), pelo que o custo é O(len(a)) operações sobre inteiros em vez
+    de O(len(a) * len(b)) operações elementares.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return len(a)
+    
+    padroes: Dict[str, int] = {}
+    for i, c in enumerate(b):
+        padroes[c] = padroes.get(c, 0) | (1 << i)
+    
+    cheio = (1 << m) - 1
+    ultimo = 1 << (m - 1)
+    positivos, negativos, distancia = cheio, 0, m
+    for c in a:
+        igual = padroes.get(c, 0)
+        xv = igual | negativos
+        xh = (((igual & positivos) + positivos) ^ positivos) | igual
+        ph = negativos | (~(xh | positivos) & cheio)
+        mh = positivos & xh
+        if ph & ultimo:
+            distancia += 1
+        elif mh & ultimo:
+            distancia -= 1
+        ph = ((ph << 1) | 1) & cheio
+        mh = (mh << 1) & cheio
+        positivos = mh | (~(xv | ph) & cheio)
+        negativos = ph & xv
+    return distancia
+
+
+class ArvoreBK:
+    """
+    Árvore BK (Burkhard-Keller) para pesquisa aproximada por distância de edição.
+    
+    Cada nó guarda um nome distinto e os identificadores que o partilham;
+    os filhos são indexados pela distância ao nó. Pela desigualdade
+    triangular, uma pesquisa com tolerância ``d`` só desce aos filhos cuja
+    distância está em ``[dist - d, dist + d]``, evitando calcular a
+    distância contra todos os nomes.
+    """
+    
+    __slots__ = ("_raiz", "_tamanho")
+    
+    def __init__(self):
+        # Nó: [nome, identificadores, {distância: nó filho}]
+        self._raiz: Optional[list] = None
+        self._tamanho = 0
+    
+    def __len__(self) -> int:
+        return self._tamanho
+    
+    def adicionar(self, nome: str, identificador: int) -> None:
+        """Associa um identificador a um nome normalizado."""
+        self._tamanho += 1
+        if self._raiz is None:
+            self._raiz = [nome, [identificador], {}]
+            return
+        
+        no = self._raiz
+        while True:
+            distancia = distancia_edicao(nome, no[0])
+            if distancia == 0:
+                no[1].append(identificador)
+                return
+            filho = no[2].get(distancia)
+            if filho is None:
+                no[2][distancia] = [nome, [identificador], {}]
+                return
+            no = filho
+    
+    def pesquisar(self, termo: str, max_distancia: int) -> List[Tuple[int, str, List[int]]]:
+        """
+        Encontra os nomes a uma distância de edição até ``max_distancia``.
+        
+        Returns:
+            Lista de tuplos ``(distancia, nome, identificadores)`` ordenada
+            por distância e depois por nome.
+        """
+        resultados = []
+        if self._raiz is None:
+            return resultados
+        
+        pendentes = [self._raiz]
+        while pendentes:
+            nome, identificadores, filhos = pendentes.pop()
+            distancia = distancia_edicao(termo, nome)
+            if distancia <= max_distancia:
+                resultados.append((distancia, nome, identificadores))
+            inferior = distancia - max_distancia
+            superior = distancia + max_distancia
+            for chave, filho in filhos.items():
+                if inferior <= chave <= superior:
+                    pendentes.append(filho)
+        
+        resultados.sort(key=lambda r: (r[0], r[1]))
+        return resultados
+
+
+class IndicePrefixos:
+    """
+    Índice de prefixos sobre um array ordenado de nomes.
+    
+    Equivale a percorrer uma trie compacta: a primeira correspondência é
+    encontrada por pesquisa binária e as seguintes são contíguas, pelo que
+    o custo é O(log n + k) para ``k`` resultados, independente do número
+    de nomes que partilham o prefixo.
+    """
+    
+    __slots__ = ("_nomes", "_identificadores")
+    
+    def __init__(self, pares: Iterable[Tuple[str, int]]):
+        """
+        Args:
+            pares: Tuplos ``(nome_normalizado, identificador)``.
+        """
+        ordenados = sorted(pares)
+        self._nomes = [nome for nome, _ in ordenados]
+        self._identificadores = [identificador for _, identificador in ordenados]
+    
+    def __len__(self) -> int:
+        return len(self._nomes)
+    
+    def pesquisar(self, prefixo: str, limite: int) -> List[int]:
+        """
+        Devolve até ``limite`` identificadores cujo nome começa pelo prefixo,
+        por ordem alfabética do nome normalizado.
+        """
+        nomes = self._nomes
+        resultados = []
+        i = bisect_left(nomes, prefixo)
+        while i < len(nomes) and len(resultados) < limite and nomes[i].startswith(prefixo):
+            resultados.append(self._identificadores[i])
+            i += 1
+        return resultados
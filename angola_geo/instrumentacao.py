@@ -0,0 +1,153 @@
+"""
+Instrumentação opcional dos métodos de AngolaGeo.
+
+Quando ativada (``AngolaGeo(instrumentar=True)`` ou
+``ativar_instrumentacao()``), cada método público da instância é
+substituído por um invólucro que mede a duração de cada chamada e a
+regista em :class:`Metricas`: número de chamadas, erros, tempo acumulado e
+um histograma com intervalos em potências de 2 microssegundos. O
+carregamento dos dados é registado como ``"carregamento"``.
+
+Desativada, a instância usa diretamente os métodos da classe, pelo que não
+há qualquer custo adicional.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# Observador chamado após cada medição com o nome do método e a duração (s)
+Observador = Callable[[str, float], None]
+
+# Número de intervalos do histograma: o último acumula as durações a
+# partir de 2**(INTERVALOS - 2) µs (cerca de 9 minutos)
+INTERVALOS = 32
+
+CARREGAMENTO = "carregamento"
+
+
+class _Contadores:
+    """Contadores de um método."""
+
+    __slots__ = ("chamadas", "erros", "tempo_total_ns", "tempo_maximo_ns", "histograma")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.tempo_total_ns = 0
+        self.tempo_maximo_ns = 0
+        self.histograma = [0] * INTERVALOS
+
+
+class Metricas:
+    """
+    Métricas de chamadas por nome de método.
+
+    O intervalo ``i`` do histograma conta as chamadas com duração inferior
+    a ``2**i`` µs (e pelo menos ``2**(i-1)`` µs); ``i = 0`` conta as
+    chamadas abaixo de 1 µs.
+    """
+
+    def __init__(self):
+        self._contadores: Dict[str, _Contadores] = {}
+        self._observadores: List[Observador] = []
+        self._trava = threading.Lock()
+
+    def adicionar_observador(self, observador: Observador) -> None:
+        """Regista uma função chamada com ``(nome, duracao_s)`` após cada medição."""
+        self._observadores.append(observador)
+
+    def registar(self, nome: str, duracao_ns: int, erro: bool = False) -> None:
+        """Regista uma chamada de ``nome`` com a duração indicada."""
+        intervalo = min((duracao_ns // 1000).bit_length(), INTERVALOS - 1)
+        with self._trava:
+            contadores = self._contadores.get(nome)
+            if contadores is None:
+                contadores = self._contadores[nome] = _Contadores()
+            contadores.chamadas += 1
+            contadores.erros += erro
+            contadores.tempo_total_ns += duracao_ns
+            if duracao_ns > contadores.tempo_maximo_ns:
+                contadores.tempo_maximo_ns = duracao_ns
+            contadores.histograma[intervalo] += 1
+        for observador in self._observadores:
+            observador(nome, duracao_ns / 1e9)
+
+    def estatisticas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumo das métricas por método.
+
+        Returns:
+            ``{nome: {...}}`` com 'chamadas', 'erros', 'tempo_total_s',
+            'tempo_medio_us', 'tempo_maximo_us' e 'histograma_us' (limite
+            superior do intervalo em µs → chamadas, só intervalos não vazios).
+        """
+        with self._trava:
+            return {
+                nome: {
+                    "chamadas": c.chamadas,
+                    "erros": c.erros,
+                    "tempo_total_s": c.tempo_total_ns / 1e9,
+                    "tempo_medio_us": c.tempo_total_ns / c.chamadas / 1000,
+                    "tempo_maximo_us": c.tempo_maximo_ns / 1000,
+                    "histograma_us": {
+                        2 ** i: contagem
+                        for i, contagem in enumerate(c.histograma) if contagem
+                    },
+                }
+                for nome, c in self._contadores.items()
+            }
+
+    def repor(self) -> None:
+        """Descarta todas as medições (os observadores mantêm-se)."""
+        with self._trava:
+            self._contadores.clear()
+
+    def medir(self, nome: str, funcao: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Devolve um invólucro de ``funcao`` que regista cada chamada.
+
+        Em funções geradoras mede-se o tempo passado dentro do gerador até
+        este terminar (ou ser fechado), não só a criação do gerador.
+        """
+        registar = self.registar
+        relogio = time.perf_counter_ns
+
+        if inspect.isgeneratorfunction(funcao):
+            @functools.wraps(funcao)
+            def gerador(*args, **kwargs):
+                total = 0
+                erro = False
+                iterador = funcao(*args, **kwargs)
+                try:
+                    while True:
+                        inicio = relogio()
+                        try:
+                            valor = next(iterador)
+                        except StopIteration:
+                            total += relogio() - inicio
+                            return
+                        except BaseException:
+                            total += relogio() - inicio
+                            erro = True
+                            raise
+                        total += relogio() - inicio
+                        yield valor
+                finally:
+                    iterador.close()
+                    registar(nome, total, erro)
+            return gerador
+
+        @functools.wraps(funcao)
+        def medido(*args, **kwargs):
+            inicio = relogio()
+            erro = True
+            try:
+                resultado = funcao(*args, **kwargs)
+                erro = False
+                return resultado
+            finally:
+                registar(nome, relogio() - inicio, erro)
+        return medido
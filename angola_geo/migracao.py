@@ -0,0 +1,169 @@
+"""
+Migração de registos da divisão anterior à Lei n.º 14/24.
+
+Registos históricos usam a divisão em 18 províncias e 164 municípios,
+guardada em ``data/divisions_pre_14_24.json`` (no mesmo formato de
+``divisions.json``, pelo que também se pode consultar com
+``AngolaGeo(caminho=CAMINHO_DADOS_ANTERIORES)``). Cada unidade desse
+ficheiro indica, em ``successors``, as unidades da divisão atual em que se
+tornou, começando pela principal (a que manteve o nome ou a sede): por
+exemplo, Cuando Cubango → Cubango e Cuando, ou o município de Quiçama →
+Quiçama e Cabo Ledo, na nova província de Icolo e Bengo.
+
+:class:`TabelaMigracao` pré-calcula o resultado de cada unidade anterior
+numa tabela indexada pelos nomes normalizados; migrar um registo é uma
+consulta a essa tabela, memorizada numa cache LRU sobre o texto original,
+sem percorrer os dados.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .codigos import formatar
+from .excecoes import DadosInvalidos
+from .modelos import Municipio, Provincia
+from .normalizacao import normalizar
+from .resolucao import CAPACIDADE_CACHE
+from .vistas import DicionarioImutavel, congelar
+
+if TYPE_CHECKING:
+    from .dados import ConjuntoDados
+
+# Um registo anterior: nome da província, par (província, município) ou
+# mapeamento com as chaves 'provincia' e, opcionalmente, 'municipio'
+RegistoAnterior = Union[str, Tuple[Optional[str], Optional[str]], Dict[str, Any]]
+
+# Resultado de registos sem correspondência
+SEM_CORRESPONDENCIA = DicionarioImutavel(
+    nivel=None, provincia=None, municipio=None, codigo=None, exato=False, candidatos=()
+)
+
+
+class TabelaMigracao:
+    """
+    Correspondência pré-calculada entre a divisão anterior e a atual.
+
+    O resultado de cada unidade anterior é uma vista só de leitura,
+    partilhada por todos os registos que a referem, com:
+
+    * 'nivel': nível da unidade anterior reconhecida ('provincia' ou
+      'municipio'; 'provincia' quando o município do registo não é
+      conhecido mas a província é);
+    * 'provincia', 'municipio' e 'codigo': o sucessor principal na divisão
+      atual ('municipio' é ``None`` se o sucessor ainda não constar dos
+      dados, caso em que o código é o da província);
+    * 'exato': ``True`` se a unidade tiver um único sucessor;
+    * 'candidatos': todos os sucessores, cada um com 'codigo', 'provincia'
+      e 'municipio'.
+    """
+
+    def __init__(self, dados_anteriores: Dict[str, Any], conjunto: "ConjuntoDados"):
+        """
+        Args:
+            dados_anteriores: Conteúdo de ``divisions_pre_14_24.json``.
+            conjunto: Dados da divisão atual.
+
+        Raises:
+            DadosInvalidos: Se uma província sucessora não existir nos dados
+                atuais.
+        """
+        self.metadados: DicionarioImutavel = congelar(dados_anteriores["metadata"])
+        self._conjunto = conjunto
+        self._tabela: Dict[Tuple[str, str], DicionarioImutavel] = {}
+        municipios_por_nome: Dict[str, List[DicionarioImutavel]] = {}
+
+        for provincia in dados_anteriores["provinces"]:
+            chave_provincia = normalizar(provincia["name"])
+            sucessoras = [
+                self._provincia(nome) for nome in provincia.get("successors", [provincia["name"]])
+            ]
+            self._tabela[chave_provincia, ""] = self._vista("provincia", sucessoras)
+
+            for municipio in provincia["municipalities"]:
+                chave_municipio = normalizar(municipio["name"])
+                sucessores = [
+                    self._municipio(s["province"], s["municipality"])
+                    for s in municipio.get("successors", [])
+                ] or sucessoras[:1]
+                vista = self._vista("municipio", sucessores)
+                self._tabela[chave_provincia, chave_municipio] = vista
+                municipios_por_nome.setdefault(chave_municipio, []).append(vista)
+
+        # Registos só com o município: apenas nomes que não se repetem
+        for chave_municipio, vistas in municipios_por_nome.items():
+            if len(vistas) == 1:
+                self._tabela["", chave_municipio] = vistas[0]
+
+        self.migrar: Callable[[Optional[str], Optional[str]], DicionarioImutavel] = (
+            lru_cache(maxsize=CAPACIDADE_CACHE)(self._migrar)
+        )
+
+    def __len__(self) -> int:
+        return len(self._tabela)
+
+    def _provincia(self, nome: str) -> Provincia:
+        provincia = self._conjunto.indice_provincias.get(normalizar(nome))
+        if provincia is None:
+            raise DadosInvalidos(f"Província sucessora '{nome}' não existe nos dados atuais")
+        return provincia
+
+    def _municipio(self, nome_provincia: str, nome: str) -> Union[Provincia, Municipio]:
+        """Município sucessor ou, se ainda não constar dos dados, a sua província."""
+        provincia = self._provincia(nome_provincia)
+        for municipio in self._conjunto.indice_municipios.get(normalizar(nome), ()):
+            if municipio.provincia is provincia:
+                return municipio
+        return provincia
+
+    def _codigo(self, registo: Union[Provincia, Municipio]) -> str:
+        conjunto = self._conjunto
+        for identificador in conjunto.identificadores_nomes[normalizar(registo.nome)]:
+            if conjunto.entradas[identificador] is registo:
+                return formatar(conjunto.codigos[identificador])
+        raise DadosInvalidos(f"Registo sem código: {registo!r}")
+
+    def _vista(
+        self,
+        nivel: str,
+        sucessores: List[Union[Provincia, Municipio]]
+    ) -> DicionarioImutavel:
+        candidatos = []
+        for registo in dict.fromkeys(sucessores):
+            e_municipio = isinstance(registo, Municipio)
+            candidatos.append(DicionarioImutavel(
+                codigo=self._codigo(registo),
+                provincia=registo.provincia.nome if e_municipio else registo.nome,
+                municipio=registo.nome if e_municipio else None,
+            ))
+        principal = candidatos[0]
+        return DicionarioImutavel(
+            nivel=nivel,
+            provincia=principal["provincia"],
+            municipio=principal["municipio"],
+            codigo=principal["codigo"],
+            exato=len(candidatos) == 1,
+            candidatos=tuple(candidatos),
+        )
+
+    def _migrar(self, provincia: Optional[str], municipio: Optional[str]) -> DicionarioImutavel:
+        chave_provincia = normalizar(provincia) if provincia else ""
+        chave_municipio = normalizar(municipio) if municipio else ""
+        tabela = self._tabela
+        if chave_municipio:
+            vista = tabela.get((chave_provincia, chave_municipio))
+            if vista is not None:
+                return vista
+        if chave_provincia:
+            return tabela.get((chave_provincia, ""), SEM_CORRESPONDENCIA)
+        return SEM_CORRESPONDENCIA
+
+    def migrar_lote(self, registos: Iterable[RegistoAnterior]) -> Iterator[DicionarioImutavel]:
+        """Migra registos anteriores, pela ordem (ver :meth:`AngolaGeo.migrar_lote`)."""
+        migrar = self.migrar
+        for registo in registos:
+            if isinstance(registo, str):
+                yield migrar(registo, None)
+            elif isinstance(registo, dict):
+                yield migrar(registo.get("provincia"), registo.get("municipio"))
+            else:
+                yield migrar(*registo)
@@ -0,0 +1,137 @@
+"""
+Registos imutáveis das divisões administrativas.
+
+Os dados carregados de ``divisions.json`` são convertidos uma vez nestes
+registos compactos (``__slots__``, nomes internados, filhos em tuplos e
+referência ao pai), usados internamente por AngolaGeo. Os dicionários
+devolvidos pela API pública são gerados a partir deles.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+
+class _Registo:
+    """Base dos registos: impede a alteração de atributos após a construção."""
+    
+    __slots__ = ()
+    
+    nivel = ""
+    
+    def __setattr__(self, nome: str, valor: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} é imutável")
+    
+    def __delattr__(self, nome: str) -> None:
+        raise AttributeError(f"{type(self).__name__} é imutável")
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.nome!r})"
+
+
+_definir = object.__setattr__
+
+
+class Comuna(_Registo):
+    """Comuna, com referência ao município a que pertence."""
+    
+    __slots__ = ("nome", "municipio")
+    
+    nivel = "comuna"
+    
+    def __init__(self, nome: str, municipio: "Municipio"):
+        _definir(self, "nome", sys.intern(nome))
+        _definir(self, "municipio", municipio)
+    
+    @property
+    def provincia(self) -> "Provincia":
+        """Província a que a comuna pertence."""
+        return self.municipio.provincia
+
+
+class Municipio(_Registo):
+    """Município, com as suas comunas e referência à província."""
+    
+    __slots__ = ("nome", "provincia", "comunas")
+    
+    nivel = "municipio"
+    
+    def __init__(self, nome: str, provincia: "Provincia"):
+        _definir(self, "nome", sys.intern(nome))
+        _definir(self, "provincia", provincia)
+        _definir(self, "comunas", ())
+
+
+class Provincia(_Registo):
+    """Província, com os seus municípios."""
+    
+    __slots__ = ("id", "nome", "capital", "total_municipios", "observacoes", "municipios")
+    
+    nivel = "provincia"
+    
+    def __init__(
+        self,
+        id: int,
+        nome: str,
+        capital: str,
+        total_municipios: int,
+        observacoes: Optional[str] = None
+    ):
+        _definir(self, "id", id)
+        _definir(self, "nome", sys.intern(nome))
+        _definir(self, "capital", sys.intern(capital))
+        _definir(self, "total_municipios", total_municipios)
+        _definir(self, "observacoes", observacoes)
+        _definir(self, "municipios", ())
+    
+    @classmethod
+    def de_json(cls, dados: Dict[str, Any]) -> "Provincia":
+        """
+        Constrói a província e toda a sua subárvore a partir do JSON.
+        
+        Comunas sem nome (ou que não sejam objetos) são ignoradas.
+        """
+        return construir_provincia(
+            dados["id"],
+            dados["name"],
+            dados["capital"],
+            dados["municipality_count"],
+            dados.get("notes"),
+            (
+                (
+                    m["name"],
+                    (
+                        c["name"] for c in m.get("communes", [])
+                        if isinstance(c, dict) and c.get("name")
+                    )
+                )
+                for m in dados["municipalities"]
+            )
+        )
+
+
+def construir_provincia(
+    id: int,
+    nome: str,
+    capital: str,
+    total_municipios: int,
+    observacoes: Optional[str],
+    municipios: Iterable[Tuple[str, Iterable[str]]]
+) -> Provincia:
+    """
+    Constrói uma província com os seus municípios e comunas.
+    
+    Args:
+        municipios: Pares ``(nome_municipio, nomes_comunas)`` por ordem.
+    """
+    provincia = Provincia(id, nome, capital, total_municipios, observacoes)
+    registos = []
+    for nome_municipio, nomes_comunas in municipios:
+        municipio = Municipio(nome_municipio, provincia)
+        _definir(municipio, "comunas", tuple(Comuna(c, municipio) for c in nomes_comunas))
+        registos.append(municipio)
+    _definir(provincia, "municipios", tuple(registos))
+    return provincia
+
+
+# Qualquer registo da hierarquia (tipo dos elementos de ``ConjuntoDados.entradas``)
+Registo = Union[Provincia, Municipio, Comuna]
@@ -0,0 +1,31 @@
+"""
+Normalização de nomes para comparação e indexação.
+
+Os nomes das divisões administrativas aparecem com e sem acentos
+("Uíge"/"Uige", "Úcua"/"UCUA"), por isso todas as chaves dos índices
+internos passam por :func:`normalizar`.
+"""
+
+import unicodedata
+
+
+def normalizar(texto: str) -> str:
+    """
+    Normaliza um nome para uso como chave de índice.
+
+    Aplica ``casefold``, remove os acentos (marcas combinantes após a
+    decomposição Unicode) e colapsa espaços repetidos.
+
+    Args:
+        texto: Nome a normalizar.
+
+    Returns:
+        Nome normalizado.
+
+    Example:
+        >>> normalizar("  Úcua ")
+        'ucua'
+    """
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.split())
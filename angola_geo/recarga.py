@@ -0,0 +1,167 @@
+"""
+Recarga automática dos dados em serviços de longa duração.
+
+:class:`VigilanteDados` vigia o ficheiro de divisões de uma instância de
+AngolaGeo (ver :meth:`angola_geo.core.AngolaGeo.vigiar_dados`). Numa
+thread própria, compara periodicamente a data de modificação e o tamanho
+do ficheiro; quando mudam, lê-o e compara o SHA-256 do conteúdo com o do
+conjunto ativo. Só um conteúdo novo é carregado, e todos os índices
+(incluindo os que normalmente são construídos na primeira utilização) são
+construídos nessa thread, fora do caminho dos pedidos.
+
+O conjunto novo é publicado com uma única atribuição de referência na
+instância. Os métodos de AngolaGeo leem essa referência uma vez por
+chamada, por isso cada chamada vê uma versão completa e consistente dos
+dados sem precisar de qualquer trava; chamadas já em curso terminam com a
+versão anterior. Se o ficheiro novo não for válido (por exemplo, a meio
+de ser escrito), a versão ativa mantém-se e o observador recebe o erro.
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from .dados import ConjuntoDados, conjunto_de_conteudo
+from .instrumentacao import CARREGAMENTO
+from .resumo import hash_conteudo
+
+if TYPE_CHECKING:
+    from .core import AngolaGeo
+
+# Intervalo (s) entre verificações do ficheiro
+INTERVALO_PADRAO = 2.0
+
+# Observador chamado após cada recarga ou tentativa falhada, com um
+# dicionário: 'caminho', 'versao_anterior', 'versao', 'duracao_s' e 'erro'
+# (``None`` se a recarga correu bem, ou a exceção)
+ObservadorRecarga = Callable[[Dict[str, Any]], None]
+
+
+def _versao(conjunto: ConjuntoDados) -> Optional[str]:
+    return conjunto.metadados.get("data_version")
+
+
+class VigilanteDados:
+    """Deteta alterações no ficheiro de dados e publica os novos conjuntos."""
+
+    def __init__(
+        self,
+        geo: "AngolaGeo",
+        caminho: str,
+        intervalo: float = INTERVALO_PADRAO,
+        observador: Optional[ObservadorRecarga] = None
+    ):
+        """
+        Args:
+            geo: Instância onde os conjuntos novos são publicados.
+            caminho: Ficheiro de divisões vigiado.
+            intervalo: Segundos entre verificações da thread de vigilância.
+            observador: Função chamada após cada recarga (ou falha).
+            
+        Raises:
+            ValueError: Se ``intervalo`` não for positivo.
+        """
+        if not intervalo > 0:
+            raise ValueError(f"intervalo tem de ser positivo: {intervalo!r}")
+        self.geo = geo
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.observador = observador
+        # Só quem verifica usa a trava; os leitores nunca a tomam
+        self._trava = threading.Lock()
+        self._assinatura: Optional[Tuple[int, int]] = None
+        self._hash = geo._conjunto.hash_origem
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ativo(self) -> bool:
+        """``True`` enquanto a thread de vigilância estiver a correr."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self) -> None:
+        """Inicia a thread de vigilância (daemon), se ainda não estiver ativa."""
+        if self.ativo:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._vigiar, name="angola-geo-recarga", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self, esperar: bool = True) -> None:
+        """Para a thread de vigilância."""
+        self._parar.set()
+        thread = self._thread
+        if esperar and thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def _vigiar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception:
+                # Um observador com erro não deve parar a vigilância
+                pass
+
+    def verificar(self) -> bool:
+        """
+        Verifica o ficheiro uma vez e recarrega-o se o conteúdo mudou.
+
+        Returns:
+            ``True`` se um conjunto novo foi publicado.
+        """
+        with self._trava:
+            try:
+                estado = os.stat(self.caminho)
+            except OSError as erro:
+                self._notificar(None, 0.0, erro)
+                return False
+            assinatura = (estado.st_mtime_ns, estado.st_size)
+            if assinatura == self._assinatura:
+                return False
+
+            inicio = time.perf_counter_ns()
+            try:
+                with open(self.caminho, "rb") as f:
+                    conteudo = f.read()
+                hash_novo = hash_conteudo(conteudo)
+                self._assinatura = assinatura
+                if hash_novo == self._hash:
+                    return False
+                conjunto = conjunto_de_conteudo(conteudo, self.caminho)
+                # Construir já os índices preguiçosos, fora dos pedidos
+                conjunto.arvore_bk
+            except Exception as erro:
+                self._notificar(None, (time.perf_counter_ns() - inicio) / 1e9, erro)
+                return False
+
+            duracao = time.perf_counter_ns() - inicio
+            # Conta como um carregamento, tal como AngolaGeo._carregar
+            metricas = self.geo._metricas
+            if metricas is not None:
+                metricas.registar(CARREGAMENTO, duracao)
+            self._hash = hash_novo
+            anterior = self.geo._publicar(conjunto)
+            self._notificar(anterior, duracao / 1e9, None, conjunto)
+            return True
+
+    def _notificar(
+        self,
+        anterior: Optional[ConjuntoDados],
+        duracao: float,
+        erro: Optional[BaseException],
+        conjunto: Optional[ConjuntoDados] = None
+    ) -> None:
+        if self.observador is None:
+            return
+        ativo = self.geo._conjunto
+        self.observador({
+            "caminho": self.caminho,
+            "versao_anterior": _versao(anterior or ativo),
+            "versao": _versao(conjunto or ativo),
+            "duracao_s": duracao,
+            "erro": erro,
+        })
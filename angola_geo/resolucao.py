@@ -0,0 +1,133 @@
+"""
+Resolução de texto livre para registos canónicos.
+
+Converte localizações escritas por utilizadores ("luanda", "Prov. de
+Benguela", "mun. Cazenga") no registo correspondente, com uma medida de
+confiança. Cada conjunto de dados tem o seu resolvedor (ver
+:func:`criar_resolvedor`), memorizado numa cache LRU limitada e indexada
+pelo texto normalizado, porque em dados reais as mesmas entradas
+repetem-se muito.
+"""
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from .modelos import Comuna, Municipio, Provincia
+
+if TYPE_CHECKING:
+    from .dados import ConjuntoDados
+
+# Número máximo de textos normalizados distintos memorizados por conjunto
+CAPACIDADE_CACHE = 65536
+
+# Distância de edição máxima na correspondência aproximada; termos curtos
+# toleram menos erros (uma edição por cada CARATERES_POR_EDICAO caracteres)
+MAX_DISTANCIA = 2
+CARATERES_POR_EDICAO = 4
+
+# Fator aplicado à confiança quando o nível indicado no texto ("mun.",
+# "província de", ...) não é o do registo encontrado
+PENALIZACAO_NIVEL = 0.9
+
+# Prefixos que indicam o nível, sobre texto já normalizado
+_PREFIXO_NIVEL = re.compile(
+    r"^(?P<nivel>prov(?:incia)?|mun(?:icipio)?|com(?:una)?)\b\.?\s*"
+    r"(?:(?:de|do|da|dos|das)\s+)?"
+)
+_NIVEL_PREFIXO = {"p": Provincia.nivel, "m": Municipio.nivel, "c": Comuna.nivel}
+_PONTUACAO = re.compile(r"[.,;:]+")
+
+Resolucao = Optional[Tuple[int, float]]
+
+
+def separar_nivel(texto: str) -> Tuple[Optional[str], str]:
+    """
+    Separa o prefixo de nível de um texto normalizado.
+
+    Args:
+        texto: Texto já normalizado (ver :func:`angola_geo.normalizacao.normalizar`).
+
+    Returns:
+        ``(nivel, nome)``, em que ``nivel`` é 'provincia', 'municipio',
+        'comuna' ou ``None`` se o texto não tiver prefixo.
+
+    Example:
+        >>> separar_nivel("prov. de benguela")
+        ('provincia', 'benguela')
+    """
+    correspondencia = _PREFIXO_NIVEL.match(texto)
+    nivel = None
+    if correspondencia and correspondencia.end() < len(texto):
+        nivel = _NIVEL_PREFIXO[correspondencia.group("nivel")[0]]
+        texto = texto[correspondencia.end():]
+    return nivel, " ".join(_PONTUACAO.sub(" ", texto).split())
+
+
+def criar_resolvedor(
+    conjunto: "ConjuntoDados",
+    capacidade: int = CAPACIDADE_CACHE
+) -> Callable[[str], Resolucao]:
+    """
+    Cria a função de resolução de um conjunto de dados.
+
+    A função recebe um texto normalizado e devolve ``(identificador,
+    confianca)``, com o identificador do registo em ``conjunto.entradas``
+    e a confiança entre 0 e 1, ou ``None`` se nada corresponder:
+
+    * nome exato: confiança 1;
+    * nome a uma distância de edição ``d``: ``1 - d / comprimento``;
+    * homónimos no mesmo nível (municípios com o mesmo nome em províncias
+      diferentes): a confiança é dividida pelo número de candidatos;
+    * sem prefixo de nível prefere-se o nível mais alto (província, depois
+      município, depois comuna); com prefixo, o nível indicado.
+
+    Os resultados ficam numa cache LRU (``functools.lru_cache``), cujas
+    estatísticas se obtêm com ``cache_info()``.
+    """
+    entradas = conjunto.entradas
+    exatos = conjunto.identificadores_nomes
+    ordem_niveis = {
+        nivel: posicao
+        for posicao, nivel in enumerate((Provincia.nivel, Municipio.nivel, Comuna.nivel))
+    }
+
+    @lru_cache(maxsize=capacidade)
+    def resolver(texto: str) -> Resolucao:
+        nivel, nome = separar_nivel(texto)
+        if not nome:
+            return None
+
+        distancia = 0
+        identificadores = exatos.get(nome)
+        if not identificadores:
+            max_distancia = min(MAX_DISTANCIA, len(nome) // CARATERES_POR_EDICAO)
+            if not max_distancia:
+                return None
+            encontrados = conjunto.arvore_bk.pesquisar(nome, max_distancia)
+            if not encontrados:
+                return None
+            distancia = encontrados[0][0]
+            identificadores = [
+                identificador
+                for d, _, ids in encontrados if d == distancia
+                for identificador in ids
+            ]
+
+        melhor = min(
+            (entradas[i].nivel != nivel, ordem_niveis[entradas[i].nivel])
+            for i in identificadores
+        )
+        candidatos = [
+            i for i in identificadores
+            if (entradas[i].nivel != nivel, ordem_niveis[entradas[i].nivel]) == melhor
+        ]
+        escolhido = candidatos[0]
+
+        comprimento = max(len(nome), len(conjunto.indice_trigramas.nomes[escolhido]))
+        confianca = (1 - distancia / comprimento) / len(candidatos)
+        if nivel is not None and entradas[escolhido].nivel != nivel:
+            confianca *= PENALIZACAO_NIVEL
+        return escolhido, round(confianca, 3)
+
+    return resolver
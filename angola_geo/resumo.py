@@ -0,0 +1,126 @@
+"""
+Leitura rápida dos metadados e do resumo das províncias.
+
+Comandos como ``angola-geo info`` só precisam dos metadados do conjunto
+de dados e dos dados básicos das províncias. Este módulo lê essa secção
+do instantâneo binário (ver :mod:`angola_geo.binario`) sem carregar a
+hierarquia completa nem construir índices, e depende apenas de módulos
+leves da biblioteca padrão para manter o arranque da CLI rápido.
+"""
+
+import hashlib
+import marshal
+import os
+
+CAMINHO_DADOS = os.path.join(os.path.dirname(__file__), "data", "divisions.json")
+# Divisão anterior à Lei n.º 14/24, com a correspondência para a atual
+CAMINHO_DADOS_ANTERIORES = os.path.join(
+    os.path.dirname(__file__), "data", "divisions_pre_14_24.json"
+)
+# Limites geográficos opcionais (ver angola_geo.geometria)
+CAMINHO_LIMITES = os.path.join(os.path.dirname(__file__), "data", "limites.bin")
+# Coordenadas das sedes das divisões (ver angola_geo.sedes)
+CAMINHO_SEDES = os.path.join(os.path.dirname(__file__), "data", "sedes.json")
+
+# Províncias criadas pela Lei n.º 14/24
+PROVINCIAS_NOVAS = frozenset({"Icolo e Bengo", "Cuando", "Moxico Leste"})
+
+# Cabeçalho do instantâneo: assinatura, versão, SHA-256 do JSON de origem e
+# tamanho (4 bytes, little-endian) da secção de resumo que se lhe segue
+ASSINATURA = b"AGEOBIN"
+VERSAO_FORMATO = 2
+TAMANHO_HASH = 32
+TAMANHO_CABECALHO = len(ASSINATURA) + 1 + TAMANHO_HASH + 4
+
+
+def caminho_binario(caminho_json: str) -> str:
+    """Caminho do instantâneo correspondente a um ficheiro JSON."""
+    return os.path.splitext(caminho_json)[0] + ".bin"
+
+
+def hash_conteudo(conteudo: bytes) -> bytes:
+    """SHA-256 do conteúdo do JSON de origem."""
+    return hashlib.sha256(conteudo).digest()
+
+
+def criar_cabecalho(hash_origem: bytes, resumo: bytes) -> bytes:
+    """Cabeçalho seguido da secção de resumo já serializada."""
+    return (
+        ASSINATURA
+        + bytes([VERSAO_FORMATO])
+        + hash_origem
+        + len(resumo).to_bytes(4, "little")
+        + resumo
+    )
+
+
+def abrir_instantaneo(conteudo: bytes, hash_esperado: bytes):
+    """
+    Valida o cabeçalho e lê a secção de resumo de um instantâneo.
+    
+    Returns:
+        ``(metadados, provincias, inicio_corpo)``, em que ``provincias`` é
+        um tuplo de ``(id, nome, capital, total_municipios, observacoes)``
+        e ``inicio_corpo`` a posição onde começa o resto do instantâneo;
+        ou ``None`` se o instantâneo não corresponder ao hash esperado ou
+        não puder ser lido.
+    """
+    inicio_hash = len(ASSINATURA) + 1
+    if (
+        conteudo[:len(ASSINATURA)] != ASSINATURA
+        or conteudo[len(ASSINATURA):inicio_hash] != bytes([VERSAO_FORMATO])
+        or conteudo[inicio_hash:inicio_hash + TAMANHO_HASH] != hash_esperado
+    ):
+        return None
+    tamanho = int.from_bytes(conteudo[TAMANHO_CABECALHO - 4:TAMANHO_CABECALHO], "little")
+    fim = TAMANHO_CABECALHO + tamanho
+    try:
+        metadados, provincias = marshal.loads(conteudo[TAMANHO_CABECALHO:fim])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return metadados, provincias, fim
+
+
+def carregar_resumo(caminho: str = CAMINHO_DADOS):
+    """
+    Obtém os metadados e o resumo das províncias.
+    
+    Usa a secção de resumo do instantâneo binário quando está atualizado;
+    caso contrário interpreta o JSON.
+    
+    Returns:
+        ``(metadados, provincias)``, em que ``provincias`` é uma lista de
+        dicionários com 'id', 'nome', 'capital', 'total_municipios' e
+        'observacoes' (``None`` se não houver).
+    """
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    
+    try:
+        with open(caminho_binario(caminho), "rb") as f:
+            aberto = abrir_instantaneo(f.read(), hash_conteudo(conteudo))
+    except OSError:
+        aberto = None
+    
+    if aberto is not None:
+        metadados, provincias, _ = aberto
+    else:
+        import json
+        
+        dados = json.loads(conteudo.decode("utf-8"))
+        metadados = dados["metadata"]
+        provincias = [
+            (p["id"], p["name"], p["capital"], p["municipality_count"], p.get("notes"))
+            for p in dados["provinces"]
+        ]
+    
+    return metadados, [
+        {
+            "id": id_,
+            "nome": nome,
+            "capital": capital,
+            "total_municipios": total,
+            "observacoes": observacoes
+        }
+        for id_, nome, capital, total, observacoes in provincias
+    ]
@@ -0,0 +1,286 @@
+"""
+Coordenadas das sedes das divisões e consultas de proximidade.
+
+``data/sedes.json`` guarda, para cada divisão cuja sede tem posição
+conhecida, o código hierárquico (ver :mod:`angola_geo.codigos`), o nome
+(validado contra os dados) e as coordenadas aproximadas da sede: a capital
+da província (o campo ``capital``) ou a sede do município. As divisões
+sem coordenadas não entram nas consultas.
+
+As sedes de cada nível são indexadas numa :class:`ArvoreKD` sobre os
+vetores unitários 3D correspondentes às coordenadas. A distância em linha
+reta (corda) entre dois vetores unitários cresce com a distância ao longo
+da superfície, por isso os vizinhos mais próximos pela corda são os mais
+próximos no globo, sem os problemas das coordenadas angulares (a
+longitude encolhe com a latitude e dá a volta em ±180°). As distâncias
+devolvidas são as do círculo máximo numa esfera de raio
+:data:`RAIO_TERRA_KM`, como pela fórmula de haversine.
+"""
+
+import math
+from array import array
+from heapq import heappush, heapreplace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .codigos import interpretar
+from .excecoes import DadosInvalidos
+from .modelos import Comuna, Municipio, Provincia
+from .normalizacao import normalizar
+from .vistas import DicionarioImutavel, congelar
+
+if TYPE_CHECKING:
+    from .dados import ConjuntoDados
+
+# Raio médio da Terra (IUGG), em quilómetros
+RAIO_TERRA_KM = 6371.0088
+
+Ponto = Tuple[float, float, float]
+
+
+def vetor_unitario(latitude: float, longitude: float) -> Ponto:
+    """
+    Vetor unitário 3D de um ponto da superfície.
+
+    Raises:
+        ValueError: Se as coordenadas estiverem fora dos limites (ou não
+            forem números).
+    """
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(f"Coordenadas inválidas: {latitude}, {longitude}")
+    phi = math.radians(latitude)
+    lambda_ = math.radians(longitude)
+    return (math.cos(phi) * math.cos(lambda_), math.cos(phi) * math.sin(lambda_), math.sin(phi))
+
+
+def corda_para_km(corda_quadrado: float) -> float:
+    """Distância ao longo da superfície para uma corda (ao quadrado)."""
+    return 2 * RAIO_TERRA_KM * math.asin(min(math.sqrt(corda_quadrado) / 2, 1.0))
+
+
+def km_para_corda(km: float) -> float:
+    """Corda correspondente a uma distância ao longo da superfície."""
+    return 2 * math.sin(min(km / RAIO_TERRA_KM, math.pi) / 2)
+
+
+class ArvoreKD:
+    """
+    Árvore k-d sobre pontos 3D, guardada em arrays.
+
+    A árvore é equilibrada e implícita: os pontos estão ordenados de modo
+    que o nó de um intervalo ``[inicio, fim)`` é o elemento do meio, com a
+    subárvore esquerda antes e a direita depois; cada nó divide pelo eixo
+    em que os pontos do seu intervalo mais variam. Uma consulta só desce
+    ao lado mais afastado do plano de divisão quando este ainda pode
+    conter um ponto melhor, o que a torna sublinear.
+    """
+
+    __slots__ = ("_coordenadas", "_identificadores", "_eixos")
+
+    def __init__(self, pontos: Sequence[Ponto], identificadores: Sequence[int]):
+        """
+        Args:
+            pontos: Coordenadas de cada ponto.
+            identificadores: Identificador de cada ponto, devolvido nas
+                consultas.
+        """
+        ordem = list(range(len(pontos)))
+        self._eixos = array("b", bytes(len(pontos)))
+        pendentes = [(0, len(ordem))]
+        while pendentes:
+            inicio, fim = pendentes.pop()
+            if fim - inicio < 2:
+                continue
+            segmento = ordem[inicio:fim]
+            eixo = max(range(3), key=lambda e: (
+                max(pontos[i][e] for i in segmento) - min(pontos[i][e] for i in segmento)
+            ))
+            segmento.sort(key=lambda i: pontos[i][eixo])
+            ordem[inicio:fim] = segmento
+            meio = (inicio + fim) // 2
+            self._eixos[meio] = eixo
+            pendentes += [(inicio, meio), (meio + 1, fim)]
+        self._coordenadas = array("d", (c for i in ordem for c in pontos[i]))
+        self._identificadores = array("i", (identificadores[i] for i in ordem))
+
+    def __len__(self) -> int:
+        return len(self._identificadores)
+
+    def mais_proximos(self, ponto: Ponto, k: int) -> List[Tuple[float, int]]:
+        """
+        Os ``k`` pontos mais próximos.
+
+        Returns:
+            Pares ``(distancia_ao_quadrado, identificador)`` por ordem
+            crescente (empates pelo identificador).
+        """
+        if k <= 0:
+            return []
+        coordenadas = self._coordenadas
+        identificadores = self._identificadores
+        eixos = self._eixos
+        x, y, z = ponto
+        # Heap de máximos com os k melhores: (-distância, -identificador)
+        melhores: List[Tuple[float, int]] = []
+        pendentes = [(0, len(identificadores), 0.0)]
+        while pendentes:
+            inicio, fim, minimo = pendentes.pop()
+            if inicio >= fim or (len(melhores) == k and minimo > -melhores[0][0]):
+                continue
+            meio = (inicio + fim) // 2
+            j = meio * 3
+            dx = coordenadas[j] - x
+            dy = coordenadas[j + 1] - y
+            dz = coordenadas[j + 2] - z
+            candidato = (-(dx * dx + dy * dy + dz * dz), -identificadores[meio])
+            if len(melhores) < k:
+                heappush(melhores, candidato)
+            elif candidato > melhores[0]:
+                heapreplace(melhores, candidato)
+            if fim - inicio == 1:
+                continue
+            diferenca = ponto[eixos[meio]] - coordenadas[j + eixos[meio]]
+            esquerda, direita = (inicio, meio), (meio + 1, fim)
+            perto, longe = (esquerda, direita) if diferenca < 0 else (direita, esquerda)
+            # O lado próximo fica no topo da pilha e é visitado primeiro
+            pendentes.append((*longe, diferenca * diferenca))
+            pendentes.append((*perto, 0.0))
+        return sorted((-distancia, -identificador) for distancia, identificador in melhores)
+
+    def dentro_de(self, ponto: Ponto, raio: float) -> List[Tuple[float, int]]:
+        """
+        Os pontos a uma distância até ``raio``.
+
+        Returns:
+            Pares ``(distancia_ao_quadrado, identificador)`` por ordem
+            crescente (empates pelo identificador).
+        """
+        coordenadas = self._coordenadas
+        identificadores = self._identificadores
+        eixos = self._eixos
+        x, y, z = ponto
+        raio_quadrado = raio * raio
+        resultados = []
+        pendentes = [(0, len(identificadores))]
+        while pendentes:
+            inicio, fim = pendentes.pop()
+            if inicio >= fim:
+                continue
+            meio = (inicio + fim) // 2
+            j = meio * 3
+            dx = coordenadas[j] - x
+            dy = coordenadas[j + 1] - y
+            dz = coordenadas[j + 2] - z
+            distancia = dx * dx + dy * dy + dz * dz
+            if distancia <= raio_quadrado:
+                resultados.append((distancia, identificadores[meio]))
+            if fim - inicio == 1:
+                continue
+            diferenca = ponto[eixos[meio]] - coordenadas[j + eixos[meio]]
+            if diferenca * diferenca <= raio_quadrado:
+                pendentes += [(inicio, meio), (meio + 1, fim)]
+            elif diferenca < 0:
+                pendentes.append((inicio, meio))
+            else:
+                pendentes.append((meio + 1, fim))
+        resultados.sort()
+        return resultados
+
+
+class IndiceSedes:
+    """
+    Coordenadas das sedes e uma :class:`ArvoreKD` por nível.
+
+    ``coordenadas`` associa o identificador de cada registo com sede (ver
+    :class:`~angola_geo.dados.ConjuntoDados`) a ``(latitude, longitude)``.
+    Depois do construtor nada muda, por isso as consultas podem correr em
+    paralelo sem travas.
+    """
+
+    def __init__(self, dados: Dict[str, Any], conjunto: "ConjuntoDados"):
+        """
+        Args:
+            dados: Conteúdo de ``sedes.json``.
+            conjunto: Dados das divisões a que os códigos se referem.
+
+        Raises:
+            DadosInvalidos: Se uma sede tiver um código inválido ou que não
+                existe nos dados, um nome diferente do da divisão, mais de
+                uma entrada ou coordenadas fora dos limites.
+        """
+        self.metadados: DicionarioImutavel = congelar(dados["metadata"])
+        self.coordenadas: Dict[int, Tuple[float, float]] = {}
+        por_nivel: Dict[Optional[str], List[int]] = {
+            Provincia.nivel: [], Municipio.nivel: [], Comuna.nivel: []
+        }
+        for sede in dados["seats"]:
+            try:
+                identificador = conjunto.identificadores_codigos.get(interpretar(sede["code"]))
+            except ValueError as erro:
+                raise DadosInvalidos(f"Sede com código inválido: {sede['code']!r}") from erro
+            if identificador is None:
+                raise DadosInvalidos(f"Sede com código inexistente: {sede['code']}")
+            registo = conjunto.entradas[identificador]
+            if normalizar(sede["name"]) != normalizar(registo.nome):
+                raise DadosInvalidos(
+                    f"Sede {sede['code']}: '{sede['name']}' não corresponde a '{registo.nome}'"
+                )
+            if identificador in self.coordenadas:
+                raise DadosInvalidos(f"Sede repetida: {sede['code']}")
+            coordenadas = (sede["latitude"], sede["longitude"])
+            try:
+                vetor_unitario(*coordenadas)
+            except ValueError as erro:
+                raise DadosInvalidos(f"Sede {sede['code']}: {erro}") from erro
+            self.coordenadas[identificador] = coordenadas
+            por_nivel[registo.nivel].append(identificador)
+        por_nivel[None] = list(self.coordenadas)
+
+        self._arvores: Dict[Optional[str], ArvoreKD] = {
+            nivel: ArvoreKD([vetor_unitario(*self.coordenadas[i]) for i in ids], ids)
+            for nivel, ids in por_nivel.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.coordenadas)
+
+    def mais_proximos(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        nivel: Optional[str]
+    ) -> List[Tuple[int, float]]:
+        """
+        As ``k`` sedes de ``nivel`` (``None`` para todos) mais próximas.
+
+        Returns:
+            Pares ``(identificador, distancia_km)``, do mais próximo para o
+            mais afastado.
+
+        Raises:
+            ValueError: Se as coordenadas forem inválidas.
+        """
+        vizinhos = self._arvores[nivel].mais_proximos(vetor_unitario(latitude, longitude), k)
+        return [(identificador, corda_para_km(d)) for d, identificador in vizinhos]
+
+    def dentro_do_raio(
+        self,
+        latitude: float,
+        longitude: float,
+        raio_km: float,
+        nivel: Optional[str]
+    ) -> List[Tuple[int, float]]:
+        """
+        As sedes de ``nivel`` (``None`` para todos) a até ``raio_km``.
+
+        Returns:
+            Pares ``(identificador, distancia_km)``, do mais próximo para o
+            mais afastado.
+
+        Raises:
+            ValueError: Se as coordenadas forem inválidas.
+        """
+        vizinhos = self._arvores[nivel].dentro_de(
+            vetor_unitario(latitude, longitude), km_para_corda(raio_km)
+        )
+        return [(identificador, corda_para_km(d)) for d, identificador in vizinhos]
@@ -0,0 +1,259 @@
+"""
+Serviço HTTP de consultas (``angola-geo servir``).
+
+Servidor asyncio só com a biblioteca padrão que expõe as consultas de
+:class:`angola_geo.core.AngolaGeo` em JSON:
+
+* ``GET /provincias``
+* ``GET /provincias/<nome>``
+* ``GET /provincias/<nome>/municipios``
+* ``GET /municipios`` (aceita ``?provincia=<nome>``)
+* ``GET /pesquisar?q=<termo>``
+* ``GET /metadados``
+
+As ligações são mantidas abertas entre pedidos (keep-alive, por omissão
+em HTTP/1.1). Todas as respostas levam um ``ETag`` derivado de
+``data_version``: com os mesmos dados, o mesmo URL devolve sempre o mesmo
+corpo, pelo que um ``If-None-Match`` igual recebe ``304 Not Modified``.
+Os corpos das rotas estáticas (tudo exceto a pesquisa) vêm das variantes
+``*_json`` de AngolaGeo, serializados uma única vez (no arranque, e depois
+de cada recarga dos dados no primeiro pedido de cada rota).
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .excecoes import ProvinciaInexistente
+from .vistas import serializar_json
+
+if TYPE_CHECKING:
+    from .core import AngolaGeo
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8080
+
+# Tempo máximo (s) de espera por um pedido numa ligação aberta
+TEMPO_INATIVIDADE = 15.0
+# Tamanho máximo da linha de pedido e cabeçalhos
+MAX_CABECALHOS = 16 * 1024
+# Tamanho máximo do corpo de um pedido: as rotas só aceitam GET e HEAD, por
+# isso um corpo maior é recusado em vez de ser lido para memória
+MAX_CORPO = 8 * 1024
+
+_RAZOES = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Content Too Large",
+    431: "Request Header Fields Too Large",
+}
+
+Resposta = Tuple[int, bytes]
+
+
+class ServicoConsultas:
+    """
+    Encaminhamento dos pedidos para as consultas de AngolaGeo.
+
+    Independente da rede: :meth:`responder` recebe o alvo do pedido
+    (caminho e query string) e devolve o estado HTTP e o corpo JSON.
+    """
+
+    def __init__(self, geo: "AngolaGeo"):
+        """
+        Args:
+            geo: Instância cujos dados são servidos. Os corpos estáticos
+                são pré-calculados aqui.
+        """
+        self.geo = geo
+
+        self._estaticas = {
+            "/provincias": geo.listar_provincias_json,
+            "/metadados": geo.obter_metadados_json,
+        }
+        # Serializar já todos os corpos estáticos, em vez de no primeiro pedido
+        for rota in self._estaticas.values():
+            rota()
+        geo.listar_municipios_json()
+        for nome in geo.obter_nomes_provincias():
+            geo.obter_provincia_json(nome)
+            geo.listar_municipios_json(nome)
+
+    @property
+    def etag(self) -> bytes:
+        """ETag dos dados ativos; muda quando os dados são recarregados."""
+        return f'"{self.geo.versao_dados or "0"}"'.encode("ascii")
+
+    def responder(self, alvo: str) -> Resposta:
+        """
+        Responde a um pedido GET.
+
+        Args:
+            alvo: Caminho do pedido, com a query string (ex.: ``/pesquisar?q=bengo``).
+
+        Returns:
+            ``(estado, corpo)``.
+        """
+        partes = urlsplit(alvo)
+        caminho = partes.path.rstrip("/") or "/"
+        parametros = parse_qs(partes.query)
+        segmentos = [unquote(s) for s in caminho.strip("/").split("/")]
+
+        try:
+            if caminho in self._estaticas:
+                return 200, self._estaticas[caminho]()
+
+            if segmentos[0] == "provincias" and len(segmentos) == 2:
+                return 200, self.geo.obter_provincia_json(segmentos[1])
+
+            if segmentos[0] == "provincias" and segmentos[2:] == ["municipios"]:
+                return 200, self.geo.listar_municipios_json(segmentos[1])
+
+            if caminho == "/municipios":
+                provincia = parametros.get("provincia", [""])[0]
+                return 200, self.geo.listar_municipios_json(provincia or None)
+        except ProvinciaInexistente as e:
+            return 404, serializar_json({"erro": str(e), "sugestoes": e.sugestoes})
+
+        if caminho == "/pesquisar":
+            termo = parametros.get("q", [""])[0]
+            if not termo:
+                return self._erro(400, "Parâmetro 'q' em falta")
+            return 200, serializar_json(self.geo.pesquisar(termo))
+
+        return self._erro(404, "Rota não encontrada")
+
+    @staticmethod
+    def _erro(estado: int, mensagem: str) -> Resposta:
+        return estado, serializar_json({"erro": mensagem})
+
+
+def _cabecalhos(
+    estado: int,
+    tamanho: int,
+    etag: Optional[bytes],
+    manter: bool
+) -> bytes:
+    """Linha de estado e cabeçalhos de uma resposta."""
+    linhas = [
+        b"HTTP/1.1 %d %s" % (estado, _RAZOES[estado].encode("ascii")),
+        b"Content-Type: application/json; charset=utf-8",
+        b"Content-Length: %d" % tamanho,
+        b"Connection: keep-alive" if manter else b"Connection: close",
+    ]
+    if etag is not None:
+        linhas.append(b"ETag: " + etag)
+    return b"\r\n".join(linhas) + b"\r\n\r\n"
+
+
+async def tratar_ligacao(
+    servico: ServicoConsultas,
+    leitor: asyncio.StreamReader,
+    escritor: asyncio.StreamWriter
+) -> None:
+    """Atende os pedidos de uma ligação até esta fechar ou ficar inativa."""
+    try:
+        while True:
+            try:
+                cabecalho = await asyncio.wait_for(
+                    leitor.readuntil(b"\r\n\r\n"), TEMPO_INATIVIDADE
+                )
+            except asyncio.LimitOverrunError:
+                escritor.write(_cabecalhos(431, 0, None, False))
+                break
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+
+            linhas = cabecalho.decode("latin-1").split("\r\n")
+            try:
+                metodo, alvo, versao = linhas[0].split(" ")
+            except ValueError:
+                escritor.write(_cabecalhos(400, 0, None, False))
+                break
+
+            cabecalhos = {}
+            for linha in linhas[1:]:
+                nome, _, valor = linha.partition(":")
+                if nome:
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+            ligacao = cabecalhos.get("connection", "").lower()
+            if versao == "HTTP/1.0":
+                manter = ligacao == "keep-alive"
+            else:
+                manter = ligacao != "close"
+
+            # Pedidos GET/HEAD não têm corpo, mas descartamo-lo se vier (e
+            # não exceder MAX_CORPO)
+            try:
+                tamanho_corpo = int(cabecalhos.get("content-length") or 0)
+            except ValueError:
+                tamanho_corpo = -1
+            if tamanho_corpo < 0:
+                escritor.write(_cabecalhos(400, 0, None, False))
+                break
+            if tamanho_corpo > MAX_CORPO:
+                escritor.write(_cabecalhos(413, 0, None, False))
+                break
+            if tamanho_corpo > 0:
+                try:
+                    await asyncio.wait_for(
+                        leitor.readexactly(tamanho_corpo), TEMPO_INATIVIDADE
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            if metodo not in ("GET", "HEAD"):
+                estado, corpo = ServicoConsultas._erro(405, "Método não permitido")
+                etag = None
+            else:
+                estado, corpo = servico.responder(alvo)
+                etag = servico.etag if estado == 200 else None
+                if etag is not None and cabecalhos.get("if-none-match") == etag.decode("ascii"):
+                    estado, corpo = 304, b""
+
+            escritor.write(_cabecalhos(estado, len(corpo), etag, manter))
+            if metodo != "HEAD" and corpo:
+                escritor.write(corpo)
+            await escritor.drain()
+            if not manter:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def iniciar_servidor(
+    geo: "AngolaGeo",
+    host: str = HOST_PADRAO,
+    porta: int = PORTA_PADRAO
+) -> asyncio.AbstractServer:
+    """
+    Inicia o servidor no ciclo de eventos atual.
+
+    Use a porta 0 para escolher uma porta livre (ver ``sockets`` do
+    servidor devolvido).
+    """
+    servico = ServicoConsultas(geo)
+    return await asyncio.start_server(
+        lambda leitor, escritor: tratar_ligacao(servico, leitor, escritor),
+        host,
+        porta,
+        limit=MAX_CABECALHOS
+    )
+
+
+def servir(geo: "AngolaGeo", host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> None:
+    """Corre o servidor até o processo ser interrompido."""
+    async def principal():
+        servidor = await iniciar_servidor(geo, host, porta)
+        endereco = servidor.sockets[0].getsockname()
+        print(f"🌍 A servir em http://{endereco[0]}:{endereco[1]} (Ctrl+C para terminar)")
+        async with servidor:
+            await servidor.serve_forever()
+
+    asyncio.run(principal())
@@ -0,0 +1,165 @@
+"""
+Vistas só de leitura dos registos, no formato devolvido pela API pública.
+
+As vistas são construídas uma vez por conjunto de dados e reutilizadas em
+todas as chamadas, pelo que listar províncias ou municípios repetidamente
+não aloca novos dicionários. São dicionários imutáveis (continuam a ser
+``dict``, por isso ``json.dumps`` e ``isinstance(x, dict)`` funcionam) com
+tuplos no lugar de listas; :func:`copiar` devolve uma cópia mutável e
+:func:`congelar` faz o inverso (usado nos metadados).
+
+:func:`serializar_json` define o JSON devolvido pelas variantes ``*_json``
+da API, que guardam os bytes em cache no conjunto de dados.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from .modelos import Comuna, Municipio, Provincia, Registo
+
+
+class DicionarioImutavel(dict):
+    """Dicionário que rejeita qualquer alteração após a construção."""
+    
+    __slots__ = ()
+    
+    def _recusar(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(
+            "Resultado só de leitura; use copiar=True para obter uma cópia mutável"
+        )
+    
+    __setitem__ = _recusar
+    __delitem__ = _recusar
+    __ior__ = _recusar
+    clear = _recusar
+    pop = _recusar
+    popitem = _recusar
+    setdefault = _recusar
+    update = _recusar
+    
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def copiar(valor: Any) -> Any:
+    """
+    Converte uma vista (e todas as vistas aninhadas) em dicionários e
+    listas mutáveis.
+    """
+    if isinstance(valor, dict):
+        return {chave: copiar(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [copiar(v) for v in valor]
+    return valor
+
+
+def congelar(valor: Any) -> Any:
+    """
+    Converte dicionários e listas (também aninhados) em vistas só de
+    leitura e tuplos; operação inversa de :func:`copiar`.
+    """
+    if isinstance(valor, dict):
+        return DicionarioImutavel({chave: congelar(v) for chave, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+def serializar_json(valor: Any) -> bytes:
+    """Serializa uma vista em JSON UTF-8 compacto, sem escapar acentos."""
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def vista_municipio(municipio: Municipio) -> DicionarioImutavel:
+    """Vista de um município, como em ``listar_municipios``."""
+    return DicionarioImutavel(
+        nome=municipio.nome,
+        provincia=municipio.provincia.nome,
+        comunas=tuple(DicionarioImutavel(name=c.nome) for c in municipio.comunas)
+    )
+
+
+def vista_provincia(
+    provincia: Provincia,
+    municipios: Tuple[DicionarioImutavel, ...]
+) -> DicionarioImutavel:
+    """Vista de uma província, reutilizando as vistas dos seus municípios."""
+    dados: Dict[str, Any] = {
+        "id": provincia.id,
+        "nome": provincia.nome,
+        "capital": provincia.capital,
+        "total_municipios": provincia.total_municipios,
+        "municipios": municipios
+    }
+    if provincia.observacoes is not None:
+        dados["observacoes"] = provincia.observacoes
+    return DicionarioImutavel(dados)
+
+
+def vista_resumo_provincia(
+    id: int,
+    nome: str,
+    capital: str,
+    total_municipios: int,
+    observacoes: Optional[str] = None
+) -> DicionarioImutavel:
+    """
+    Vista de uma província sem os municípios, como em
+    ``listar_provincias(resumo=True)``.
+    """
+    dados: Dict[str, Any] = {
+        "id": id,
+        "nome": nome,
+        "capital": capital,
+        "total_municipios": total_municipios
+    }
+    if observacoes is not None:
+        dados["observacoes"] = observacoes
+    return DicionarioImutavel(dados)
+
+
+def vista_resultado_municipio(municipio: Municipio) -> DicionarioImutavel:
+    """Vista de um município nos resultados de ``pesquisar``."""
+    return DicionarioImutavel(
+        nome=municipio.nome,
+        provincia=municipio.provincia.nome,
+        capital_provincia=municipio.provincia.capital
+    )
+
+
+def vista_resultado_comuna(comuna: Comuna) -> DicionarioImutavel:
+    """Vista de uma comuna nos resultados de ``pesquisar``."""
+    return DicionarioImutavel(
+        nome=comuna.nome,
+        municipio=comuna.municipio.nome,
+        provincia=comuna.provincia.nome
+    )
+
+
+def vista_divisao(
+    registo: Registo,
+    codigo: str,
+    ancestrais: Tuple[DicionarioImutavel, ...]
+) -> DicionarioImutavel:
+    """
+    Vista de uma divisão com a cadeia de ascendentes, como em
+    ``obter_municipio`` e ``obter_comuna``.
+    
+    Args:
+        registo: Município ou comuna.
+        codigo: Código hierárquico do registo.
+        ancestrais: Vistas curtas (ver :func:`vista_ascendente`) dos
+            ascendentes, da província ao pai.
+    """
+    dados: Dict[str, Any] = {"codigo": codigo, "nivel": registo.nivel, "nome": registo.nome}
+    for ascendente in ancestrais:
+        dados[ascendente["nivel"]] = ascendente["nome"]
+    if isinstance(registo, Municipio):
+        dados["comunas"] = tuple(DicionarioImutavel(name=c.nome) for c in registo.comunas)
+    dados["ancestrais"] = ancestrais
+    return DicionarioImutavel(dados)
+
+
+def vista_ascendente(registo: Registo, codigo: str) -> DicionarioImutavel:
+    """Vista curta de um ascendente na cadeia de :func:`vista_divisao`."""
+    return DicionarioImutavel(codigo=codigo, nivel=registo.nivel, nome=registo.nome)
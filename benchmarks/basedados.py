@@ -0,0 +1,139 @@
+"""
+Benchmark do backend SQLite contra o backend em memória.
+
+Exporta o conjunto distribuído e um conjunto sintético ampliado para
+SQLite (ver :mod:`angola_geo.basedados`) e mede, nos dois backends, o
+arranque (criar a instância e responder à primeira consulta), a memória
+alocada nesse arranque e o tempo por chamada das consultas mais comuns.
+O backend em memória responde a partir de vistas já construídas; o
+SQLite paga uma consulta por chamada, mas arranca sem ler nem indexar os
+dados.
+
+Uso:
+    python benchmarks/basedados.py [--fator N] [--json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo import AngolaGeo  # noqa: E402
+from angola_geo.basedados import exportar_sqlite  # noqa: E402
+from angola_geo.dados import carregar_conjunto  # noqa: E402
+from angola_geo.desempenho import gerar_dados_sinteticos, medir  # noqa: E402
+from angola_geo.resumo import CAMINHO_DADOS  # noqa: E402
+
+
+def consultas(geo, provincia, municipio):
+    """Consultas medidas em cada backend."""
+    return [
+        ("obter_provincia", lambda: geo.obter_provincia(provincia)),
+        ("listar_municipios", lambda: geo.listar_municipios(provincia)),
+        ("obter_municipio", lambda: geo.obter_municipio(municipio, provincia=provincia)),
+        ("obter_por_codigo", lambda: geo.obter_por_codigo("1.1")),
+        ("codigo_de", lambda: geo.codigo_de(municipio, provincia=provincia)),
+        ("pesquisar", lambda: geo.pesquisar("cacuaco")),
+        ("pesquisar_curto", lambda: geo.pesquisar("an")),
+        ("pesquisar_iter_primeiro", lambda: next(geo.pesquisar_iter("an"))),
+        ("iterar_municipios_pagina", lambda: list(geo.iterar_municipios(offset=20, limite=10))),
+    ]
+
+
+def arranque(criar, provincia):
+    """
+    Tempo (ms) e pico de memória alocada (KiB) até à primeira
+    ``obter_provincia``; a memória é medida numa segunda execução, porque
+    o tracemalloc abranda as alocações.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    geo = criar()
+    geo.obter_provincia(provincia)
+    duracao = time.perf_counter() - inicio
+
+    gc.collect()
+    tracemalloc.start()
+    criar().obter_provincia(provincia)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return geo, duracao * 1000, pico / 1024
+
+
+def comparar(nome, caminho_json, pasta):
+    """Mede os dois backends sobre um ficheiro de divisões."""
+    caminho_db = exportar_sqlite(
+        os.path.join(pasta, f"{nome}.db"), carregar_conjunto(caminho_json)
+    )
+    memoria, ms_memoria, kib_memoria = arranque(
+        lambda: AngolaGeo(caminho=caminho_json), "Luanda"
+    )
+    sqlite, ms_sqlite, kib_sqlite = arranque(
+        lambda: AngolaGeo(backend="sqlite", caminho=caminho_db), "Luanda"
+    )
+    municipio = memoria.listar_municipios("Luanda")[1]["nome"]
+
+    linhas = [{
+        "consulta": "arranque",
+        "memoria_us": ms_memoria * 1000,
+        "sqlite_us": ms_sqlite * 1000,
+    }]
+    for (consulta, em_memoria), (_, em_sqlite) in zip(
+        consultas(memoria, "Luanda", municipio), consultas(sqlite, "Luanda", municipio)
+    ):
+        linhas.append({
+            "consulta": consulta,
+            "memoria_us": medir(em_memoria)["min_us"],
+            "sqlite_us": medir(em_sqlite)["min_us"],
+        })
+    return {
+        "conjunto": nome,
+        "tamanho_sqlite_kib": os.path.getsize(caminho_db) / 1024,
+        "arranque_kib": {"memoria": kib_memoria, "sqlite": kib_sqlite},
+        "resultados": linhas,
+    }
+
+
+def imprimir(relatorio):
+    print(f"\n{relatorio['conjunto']}: ficheiro SQLite "
+          f"{relatorio['tamanho_sqlite_kib']:.0f} KiB; memória alocada no arranque "
+          f"{relatorio['arranque_kib']['memoria']:.0f} KiB (memória) vs "
+          f"{relatorio['arranque_kib']['sqlite']:.0f} KiB (SQLite)")
+    print(f"  {'Consulta':<26} {'Memória µs':>12} {'SQLite µs':>12} {'Razão':>8}")
+    for linha in relatorio["resultados"]:
+        razao = linha["sqlite_us"] / linha["memoria_us"]
+        print(f"  {linha['consulta']:<26} {linha['memoria_us']:>12.1f} "
+              f"{linha['sqlite_us']:>12.1f} {razao:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fator", type=int, default=10,
+                        help="Multiplicador de municípios do conjunto sintético")
+    parser.add_argument("--json", action="store_true", help="Resultados em JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        sintetico = os.path.join(pasta, "sintetico.json")
+        with open(sintetico, "w", encoding="utf-8") as f:
+            json.dump(gerar_dados_sinteticos(args.fator), f, ensure_ascii=False)
+        relatorios = [
+            comparar("distribuido", CAMINHO_DADOS, pasta),
+            comparar(f"sintetico_x{args.fator}", sintetico, pasta),
+        ]
+
+    if args.json:
+        print(json.dumps(relatorios, ensure_ascii=False, indent=2))
+        return
+    for relatorio in relatorios:
+        imprimir(relatorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Teste de carga local do serviço HTTP (``angola-geo servir``).
+
+Abre várias ligações keep-alive em simultâneo, envia pedidos em sequência
+em cada uma e reporta pedidos por segundo e as latências p50/p99. Sem
+``--url`` inicia o servidor no próprio processo, numa porta livre.
+
+Uso:
+    python benchmarks/carga_http.py [--url http://127.0.0.1:8080]
+        [--ligacoes N] [--pedidos N] [--caminho /provincias]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo import AngolaGeo  # noqa: E402
+from angola_geo.servidor import iniciar_servidor  # noqa: E402
+
+CAMINHOS_PADRAO = [
+    "/provincias",
+    "/provincias/Luanda",
+    "/municipios?provincia=Bengo",
+    "/pesquisar?q=bengo",
+    "/metadados",
+]
+
+
+async def cliente(host, porta, caminhos, pedidos, latencias):
+    """Uma ligação keep-alive que envia ``pedidos`` pedidos em sequência."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    try:
+        for i in range(pedidos):
+            caminho = caminhos[i % len(caminhos)]
+            inicio = time.perf_counter()
+            escritor.write(f"GET {caminho} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("ascii"))
+            cabecalho = await leitor.readuntil(b"\r\n\r\n")
+            tamanho = 0
+            for linha in cabecalho.split(b"\r\n"):
+                if linha.lower().startswith(b"content-length:"):
+                    tamanho = int(linha.split(b":", 1)[1])
+            await leitor.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        escritor.close()
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) de uma lista ordenada."""
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+async def executar(args):
+    servidor = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, porta = partes.hostname, partes.port or 80
+    else:
+        servidor = await iniciar_servidor(AngolaGeo(), "127.0.0.1", 0)
+        host, porta = servidor.sockets[0].getsockname()[:2]
+
+    caminhos = args.caminho or CAMINHOS_PADRAO
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        cliente(host, porta, caminhos, args.pedidos, latencias)
+        for _ in range(args.ligacoes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    if servidor is not None:
+        servidor.close()
+        await servidor.wait_closed()
+
+    latencias.sort()
+    print(f"Pedidos:      {len(latencias)} ({args.ligacoes} ligações keep-alive)")
+    print(f"Pedidos/s:    {len(latencias) / duracao:10.0f}")
+    print(f"Latência p50: {percentil(latencias, 50) * 1000:10.3f} ms")
+    print(f"Latência p99: {percentil(latencias, 99) * 1000:10.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Servidor já em execução (padrão: iniciar um local)")
+    parser.add_argument("--ligacoes", type=int, default=50)
+    parser.add_argument("--pedidos", type=int, default=200,
+                        help="Pedidos por ligação")
+    parser.add_argument("--caminho", action="append",
+                        help="Caminho a pedir (repetível; padrão: uma mistura de rotas)")
+    asyncio.run(executar(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
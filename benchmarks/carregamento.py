@@ -0,0 +1,79 @@
+"""
+Benchmark do carregamento dos dados: JSON vs instantâneo binário.
+
+Mede, para o conjunto distribuído e para um conjunto sintético ampliado
+(todas as províncias preenchidas com municípios e comunas fictícios), o
+tempo de obter os registos (e, no binário, o índice de trigramas) e o
+tempo total de ``carregar_conjunto``, que inclui os restantes índices.
+
+Uso:
+    python benchmarks/carregamento.py [--fator N] [--repeticoes N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo import binario, dados  # noqa: E402
+from angola_geo.desempenho import gerar_dados_sinteticos  # noqa: E402
+from angola_geo.modelos import Provincia  # noqa: E402
+
+
+def medir(nome: str, conteudo_json: bytes, repeticoes: int) -> None:
+    """Mede e imprime os tempos de carregamento de um conteúdo JSON."""
+    hash_origem = binario.hash_conteudo(conteudo_json)
+    compilado = binario.compilar_dados(
+        dados.ConjuntoDados.de_json(json.loads(conteudo_json)), hash_origem
+    )
+    
+    def via_json():
+        return [Provincia.de_json(p) for p in json.loads(conteudo_json)["provinces"]]
+    
+    def via_binario():
+        return binario.ler_dados(compilado, binario.hash_conteudo(conteudo_json))
+    
+    t_json = min(timeit.repeat(via_json, number=repeticoes, repeat=3)) / repeticoes
+    t_bin = min(timeit.repeat(via_binario, number=repeticoes, repeat=3)) / repeticoes
+    
+    print(f"\n{nome}: JSON {len(conteudo_json) / 1024:.1f} KiB, "
+          f"binário {len(compilado) / 1024:.1f} KiB")
+    print(f"  registos a partir do JSON       {t_json * 1000:9.3f} ms")
+    print(f"  registos a partir do binário    {t_bin * 1000:9.3f} ms  ({t_json / t_bin:.1f}x)")
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "divisions.json")
+        with open(caminho, "wb") as f:
+            f.write(conteudo_json)
+        t_total_json = min(timeit.repeat(
+            lambda: dados.carregar_conjunto(caminho), number=repeticoes, repeat=3
+        )) / repeticoes
+        binario.compilar(caminho)
+        t_total_bin = min(timeit.repeat(
+            lambda: dados.carregar_conjunto(caminho), number=repeticoes, repeat=3
+        )) / repeticoes
+    print(f"  carregar_conjunto (JSON)        {t_total_json * 1000:9.3f} ms")
+    print(f"  carregar_conjunto (binário)     {t_total_bin * 1000:9.3f} ms  "
+          f"({t_total_json / t_total_bin:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fator", type=int, default=20,
+                        help="Multiplicador de municípios do conjunto sintético")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    
+    with open(dados.CAMINHO_DADOS, "rb") as f:
+        medir("Conjunto distribuído", f.read(), args.repeticoes)
+    
+    sintetico = json.dumps(gerar_dados_sinteticos(args.fator), ensure_ascii=False).encode("utf-8")
+    medir(f"Conjunto sintético (fator {args.fator})", sintetico, max(1, args.repeticoes // 10))
+
+
+if __name__ == "__main__":
+    main()
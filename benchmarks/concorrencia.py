@@ -0,0 +1,172 @@
+"""
+Benchmark de leituras concorrentes numa instância partilhada de AngolaGeo.
+
+Várias threads executam uma mistura de consultas (província, municípios,
+pesquisa exata e aproximada, autocompletar, normalização e códigos) sobre a
+mesma instância durante um intervalo fixo; reporta operações por segundo
+e a escala em relação a uma thread. Como as leituras não tomam travas, num
+CPython com GIL a escala fica perto de 1x e num CPython sem GIL
+(free-threaded, ``python3.13t``) deve crescer com o número de núcleos.
+
+Por omissão corre no interpretador atual e repete a medição em cada
+interpretador free-threaded encontrado no PATH; ``--interpretador`` indica
+outros explicitamente.
+
+Uso:
+    python benchmarks/concorrencia.py [--threads 1,2,4,8] [--duracao S]
+        [--interpretador python3.13t] [--json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo import AngolaGeo  # noqa: E402
+
+# Interpretadores free-threaded procurados no PATH
+INTERPRETADORES_SEM_GIL = ["python3.13t", "python3.14t", "python3.15t"]
+
+
+def gil_ativo():
+    """``True`` se o interpretador atual estiver a usar o GIL."""
+    verificar = getattr(sys, "_is_gil_enabled", None)
+    return verificar() if verificar is not None else True
+
+
+def descricao_interpretador():
+    """Versão do interpretador e estado do GIL."""
+    compilado_sem_gil = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    estado = "sem GIL" if not gil_ativo() else (
+        "free-threaded, GIL reativado" if compilado_sem_gil else "com GIL"
+    )
+    return f"Python {sys.version.split()[0]} ({estado})"
+
+
+def consultas(geo):
+    """Mistura de leituras executada em cada volta de cada thread."""
+    return [
+        lambda: geo.obter_provincia("Luanda"),
+        lambda: geo.listar_municipios("Bengo"),
+        lambda: geo.pesquisar("Cacuaco"),
+        lambda: geo.pesquisar_aproximado("Benguella"),
+        lambda: geo.autocompletar("ca"),
+        lambda: next(geo.normalizar_lote(["uige"])),
+        lambda: geo.obter_por_codigo("13.002"),
+        lambda: geo.obter_metadados(),
+    ]
+
+
+def medir(geo, threads, duracao):
+    """Operações por segundo com ``threads`` threads a ler durante ``duracao`` s."""
+    funcoes = consultas(geo)
+    for funcao in funcoes:
+        # Aquecer as estruturas preguiçosas antes de medir
+        funcao()
+
+    contagens = [0] * threads
+    barreira = threading.Barrier(threads + 1)
+    parar = threading.Event()
+
+    def trabalhar(posicao):
+        barreira.wait()
+        voltas = 0
+        while not parar.is_set():
+            for funcao in funcoes:
+                funcao()
+            voltas += 1
+        contagens[posicao] = voltas * len(funcoes)
+
+    trabalhadores = [
+        threading.Thread(target=trabalhar, args=(i,)) for i in range(threads)
+    ]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    time.sleep(duracao)
+    parar.set()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    return sum(contagens) / (time.perf_counter() - inicio)
+
+
+def executar(contagens_threads, duracao):
+    """Mede cada número de threads no interpretador atual."""
+    geo = AngolaGeo()
+    return {
+        "interpretador": descricao_interpretador(),
+        "resultados": [
+            {"threads": n, "operacoes_s": medir(geo, n, duracao)}
+            for n in contagens_threads
+        ],
+    }
+
+
+def executar_noutro(interpretador, args):
+    """Corre este script noutro interpretador e devolve os resultados (ou ``None``)."""
+    comando = [
+        interpretador, os.path.abspath(__file__), "--json", "--sem-outros",
+        "--threads", args.threads, "--duracao", str(args.duracao),
+    ]
+    try:
+        processo = subprocess.run(comando, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as erro:
+        print(f"{interpretador}: não foi possível executar ({erro})", file=sys.stderr)
+        return None
+    return json.loads(processo.stdout)
+
+
+def imprimir(relatorio):
+    print(relatorio["interpretador"])
+    base = relatorio["resultados"][0]["operacoes_s"]
+    print(f"  {'Threads':>7} {'Operações/s':>14} {'Escala':>8}")
+    for linha in relatorio["resultados"]:
+        escala = linha["operacoes_s"] / base
+        print(f"  {linha['threads']:>7} {linha['operacoes_s']:>14.0f} {escala:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", default="1,2,4,8",
+                        help="Números de threads a medir, separados por vírgulas")
+    parser.add_argument("--duracao", type=float, default=1.0,
+                        help="Segundos de medição por número de threads")
+    parser.add_argument("--interpretador", action="append", default=[],
+                        help="Outro interpretador a medir (repetível)")
+    parser.add_argument("--sem-outros", action="store_true",
+                        help="Medir só o interpretador atual")
+    parser.add_argument("--json", action="store_true", help="Resultados em JSON")
+    args = parser.parse_args()
+
+    contagens_threads = [int(n) for n in args.threads.split(",")]
+    relatorios = [executar(contagens_threads, args.duracao)]
+
+    if not args.sem_outros:
+        outros = args.interpretador or [
+            nome for nome in INTERPRETADORES_SEM_GIL if shutil.which(nome)
+        ]
+        for interpretador in outros:
+            relatorio = executar_noutro(interpretador, args)
+            if relatorio is not None:
+                relatorios.extend(relatorio)
+
+    if args.json:
+        print(json.dumps(relatorios, ensure_ascii=False, indent=2))
+        return
+    for relatorio in relatorios:
+        imprimir(relatorio)
+    if len(relatorios) == 1 and gil_ativo():
+        print("Nenhum interpretador free-threaded encontrado "
+              "(indique um com --interpretador python3.13t)")
+
+
+if __name__ == "__main__":
+    main()
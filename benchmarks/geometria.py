@@ -0,0 +1,157 @@
+"""
+Benchmark da geocodificação inversa (angola_geo.geometria).
+
+Gera limites sintéticos sobre a caixa envolvente de Angola (províncias em
+mosaico, cada uma dividida em municípios, com arestas irregulares e
+muitos vértices), e mede a construção da grelha, ``localizar`` ponto a
+ponto, ``localizar_lote`` e, como referência, o teste exato contra todos
+os polígonos (comparando primeiro a caixa de cada um).
+
+Uso:
+    python benchmarks/geometria.py [--vertices N] [--celulas N] [--pontos N] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo.codigos import codificar, formatar  # noqa: E402
+from angola_geo.geometria import ESCALA, Limites, Localizador  # noqa: E402
+
+# Caixa envolvente aproximada de Angola: oeste, sul, este, norte
+CAIXA = (11.6, -18.1, 24.1, -4.4)
+PROVINCIAS = (7, 3)
+MUNICIPIOS = (4, 2)
+
+
+def anel_irregular(oeste, sul, este, norte, vertices, aleatorio):
+    """Retângulo com ``vertices`` vértices deslocados para dentro ao acaso."""
+    por_lado = max(vertices // 4, 1)
+    margem = min(este - oeste, norte - sul) * 0.02
+    anel = []
+    for lado in range(4):
+        for i in range(por_lado):
+            t = i / por_lado
+            desvio = aleatorio.uniform(0, margem)
+            anel.append([
+                (oeste + (este - oeste) * t, sul + desvio),
+                (este - desvio, sul + (norte - sul) * t),
+                (este - (este - oeste) * t, norte - desvio),
+                (oeste + desvio, norte - (norte - sul) * t),
+            ][lado])
+    return anel + [anel[0]]
+
+
+def limites_sinteticos(vertices, aleatorio):
+    oeste, sul, este, norte = CAIXA
+    largura = (este - oeste) / PROVINCIAS[0]
+    altura = (norte - sul) / PROVINCIAS[1]
+    elementos = []
+    provincia = 0
+    for linha in range(PROVINCIAS[1]):
+        for coluna in range(PROVINCIAS[0]):
+            provincia += 1
+            p_oeste, p_sul = oeste + coluna * largura, sul + linha * altura
+            elementos.append(_elemento(codificar(provincia), anel_irregular(
+                p_oeste, p_sul, p_oeste + largura, p_sul + altura, vertices * 4, aleatorio
+            )))
+            m_largura, m_altura = largura / MUNICIPIOS[0], altura / MUNICIPIOS[1]
+            municipio = 0
+            for m_linha in range(MUNICIPIOS[1]):
+                for m_coluna in range(MUNICIPIOS[0]):
+                    municipio += 1
+                    m_oeste = p_oeste + m_coluna * m_largura
+                    m_sul = p_sul + m_linha * m_altura
+                    elementos.append(_elemento(codificar(provincia, municipio), anel_irregular(
+                        m_oeste, m_sul, m_oeste + m_largura, m_sul + m_altura,
+                        vertices, aleatorio
+                    )))
+    return Limites.de_geojson({"type": "FeatureCollection", "features": elementos})
+
+
+def _elemento(codigo, anel):
+    return {
+        "type": "Feature",
+        "properties": {"codigo": formatar(codigo)},
+        "geometry": {"type": "Polygon", "coordinates": [anel]},
+    }
+
+
+def por_ponto_us(funcao, pontos):
+    inicio = time.perf_counter()
+    for latitude, longitude in pontos:
+        funcao(latitude, longitude)
+    return (time.perf_counter() - inicio) / len(pontos) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vertices", type=int, default=400,
+                        help="Vértices por município (as províncias têm 4 vezes mais)")
+    parser.add_argument("--celulas", type=int, default=256, help="Células da grelha por eixo")
+    parser.add_argument("--pontos", type=int, default=20000, help="Pontos consultados")
+    parser.add_argument("--json", action="store_true", help="Resultados em JSON")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(14)
+    limites = limites_sinteticos(args.vertices, aleatorio)
+    oeste, sul, este, norte = CAIXA
+    pontos = [
+        (aleatorio.uniform(sul, norte), aleatorio.uniform(oeste, este))
+        for _ in range(args.pontos)
+    ]
+
+    inicio = time.perf_counter()
+    localizador = Localizador(limites, celulas_por_eixo=args.celulas)
+    construcao_ms = (time.perf_counter() - inicio) * 1000
+    interiores = sum(
+        1 for celula in localizador._grelha if celula and celula[0][1] is None
+    ) / len(localizador._grelha)
+
+    def exaustivo(latitude, longitude):
+        x, y = longitude * ESCALA, latitude * ESCALA
+        caixas = localizador._caixas
+        for poligono in range(len(limites)):
+            i = poligono * 4
+            if (caixas[i] <= x <= caixas[i + 2] and caixas[i + 1] <= y <= caixas[i + 3]
+                    and localizador._contem(poligono, x, y)):
+                return limites.codigos[poligono]
+        return None
+
+    amostra = pontos[:max(len(pontos) // 20, 1)]
+    inicio = time.perf_counter()
+    encontrados = sum(1 for r in localizador.localizar_lote(pontos) if r is not None)
+    lote_us = (time.perf_counter() - inicio) / len(pontos) * 1e6
+    resultado = {
+        "poligonos": len(limites),
+        "vertices": len(limites.coordenadas) // 2,
+        "tamanho_kib": len(limites.serializar()) / 1024,
+        "celulas_por_eixo": args.celulas,
+        "celulas_interiores": interiores,
+        "construcao_ms": construcao_ms,
+        "localizar_us": por_ponto_us(localizador.localizar, pontos),
+        "localizar_lote_us": lote_us,
+        "exaustivo_us": por_ponto_us(exaustivo, amostra),
+        "encontrados": encontrados / len(pontos),
+    }
+
+    if args.json:
+        print(json.dumps(resultado, indent=2))
+        return
+    print(f"{resultado['poligonos']} polígonos, {resultado['vertices']} vértices, "
+          f"{resultado['tamanho_kib']:.0f} KiB empacotados")
+    print(f"Grelha {args.celulas}×{args.celulas}: construída em "
+          f"{construcao_ms:.0f} ms, {interiores:.0%} das células interiores")
+    print(f"  localizar          {resultado['localizar_us']:>8.1f} µs/ponto")
+    print(f"  localizar_lote     {resultado['localizar_lote_us']:>8.1f} µs/ponto")
+    print(f"  todos os polígonos {resultado['exaustivo_us']:>8.1f} µs/ponto")
+    print(f"  ({resultado['encontrados']:.0%} dos pontos dentro de algum limite)")
+
+
+if __name__ == "__main__":
+    main()
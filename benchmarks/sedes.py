@@ -0,0 +1,111 @@
+"""
+Benchmark das consultas de proximidade (angola_geo.sedes).
+
+Gera conjuntos sintéticos de sedes, de tamanho crescente, sobre a caixa
+envolvente de Angola e mede, em cada um, a construção da árvore k-d,
+``mais_proximos`` (k=5) e ``dentro_de`` (raio de 25 km) ponto a ponto e,
+como referência, a procura exaustiva pela fórmula de haversine. Com a
+árvore o tempo por consulta cresce muito mais devagar do que o número de
+sedes; a procura exaustiva cresce em proporção.
+
+Uso:
+    python benchmarks/sedes.py [--sedes N ...] [--pontos N] [--json]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from heapq import nsmallest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from angola_geo.sedes import (  # noqa: E402
+    RAIO_TERRA_KM,
+    ArvoreKD,
+    km_para_corda,
+    vetor_unitario,
+)
+
+# Caixa envolvente aproximada de Angola: oeste, sul, este, norte
+CAIXA = (11.6, -18.1, 24.1, -4.4)
+K = 5
+RAIO_KM = 25.0
+
+
+def coordenadas_aleatorias(quantidade, aleatorio):
+    oeste, sul, este, norte = CAIXA
+    return [
+        (aleatorio.uniform(sul, norte), aleatorio.uniform(oeste, este))
+        for _ in range(quantidade)
+    ]
+
+
+def haversine(latitude1, longitude1, latitude2, longitude2):
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2)
+         * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+
+def por_ponto_us(funcao, pontos):
+    inicio = time.perf_counter()
+    for ponto in pontos:
+        funcao(ponto)
+    return (time.perf_counter() - inicio) / len(pontos) * 1e6
+
+
+def medir_conjunto(quantidade, consultas, aleatorio):
+    """Mede a árvore e a procura exaustiva sobre ``quantidade`` sedes."""
+    sedes = coordenadas_aleatorias(quantidade, aleatorio)
+    inicio = time.perf_counter()
+    arvore = ArvoreKD([vetor_unitario(*s) for s in sedes], range(quantidade))
+    construcao_ms = (time.perf_counter() - inicio) * 1000
+
+    vetores = [vetor_unitario(*c) for c in consultas]
+    raio = km_para_corda(RAIO_KM)
+
+    def exaustivo(consulta):
+        latitude, longitude = consulta
+        return nsmallest(K, (
+            (haversine(latitude, longitude, *sede), i) for i, sede in enumerate(sedes)
+        ))
+
+    amostra = consultas[:max(len(consultas) // 20, 1)]
+    return {
+        "sedes": quantidade,
+        "construcao_ms": construcao_ms,
+        "mais_proximos_us": por_ponto_us(lambda v: arvore.mais_proximos(v, K), vetores),
+        "dentro_de_us": por_ponto_us(lambda v: arvore.dentro_de(v, raio), vetores),
+        "exaustivo_us": por_ponto_us(exaustivo, amostra),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sedes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Tamanhos dos conjuntos sintéticos de sedes")
+    parser.add_argument("--pontos", type=int, default=2000, help="Pontos consultados")
+    parser.add_argument("--json", action="store_true", help="Resultados em JSON")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(25)
+    consultas = coordenadas_aleatorias(args.pontos, aleatorio)
+    resultados = [medir_conjunto(n, consultas, aleatorio) for n in args.sedes]
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+    print(f"k={K}, raio={RAIO_KM:g} km, {args.pontos} pontos")
+    print(f"  {'Sedes':>8} {'Árvore ms':>10} {'k-NN µs':>9} {'Raio µs':>9} {'Exaustivo µs':>13}")
+    for r in resultados:
+        print(f"  {r['sedes']:>8} {r['construcao_ms']:>10.0f} {r['mais_proximos_us']:>9.1f} "
+              f"{r['dentro_de_us']:>9.1f} {r['exaustivo_us']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,19 @@
 Testes unitários para a biblioteca angola_geo.
 """
 
+import json
+import os
+import shutil
+import tempfile
 import unittest
-from angola_geo import AngolaGeo, ProvinciaInexistente, MunicipioInexistente
+from angola_geo import (
+    AngolaGeo,
+    ComunaInexistente,
+    DivisaoAmbigua,
+    MunicipioInexistente,
+    ProvinciaInexistente,
+)
+from angola_geo.normalizacao import normalizar
 
 
 class TestAngolaGeo(unittest.TestCase):
@@ -38,7 +49,102 @@ class TestAngolaGeo(unittest.TestCase):
             self.assertIn('capital', provincia)
             self.assertIn('total_municipios', provincia)
             self.assertIn('municipios', provincia)
-            self.assertIsInstance(provincia['municipios'], list)
+            self.assertIsInstance(provincia['municipios'], tuple)
+    
+    def test_listar_provincias_vistas_partilhadas(self):
+        """Testar que listagens repetidas reutilizam as mesmas vistas."""
+        self.assertIs(self.geo.listar_provincias(), self.geo.listar_provincias())
+        self.assertIs(self.geo.obter_provincia("Luanda"), self.geo.obter_provincia("luanda"))
+        self.assertIs(
+            self.geo.listar_municipios(provincia="Luanda"),
+            self.geo.obter_provincia("Luanda")['municipios']
+        )
+        self.assertIs(
+            self.geo.pesquisar("Luanda")['provincias'][0],
+            self.geo.obter_provincia("Luanda")
+        )
+    
+    def test_vistas_so_de_leitura(self):
+        """Testar que as vistas partilhadas não podem ser alteradas."""
+        luanda = self.geo.obter_provincia("Luanda")
+        
+        with self.assertRaises(TypeError):
+            luanda['nome'] = "Outra"
+        with self.assertRaises(TypeError):
+            luanda.update(capital="Outra")
+        with self.assertRaises(AttributeError):
+            luanda['municipios'][0]['comunas'].append({'name': "Nova"})
+        self.assertEqual(json.loads(json.dumps(luanda))['capital'], "Ingombota")
+        
+        metadados = self.geo.obter_metadados()
+        self.assertIs(metadados, AngolaGeo().obter_metadados())
+        with self.assertRaises(TypeError):
+            metadados['law'] = "Outra"
+        with self.assertRaises(AttributeError):
+            metadados['sources'].append("Outra")
+        self.assertIsInstance(self.geo.obter_metadados(copiar=True)['sources'], list)
+    
+    def test_copiar(self):
+        """Testar que copiar=True devolve estruturas mutáveis independentes."""
+        copia = self.geo.obter_provincia("Luanda", copiar=True)
+        copia['municipios'].append({'nome': "Novo"})
+        copia['municipios'][0]['comunas'].append({'name': "Nova"})
+        
+        self.assertIsInstance(copia['municipios'], list)
+        self.assertEqual(len(self.geo.obter_provincia("Luanda")['municipios']), 16)
+        self.assertEqual(self.geo.obter_provincia("Luanda")['municipios'][0]['comunas'], ())
+        
+        self.assertIsInstance(self.geo.listar_provincias(copiar=True), list)
+        self.assertIsInstance(self.geo.listar_municipios(copiar=True)[0], dict)
+        resultados = self.geo.pesquisar("Bengo", copiar=True)
+        resultados['provincias'][0]['nome'] = "Outro"
+        self.assertEqual(self.geo.pesquisar("Bengo")['provincias'][0]['nome'], "Bengo")
+    
+    def test_iteradores(self):
+        """Testar que os iteradores produzem o mesmo que as listas, por páginas."""
+        self.assertEqual(list(self.geo.iterar_provincias()), list(self.geo.listar_provincias()))
+        self.assertEqual(
+            list(self.geo.iterar_municipios()), list(self.geo.listar_municipios())
+        )
+        self.assertEqual(
+            list(self.geo.iterar_municipios("luanda", offset=2, limite=3)),
+            list(self.geo.listar_municipios("Luanda")[2:5])
+        )
+        self.assertEqual(list(self.geo.iterar_provincias(offset=20, limite=5)),
+                         [self.geo.obter_provincia("Zaire")])
+        self.assertIs(next(self.geo.iterar_provincias()), self.geo.listar_provincias()[0])
+        
+        copia = next(self.geo.iterar_municipios("Luanda", copiar=True))
+        self.assertIsInstance(copia["comunas"], list)
+        
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.iterar_municipios("Inexistente")
+        with self.assertRaises(ValueError):
+            self.geo.iterar_provincias(offset=-1)
+        with self.assertRaises(ValueError):
+            self.geo.iterar_municipios(limite=-1)
+    
+    def test_pesquisar_iter(self):
+        """Testar a pesquisa incremental, com nível e paginação."""
+        for termo in ("bengo", "an", "xyzw"):
+            resultados = self.geo.pesquisar(termo)
+            pares = list(self.geo.pesquisar_iter(termo))
+            for nivel, chave in (("provincia", "provincias"), ("municipio", "municipios")):
+                self.assertEqual([v for n, v in pares if n == nivel], resultados[chave])
+            self.assertEqual(
+                [v for _, v in self.geo.pesquisar_iter(termo, nivel="municipio")],
+                resultados["municipios"]
+            )
+        
+        pares = list(self.geo.pesquisar_iter("an"))
+        self.assertEqual(list(self.geo.pesquisar_iter("an", offset=3, limite=4)), pares[3:7])
+        self.assertEqual(next(self.geo.pesquisar_iter("bengo"))[1]["nome"], "Bengo")
+        nivel, copia = next(self.geo.pesquisar_iter("bengo", copiar=True))
+        self.assertEqual(nivel, "provincia")
+        self.assertIsInstance(copia["municipios"], list)
+        
+        with self.assertRaises(ValueError):
+            self.geo.pesquisar_iter("bengo", nivel="distrito")
     
     def test_obter_provincia_luanda(self):
         """Testar obtenção da província de Luanda."""
@@ -58,6 +164,21 @@ class TestAngolaGeo(unittest.TestCase):
         self.assertEqual(luanda1['nome'], luanda2['nome'])
         self.assertEqual(luanda2['nome'], luanda3['nome'])
     
+    def test_obter_provincia_ignora_acentos(self):
+        """Testar que busca de província ignora acentos e espaços extra."""
+        self.assertEqual(self.geo.obter_provincia("Uige")['nome'], "Uíge")
+        self.assertEqual(self.geo.obter_provincia("HUILA")['nome'], "Huíla")
+        self.assertEqual(self.geo.obter_provincia("  cuanza   sul ")['nome'], "Cuanza Sul")
+        self.assertEqual(self.geo.contar_municipios("Bie"), 19)
+    
+    def test_indice_municipios_ignora_acentos(self):
+        """Testar que o índice de municípios resolve nomes sem acentos."""
+        candidatos = self.geo._conjunto.indice_municipios[normalizar("UCUA")]
+        
+        self.assertEqual(len(candidatos), 1)
+        self.assertEqual(candidatos[0].nome, "Úcua")
+        self.assertEqual(candidatos[0].provincia.nome, "Bengo")
+    
     def test_obter_provincia_inexistente(self):
         """Testar que ProvinciaInexistente é lançada para província inválida."""
         with self.assertRaises(ProvinciaInexistente) as context:
@@ -150,6 +271,131 @@ class TestAngolaGeo(unittest.TestCase):
         self.assertEqual(len(resultados1['provincias']), len(resultados2['provincias']))
         self.assertEqual(len(resultados2['provincias']), len(resultados3['provincias']))
     
+    def test_pesquisar_ignora_acentos(self):
+        """Testar que pesquisa ignora acentos no termo e nos nomes."""
+        resultados = self.geo.pesquisar("quicama")
+        
+        nomes = [m['nome'] for m in resultados['municipios']]
+        self.assertEqual(nomes, ["Quiçama"])
+    
+    def test_pesquisar_preserva_ordem(self):
+        """Testar que os resultados seguem a ordem do conjunto de dados."""
+        resultados = self.geo.pesquisar("an")
+        
+        esperados = [
+            p['nome'] for p in self.geo.listar_provincias() if "an" in p['nome'].lower()
+        ]
+        self.assertEqual([p['nome'] for p in resultados['provincias']], esperados)
+        
+        esperados = [
+            m['nome'] for m in self.geo.listar_municipios() if "an" in m['nome'].lower()
+        ]
+        self.assertEqual([m['nome'] for m in resultados['municipios']], esperados)
+    
+    def test_pesquisar_aproximado(self):
+        """Testar pesquisa tolerante a erros de digitação e espaços extra."""
+        resultados = self.geo.pesquisar_aproximado("Benguella")
+        self.assertEqual(resultados[0]['nome'], "Benguela")
+        self.assertEqual(resultados[0]['nivel'], "provincia")
+        self.assertEqual(resultados[0]['distancia'], 1)
+        
+        resultados = self.geo.pesquisar_aproximado("Cuanza  Sul")
+        self.assertEqual(resultados[0]['nome'], "Cuanza Sul")
+        self.assertEqual(resultados[0]['distancia'], 0)
+        
+        resultados = self.geo.pesquisar_aproximado("Cazengaa")
+        self.assertEqual(resultados[0], {
+            'nivel': 'municipio', 'nome': 'Cazenga', 'provincia': 'Luanda', 'distancia': 1
+        })
+    
+    def test_pesquisar_aproximado_ordenado_e_limitado(self):
+        """Testar que resultados vêm ordenados pela distância e respeitam o limite."""
+        resultados = self.geo.pesquisar_aproximado("Cuanda", max_distancia=3)
+        distancias = [r['distancia'] for r in resultados]
+        self.assertEqual(distancias, sorted(distancias))
+        
+        self.assertEqual(len(self.geo.pesquisar_aproximado("Cuanda", max_distancia=3, limite=2)), 2)
+        self.assertEqual(self.geo.pesquisar_aproximado("Zzzzzzzz"), [])
+        self.assertEqual(self.geo.pesquisar_aproximado("Bengo", limite=0), [])
+        with self.assertRaises(ValueError):
+            self.geo.pesquisar_aproximado("Bengo", limite=-1)
+        with self.assertRaises(ValueError):
+            self.geo.pesquisar_aproximado("Bengo", max_distancia=-1)
+    
+    def test_autocompletar(self):
+        """Testar autocompletar com hierarquia e filtro por nível."""
+        sugestoes = self.geo.autocompletar("cuan", nivel="provincia")
+        self.assertEqual(
+            [s['nome'] for s in sugestoes],
+            ["Cuando", "Cuanza Norte", "Cuanza Sul"]
+        )
+        
+        sugestoes = self.geo.autocompletar("Quic", nivel="municipio")
+        self.assertEqual(sugestoes, [
+            {'nivel': 'municipio', 'nome': 'Quiçama', 'provincia': 'Icolo e Bengo'},
+            {'nivel': 'municipio', 'nome': 'Quicunzo', 'provincia': 'Bengo'},
+        ])
+    
+    def test_autocompletar_todos_niveis_e_limite(self):
+        """Testar autocompletar sem nível e com limite."""
+        sugestoes = self.geo.autocompletar("Benguela")
+        self.assertEqual([s['nivel'] for s in sugestoes], ["provincia"])
+        
+        self.assertEqual(len(self.geo.autocompletar("ca", limite=3)), 3)
+        self.assertEqual(self.geo.autocompletar("xyz"), [])
+        self.assertEqual(self.geo.autocompletar("ca", limite=0), [])
+        with self.assertRaises(ValueError):
+            self.geo.autocompletar("ca", limite=-1)
+    
+    def test_autocompletar_nivel_invalido(self):
+        """Testar que um nível inválido lança ValueError."""
+        with self.assertRaises(ValueError):
+            self.geo.autocompletar("ca", nivel="bairro")
+    
+    def test_provincia_inexistente_sugestoes(self):
+        """Testar que ProvinciaInexistente sugere nomes próximos."""
+        with self.assertRaises(ProvinciaInexistente) as context:
+            self.geo.obter_provincia("Huilla")
+        
+        self.assertEqual(context.exception.sugestoes, ["Huíla"])
+        self.assertIn("Quis dizer: Huíla?", str(context.exception))
+        
+        with self.assertRaises(ProvinciaInexistente) as context:
+            self.geo.contar_municipios("Inexistente")
+        self.assertEqual(context.exception.sugestoes, [])
+    
+    def test_variantes_json(self):
+        """Testar que as variantes *_json codificam os mesmos dados."""
+        pares = [
+            (self.geo.listar_provincias_json(), self.geo.listar_provincias()),
+            (self.geo.obter_provincia_json("uige"), self.geo.obter_provincia("Uíge")),
+            (self.geo.listar_municipios_json(), self.geo.listar_municipios()),
+            (self.geo.listar_municipios_json("Luanda"), self.geo.listar_municipios("Luanda")),
+            (self.geo.obter_provincias_novas_json(), self.geo.obter_provincias_novas()),
+            (self.geo.obter_metadados_json(), self.geo.obter_metadados()),
+        ]
+        for dados, esperado in pares:
+            self.assertIsInstance(dados, bytes)
+            self.assertEqual(json.loads(dados.decode("utf-8")), json.loads(json.dumps(esperado)))
+        self.assertIn("Uíge".encode("utf-8"), pares[1][0])
+        
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.obter_provincia_json("Inexistente")
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.listar_municipios_json("Inexistente")
+    
+    def test_variantes_json_em_cache(self):
+        """Testar que os bytes são reutilizados até os dados serem recarregados."""
+        geo = AngolaGeo(usar_cache=False)
+        primeiro = geo.obter_provincia_json("Luanda")
+        self.assertIs(geo.obter_provincia_json("LUANDA"), primeiro)
+        self.assertIs(geo.listar_provincias_json(), geo.listar_provincias_json())
+        
+        geo.recarregar()
+        segundo = geo.obter_provincia_json("Luanda")
+        self.assertIsNot(segundo, primeiro)
+        self.assertEqual(segundo, primeiro)
+    
     def test_integridade_dados_municipios(self):
         """Testar que contagens de municípios correspondem aos dados reais."""
         for provincia in self.geo.listar_provincias():
@@ -165,6 +411,126 @@ class TestAngolaGeo(unittest.TestCase):
                 )
 
 
+class TestHierarquia(unittest.TestCase):
+    """Casos de teste para obter_municipio e obter_comuna."""
+    
+    def setUp(self):
+        """Criar um conjunto com municípios e comunas homónimos."""
+        dados = {
+            "metadata": {},
+            "provinces": [
+                {
+                    "id": 1, "name": "Norte", "capital": "Alfa", "municipality_count": 2,
+                    "municipalities": [
+                        {"name": "Alfa", "communes": [{"name": "Sede"}, {"name": "Úcua"}]},
+                        {"name": "Beta", "communes": [{"name": "Sede"}]},
+                    ]
+                },
+                {
+                    "id": 2, "name": "Sul", "capital": "Gama", "municipality_count": 2,
+                    "municipalities": [
+                        {"name": "Gama", "communes": []},
+                        {"name": "Beta", "communes": [{"name": "Sede"}]},
+                    ]
+                },
+            ]
+        }
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        caminho = os.path.join(pasta, "divisions.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        self.geo = AngolaGeo(caminho=caminho)
+    
+    def test_obter_municipio(self):
+        """Testar a obtenção de um município com a cadeia de ascendentes."""
+        municipio = self.geo.obter_municipio("alfa")
+        self.assertEqual(municipio["codigo"], "01.001")
+        self.assertEqual(municipio["provincia"], "Norte")
+        self.assertEqual([c["name"] for c in municipio["comunas"]], ["Sede", "Úcua"])
+        self.assertEqual(
+            municipio["ancestrais"],
+            ({"codigo": "01", "nivel": "provincia", "nome": "Norte"},)
+        )
+        self.assertIs(self.geo.obter_municipio("Alfa"), municipio)
+        with self.assertRaises(TypeError):
+            municipio["nome"] = "Outro"
+        self.assertIsInstance(self.geo.obter_municipio("Alfa", copiar=True)["comunas"], list)
+    
+    def test_obter_municipio_ambiguo(self):
+        """Testar homónimos em províncias diferentes."""
+        with self.assertRaises(DivisaoAmbigua) as contexto:
+            self.geo.obter_municipio("Beta")
+        self.assertEqual([c["codigo"] for c in contexto.exception.candidatos], ["01.002", "02.002"])
+        self.assertEqual(self.geo.obter_municipio("Beta", provincia="Sul")["codigo"], "02.002")
+    
+    def test_obter_municipio_inexistente(self):
+        """Testar nomes e províncias inexistentes."""
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.obter_municipio("Delta")
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.obter_municipio("Gama", provincia="Norte")
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.obter_municipio("Alfa", provincia="Leste")
+    
+    def test_obter_comuna(self):
+        """Testar a obtenção de comunas e a desambiguação pelos pais."""
+        comuna = self.geo.obter_comuna("ucua")
+        self.assertEqual(comuna["nome"], "Úcua")
+        self.assertEqual(comuna["municipio"], "Alfa")
+        self.assertEqual(comuna["provincia"], "Norte")
+        self.assertEqual([a["codigo"] for a in comuna["ancestrais"]], ["01", "01.001"])
+        
+        with self.assertRaises(DivisaoAmbigua) as contexto:
+            self.geo.obter_comuna("Sede")
+        self.assertEqual(len(contexto.exception.candidatos), 3)
+        with self.assertRaises(DivisaoAmbigua):
+            self.geo.obter_comuna("Sede", municipio="Beta")
+        self.assertEqual(
+            self.geo.obter_comuna("Sede", municipio="Beta", provincia="Sul")["codigo"],
+            "02.002.001"
+        )
+    
+    def test_obter_comuna_inexistente(self):
+        """Testar comunas e municípios inexistentes."""
+        with self.assertRaises(ComunaInexistente):
+            self.geo.obter_comuna("Delta")
+        with self.assertRaises(ComunaInexistente):
+            self.geo.obter_comuna("Úcua", municipio="Beta")
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.obter_comuna("Sede", municipio="Delta")
+
+    
+    def test_iterar_comunas(self):
+        """Testar a iteração de comunas por município e por província."""
+        def nomes(comunas):
+            return [(c["nome"], c["municipio"], c["provincia"]) for c in comunas]
+        
+        self.assertEqual(nomes(self.geo.iterar_comunas()), [
+            ("Sede", "Alfa", "Norte"), ("Úcua", "Alfa", "Norte"),
+            ("Sede", "Beta", "Norte"), ("Sede", "Beta", "Sul"),
+        ])
+        self.assertEqual(nomes(self.geo.iterar_comunas("alfa")), [
+            ("Sede", "Alfa", "Norte"), ("Úcua", "Alfa", "Norte"),
+        ])
+        self.assertEqual(len(list(self.geo.iterar_comunas("Beta"))), 2)
+        self.assertEqual(
+            nomes(self.geo.iterar_comunas("Beta", provincia="Sul")), [("Sede", "Beta", "Sul")]
+        )
+        self.assertEqual(
+            nomes(self.geo.iterar_comunas(provincia="Norte", offset=1, limite=1)),
+            [("Úcua", "Alfa", "Norte")]
+        )
+        self.assertEqual(list(self.geo.iterar_comunas("Gama")), [])
+        
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.iterar_comunas("Delta")
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.iterar_comunas("Gama", provincia="Norte")
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.iterar_comunas(provincia="Oeste")
+
+
 class TestIntegridadeDados(unittest.TestCase):
     """Testes de integridade e consistência dos dados."""
     
@@ -0,0 +1,341 @@
+"""
+Testes unitários para a exportação SQLite e o backend SQLite.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from angola_geo import (
+    AngolaGeo,
+    CodigoInexistente,
+    ComunaInexistente,
+    DivisaoAmbigua,
+    MunicipioInexistente,
+    OperacaoIndisponivel,
+    ProvinciaInexistente,
+)
+from angola_geo.basedados import VERSAO_ESQUEMA, AngolaGeoSQLite, exportar_sqlite
+from angola_geo.dados import carregar_conjunto
+from angola_geo.excecoes import DadosInvalidos
+
+
+def _resultado(funcao, *args, **kwargs):
+    """Resultado de uma chamada (iteradores em lista) ou o tipo e mensagem da exceção."""
+    try:
+        valor = funcao(*args, **kwargs)
+    except Exception as erro:
+        return type(erro), str(erro), getattr(erro, "candidatos", None)
+    if hasattr(valor, "__next__"):
+        return list(valor)
+    return valor
+
+
+class TestExportacao(unittest.TestCase):
+    """Casos de teste para o ficheiro escrito por exportar_sqlite."""
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.pasta)
+        self.caminho = exportar_sqlite(os.path.join(self.pasta, "divisoes.db"))
+        self.ligacao = sqlite3.connect(self.caminho)
+        self.addCleanup(self.ligacao.close)
+
+    def test_esquema(self):
+        """Testar as tabelas, a versão do esquema e a integridade das chaves estrangeiras."""
+        ligacao = self.ligacao
+        tabelas = {nome for nome, in ligacao.execute("SELECT name FROM sqlite_master")}
+        self.assertTrue({"metadados", "provincias", "municipios", "comunas", "nomes"} <= tabelas)
+        self.assertEqual(ligacao.execute("PRAGMA user_version").fetchone()[0], VERSAO_ESQUEMA)
+        self.assertEqual(ligacao.execute("PRAGMA foreign_key_check").fetchall(), [])
+        self.assertEqual(ligacao.execute("SELECT count(*) FROM provincias").fetchone()[0], 21)
+        self.assertEqual(
+            ligacao.execute("SELECT count(*) FROM municipios").fetchone()[0],
+            len(AngolaGeo().listar_municipios())
+        )
+        luanda = ligacao.execute(
+            "SELECT id, codigo, chave FROM provincias WHERE nome = 'Luanda'"
+        ).fetchone()
+        self.assertEqual(luanda, (13, 13000000, "luanda"))
+
+    def test_indice_de_nomes(self):
+        """Testar a pesquisa por substring na tabela FTS5."""
+        encontrados = self.ligacao.execute(
+            "SELECT nivel FROM nomes WHERE chave MATCH '\"bengo\"' ORDER BY rowid"
+        ).fetchall()
+        self.assertEqual(encontrados, [("provincia",), ("provincia",)])
+
+    def test_substitui_ficheiro_existente(self):
+        """Testar que exportar de novo substitui o ficheiro sem deixar o temporário."""
+        self.ligacao.close()
+        exportar_sqlite(self.caminho)
+        self.assertEqual(os.listdir(self.pasta), ["divisoes.db"])
+
+
+class TestBackendSQLite(unittest.TestCase):
+    """Casos de teste para AngolaGeo(backend="sqlite") com os dados distribuídos."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pasta = tempfile.mkdtemp()
+        cls.caminho = exportar_sqlite(os.path.join(cls.pasta, "divisoes.db"))
+        cls.memoria = AngolaGeo(precarregar=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.pasta)
+
+    def setUp(self):
+        self.geo = AngolaGeo(backend="sqlite", caminho=self.caminho)
+
+    def assertIgualMemoria(self, metodo, *args, **kwargs):
+        self.assertEqual(
+            _resultado(getattr(self.geo, metodo), *args, **kwargs),
+            _resultado(getattr(self.memoria, metodo), *args, **kwargs),
+            f"{metodo}{args}{kwargs}"
+        )
+
+    def test_tipo(self):
+        """Testar que o construtor devolve o backend pedido."""
+        self.assertIsInstance(self.geo, AngolaGeoSQLite)
+        self.assertIsInstance(self.geo, AngolaGeo)
+        self.assertNotIsInstance(self.memoria, AngolaGeoSQLite)
+        with self.assertRaises(ValueError):
+            AngolaGeo(backend="postgres")
+
+    def test_listagens_iguais_a_memoria(self):
+        """Testar metadados, listagens e variantes JSON contra o backend em memória."""
+        for metodo in (
+            "obter_metadados", "listar_provincias", "listar_municipios",
+            "obter_nomes_provincias", "obter_provincias_novas", "contar_municipios",
+            "obter_metadados_json", "listar_provincias_json", "listar_municipios_json",
+            "obter_provincias_novas_json", "iterar_provincias", "iterar_municipios",
+            "iterar_comunas",
+        ):
+            self.assertIgualMemoria(metodo)
+        self.assertIgualMemoria("listar_provincias", resumo=True)
+        self.assertIgualMemoria("iterar_provincias", offset=1, limite=2)
+        self.assertIgualMemoria("iterar_provincias", offset=-1)
+        self.assertEqual(self.geo.versao_dados, self.memoria.versao_dados)
+
+    def test_provincias_iguais_a_memoria(self):
+        """Testar as consultas por província, incluindo nomes inexistentes e sugestões."""
+        for nome in ("Luanda", "UIGE", "Luandaa", "Oeste"):
+            for metodo in (
+                "obter_provincia", "listar_municipios", "contar_municipios",
+                "obter_provincia_json", "listar_municipios_json",
+            ):
+                self.assertIgualMemoria(metodo, nome)
+            self.assertIgualMemoria("iterar_municipios", nome, offset=2, limite=3)
+        with self.assertRaises(ProvinciaInexistente) as contexto:
+            self.geo.obter_provincia("Luandaa")
+        self.assertEqual(contexto.exception.sugestoes, ["Luanda"])
+
+    def test_pesquisa_igual_a_memoria(self):
+        """Testar pesquisar e pesquisar_iter com termos curtos, longos e especiais."""
+        for termo in ("", "an", "Bengo", "Cacuaco", "xyz", 'a"b', "%", "_", "icolo e"):
+            self.assertIgualMemoria("pesquisar", termo)
+            for nivel in (None, "provincia", "municipio"):
+                self.assertIgualMemoria("pesquisar_iter", termo, nivel=nivel)
+                self.assertIgualMemoria("pesquisar_iter", termo, nivel=nivel, offset=1, limite=3)
+        self.assertIgualMemoria("pesquisar_iter", "an", nivel="distrito")
+
+    def test_codigos_iguais_a_memoria(self):
+        """Testar obter_por_codigo, codigo_de e obter_municipio."""
+        for codigo in ("13.002", "1.1", "01", 13002000, "99", "1.999", "1.1.1", "abc"):
+            self.assertIgualMemoria("obter_por_codigo", codigo)
+        for nome in ("Bengo", "Dande", "Benguela", "Xpto"):
+            self.assertIgualMemoria("codigo_de", nome)
+            self.assertIgualMemoria("codigo_de", nome, provincia="Bengo", inteiro=True)
+            self.assertIgualMemoria("codigo_de", nome, nivel="municipio")
+            self.assertIgualMemoria("obter_municipio", nome)
+            self.assertIgualMemoria("obter_municipio", nome, provincia="Benguela")
+        with self.assertRaises(CodigoInexistente):
+            self.geo.obter_por_codigo("99")
+
+    def test_metodos_em_memoria(self):
+        """Testar os métodos que indexam os dados do ficheiro em memória."""
+        self.assertNotIn("_conjunto", self.geo.__dict__)
+        self.assertIgualMemoria("autocompletar", "ca")
+        self.assertIgualMemoria("pesquisar_aproximado", "Benguella")
+        self.assertEqual(
+            list(self.geo.normalizar_lote(["Prov. de Benguela", "mun. Cazenga"])),
+            list(self.memoria.normalizar_lote(["Prov. de Benguela", "mun. Cazenga"]))
+        )
+        self.assertIgualMemoria("migrar_lote", ["Cuando Cubango"])
+        self.assertIn("_conjunto", self.geo.__dict__)
+
+    def test_resultados_so_de_leitura(self):
+        """Testar que os resultados são vistas só de leitura, ou cópias com copiar=True."""
+        luanda = self.geo.obter_provincia("Luanda")
+        with self.assertRaises(TypeError):
+            luanda["capital"] = "Outra"
+        copia = self.geo.obter_provincia("Luanda", copiar=True)
+        copia["municipios"].append({"nome": "Novo"})
+        self.assertEqual(len(self.geo.obter_provincia("Luanda")["municipios"]), 16)
+
+    def test_ligacoes_so_de_leitura(self):
+        """Testar que as ligações do pool não escrevem no ficheiro."""
+        with self.geo._pool.ligacao() as ligacao:
+            with self.assertRaises(sqlite3.OperationalError):
+                ligacao.execute("DELETE FROM provincias")
+
+    def test_leituras_concorrentes(self):
+        """Testar consultas de várias threads sobre a mesma instância."""
+        esperado = self.memoria.obter_provincia("Bengo")
+        pesquisa = self.memoria.pesquisar("an")
+        erros = []
+
+        def ler():
+            try:
+                for _ in range(50):
+                    self.assertEqual(self.geo.obter_provincia("Bengo"), esperado)
+                    self.assertEqual(self.geo.pesquisar("an"), pesquisa)
+            except Exception as erro:
+                erros.append(erro)
+
+        threads = [threading.Thread(target=ler) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(erros, [])
+        self.assertLessEqual(len(self.geo._pool._livres), self.geo._pool.tamanho)
+
+    def test_instrumentacao(self):
+        """Testar a instrumentação das consultas ao ficheiro."""
+        geo = AngolaGeo(backend="sqlite", caminho=self.caminho, instrumentar=True)
+        geo.listar_municipios_json("Luanda")
+        estatisticas = geo.estatisticas()
+        self.assertEqual(estatisticas["listar_municipios_json"]["chamadas"], 1)
+        self.assertNotIn("listar_municipios", estatisticas)
+
+    def test_ficheiros_invalidos(self):
+        """Testar os erros do construtor."""
+        with self.assertRaises(ValueError):
+            AngolaGeo(backend="sqlite")
+        with self.assertRaises(FileNotFoundError):
+            AngolaGeo(backend="sqlite", caminho=os.path.join(self.pasta, "nada.db"))
+        invalido = os.path.join(self.pasta, "invalido.db")
+        with open(invalido, "w") as f:
+            f.write("não é SQLite " * 100)
+        with self.assertRaises(DadosInvalidos):
+            AngolaGeo(backend="sqlite", caminho=invalido)
+        with self.assertRaises(OperacaoIndisponivel) as contexto:
+            self.geo.vigiar_dados()
+        self.assertIsInstance(contexto.exception, NotImplementedError)
+        self.assertEqual(contexto.exception.backend, "sqlite")
+
+
+class TestBackendSQLiteHierarquia(unittest.TestCase):
+    """Casos de teste com comunas e municípios homónimos."""
+
+    def setUp(self):
+        """Exportar um conjunto com municípios e comunas homónimos."""
+        dados = {
+            "metadata": {"data_version": "1"},
+            "provinces": [
+                {
+                    "id": 1, "name": "Norte", "capital": "Alfa", "municipality_count": 2,
+                    "municipalities": [
+                        {"name": "Alfa", "communes": [{"name": "Sede"}, {"name": "Úcua"}]},
+                        {"name": "Beta", "communes": [{"name": "Sede"}]},
+                    ]
+                },
+                {
+                    "id": 2, "name": "Sul", "capital": "Gama", "municipality_count": 2,
+                    "municipalities": [
+                        {"name": "Gama", "communes": []},
+                        {"name": "Beta", "communes": [{"name": "Sede"}]},
+                    ]
+                },
+            ]
+        }
+        self.pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.pasta)
+        self.json = os.path.join(self.pasta, "divisions.json")
+        with open(self.json, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        self.caminho = exportar_sqlite(
+            os.path.join(self.pasta, "divisoes.db"), carregar_conjunto(self.json)
+        )
+        self.memoria = AngolaGeo(caminho=self.json)
+        self.geo = AngolaGeo(backend="sqlite", caminho=self.caminho)
+
+    def test_iguais_a_memoria(self):
+        """Testar as consultas da hierarquia contra o backend em memória."""
+        chamadas = [
+            ("obter_municipio", ("Beta",), {}),
+            ("obter_municipio", ("Beta",), {"provincia": "Sul"}),
+            ("obter_comuna", ("Sede",), {}),
+            ("obter_comuna", ("Sede",), {"municipio": "Beta"}),
+            ("obter_comuna", ("ucua",), {"municipio": "Alfa"}),
+            ("obter_comuna", ("Sede",), {"municipio": "Delta"}),
+            ("obter_comuna", ("Sede",), {"municipio": "Beta", "provincia": "Sul"}),
+            ("iterar_comunas", (), {}),
+            ("iterar_comunas", ("Beta",), {}),
+            ("iterar_comunas", ("Gama",), {"provincia": "Norte"}),
+            ("iterar_comunas", (), {"provincia": "Norte", "offset": 1, "limite": 1}),
+            ("codigo_de", ("Sede",), {}),
+            ("codigo_de", ("Sede",), {"provincia": "Sul"}),
+            ("codigo_de", ("Beta",), {"inteiro": True}),
+            ("obter_por_codigo", ("2.2.1",), {}),
+            ("pesquisar", ("sede",), {}),
+            ("pesquisar_iter", ("e",), {"offset": 2, "limite": 3}),
+            ("listar_municipios", ("Norte",), {}),
+            ("listar_provincias_json", (), {}),
+        ]
+        for metodo, args, kwargs in chamadas:
+            self.assertEqual(
+                _resultado(getattr(self.geo, metodo), *args, **kwargs),
+                _resultado(getattr(self.memoria, metodo), *args, **kwargs),
+                f"{metodo}{args}{kwargs}"
+            )
+
+    def test_erros(self):
+        """Testar as exceções de nomes inexistentes e ambíguos."""
+        with self.assertRaises(DivisaoAmbigua) as contexto:
+            self.geo.obter_municipio("Beta")
+        self.assertEqual([c["codigo"] for c in contexto.exception.candidatos], ["01.002", "02.002"])
+        with self.assertRaises(MunicipioInexistente):
+            self.geo.iterar_comunas("Delta")
+        with self.assertRaises(ComunaInexistente):
+            self.geo.obter_comuna("Nada")
+
+    def test_recarregar(self):
+        """Testar que recarregar passa a ler uma exportação nova do mesmo ficheiro."""
+        self.geo.autocompletar("s")
+        with open(self.json, encoding="utf-8") as f:
+            dados = json.load(f)
+        dados["metadata"]["data_version"] = "2"
+        dados["provinces"][1]["municipalities"][0]["communes"] = [{"name": "Delta"}]
+        with open(self.json, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        exportar_sqlite(self.caminho, carregar_conjunto(self.json))
+
+        self.geo.recarregar()
+        self.assertEqual(self.geo.versao_dados, "2")
+        self.assertEqual(self.geo.obter_comuna("delta")["municipio"], "Gama")
+        self.assertEqual(self.geo.autocompletar("del")[0]["nome"], "Delta")
+
+    def test_verificar_dados(self):
+        """Testar que verificar_dados só reabre o ficheiro depois de este mudar."""
+        self.assertFalse(self.geo.verificar_dados())
+        with open(self.json, encoding="utf-8") as f:
+            dados = json.load(f)
+        dados["metadata"]["data_version"] = "3"
+        with open(self.json, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        exportar_sqlite(self.caminho, carregar_conjunto(self.json))
+
+        self.assertTrue(self.geo.verificar_dados())
+        self.assertEqual(self.geo.versao_dados, "3")
+        self.assertFalse(self.geo.verificar_dados())
+
+
+if __name__ == "__main__":
+    unittest.main()
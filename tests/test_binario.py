@@ -0,0 +1,125 @@
+"""
+Testes unitários para o instantâneo binário dos dados.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from angola_geo import binario, dados, resumo
+
+
+def _resumo(provincias):
+    """Representação comparável de uma árvore de registos."""
+    return [
+        (p.id, p.nome, p.capital, p.total_municipios, p.observacoes,
+         [(m.nome, [c.nome for c in m.comunas]) for m in p.municipios])
+        for p in provincias
+    ]
+
+
+class TestBinario(unittest.TestCase):
+    """Casos de teste para compilação e leitura do formato binário."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        with open(dados.CAMINHO_DADOS, "rb") as f:
+            self.conteudo = f.read()
+        self.hash = binario.hash_conteudo(self.conteudo)
+        self.dados = json.loads(self.conteudo.decode("utf-8"))
+        self.dados["provinces"][0]["municipalities"][0]["communes"] = [
+            {"name": "Caxito"}, {"name": ""}, {"name": "Mabubas"}
+        ]
+        self.dados["provinces"][0]["notes"] = "Nota"
+        self.pasta = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Remover ficheiros temporários."""
+        shutil.rmtree(self.pasta)
+    
+    def test_ida_e_volta(self):
+        """Testar que ler o binário reconstrói os mesmos registos que o JSON."""
+        esperado = dados.ConjuntoDados.de_json(self.dados)
+        compilado = binario.compilar_dados(esperado, self.hash)
+        provincias, metadados, indice = binario.ler_dados(compilado, self.hash)
+        
+        self.assertEqual(_resumo(provincias), _resumo(esperado.provincias))
+        self.assertEqual(metadados, self.dados["metadata"])
+        self.assertEqual(indice.nomes, esperado.indice_trigramas.nomes)
+        self.assertEqual(indice.pesquisar("bengo"), esperado.indice_trigramas.pesquisar("bengo"))
+        self.assertEqual(
+            [c.nome for c in provincias[0].municipios[0].comunas], ["Caxito", "Mabubas"]
+        )
+    
+    def test_hash_diferente(self):
+        """Testar que um instantâneo desatualizado é ignorado."""
+        compilado = binario.compilar_dados(dados.ConjuntoDados.de_json(self.dados), self.hash)
+        self.assertIsNone(binario.ler_dados(compilado, binario.hash_conteudo(b"outro")))
+    
+    def test_corrompido(self):
+        """Testar que conteúdo inválido é ignorado."""
+        compilado = binario.compilar_dados(dados.ConjuntoDados.de_json(self.dados), self.hash)
+        self.assertIsNone(binario.ler_dados(compilado[:-10], self.hash))
+        self.assertIsNone(binario.ler_dados(b"lixo" * 20, self.hash))
+    
+    def hash_de(self, caminho):
+        """SHA-256 do conteúdo de um ficheiro."""
+        with open(caminho, "rb") as f:
+            return binario.hash_conteudo(f.read())
+    
+    def test_instantaneo_distribuido_atualizado(self):
+        """Testar que o divisions.bin distribuído corresponde ao divisions.json."""
+        with open(binario.caminho_binario(dados.CAMINHO_DADOS), "rb") as f:
+            self.assertIsNotNone(
+                binario.ler_dados(f.read(), self.hash),
+                "divisions.bin desatualizado: execute python -m angola_geo.binario"
+            )
+    
+    def test_carregar_conjunto_recorre_ao_json(self):
+        """Testar que o carregador usa o JSON quando o binário falta ou está desatualizado."""
+        caminho = os.path.join(self.pasta, "divisions.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.dados, f)
+        
+        sem_binario = dados.carregar_conjunto(caminho)
+        binario.compilar(caminho)
+        com_binario = dados.carregar_conjunto(caminho)
+        self.assertEqual(_resumo(sem_binario.provincias), _resumo(com_binario.provincias))
+        
+        self.dados["provinces"][0]["name"] = "Bengo Alterado"
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.dados, f)
+        desatualizado = dados.carregar_conjunto(caminho)
+        self.assertEqual(desatualizado.provincias[0].nome, "Bengo Alterado")
+    
+    def test_resumo_sem_corpo(self):
+        """Testar que o resumo se lê do instantâneo e coincide com o JSON."""
+        caminho = os.path.join(self.pasta, "divisions.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.dados, f)
+        via_json = resumo.carregar_resumo(caminho)
+        
+        binario.compilar(caminho)
+        with open(binario.caminho_binario(caminho), "r+b") as f:
+            # O resumo não depende do corpo, que aqui fica ilegível
+            f.truncate(os.path.getsize(f.name) - 10)
+        with open(binario.caminho_binario(caminho), "rb") as f:
+            truncado = f.read()
+        self.assertIsNone(binario.ler_dados(truncado, self.hash_de(caminho)))
+        self.assertIsNotNone(resumo.abrir_instantaneo(truncado, self.hash_de(caminho)))
+        via_binario = resumo.carregar_resumo(caminho)
+        
+        self.assertEqual(via_json, via_binario)
+        metadados, provincias = via_binario
+        self.assertEqual(metadados, self.dados["metadata"])
+        self.assertEqual(provincias[0]["observacoes"], "Nota")
+        self.assertEqual(
+            [p["nome"] for p in provincias],
+            [p["name"] for p in self.dados["provinces"]]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from io import StringIO
+import os
+import subprocess
 import sys
 from angola_geo.cli import main, cmd_info, cmd_listar_provincias, cmd_obter_provincia, cmd_listar_municipios, cmd_pesquisar, cmd_provincias_novas
 from angola_geo import AngolaGeo
@@ -84,5 +86,162 @@ class TestCLI(unittest.TestCase):
             self.assertIn("Icolo e Bengo", output)
             self.assertIn("Moxico Leste", output)
 
+    def test_listar_sem_tipo_mostra_ajuda(self):
+        """Testar que 'listar' sem tipo mostra a ajuda do subcomando."""
+        with patch('sys.argv', ['angola-geo', 'listar']):
+            main()
+            output = sys.stdout.getvalue()
+            self.assertIn("provincias", output)
+            self.assertIn("municipios", output)
+
+    def test_info_mostra_provincias_novas(self):
+        """Testar que 'info' indica as novas províncias e as capitais."""
+        with patch('sys.argv', ['angola-geo', 'info']):
+            main()
+            output = sys.stdout.getvalue()
+            for provincia in self.geo.obter_provincias_novas():
+                self.assertIn(f"{provincia['nome']} (Capital: {provincia['capital']})", output)
+
+    def test_saida_json(self):
+        """Testar que --json escreve a província em JSON."""
+        import json
+        with patch('sys.argv', ['angola-geo', 'obter', 'provincia', 'Luanda', '--json']):
+            main()
+            output = sys.stdout.getvalue()
+            self.assertEqual(json.loads(output), self.geo.obter_provincia("Luanda", copiar=True))
+
+    def test_info_json(self):
+        """Testar que 'info --json' escreve os metadados."""
+        import json
+        with patch('sys.argv', ['angola-geo', 'info', '--json']):
+            main()
+            output = sys.stdout.getvalue()
+            self.assertEqual(json.loads(output), self.geo.obter_metadados(copiar=True))
+
+    def test_bench(self):
+        """Testar que 'bench' corre os benchmarks filtrados."""
+        with patch('sys.argv', ['angola-geo', 'bench', '--fator', '0', '--amostras', '1',
+                                '--filtro', 'distribuido/pesquisar']):
+            main()
+            output = sys.stdout.getvalue()
+            self.assertIn("distribuido/pesquisar_encontrado", output)
+            self.assertIn("distribuido/pesquisar_inexistente", output)
+
+    def test_bench_regista_opcoes(self):
+        """Testar que as opções de bench são registadas só para esse comando."""
+        with patch('sys.argv', ['angola-geo', 'bench', '--help']), \
+                self.assertRaises(SystemExit):
+            main()
+        self.assertIn('--comparar', sys.stdout.getvalue())
+
+    def test_exportar_sqlite(self):
+        """Testar que 'exportar sqlite' escreve um ficheiro utilizável."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as pasta:
+            destino = os.path.join(pasta, 'divisoes.db')
+            with patch('sys.argv', ['angola-geo', 'exportar', 'sqlite', destino]):
+                main()
+            geo = AngolaGeo(backend='sqlite', caminho=destino)
+            self.assertEqual(geo.obter_provincia('Luanda'), self.geo.obter_provincia('Luanda'))
+            geo._pool.fechar()
+        self.assertIn("Dados exportados", sys.stdout.getvalue())
+
+    def test_enriquecer_stdin(self):
+        """Testar o enriquecimento de um CSV lido do stdin."""
+        entrada = StringIO('id,local\n1,Prov. de Benguela\n')
+        with patch('sys.argv', ['angola-geo', 'enriquecer', '--coluna', 'local']), \
+                patch('sys.stdin', entrada):
+            main()
+            output = sys.stdout.getvalue()
+            self.assertIn("geo_provincia", output)
+            self.assertIn("1,Prov. de Benguela,provincia,Benguela,,,1.0", output)
+
+    def test_enriquecer_coluna_inexistente(self):
+        """Testar que uma coluna inexistente termina com erro."""
+        entrada = StringIO('id,local\n')
+        with patch('sys.argv', ['angola-geo', 'enriquecer', '-c', 'morada']), \
+                patch('sys.stdin', entrada), patch('sys.stderr', StringIO()) as erros:
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 1)
+            self.assertIn("Coluna 'morada'", erros.getvalue())
+
+    def test_enriquecer_argumentos_invalidos(self):
+        """Testar que --workers e --tamanho-bloco menores que 1 são rejeitados."""
+        for opcao in (['--tamanho-bloco', '0'], ['--workers', '0'], ['-w', '-1']):
+            argv = ['angola-geo', 'enriquecer', '-c', 'local'] + opcao
+            with patch('sys.argv', argv), patch('sys.stdin', StringIO('local\nLuanda\n')), \
+                    patch('sys.stderr', StringIO()) as erros:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("pelo menos 1", erros.getvalue())
+        self.assertEqual(sys.stdout.getvalue(), "")
+
+    def test_servir_recarregar_invalido(self):
+        """Testar que --recarregar rejeita intervalos que não são positivos."""
+        for valor in ('0', '-1', 'nan', 'x'):
+            argv = ['angola-geo', 'servir', '--recarregar', valor]
+            with patch('sys.argv', argv), patch('sys.stderr', StringIO()) as erros:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("--recarregar", erros.getvalue())
+
+
+class TestArranqueCLI(unittest.TestCase):
+    """Regressão do tempo de arranque, medido com ``python -X importtime``."""
+
+    RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Módulos que só os comandos que consultam os dados completos devem importar
+    MODULOS_PESADOS = (
+        "angola_geo.core", "angola_geo.dados", "angola_geo.binario", "angola_geo.desempenho"
+    )
+    # Orçamento generoso (em microssegundos) para o tempo próprio dos
+    # módulos do pacote; o tempo cumulativo contaria várias vezes as
+    # importações aninhadas
+    ORCAMENTO_US = 100_000
+
+    def importacoes(self, *argumentos):
+        """Corre a CLI e devolve {módulo: tempo próprio em µs}."""
+        ambiente = dict(os.environ, PYTHONPATH=self.RAIZ)
+        resultado = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'angola_geo.cli', *argumentos],
+            capture_output=True, text=True, cwd=self.RAIZ, env=ambiente, timeout=60
+        )
+        self.assertEqual(resultado.returncode, 0, resultado.stderr)
+        tempos = {}
+        for linha in resultado.stderr.splitlines():
+            if not linha.startswith('import time:') or '|' not in linha:
+                continue
+            proprio, _, modulo = linha.split('|')
+            proprio = proprio[len('import time:'):].strip()
+            if proprio.isdigit():
+                tempos[modulo.strip()] = int(proprio)
+        return tempos
+
+    def verificar_arranque_leve(self, *argumentos):
+        """Verificar que o comando não importa os módulos pesados."""
+        tempos = self.importacoes(*argumentos)
+        self.assertIn('angola_geo.resumo', tempos)
+        for modulo in self.MODULOS_PESADOS:
+            self.assertNotIn(modulo, tempos)
+        pacote = sum(t for m, t in tempos.items() if m.startswith('angola_geo'))
+        self.assertLess(pacote, self.ORCAMENTO_US)
+
+    def test_ajuda_nao_carrega_dados(self):
+        """Testar que --help não importa o núcleo nem os dados."""
+        self.verificar_arranque_leve('--help')
+
+    def test_info_nao_carrega_dados(self):
+        """Testar que 'info' não importa o núcleo nem os dados."""
+        self.verificar_arranque_leve('info')
+
+    def test_pesquisar_carrega_dados(self):
+        """Testar que 'pesquisar' importa o núcleo."""
+        tempos = self.importacoes('pesquisar', 'Luanda')
+        self.assertIn('angola_geo.core', tempos)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,141 @@
+"""
+Testes unitários para os códigos hierárquicos das divisões.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from angola_geo import AngolaGeo, CodigoInexistente, DivisaoAmbigua, ProvinciaInexistente
+from angola_geo.codigos import codificar, decodificar, formatar, interpretar, intervalo
+from angola_geo.dados import SEM_PAI, ConjuntoDados
+
+
+class TestFormatoCodigos(unittest.TestCase):
+    """Casos de teste para a codificação dos códigos."""
+    
+    def test_ida_e_volta(self):
+        """Testar a conversão entre as formas textual e inteira."""
+        for componentes in [(1, 0, 0), (12, 3, 0), (21, 999, 999)]:
+            inteiro = codificar(*componentes)
+            self.assertEqual(decodificar(inteiro), componentes)
+            self.assertEqual(interpretar(formatar(inteiro)), inteiro)
+            self.assertEqual(interpretar(inteiro), inteiro)
+        self.assertEqual(formatar(codificar(12, 3, 1)), "12.003.001")
+        self.assertEqual(interpretar("12.3.1"), 12003001)
+    
+    def test_codigos_invalidos(self):
+        """Testar que códigos mal formados são rejeitados."""
+        for codigo in ["", "a", "1.2.3.4", "1.0.2", "0", "1.1000", -1, True, "1.-2"]:
+            with self.assertRaises(ValueError, msg=repr(codigo)):
+                interpretar(codigo)
+    
+    def test_intervalo_descendentes(self):
+        """Testar que os descendentes ficam no intervalo do pai."""
+        inicio, fim = intervalo(codificar(12))
+        self.assertTrue(inicio <= codificar(12, 999, 999) < fim)
+        self.assertFalse(inicio <= codificar(13) < fim)
+        inicio, fim = intervalo(codificar(12, 3))
+        self.assertTrue(inicio <= codificar(12, 3, 5) < fim)
+        self.assertFalse(inicio <= codificar(12, 4) < fim)
+
+
+# Conjunto mínimo com uma comuna homónima em dois municípios
+DADOS_HOMONIMOS = {
+    "metadata": {},
+    "provinces": [{
+        "id": 3, "name": "A", "capital": "A1", "municipality_count": 2,
+        "municipalities": [
+            {"name": "A1", "communes": [{"name": "C1"}, {"name": "C2"}]},
+            {"name": "A2", "communes": [{"name": "C1"}]},
+        ]
+    }]
+}
+
+
+class TestCodigosConjunto(unittest.TestCase):
+    """Casos de teste para as tabelas de códigos do conjunto de dados."""
+    
+    def _conjunto(self):
+        return ConjuntoDados.de_json(DADOS_HOMONIMOS)
+    
+    def test_tabelas_alinhadas(self):
+        """Testar os arrays de códigos e pais, alinhados com as entradas."""
+        conjunto = self._conjunto()
+        self.assertEqual(
+            [formatar(c) for c in conjunto.codigos],
+            ["03", "03.001", "03.001.001", "03.001.002", "03.002", "03.002.001"]
+        )
+        self.assertEqual(list(conjunto.pais), [SEM_PAI, 0, 1, 1, 0, 4])
+        for identificador, codigo in enumerate(conjunto.codigos):
+            self.assertEqual(conjunto.identificadores_codigos[codigo], identificador)
+    
+    def test_tabelas_so_de_leitura(self):
+        """Testar que os arrays partilhados de códigos e pais não podem ser alterados."""
+        conjunto = self._conjunto()
+        for tabela in (conjunto.codigos, conjunto.pais):
+            with self.assertRaises(TypeError):
+                tabela[0] = 0
+        self.assertEqual(conjunto.codigos[-1], conjunto.codigos[len(conjunto.codigos) - 1])
+
+
+class TestCodigosAngolaGeo(unittest.TestCase):
+    """Casos de teste para obter_por_codigo e codigo_de."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.geo = AngolaGeo()
+    
+    def test_obter_por_codigo(self):
+        """Testar a obtenção de províncias e municípios pelo código."""
+        bengo = self.geo.obter_provincia("Bengo")
+        self.assertEqual(self.geo.obter_por_codigo(f"{bengo['id']:02d}")["nome"], "Bengo")
+        municipio = self.geo.obter_por_codigo("1.1")
+        self.assertEqual(municipio["codigo"], "01.001")
+        self.assertEqual(municipio["codigo_inteiro"], 1001000)
+        self.assertEqual(municipio["nome"], bengo["municipios"][0]["nome"])
+        self.assertEqual(self.geo.obter_por_codigo(1001000), municipio)
+    
+    def test_codigo_inexistente(self):
+        """Testar códigos válidos sem divisão e códigos mal formados."""
+        with self.assertRaises(CodigoInexistente):
+            self.geo.obter_por_codigo("99")
+        with self.assertRaises(ValueError):
+            self.geo.obter_por_codigo("x.1")
+    
+    def test_codigo_de(self):
+        """Testar a ida e volta entre nome e código."""
+        for municipio in self.geo.listar_municipios("Bengo"):
+            codigo = self.geo.codigo_de(municipio["nome"], provincia="Bengo")
+            self.assertEqual(self.geo.obter_por_codigo(codigo)["nome"], municipio["nome"])
+        self.assertEqual(self.geo.codigo_de("bengo", inteiro=True), 1000000)
+        self.assertIsNone(self.geo.codigo_de("Inexistente"))
+    
+    def test_codigo_de_homonimos(self):
+        """Testar que a província é preferida a um município homónimo."""
+        codigo = self.geo.codigo_de("Benguela")
+        self.assertEqual(self.geo.obter_por_codigo(codigo)["nivel"], "provincia")
+        self.assertIsNone(self.geo.codigo_de("Benguela", nivel="comuna"))
+        with self.assertRaises(ProvinciaInexistente):
+            self.geo.codigo_de("Dande", provincia="Inexistente")
+        with self.assertRaises(ValueError):
+            self.geo.codigo_de("Dande", nivel="bairro")
+
+    
+    def test_codigo_de_ambiguo(self):
+        """Testar que homónimos no mesmo nível são recusados."""
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        caminho = os.path.join(pasta, "divisions.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(DADOS_HOMONIMOS, f)
+        geo = AngolaGeo(caminho=caminho)
+        with self.assertRaises(DivisaoAmbigua):
+            geo.codigo_de("C1")
+        self.assertEqual(geo.codigo_de("C2"), "03.001.002")
+
+
+if __name__ == '__main__':
+    unittest.main()
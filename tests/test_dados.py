@@ -0,0 +1,105 @@
+"""
+Testes unitários para o carregamento e a cache partilhada de dados.
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+from angola_geo import AngolaGeo
+from angola_geo import dados
+
+
+class TestCacheDados(unittest.TestCase):
+    """Casos de teste para a cache de dados partilhada entre instâncias."""
+    
+    def setUp(self):
+        """Começar cada teste com a cache vazia."""
+        dados.invalidar_cache()
+    
+    def tearDown(self):
+        """Não deixar conjuntos de teste na cache partilhada."""
+        dados.invalidar_cache()
+    
+    def test_instancias_partilham_conjunto(self):
+        """Testar que o ficheiro é lido uma única vez para várias instâncias."""
+        with patch.object(dados, "carregar_conjunto", wraps=dados.carregar_conjunto) as carregar:
+            geo1 = AngolaGeo(precarregar=True)
+            geo2 = AngolaGeo(precarregar=True)
+        
+        self.assertEqual(carregar.call_count, 1)
+        self.assertIs(geo1._conjunto, geo2._conjunto)
+    
+    def test_sem_cache(self):
+        """Testar que usar_cache=False carrega um conjunto privado."""
+        partilhado = AngolaGeo()
+        privado = AngolaGeo(usar_cache=False)
+        
+        self.assertIsNot(partilhado._conjunto, privado._conjunto)
+        self.assertIs(AngolaGeo()._conjunto, partilhado._conjunto)
+        self.assertEqual(privado.contar_municipios("Luanda"), 16)
+    
+    def test_recarregar_invalida_cache(self):
+        """Testar que recarregar() volta a ler o ficheiro para novas instâncias."""
+        geo = AngolaGeo()
+        antigo = geo._conjunto
+        
+        geo.recarregar()
+        
+        self.assertIsNot(geo._conjunto, antigo)
+        self.assertIs(AngolaGeo()._conjunto, geo._conjunto)
+    
+    def test_carregamento_concorrente(self):
+        """Testar que threads concorrentes recebem o mesmo conjunto."""
+        conjuntos = []
+        barreira = threading.Barrier(8)
+        
+        def carregar():
+            barreira.wait()
+            conjuntos.append(dados.obter_conjunto())
+        
+        with patch.object(dados, "carregar_conjunto", wraps=dados.carregar_conjunto) as carregar_conjunto:
+            threads = [threading.Thread(target=carregar) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(carregar_conjunto.call_count, 1)
+        self.assertEqual(len({id(c) for c in conjuntos}), 1)
+    
+    def test_leituras_concorrentes(self):
+        """Testar que várias threads leem o mesmo conjunto sem travas."""
+        geo = AngolaGeo(precarregar=True)
+        esperado = [
+            geo.obter_provincia("Luanda"),
+            geo.pesquisar("Cacuaco"),
+            geo.autocompletar("Lu"),
+            geo.pesquisar_aproximado("Luandaa"),
+        ]
+        resultados = []
+        barreira = threading.Barrier(8)
+        
+        def ler():
+            barreira.wait()
+            for _ in range(50):
+                obtido = [
+                    geo.obter_provincia("Luanda"),
+                    geo.pesquisar("Cacuaco"),
+                    geo.autocompletar("Lu"),
+                    geo.pesquisar_aproximado("Luandaa"),
+                ]
+            resultados.append(obtido)
+        
+        threads = [threading.Thread(target=ler) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(resultados, [esperado] * 8)
+        self.assertIs(resultados[0][0], esperado[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Testes unitários para a suite de benchmarks.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+from angola_geo import desempenho
+
+
+class TestDesempenho(unittest.TestCase):
+    """Casos de teste para medição, execução e comparação de benchmarks."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.pasta = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Remover ficheiros temporários."""
+        shutil.rmtree(self.pasta)
+    
+    def test_gerar_dados_sinteticos(self):
+        """Testar que o conjunto sintético amplia todas as províncias."""
+        dados = desempenho.gerar_dados_sinteticos(2, comunas_por_municipio=1)
+        for provincia in dados["provinces"]:
+            self.assertEqual(len(provincia["municipalities"]), provincia["municipality_count"] * 2)
+            self.assertEqual(len(provincia["municipalities"][0]["communes"]), 1)
+    
+    def test_medir(self):
+        """Testar a medição com execuções fixas e calibradas."""
+        chamadas = []
+        resultado = desempenho.medir(lambda: chamadas.append(1), amostras=3, execucoes=2)
+        self.assertEqual(len(chamadas), 6)
+        self.assertEqual((resultado["amostras"], resultado["execucoes"]), (3, 2))
+        self.assertLessEqual(resultado["min_us"], resultado["mediana_us"])
+        
+        calibrado = desempenho.medir(lambda: None, amostras=1)
+        self.assertGreater(calibrado["execucoes"], 1)
+    
+    def test_executar_com_filtro(self):
+        """Testar que a suite corre sobre o conjunto distribuído e o sintético."""
+        resultados = desempenho.executar(fator=1, amostras=1, filtro="obter_provincia_acentos")
+        self.assertEqual(
+            sorted(resultados["resultados"]),
+            ["distribuido/obter_provincia_acentos", "sintetico_x1/obter_provincia_acentos"]
+        )
+        self.assertEqual(resultados["fator"], 1)
+    
+    def test_comparar(self):
+        """Testar a deteção de regressões com tolerância global e por benchmark."""
+        atuais = {"resultados": {
+            "a": {"min_us": 130.0},
+            "b": {"min_us": 130.0},
+            "c": {"min_us": 80.0},
+            "novo": {"min_us": 1.0},
+        }}
+        linha_base = {"resultados": {
+            "a": {"min_us": 100.0},
+            "b": {"min_us": 100.0, "tolerancia": 0.5},
+            "c": {"min_us": 100.0},
+        }}
+        comparacoes = {c["nome"]: c for c in desempenho.comparar(atuais, linha_base, 0.25)}
+        
+        self.assertEqual(sorted(comparacoes), ["a", "b", "c"])
+        self.assertTrue(comparacoes["a"]["regressao"])
+        self.assertFalse(comparacoes["b"]["regressao"])
+        self.assertFalse(comparacoes["c"]["regressao"])
+        self.assertEqual(comparacoes["a"]["razao"], 1.3)
+    
+    def test_main_gravar_e_comparar(self):
+        """Testar a gravação da linha de base e o código de saída das regressões."""
+        caminho = os.path.join(self.pasta, "base.json")
+        argumentos = ["--fator", "0", "--amostras", "1", "--filtro", "listar_municipios_provincia"]
+        
+        with unittest.mock.patch("sys.stdout"):
+            self.assertEqual(desempenho.main(argumentos + ["--gravar", caminho]), 0)
+            self.assertEqual(desempenho.main(argumentos + ["--comparar", caminho, "--tolerancia", "100"]), 0)
+            
+            with open(caminho, encoding="utf-8") as f:
+                linha_base = json.load(f)
+            for resultado in linha_base["resultados"].values():
+                resultado["min_us"] = 1e-6
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(linha_base, f)
+            self.assertEqual(desempenho.main(argumentos + ["--comparar", caminho]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Testes unitários para o enriquecimento em streaming de CSV e JSONL.
+"""
+
+import io
+import json
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.enriquecimento import CAMPOS, campos_canonicos, enriquecer
+
+
+class _EntradaContada:
+    """Iterador de linhas que regista quantas linhas já foram lidas."""
+    
+    def __init__(self, linhas):
+        self.linhas = iter(linhas)
+        self.lidas = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        linha = next(self.linhas)
+        self.lidas += 1
+        return linha
+
+
+class _SaidaContada(io.StringIO):
+    """Saída que regista quantas linhas de entrada tinham sido lidas em cada escrita."""
+    
+    def __init__(self, entrada):
+        super().__init__()
+        self.entrada = entrada
+        self.lidas_por_escrita = []
+    
+    def write(self, texto):
+        self.lidas_por_escrita.append(self.entrada.lidas)
+        return super().write(texto)
+
+
+class TestEnriquecer(unittest.TestCase):
+    """Casos de teste para enriquecer."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Configurar fixtures de teste."""
+        cls.geo = AngolaGeo()
+    
+    def test_campos_canonicos(self):
+        """Testar a conversão de resultados nos campos acrescentados."""
+        self.assertEqual(
+            campos_canonicos({"nivel": "comuna", "nome": "C", "municipio": "M",
+                              "provincia": "P", "confianca": 0.5}),
+            ("comuna", "P", "M", "C", 0.5)
+        )
+        self.assertEqual(
+            campos_canonicos({"nivel": None, "nome": None, "confianca": 0.0}),
+            (None, None, None, None, 0.0)
+        )
+    
+    def test_csv(self):
+        """Testar que as colunas canónicas são acrescentadas a cada linha."""
+        entrada = io.StringIO('id,local\n1,luanda\n2,"mun. Cazenga"\n3,xyz\n')
+        saida = io.StringIO()
+        total = enriquecer(entrada, saida, "local", geo=self.geo)
+        
+        self.assertEqual(total, 3)
+        self.assertEqual(saida.getvalue().splitlines(), [
+            "id,local," + ",".join("geo_" + campo for campo in CAMPOS),
+            "1,luanda,provincia,Luanda,,,1.0",
+            "2,mun. Cazenga,municipio,Luanda,Cazenga,,1.0",
+            "3,xyz,,,,,0.0",
+        ])
+    
+    def test_csv_coluna_inexistente(self):
+        """Testar que uma coluna inexistente lança ValueError."""
+        with self.assertRaises(ValueError):
+            enriquecer(io.StringIO("id,local\n"), io.StringIO(), "morada", geo=self.geo)
+    
+    def test_jsonl(self):
+        """Testar JSONL, incluindo linhas em branco e valores que não são texto."""
+        entrada = io.StringIO('{"local": "Huíla"}\n\n{"local": 7}\n')
+        saida = io.StringIO()
+        total = enriquecer(entrada, saida, "local", formato="jsonl", prefixo="", geo=self.geo)
+        
+        registos = [json.loads(linha) for linha in saida.getvalue().splitlines()]
+        self.assertEqual(total, 2)
+        self.assertEqual(registos[0]["provincia"], "Huíla")
+        self.assertEqual(registos[0]["confianca"], 1.0)
+        self.assertIsNone(registos[1]["nivel"])
+    
+    def test_jsonl_invalido(self):
+        """Testar que linhas que não são objetos JSON indicam o número da linha."""
+        casos = [
+            ('{"local": "Huíla"}\n\n[1, 2]\n', "Linha 3: esperado um objeto JSON"),
+            ('{"local": "Huíla"}\n{"local": \n', "Linha 2: JSON inválido"),
+        ]
+        for entrada, mensagem in casos:
+            for tamanho_bloco in (1, 1000):
+                with self.assertRaises(ValueError) as contexto:
+                    enriquecer(io.StringIO(entrada), io.StringIO(), "local", formato="jsonl",
+                               tamanho_bloco=tamanho_bloco, geo=self.geo)
+                self.assertIn(mensagem, str(contexto.exception))
+    
+    def test_workers_e_bloco_invalidos(self):
+        """Testar que workers ou tamanho_bloco menores que 1 lançam ValueError."""
+        for argumentos in ({"workers": 0}, {"workers": -2}, {"tamanho_bloco": 0},
+                           {"tamanho_bloco": -1}):
+            with self.assertRaises(ValueError):
+                enriquecer(io.StringIO("local\nLuanda\n"), io.StringIO(), "local",
+                           geo=self.geo, **argumentos)
+    
+    def test_formato_invalido(self):
+        """Testar que formatos desconhecidos lançam ValueError."""
+        with self.assertRaises(ValueError):
+            enriquecer(io.StringIO(), io.StringIO(), "local", formato="xml", geo=self.geo)
+    
+    def test_streaming_por_blocos(self):
+        """Testar que cada bloco é escrito antes de a entrada seguinte ser lida."""
+        entrada = _EntradaContada(['{"local": "Luanda"}\n'] * 10)
+        saida = _SaidaContada(entrada)
+        enriquecer(entrada, saida, "local", formato="jsonl", tamanho_bloco=3, geo=self.geo)
+        
+        self.assertEqual(saida.lidas_por_escrita, [3, 6, 9, 10])
+    
+    def test_workers_preservam_ordem(self):
+        """Testar que o processamento em vários processos mantém a ordem."""
+        nomes = ["Luanda", "Benguela", "Huíla", "Namibe", "Bié"] * 8
+        csv_entrada = "local\n" + "\n".join(nomes) + "\n"
+        
+        sequencial = io.StringIO()
+        enriquecer(io.StringIO(csv_entrada), sequencial, "local", geo=self.geo)
+        paralelo = io.StringIO()
+        total = enriquecer(
+            io.StringIO(csv_entrada), paralelo, "local", workers=2, tamanho_bloco=3
+        )
+        
+        self.assertEqual(total, len(nomes))
+        self.assertEqual(paralelo.getvalue(), sequencial.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
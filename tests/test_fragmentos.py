@@ -0,0 +1,178 @@
+"""
+Testes unitários para os dados fragmentados por província.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from angola_geo import AngolaGeo, ProvinciaInexistente, dados, fragmentos
+from angola_geo.resumo import hash_conteudo
+
+
+class TestFragmentos(unittest.TestCase):
+    """Casos de teste para o manifesto e o carregamento a pedido."""
+    
+    def setUp(self):
+        """Começar cada teste sem dados carregados."""
+        dados.invalidar_cache()
+        self.completo = AngolaGeo(usar_cache=False, precarregar=True)
+    
+    def tearDown(self):
+        """Não deixar fragmentos de teste na cache partilhada."""
+        dados.invalidar_cache()
+    
+    def test_fragmentos_distribuidos_atualizados(self):
+        """Testar que os fragmentos distribuídos correspondem ao divisions.json."""
+        with open(dados.CAMINHO_DADOS, "rb") as f:
+            conteudo = f.read()
+        origem = json.loads(conteudo.decode("utf-8"))
+        conjunto = fragmentos.ConjuntoFragmentado()
+        
+        mensagem = "Fragmentos desatualizados: execute python -m angola_geo.fragmentos"
+        self.assertEqual(conjunto.hash_origem, hash_conteudo(conteudo).hex(), mensagem)
+        for provincia in origem["provinces"]:
+            caminho = os.path.join(fragmentos.DIRETORIO_FRAGMENTOS, f"{provincia['id']:02d}.json")
+            with open(caminho, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), provincia, mensagem)
+    
+    def test_consultas_do_manifesto(self):
+        """Testar as consultas respondidas sem ler fragmentos nem os dados completos."""
+        with patch.object(dados, "carregar_conjunto") as carregar:
+            geo = AngolaGeo()
+            self.assertEqual(geo.contar_municipios(), 326)
+            self.assertEqual(geo.contar_municipios("luanda"), 16)
+            self.assertEqual(geo.obter_nomes_provincias(), self.completo.obter_nomes_provincias())
+            self.assertEqual(geo.obter_metadados(), self.completo.obter_metadados())
+            self.assertEqual(geo.versao_dados, self.completo.versao_dados)
+            self.assertEqual(
+                geo.listar_provincias(resumo=True), self.completo.listar_provincias(resumo=True)
+            )
+        
+        carregar.assert_not_called()
+        self.assertEqual(geo._fragmentos.carregados(), [])
+        self.assertEqual(len(geo.listar_provincias(resumo=True)), 21)
+        self.assertNotIn("municipios", geo.listar_provincias(resumo=True)[0])
+    
+    def test_provincia_a_pedido(self):
+        """Testar que só o fragmento da província pedida é lido."""
+        with patch.object(dados, "carregar_conjunto") as carregar:
+            geo = AngolaGeo()
+            luanda = geo.obter_provincia("LUANDA")
+            municipios = geo.listar_municipios("Luanda")
+            corpo = geo.obter_provincia_json("luanda")
+        
+        carregar.assert_not_called()
+        self.assertEqual(geo._fragmentos.carregados(), ["Luanda"])
+        self.assertEqual(luanda, self.completo.obter_provincia("Luanda"))
+        self.assertIs(municipios, luanda["municipios"])
+        self.assertEqual(corpo, self.completo.obter_provincia_json("Luanda"))
+        self.assertIs(AngolaGeo().obter_provincia("Luanda"), luanda)
+    
+    def test_provincia_inexistente(self):
+        """Testar que as sugestões vêm do manifesto e coincidem com as completas."""
+        geo = AngolaGeo()
+        for chamada in (geo.obter_provincia, geo.listar_municipios, geo.contar_municipios):
+            with self.assertRaises(ProvinciaInexistente) as contexto:
+                chamada("Luandaa")
+            self.assertEqual(contexto.exception.sugestoes, ["Luanda"])
+        with self.assertRaises(ProvinciaInexistente) as esperado:
+            self.completo.obter_provincia("Benga")
+        with self.assertRaises(ProvinciaInexistente) as contexto:
+            geo.obter_provincia("Benga")
+        self.assertEqual(contexto.exception.sugestoes, esperado.exception.sugestoes)
+        self.assertNotIn("_conjunto", vars(geo))
+    
+    def test_dados_completos_quando_necessarios(self):
+        """Testar que a pesquisa carrega os dados completos uma vez."""
+        geo = AngolaGeo()
+        geo.obter_provincia("Bengo")
+        self.assertNotIn("_conjunto", vars(geo))
+        
+        self.assertEqual(geo.pesquisar("Cacuaco"), self.completo.pesquisar("Cacuaco"))
+        self.assertIsNone(geo._fragmentos)
+        self.assertIs(geo._conjunto, dados.obter_conjunto())
+        self.assertIs(geo.obter_provincia("Bengo"), geo._conjunto.vistas_provincias[
+            geo._conjunto.indice_provincias["bengo"]
+        ])
+        self.assertIn("_conjunto", vars(AngolaGeo()))
+    
+    def test_precarregar(self):
+        """Testar que precarregar=True carrega os dados completos no arranque."""
+        with patch.object(dados, "carregar_conjunto", wraps=dados.carregar_conjunto) as carregar:
+            geo = AngolaGeo(precarregar=True)
+        
+        self.assertEqual(carregar.call_count, 1)
+        self.assertIsNone(geo._fragmentos)
+    
+    def test_fragmento_concorrente(self):
+        """Testar que threads concorrentes recebem o mesmo fragmento."""
+        conjunto = fragmentos.ConjuntoFragmentado()
+        obtidos = []
+        barreira = threading.Barrier(8)
+        
+        def ler():
+            barreira.wait()
+            obtidos.append(conjunto.fragmento("Luanda"))
+        
+        threads = [threading.Thread(target=ler) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len({id(f) for f in obtidos}), 1)
+    
+    def test_fragmentos_desatualizados(self):
+        """Testar que fragmentos de outra versão do JSON não são usados."""
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        origem = os.path.join(pasta, "divisions.json")
+        shutil.copy(dados.CAMINHO_DADOS, origem)
+        diretorio = os.path.join(pasta, "provincias")
+        fragmentos.compilar(origem, diretorio)
+        
+        with patch.object(fragmentos, "DIRETORIO_FRAGMENTOS", diretorio), \
+                patch.object(fragmentos, "CAMINHO_DADOS", origem):
+            self.assertIsNotNone(fragmentos.obter_fragmentos(usar_cache=False))
+            
+            # Editar a origem sem recompilar os fragmentos
+            with open(origem, encoding="utf-8") as f:
+                editado = json.load(f)
+            editado["provinces"][0]["capital"] = "XPTO"
+            with open(origem, "w", encoding="utf-8") as f:
+                json.dump(editado, f)
+            
+            self.assertIsNone(fragmentos.obter_fragmentos(usar_cache=False))
+            geo = AngolaGeo(usar_cache=False)
+        self.assertIsNone(geo._fragmentos)
+        self.assertIn("_conjunto", vars(geo))
+    
+    def test_compilar(self):
+        """Testar a compilação e a falta de fragmentos."""
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        with open(os.path.join(pasta, "99.json"), "w") as f:
+            f.write("{}")
+        
+        escritos = fragmentos.compilar(dados.CAMINHO_DADOS, pasta)
+        
+        self.assertEqual(os.path.basename(escritos[0]), fragmentos.MANIFESTO)
+        self.assertEqual(len(escritos), 22)
+        self.assertFalse(os.path.exists(os.path.join(pasta, "99.json")))
+        self.assertEqual(
+            fragmentos.ConjuntoFragmentado(pasta).fragmento("Uíge").provincia.nome, "Uíge"
+        )
+        
+        with patch.object(fragmentos, "DIRETORIO_FRAGMENTOS", os.path.join(pasta, "nada")):
+            geo = AngolaGeo(usar_cache=False)
+        self.assertIsNone(geo._fragmentos)
+        self.assertIn("_conjunto", vars(geo))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+Testes unitários para os limites geográficos e a geocodificação inversa.
+"""
+
+import json
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from angola_geo import AngolaGeo, LimitesIndisponiveis
+from angola_geo.basedados import exportar_sqlite
+from angola_geo.excecoes import DadosInvalidos
+from angola_geo.geometria import ESCALA, Limites, Localizador, _nivel, compilar
+
+
+def retangulo(oeste, sul, este, norte):
+    """Anel fechado de um retângulo, no formato GeoJSON."""
+    return [[oeste, sul], [este, sul], [este, norte], [oeste, norte], [oeste, sul]]
+
+
+def elemento(codigo, tipo, coordenadas):
+    return {
+        "type": "Feature",
+        "properties": {"codigo": codigo},
+        "geometry": {"type": tipo, "coordinates": coordenadas},
+    }
+
+
+# Luanda com dois municípios (Cacuaco em duas partes) e o Bengo com um lago
+LIMITES = {
+    "type": "FeatureCollection",
+    "features": [
+        elemento("13", "Polygon", [retangulo(13.0, -9.2, 13.6, -8.6)]),
+        elemento("13.001", "Polygon", [retangulo(13.0, -9.2, 13.3, -8.9)]),
+        elemento("13.2", "MultiPolygon", [
+            [retangulo(13.0, -8.8, 13.2, -8.6)],
+            [retangulo(13.4, -8.8, 13.6, -8.6)],
+        ]),
+        elemento("01", "Polygon", [
+            retangulo(13.6, -9.2, 14.4, -8.0),
+            retangulo(13.9, -8.7, 14.1, -8.5)[::-1],
+        ]),
+    ],
+}
+
+
+def estrela(x, y, raio, vertices, aleatorio):
+    """Anel irregular (em estrela) à volta de ``(x, y)``."""
+    anel = []
+    for i in range(vertices):
+        angulo = 2 * math.pi * i / vertices
+        distancia = raio * aleatorio.uniform(0.4, 1.0)
+        anel.append([x + distancia * math.cos(angulo), y + distancia * math.sin(angulo)])
+    return anel + [anel[0]]
+
+
+class TestLocalizar(unittest.TestCase):
+    """Casos de teste para AngolaGeo.localizar e localizar_lote."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pasta = tempfile.TemporaryDirectory()
+        origem = os.path.join(cls.pasta.name, "limites.geojson")
+        with open(origem, "w", encoding="utf-8") as f:
+            json.dump(LIMITES, f)
+        cls.caminho = compilar(origem, os.path.join(cls.pasta.name, "limites.bin"))
+        cls.geo = AngolaGeo(limites=cls.caminho)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pasta.cleanup()
+
+    def test_divisao_mais_profunda(self):
+        """Testar que se devolve o município quando há limites dele."""
+        belas = self.geo.localizar(-9.0, 13.1)
+        self.assertEqual(belas, self.geo.obter_por_codigo("13.001"))
+        self.assertEqual(belas["nome"], "Belas")
+        self.assertEqual(belas["provincia"], "Luanda")
+        self.assertEqual(self.geo.localizar(-8.7, 13.5)["nome"], "Cacuaco")
+        self.assertEqual(self.geo.localizar(-8.7, 13.1)["nome"], "Cacuaco")
+
+    def test_provincia_sem_municipio(self):
+        """Testar pontos da província fora dos limites dos municípios."""
+        luanda = self.geo.localizar(-8.7, 13.3)
+        self.assertEqual(luanda["nivel"], "provincia")
+        self.assertEqual(luanda["nome"], "Luanda")
+        self.assertEqual(self.geo.localizar(-8.2, 14.0)["nome"], "Bengo")
+
+    def test_fora_dos_limites(self):
+        """Testar buracos, pontos fora dos limites e coordenadas inválidas."""
+        self.assertIsNone(self.geo.localizar(-8.6, 14.0))
+        self.assertIsNone(self.geo.localizar(-12.0, 15.0))
+        self.assertIsNone(self.geo.localizar(0.0, 0.0))
+        self.assertIsNone(self.geo.localizar(float("nan"), 13.1))
+        # Latitude e longitude trocadas
+        self.assertIsNone(self.geo.localizar(13.1, -9.0))
+
+    def test_lote(self):
+        """Testar que o lote dá os mesmos resultados, pela ordem."""
+        pontos = [(-9.0, 13.1), (0.0, 0.0), [-8.7, 13.3], (-8.2, 14.0), (-8.7, 13.5)]
+        resultados = self.geo.localizar_lote(iter(pontos))
+        self.assertEqual(list(resultados), [self.geo.localizar(*p) for p in pontos])
+
+    def test_sem_limites(self):
+        """Testar a exceção sem ficheiro de limites, já na chamada do lote."""
+        geo = AngolaGeo(limites=os.path.join(self.pasta.name, "inexistente.bin"))
+        with self.assertRaises(LimitesIndisponiveis) as contexto:
+            geo.localizar(-9.0, 13.1)
+        self.assertIsInstance(contexto.exception, FileNotFoundError)
+        with self.assertRaises(LimitesIndisponiveis):
+            geo.localizar_lote([])
+
+    def test_codigo_inexistente(self):
+        """Testar limites com códigos que não existem nos dados."""
+        caminho = os.path.join(self.pasta.name, "desconhecido.bin")
+        limites = Limites.de_geojson({"features": [
+            elemento("13.099", "Polygon", [retangulo(13.0, -9.2, 13.6, -8.6)])
+        ]})
+        with open(caminho, "wb") as f:
+            f.write(limites.serializar())
+        with self.assertRaises(DadosInvalidos):
+            AngolaGeo(limites=caminho).localizar(-9.0, 13.1)
+
+    def test_backend_sqlite(self):
+        """Testar localizar no backend SQLite."""
+        db = exportar_sqlite(os.path.join(self.pasta.name, "angola.db"))
+        geo = AngolaGeo(backend="sqlite", caminho=db, limites=self.caminho)
+        self.assertEqual(geo.localizar(-9.0, 13.1), self.geo.localizar(-9.0, 13.1))
+
+
+class TestLimites(unittest.TestCase):
+    """Casos de teste para o formato empacotado dos limites."""
+
+    def test_formato(self):
+        """Testar os arrays empacotados e a leitura do ficheiro serializado."""
+        limites = Limites.de_geojson(LIMITES)
+        # Cacuaco tem duas partes; o anel fechado não repete o vértice
+        self.assertEqual(list(limites.codigos), [13000000, 13001000, 13002000, 13002000, 1000000])
+        self.assertEqual(list(limites.aneis), [0, 1, 2, 3, 4, 6])
+        self.assertEqual(len(limites.coordenadas), 6 * 4 * 2)
+        self.assertEqual(limites.coordenadas[:2].tolist(), [13 * ESCALA, -92 * ESCALA // 10])
+        lido = Limites.ler(limites.serializar())
+        for campo in Limites.__slots__:
+            self.assertEqual(getattr(lido, campo), getattr(limites, campo))
+
+    def test_geojson_invalido(self):
+        """Testar elementos sem código, que não são polígonos ou degenerados."""
+        invalidos = [
+            elemento(None, "Polygon", [retangulo(13, -9, 14, -8)]),
+            elemento("13", "Point", [13, -9]),
+            elemento("13", "Polygon", [[[13, -9], [14, -9], [13, -9]]]),
+            elemento("13", "Polygon", [retangulo(13, -9, 200, -8)]),
+        ]
+        for invalido in invalidos:
+            with self.assertRaises(DadosInvalidos):
+                Limites.de_geojson({"features": [invalido]})
+
+    def test_ficheiro_invalido(self):
+        """Testar ficheiros com outra assinatura ou corrompidos."""
+        conteudo = Limites.de_geojson(LIMITES).serializar()
+        for invalido in (b"", b"AGEOBIN\x02", conteudo[:12]):
+            with self.assertRaises(DadosInvalidos):
+                Limites.ler(invalido)
+
+
+class TestLocalizador(unittest.TestCase):
+    """Casos de teste para a grelha do Localizador."""
+
+    def test_igual_ao_teste_exato(self):
+        """Testar que a grelha dá o mesmo que testar todos os polígonos."""
+        aleatorio = random.Random(24)
+        elementos = []
+        for provincia in range(1, 6):
+            x, y = 12 + provincia * 1.5, aleatorio.uniform(-11, -9)
+            elementos.append(elemento(str(provincia), "Polygon", [
+                estrela(x, y, 1.2, 120, aleatorio),
+                estrela(x, y, 0.3, 10, aleatorio)[::-1],
+            ]))
+            for municipio in range(1, 4):
+                elementos.append(elemento(f"{provincia}.{municipio}", "MultiPolygon", [
+                    [estrela(x + aleatorio.uniform(-.6, .6), y + aleatorio.uniform(-.6, .6),
+                             0.4, 40, aleatorio)],
+                    [estrela(x + aleatorio.uniform(-.6, .6), y + aleatorio.uniform(-.6, .6),
+                             0.2, 6, aleatorio)],
+                ]))
+        limites = Limites.de_geojson({"features": elementos})
+        pontos = [
+            (aleatorio.uniform(-12.5, -7.5), aleatorio.uniform(12, 22)) for _ in range(3000)
+        ]
+        # Vértices: pontos sobre as arestas
+        pontos += [
+            (limites.coordenadas[i + 1] / ESCALA, limites.coordenadas[i] / ESCALA)
+            for i in range(0, len(limites.coordenadas), 6)
+        ]
+
+        exato = Localizador(limites, celulas_por_eixo=1)
+
+        def esperado(latitude, longitude):
+            contem = [
+                p for p in range(len(limites))
+                if exato._contem(p, longitude * ESCALA, latitude * ESCALA)
+            ]
+            if not contem:
+                return None
+            return limites.codigos[min(contem, key=lambda p: (-_nivel(limites.codigos[p]), p))]
+
+        esperados = [esperado(*p) for p in pontos]
+        self.assertTrue(any(esperados) and not all(esperados))
+        for celulas in (1, 7, 64, 256):
+            localizador = Localizador(limites, celulas_por_eixo=celulas)
+            self.assertEqual(list(localizador.localizar_lote(pontos)), esperados, celulas)
+
+    def test_sem_poligonos(self):
+        """Testar um índice vazio."""
+        localizador = Localizador(Limites.de_geojson({"features": []}))
+        self.assertIsNone(localizador.localizar(-9.0, 13.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Testes unitários para as estruturas de índice de angola_geo.
+"""
+
+import unittest
+from angola_geo.indices import ArvoreBK, IndicePrefixos, IndiceTrigramas, distancia_edicao
+
+
+class TestIndiceTrigramas(unittest.TestCase):
+    """Casos de teste para o índice invertido de trigramas."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.nomes = ["bengo", "icolo e bengo", "benguela", "luanda", "ca"]
+        self.indice = IndiceTrigramas()
+        for nome in self.nomes:
+            self.indice.adicionar(nome)
+    
+    def test_identificadores_sequenciais(self):
+        """Testar que os identificadores seguem a ordem de inserção."""
+        self.assertEqual(len(self.indice), 5)
+        self.assertEqual(self.indice.adicionar("huambo"), 5)
+    
+    def test_pesquisar_substring(self):
+        """Testar que a pesquisa devolve os nomes que contêm o termo."""
+        self.assertEqual(self.indice.pesquisar("bengo"), [0, 1])
+        self.assertEqual(self.indice.pesquisar("bengu"), [2])
+        self.assertEqual(self.indice.pesquisar("engo"), [0, 1])
+    
+    def test_pesquisar_verifica_candidatos(self):
+        """Testar que candidatos com os trigramas fora de ordem são descartados."""
+        indice = IndiceTrigramas()
+        indice.adicionar("abcxbcd")
+        self.assertEqual(indice.pesquisar("abcd"), [])
+    
+    def test_pesquisar_termo_curto(self):
+        """Testar que termos com menos de três caracteres fazem varrimento."""
+        self.assertEqual(self.indice.pesquisar("ca"), [4])
+        self.assertEqual(self.indice.pesquisar(""), [0, 1, 2, 3, 4])
+    
+    def test_pesquisar_sem_resultados(self):
+        """Testar pesquisa por termo inexistente."""
+        self.assertEqual(self.indice.pesquisar("xyz"), [])
+    
+    def test_exportar_importar(self):
+        """Testar que o índice compacto responde como o original."""
+        importado = IndiceTrigramas.importar(*self.indice.exportar())
+        
+        self.assertEqual(importado.nomes, self.nomes)
+        for termo in ["bengo", "engo", "anda", "ca", "xyz"]:
+            self.assertEqual(importado.pesquisar(termo), self.indice.pesquisar(termo))
+
+
+
+class TestArvoreBK(unittest.TestCase):
+    """Casos de teste para a árvore BK e a distância de edição."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.nomes = ["benguela", "bengo", "luanda", "cuando", "cuanza sul", "cuanza norte", "bengo"]
+        self.arvore = ArvoreBK()
+        for identificador, nome in enumerate(self.nomes):
+            self.arvore.adicionar(nome, identificador)
+    
+    def test_distancia_edicao(self):
+        """Testar a distância de Levenshtein em casos conhecidos."""
+        self.assertEqual(distancia_edicao("benguella", "benguela"), 1)
+        self.assertEqual(distancia_edicao("kitten", "sitting"), 3)
+        self.assertEqual(distancia_edicao("", "abc"), 3)
+        self.assertEqual(distancia_edicao("abc", "abc"), 0)
+    
+    def test_nomes_repetidos_partilham_no(self):
+        """Testar que nomes iguais acumulam identificadores no mesmo nó."""
+        self.assertEqual(len(self.arvore), 7)
+        self.assertIn((0, "bengo", [1, 6]), self.arvore.pesquisar("bengo", 0))
+    
+    def test_pesquisar_equivale_forca_bruta(self):
+        """Testar que a pesquisa devolve o mesmo que comparar com todos os nomes."""
+        for termo in ["benguella", "luand", "cuanza", "xyz", "cuando"]:
+            for max_distancia in range(4):
+                esperados = sorted({
+                    (distancia_edicao(termo, nome), nome)
+                    for nome in self.nomes
+                    if distancia_edicao(termo, nome) <= max_distancia
+                })
+                obtidos = [(d, nome) for d, nome, _ in self.arvore.pesquisar(termo, max_distancia)]
+                self.assertEqual(obtidos, esperados)
+    
+    def test_arvore_vazia(self):
+        """Testar pesquisa numa árvore vazia."""
+        self.assertEqual(ArvoreBK().pesquisar("bengo", 2), [])
+
+
+
+class TestIndicePrefixos(unittest.TestCase):
+    """Casos de teste para o índice de prefixos."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.indice = IndicePrefixos(
+            [("cuanza sul", 0), ("cuando", 1), ("cabinda", 2), ("cuanza norte", 3), ("cuando", 4)]
+        )
+    
+    def test_pesquisar_prefixo(self):
+        """Testar que os resultados são os nomes com o prefixo, por ordem alfabética."""
+        self.assertEqual(len(self.indice), 5)
+        self.assertEqual(self.indice.pesquisar("cuan", 10), [1, 4, 3, 0])
+        self.assertEqual(self.indice.pesquisar("cuanza", 10), [3, 0])
+    
+    def test_pesquisar_limite(self):
+        """Testar que o limite corta os resultados."""
+        self.assertEqual(self.indice.pesquisar("cu", 2), [1, 4])
+        self.assertEqual(self.indice.pesquisar("", 1), [2])
+    
+    def test_pesquisar_sem_resultados(self):
+        """Testar prefixos sem correspondência, incluindo após o último nome."""
+        self.assertEqual(self.indice.pesquisar("b", 10), [])
+        self.assertEqual(self.indice.pesquisar("z", 10), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
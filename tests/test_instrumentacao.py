@@ -0,0 +1,113 @@
+"""
+Testes unitários para a instrumentação opcional de AngolaGeo.
+"""
+
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.excecoes import ProvinciaInexistente
+from angola_geo.instrumentacao import CARREGAMENTO, Metricas
+
+
+class TestMetricas(unittest.TestCase):
+    """Casos de teste para a classe Metricas."""
+    
+    def test_histograma(self):
+        """Testar a contagem por intervalos de potências de 2 µs."""
+        metricas = Metricas()
+        metricas.registar("f", 500)          # < 1 µs
+        metricas.registar("f", 3_000)        # [2, 4) µs
+        metricas.registar("f", 3_500)
+        metricas.registar("f", 1_000_000, erro=True)  # 1 ms
+        estatisticas = metricas.estatisticas()["f"]
+        self.assertEqual(estatisticas["chamadas"], 4)
+        self.assertEqual(estatisticas["erros"], 1)
+        self.assertEqual(estatisticas["histograma_us"], {1: 1, 4: 2, 1024: 1})
+        self.assertEqual(estatisticas["tempo_maximo_us"], 1000.0)
+    
+    def test_repor(self):
+        """Testar que repor descarta as medições."""
+        metricas = Metricas()
+        metricas.registar("f", 1)
+        metricas.repor()
+        self.assertEqual(metricas.estatisticas(), {})
+    
+    def test_gerador(self):
+        """Testar que geradores são medidos até terminarem."""
+        metricas = Metricas()
+        medido = metricas.medir("g", lambda: iter(()))
+        self.assertEqual(list(medido()), [])
+        
+        def gerador():
+            yield 1
+            yield 2
+        
+        iterador = metricas.medir("g", gerador)()
+        self.assertEqual(metricas.estatisticas()["g"]["chamadas"], 1)
+        self.assertEqual(list(iterador), [1, 2])
+        self.assertEqual(metricas.estatisticas()["g"]["chamadas"], 2)
+
+
+class TestInstrumentacao(unittest.TestCase):
+    """Casos de teste para a instrumentação de AngolaGeo."""
+    
+    def test_desativada_por_omissao(self):
+        """Testar que sem instrumentação os métodos são os da classe."""
+        geo = AngolaGeo()
+        self.assertNotIn("obter_provincia", vars(geo))
+        self.assertIs(geo.obter_provincia.__func__, AngolaGeo.obter_provincia)
+        self.assertEqual(geo.estatisticas(), {})
+    
+    def test_contagens(self):
+        """Testar chamadas, erros e o carregamento dos dados."""
+        geo = AngolaGeo(instrumentar=True, usar_cache=False)
+        geo.obter_provincia("Luanda")
+        geo.obter_provincia("Bengo")
+        with self.assertRaises(ProvinciaInexistente):
+            geo.obter_provincia("Inexistente")
+        list(geo.normalizar_lote(["luanda", "belas"]))
+        
+        estatisticas = geo.estatisticas()
+        self.assertEqual(estatisticas["obter_provincia"]["chamadas"], 3)
+        self.assertEqual(estatisticas["obter_provincia"]["erros"], 1)
+        self.assertEqual(sum(estatisticas["obter_provincia"]["histograma_us"].values()), 3)
+        self.assertEqual(estatisticas["normalizar_lote"]["chamadas"], 1)
+        # Manifesto, fragmentos de Luanda e do Bengo e os dados completos
+        self.assertEqual(estatisticas[CARREGAMENTO]["chamadas"], 4)
+        self.assertNotIn("estatisticas", estatisticas)
+    
+    def test_carregamento_fragmentos(self):
+        """Testar que a leitura do manifesto e dos fragmentos é medida."""
+        geo = AngolaGeo(instrumentar=True, usar_cache=False)
+        geo.obter_provincia("Luanda")
+        geo.listar_municipios("Luanda")
+        geo.contar_municipios()
+        
+        self.assertIsNotNone(geo._fragmentos)
+        # Manifesto e fragmento de Luanda, lido uma única vez
+        self.assertEqual(geo.estatisticas()[CARREGAMENTO]["chamadas"], 2)
+    
+    def test_observador(self):
+        """Testar que o observador recebe cada medição."""
+        geo = AngolaGeo()
+        recebidas = []
+        geo.ativar_instrumentacao(lambda nome, duracao: recebidas.append((nome, duracao)))
+        geo.pesquisar("bengo")
+        geo.recarregar()
+        nomes = [nome for nome, _ in recebidas]
+        self.assertIn("pesquisar", nomes)
+        self.assertIn(CARREGAMENTO, nomes)
+        self.assertTrue(all(duracao >= 0 for _, duracao in recebidas))
+    
+    def test_desativar(self):
+        """Testar que desativar repõe os métodos e mantém as medições."""
+        geo = AngolaGeo(instrumentar=True)
+        geo.listar_provincias()
+        geo.desativar_instrumentacao()
+        geo.listar_provincias()
+        self.assertNotIn("listar_provincias", vars(geo))
+        self.assertEqual(geo.estatisticas()["listar_provincias"]["chamadas"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Testes unitários para a migração de registos da divisão anterior.
+"""
+
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.dados import carregar_json
+from angola_geo.migracao import SEM_CORRESPONDENCIA
+from angola_geo.resumo import CAMINHO_DADOS_ANTERIORES
+
+
+class TestDadosAnteriores(unittest.TestCase):
+    """Casos de teste para o conjunto da divisão anterior."""
+    
+    def test_totais(self):
+        """Testar as 18 províncias e os 164 municípios declarados."""
+        geo = AngolaGeo(caminho=CAMINHO_DADOS_ANTERIORES)
+        self.assertEqual(len(geo.listar_provincias()), 18)
+        self.assertEqual(geo.contar_municipios(), 164)
+        self.assertEqual(geo.obter_metadados()["total_municipalities"], 164)
+    
+    def test_sucessores_existem(self):
+        """Testar que todas as províncias sucessoras existem nos dados atuais."""
+        geo = AngolaGeo()
+        atuais = set(geo.obter_nomes_provincias())
+        for provincia in carregar_json(CAMINHO_DADOS_ANTERIORES)["provinces"]:
+            self.assertTrue(set(provincia["successors"]) <= atuais, provincia["name"])
+            for municipio in provincia["municipalities"]:
+                for sucessor in municipio["successors"]:
+                    self.assertIn(sucessor["province"], provincia["successors"])
+
+
+class TestMigrarLote(unittest.TestCase):
+    """Casos de teste para AngolaGeo.migrar_lote."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.geo = AngolaGeo()
+    
+    def test_provincias_divididas(self):
+        """Testar províncias divididas pela Lei 14/24."""
+        cuando_cubango, moxico, huila = self.geo.migrar_lote(
+            ["Cuando Cubango", {"provincia": "MOXICO"}, ("Huila", None)]
+        )
+        self.assertEqual(cuando_cubango["provincia"], "Cubango")
+        self.assertFalse(cuando_cubango["exato"])
+        self.assertEqual(
+            [c["provincia"] for c in cuando_cubango["candidatos"]], ["Cubango", "Cuando"]
+        )
+        self.assertEqual(
+            [c["provincia"] for c in moxico["candidatos"]], ["Moxico", "Moxico Leste"]
+        )
+        self.assertEqual(huila["provincia"], "Huíla")
+        self.assertTrue(huila["exato"])
+        self.assertEqual(huila["codigo"], self.geo.codigo_de("Huíla"))
+    
+    def test_municipios(self):
+        """Testar municípios renomeados, divididos e que mudaram de província."""
+        kilamba, quicama, dembos = self.geo.migrar_lote([
+            ("Luanda", "Kilamba Kiaxi"),
+            ("Luanda", "Quiçama"),
+            (None, "Dembos"),
+        ])
+        self.assertEqual(kilamba["municipio"], "Quilamba Quiaxi")
+        self.assertTrue(kilamba["exato"])
+        self.assertEqual(quicama["provincia"], "Icolo e Bengo")
+        self.assertEqual(quicama["nivel"], "municipio")
+        self.assertEqual(
+            self.geo.obter_por_codigo(quicama["codigo"])["nome"], quicama["municipio"]
+        )
+        self.assertEqual(dembos["municipio"], "Quibaxe")
+    
+    def test_sem_correspondencia(self):
+        """Testar registos desconhecidos e municípios desconhecidos."""
+        desconhecido, municipio_desconhecido, vazio = self.geo.migrar_lote(
+            ["Atlântida", ("Luanda", "Inexistente"), (None, None)]
+        )
+        self.assertIs(desconhecido, SEM_CORRESPONDENCIA)
+        self.assertIs(vazio, SEM_CORRESPONDENCIA)
+        self.assertEqual(municipio_desconhecido["nivel"], "provincia")
+        self.assertEqual(municipio_desconhecido["provincia"], "Luanda")
+    
+    def test_resultados_partilhados(self):
+        """Testar que registos repetidos devolvem a mesma vista só de leitura."""
+        primeiro, segundo = self.geo.migrar_lote([("Bengo", "Dande"), ("BENGO", "dande")])
+        self.assertIs(primeiro, segundo)
+        with self.assertRaises(TypeError):
+            primeiro["provincia"] = "Outra"
+
+
+if __name__ == '__main__':
+    unittest.main()
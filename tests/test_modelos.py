@@ -0,0 +1,64 @@
+"""
+Testes unitários para os registos imutáveis de angola_geo.modelos.
+"""
+
+import unittest
+from angola_geo.modelos import Comuna, Municipio, Provincia
+
+
+class TestModelos(unittest.TestCase):
+    """Casos de teste para Provincia, Municipio e Comuna."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.provincia = Provincia.de_json({
+            "id": 13,
+            "name": "Luanda",
+            "capital": "Ingombota",
+            "municipality_count": 2,
+            "municipalities": [
+                {"name": "Belas", "communes": [{"name": "Ramiros"}, {"name": ""}, "Bad"]},
+                {"name": "Ingombota"},
+            ],
+        })
+    
+    def test_hierarquia(self):
+        """Testar filhos em tuplos e referências aos pais."""
+        belas, ingombota = self.provincia.municipios
+        
+        self.assertIsInstance(self.provincia.municipios, tuple)
+        self.assertIs(belas.provincia, self.provincia)
+        self.assertEqual([c.nome for c in belas.comunas], ["Ramiros"])
+        self.assertIs(belas.comunas[0].provincia, self.provincia)
+        self.assertEqual(ingombota.comunas, ())
+        self.assertIsNone(self.provincia.observacoes)
+    
+    def test_imutavel(self):
+        """Testar que os atributos não podem ser alterados nem removidos."""
+        with self.assertRaises(AttributeError):
+            self.provincia.nome = "Outra"
+        with self.assertRaises(AttributeError):
+            del self.provincia.municipios[0].nome
+        with self.assertRaises(AttributeError):
+            self.provincia.extra = 1
+    
+    def test_sem_dicionario_por_instancia(self):
+        """Testar que os registos usam __slots__."""
+        for registo in (self.provincia, self.provincia.municipios[0],
+                        self.provincia.municipios[0].comunas[0]):
+            self.assertFalse(hasattr(registo, "__dict__"))
+    
+    def test_nomes_internados(self):
+        """Testar que nomes iguais partilham o mesmo objeto string."""
+        ingombota = self.provincia.municipios[1]
+        self.assertIs(ingombota.nome, self.provincia.capital)
+    
+    def test_niveis(self):
+        """Testar o nível de cada tipo de registo."""
+        self.assertEqual(Provincia.nivel, "provincia")
+        self.assertEqual(Municipio.nivel, "municipio")
+        self.assertEqual(Comuna.nivel, "comuna")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Testes unitários para a recarga automática dos dados.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.dados import carregar_json
+
+
+class TestRecarga(unittest.TestCase):
+    """Casos de teste para vigiar_dados e verificar_dados."""
+    
+    def setUp(self):
+        """Copiar os dados para uma pasta temporária."""
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        self.caminho = os.path.join(pasta, "divisions.json")
+        self.dados = carregar_json()
+        self._escrever("1.0.0")
+        self.geo = AngolaGeo(caminho=self.caminho)
+        self.addCleanup(self.geo.parar_vigilancia)
+    
+    def _escrever(self, versao, capital="Ingombota"):
+        self.dados["metadata"]["data_version"] = versao
+        for provincia in self.dados["provinces"]:
+            if provincia["name"] == "Luanda":
+                provincia["capital"] = capital
+        with open(self.caminho, "w", encoding="utf-8") as f:
+            json.dump(self.dados, f, ensure_ascii=False)
+    
+    def test_sem_alteracoes(self):
+        """Testar que o mesmo conteúdo não é recarregado."""
+        conjunto = self.geo._conjunto
+        self.assertFalse(self.geo.verificar_dados())
+        self._escrever("1.0.0")
+        os.utime(self.caminho, ns=(0, 0))
+        self.assertFalse(self.geo.verificar_dados())
+        self.assertIs(self.geo._conjunto, conjunto)
+    
+    def test_recarregar_conteudo_novo(self):
+        """Testar a publicação de uma versão nova."""
+        eventos = []
+        self.geo.vigiar_dados(intervalo=3600, observador=eventos.append)
+        luanda = self.geo.obter_provincia("Luanda")
+        self._escrever("1.1.0", capital="Luanda")
+        
+        self.assertTrue(self.geo.verificar_dados())
+        self.assertEqual(self.geo.versao_dados, "1.1.0")
+        self.assertEqual(self.geo.obter_provincia("Luanda")["capital"], "Luanda")
+        # Resultados obtidos antes da troca continuam válidos
+        self.assertEqual(luanda["capital"], "Ingombota")
+        self.assertEqual(len(eventos), 1)
+        self.assertEqual(
+            (eventos[0]["versao_anterior"], eventos[0]["versao"], eventos[0]["erro"]),
+            ("1.0.0", "1.1.0", None)
+        )
+        # Os índices preguiçosos já foram construídos fora do pedido
+        self.assertIsNotNone(self.geo._conjunto._arvore_bk)
+    
+    def test_ficheiro_invalido(self):
+        """Testar que um ficheiro inválido mantém a versão ativa."""
+        eventos = []
+        self.geo.vigiar_dados(intervalo=3600, observador=eventos.append)
+        with open(self.caminho, "w", encoding="utf-8") as f:
+            f.write('{"metadata": ')
+        self.assertFalse(self.geo.verificar_dados())
+        self.assertEqual(self.geo.versao_dados, "1.0.0")
+        self.assertIsInstance(eventos[0]["erro"], ValueError)
+        
+        self._escrever("1.2.0")
+        self.assertTrue(self.geo.verificar_dados())
+        self.assertEqual(self.geo.versao_dados, "1.2.0")
+    
+    def test_intervalo_invalido(self):
+        """Testar que intervalos nulos, negativos ou NaN são rejeitados."""
+        for intervalo in (0, -1, float("nan")):
+            with self.assertRaises(ValueError):
+                self.geo.vigiar_dados(intervalo)
+        self.assertIsNone(self.geo._vigilante)
+    
+    def test_metrica_carregamento(self):
+        """Testar que cada recarga conta como um carregamento."""
+        self.geo.ativar_instrumentacao()
+        self._escrever("1.3.0")
+        self.assertTrue(self.geo.verificar_dados())
+        self.assertEqual(self.geo.estatisticas()["carregamento"]["chamadas"], 1)
+    
+    def test_thread_de_vigilancia(self):
+        """Testar a deteção automática pela thread de vigilância."""
+        recarregado = threading.Event()
+        vigilante = self.geo.vigiar_dados(
+            intervalo=0.01, observador=lambda evento: recarregado.set()
+        )
+        self.assertTrue(vigilante.ativo)
+        self._escrever("2.0.0")
+        self.assertTrue(recarregado.wait(5))
+        self.assertEqual(self.geo.versao_dados, "2.0.0")
+        self.geo.parar_vigilancia()
+        self.assertFalse(vigilante.ativo)
+    
+    def test_leitores_concorrentes(self):
+        """Testar que leitores concorrentes veem sempre uma versão completa."""
+        capitais = {"Ingombota", "Luanda"}
+        erros = []
+        parar = threading.Event()
+        
+        def ler():
+            while not parar.is_set():
+                try:
+                    provincia = self.geo.obter_provincia("Luanda")
+                    if provincia["capital"] not in capitais:
+                        erros.append(provincia["capital"])
+                except Exception as e:
+                    erros.append(e)
+        
+        leitores = [threading.Thread(target=ler) for _ in range(4)]
+        for leitor in leitores:
+            leitor.start()
+        try:
+            for i in range(5):
+                self._escrever(f"3.{i}.0", capital=["Luanda", "Ingombota"][i % 2])
+                self.assertTrue(self.geo.verificar_dados())
+        finally:
+            parar.set()
+            for leitor in leitores:
+                leitor.join()
+        self.assertEqual(erros, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
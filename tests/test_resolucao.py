@@ -0,0 +1,138 @@
+"""
+Testes unitários para a normalização de texto livre em lote.
+"""
+
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.dados import ConjuntoDados
+from angola_geo.resolucao import criar_resolvedor, separar_nivel
+
+
+class TestSepararNivel(unittest.TestCase):
+    """Casos de teste para a deteção de prefixos de nível."""
+    
+    def test_prefixos(self):
+        """Testar abreviaturas e formas completas dos prefixos."""
+        self.assertEqual(separar_nivel("prov. de benguela"), ("provincia", "benguela"))
+        self.assertEqual(separar_nivel("provincia do uige"), ("provincia", "uige"))
+        self.assertEqual(separar_nivel("mun. cazenga"), ("municipio", "cazenga"))
+        self.assertEqual(separar_nivel("municipio de belas"), ("municipio", "belas"))
+        self.assertEqual(separar_nivel("comuna de mabubas"), ("comuna", "mabubas"))
+    
+    def test_sem_prefixo(self):
+        """Testar que nomes sem prefixo ficam intactos, exceto pontuação."""
+        self.assertEqual(separar_nivel("luanda,"), (None, "luanda"))
+        self.assertEqual(separar_nivel("moxico leste"), (None, "moxico leste"))
+        self.assertEqual(separar_nivel("prov."), (None, "prov"))
+
+
+class TestNormalizarLote(unittest.TestCase):
+    """Casos de teste para AngolaGeo.normalizar_lote."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.geo = AngolaGeo(usar_cache=False)
+    
+    def test_correspondencias_exatas(self):
+        """Testar entradas com maiúsculas, acentos e prefixos."""
+        resultados = list(self.geo.normalizar_lote(
+            ["luanda", "Prov. de Benguela", "mun. Cazenga", "PROVINCIA DO UIGE"]
+        ))
+        self.assertEqual(
+            [(r["nivel"], r["nome"], r["confianca"]) for r in resultados],
+            [
+                ("provincia", "Luanda", 1.0),
+                ("provincia", "Benguela", 1.0),
+                ("municipio", "Cazenga", 1.0),
+                ("provincia", "Uíge", 1.0),
+            ]
+        )
+        self.assertEqual(resultados[1]["entrada"], "Prov. de Benguela")
+        self.assertEqual(resultados[2]["provincia"], "Luanda")
+    
+    def test_correspondencia_aproximada(self):
+        """Testar que erros de digitação reduzem a confiança."""
+        resultado = next(self.geo.normalizar_lote(["Benguella"]))
+        self.assertEqual(resultado["nome"], "Benguela")
+        self.assertLess(resultado["confianca"], 1.0)
+        self.assertGreater(resultado["confianca"], 0.8)
+    
+    def test_nivel_indicado_diferente(self):
+        """Testar a penalização quando o prefixo não corresponde ao nível."""
+        resultado = next(self.geo.normalizar_lote(["comuna de Belas"]))
+        self.assertEqual(resultado["nivel"], "municipio")
+        self.assertEqual(resultado["confianca"], 0.9)
+    
+    def test_sem_correspondencia(self):
+        """Testar entradas sem correspondência."""
+        for texto in ["xyz", "", "Atlântida"]:
+            resultado = next(self.geo.normalizar_lote([texto]))
+            self.assertEqual(
+                resultado,
+                {"entrada": texto, "nivel": None, "nome": None, "confianca": 0.0}
+            )
+    
+    def test_gerador_preguicoso(self):
+        """Testar que os resultados são gerados à medida que a entrada é lida."""
+        def textos():
+            yield "Luanda"
+            raise RuntimeError("consumido cedo demais")
+        
+        resultados = self.geo.normalizar_lote(textos())
+        self.assertEqual(next(resultados)["nome"], "Luanda")
+    
+    def test_estatisticas_cache(self):
+        """Testar que entradas repetidas (após normalização) usam a cache."""
+        list(self.geo.normalizar_lote(["Luanda", "luanda", " LUANDA ", "Bengo"]))
+        estatisticas = self.geo.estatisticas_cache()
+        self.assertEqual(estatisticas["acertos"], 2)
+        self.assertEqual(estatisticas["falhas"], 2)
+        self.assertEqual(estatisticas["tamanho"], 2)
+        self.assertGreater(estatisticas["capacidade"], 0)
+
+
+class TestResolvedor(unittest.TestCase):
+    """Casos de teste para criar_resolvedor sobre dados sintéticos."""
+    
+    def setUp(self):
+        """Configurar fixtures de teste."""
+        self.conjunto = ConjuntoDados.de_json({
+            "metadata": {},
+            "provinces": [
+                {"id": 1, "name": "Norte", "capital": "Alfa", "municipality_count": 2,
+                 "municipalities": [{"name": "Alfa", "communes": [{"name": "Norte"}]},
+                                    {"name": "Gama", "communes": []}]},
+                {"id": 2, "name": "Sul", "capital": "Gama", "municipality_count": 1,
+                 "municipalities": [{"name": "Gama", "communes": []}]},
+            ]
+        })
+    
+    def registo(self, resolucao):
+        identificador, confianca = resolucao
+        return self.conjunto.entradas[identificador], confianca
+    
+    def test_homonimos_dividem_confianca(self):
+        """Testar que homónimos no mesmo nível reduzem a confiança."""
+        registo, confianca = self.registo(self.conjunto.resolver("gama"))
+        self.assertEqual(registo.nome, "Gama")
+        self.assertEqual(confianca, 0.5)
+    
+    def test_prefere_nivel_mais_alto(self):
+        """Testar a preferência por nível sem e com prefixo."""
+        registo, confianca = self.registo(self.conjunto.resolver("norte"))
+        self.assertEqual((registo.nivel, confianca), ("provincia", 1.0))
+        registo, confianca = self.registo(self.conjunto.resolver("comuna de norte"))
+        self.assertEqual((registo.nivel, confianca), ("comuna", 1.0))
+    
+    def test_capacidade_limitada(self):
+        """Testar que a cache descarta as entradas menos usadas."""
+        resolver = criar_resolvedor(self.conjunto, capacidade=2)
+        for texto in ["norte", "sul", "alfa", "norte"]:
+            resolver(texto)
+        info = resolver.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 4, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
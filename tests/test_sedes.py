@@ -0,0 +1,248 @@
+"""
+Testes unitários para as coordenadas das sedes e as consultas de proximidade.
+"""
+
+import json
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from angola_geo import AngolaGeo
+from angola_geo.basedados import exportar_sqlite
+from angola_geo.excecoes import DadosInvalidos
+from angola_geo.resumo import CAMINHO_SEDES
+from angola_geo.sedes import RAIO_TERRA_KM, ArvoreKD, km_para_corda, vetor_unitario
+
+
+def haversine(latitude1, longitude1, latitude2, longitude2):
+    """Distância (km) ao longo da superfície pela fórmula de haversine."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2)
+         * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+
+def distancia_quadrado(a, b):
+    dx, dy, dz = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+class TestArvoreKD(unittest.TestCase):
+    """Casos de teste para a ArvoreKD, contra a procura exaustiva."""
+
+    @classmethod
+    def setUpClass(cls):
+        aleatorio = random.Random(25)
+        # Pontos dispersos, um aglomerado denso e pontos repetidos (empates)
+        coordenadas = [
+            (aleatorio.uniform(-90, 90), aleatorio.uniform(-180, 180)) for _ in range(1500)
+        ]
+        coordenadas += [
+            (aleatorio.uniform(-9, -8), aleatorio.uniform(13, 14)) for _ in range(1500)
+        ]
+        coordenadas += coordenadas[:50] + [(90.0, 0.0), (-90.0, 180.0), (0.0, -180.0)]
+        cls.pontos = [vetor_unitario(*c) for c in coordenadas]
+        cls.arvore = ArvoreKD(cls.pontos, range(len(cls.pontos)))
+        cls.consultas = [
+            vetor_unitario(aleatorio.uniform(-90, 90), aleatorio.uniform(-180, 180))
+            for _ in range(100)
+        ]
+        cls.consultas += [
+            vetor_unitario(aleatorio.uniform(-9, -8), aleatorio.uniform(13, 14))
+            for _ in range(100)
+        ]
+        cls.consultas += cls.pontos[:20]
+
+    def exaustivo(self, ponto):
+        return sorted((distancia_quadrado(p, ponto), i) for i, p in enumerate(self.pontos))
+
+    def test_mais_proximos(self):
+        """Testar os k vizinhos, com empates pelo identificador."""
+        for ponto in self.consultas:
+            esperado = self.exaustivo(ponto)
+            for k in (1, 3, 17):
+                self.assertEqual(self.arvore.mais_proximos(ponto, k), esperado[:k])
+
+    def test_dentro_de(self):
+        """Testar a procura por raio."""
+        for ponto in self.consultas:
+            esperado = self.exaustivo(ponto)
+            for km in (0, 5, 50, 2000):
+                raio = km_para_corda(km)
+                self.assertEqual(
+                    self.arvore.dentro_de(ponto, raio),
+                    [(d, i) for d, i in esperado if d <= raio * raio],
+                )
+
+    def test_casos_limite(self):
+        """Testar k nulo ou maior que o número de pontos e a árvore vazia."""
+        ponto = self.consultas[0]
+        self.assertEqual(self.arvore.mais_proximos(ponto, 0), [])
+        self.assertEqual(
+            self.arvore.mais_proximos(ponto, len(self.pontos) + 5), self.exaustivo(ponto)
+        )
+        vazia = ArvoreKD([], [])
+        self.assertEqual(len(vazia), 0)
+        self.assertEqual(vazia.mais_proximos(ponto, 3), [])
+        self.assertEqual(vazia.dentro_de(ponto, 2.0), [])
+
+    def test_vetor_unitario(self):
+        """Testar coordenadas fora dos limites ou que não são números."""
+        for latitude, longitude in ((91, 0), (0, 181), (float("nan"), 0), (0, float("nan"))):
+            with self.assertRaises(ValueError):
+                vetor_unitario(latitude, longitude)
+
+
+class TestMaisProximos(unittest.TestCase):
+    """Casos de teste para AngolaGeo.mais_proximos e dentro_do_raio."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.geo = AngolaGeo()
+        with open(CAMINHO_SEDES, encoding="utf-8") as f:
+            cls.sedes = json.load(f)["seats"]
+
+    def esperado(self, latitude, longitude, nivel):
+        """
+        Sedes de ``nivel`` ordenadas pela distância de haversine; as sedes
+        na mesma posição (Luanda e Ingombota) ficam pela ordem dos dados.
+        """
+        resultados = []
+        for sede in self.sedes:
+            divisao = self.geo.obter_por_codigo(sede["code"])
+            if nivel is None or divisao["nivel"] == nivel:
+                distancia = haversine(latitude, longitude, sede["latitude"], sede["longitude"])
+                resultados.append(
+                    (round(distancia, 6), divisao["codigo_inteiro"], divisao["nome"])
+                )
+        return [(distancia, nome) for distancia, _, nome in sorted(resultados)]
+
+    def test_dados_distribuidos(self):
+        """Testar que todas as províncias têm capital e as sedes são válidas."""
+        provincias = self.geo.mais_proximos(-12.0, 17.0, k=100, nivel="provincia")
+        self.assertEqual(len(provincias), 21)
+        for provincia in provincias:
+            self.assertEqual(
+                provincia["nome"], self.geo.obter_por_codigo(provincia["codigo"])["nome"]
+            )
+        self.assertEqual(len(self.geo.mais_proximos(-12.0, 17.0, k=100, nivel=None)),
+                         len(self.sedes))
+
+    def test_resultado(self):
+        """Testar o formato, a ordem e as distâncias."""
+        dande, panguila = self.geo.mais_proximos(-8.58, 13.66, k=2)
+        self.assertEqual(
+            {c: dande[c] for c in ("codigo", "nivel", "nome", "provincia")},
+            {"codigo": "01.001", "nivel": "municipio", "nome": "Dande", "provincia": "Bengo"},
+        )
+        self.assertEqual(panguila["nome"], "Panguila")
+        self.assertLess(dande["distancia_km"], panguila["distancia_km"])
+        for latitude, longitude in ((-8.58, 13.66), (-12.0, 17.0), (-17.0, 12.0)):
+            for nivel in ("provincia", "municipio", None):
+                resultados = self.geo.mais_proximos(latitude, longitude, k=5, nivel=nivel)
+                esperado = self.esperado(latitude, longitude, nivel)[:5]
+                self.assertEqual([r["nome"] for r in resultados], [n for _, n in esperado])
+                for resultado, (distancia, _) in zip(resultados, esperado):
+                    self.assertAlmostEqual(resultado["distancia_km"], distancia, places=6)
+
+    def test_dentro_do_raio(self):
+        """Testar que o raio devolve as sedes a até essa distância, pela ordem."""
+        for raio in (0, 30, 100, 500):
+            resultados = self.geo.dentro_do_raio(-8.83, 13.24, raio, nivel=None)
+            esperado = [n for d, n in self.esperado(-8.83, 13.24, None) if d <= raio]
+            self.assertEqual([r["nome"] for r in resultados], esperado)
+        self.assertEqual(
+            [s["nome"] for s in self.geo.dentro_do_raio(-8.58, 13.66, 30)], ["Dande", "Panguila"]
+        )
+
+    def test_nivel(self):
+        """Testar os níveis, incluindo um sem sedes e um inválido."""
+        luanda = self.geo.mais_proximos(-8.8383, 13.2344, k=1, nivel="provincia")[0]
+        self.assertEqual((luanda["nivel"], luanda["nome"]), ("provincia", "Luanda"))
+        self.assertEqual(self.geo.mais_proximos(-8.8, 13.2, nivel="comuna"), [])
+        with self.assertRaises(ValueError):
+            self.geo.mais_proximos(-8.8, 13.2, nivel="bairro")
+        with self.assertRaises(ValueError):
+            self.geo.dentro_do_raio(-8.8, 13.2, 10, nivel="bairro")
+
+    def test_argumentos_invalidos(self):
+        """Testar k ou raio negativos e coordenadas inválidas."""
+        self.assertEqual(self.geo.mais_proximos(-8.8, 13.2, k=0), [])
+        chamadas = [
+            lambda: self.geo.mais_proximos(-8.8, 13.2, k=-1),
+            lambda: self.geo.dentro_do_raio(-8.8, 13.2, -1),
+            lambda: self.geo.mais_proximos(13.2, -181),
+            lambda: self.geo.dentro_do_raio(float("nan"), 13.2, 10),
+            lambda: self.geo.mais_proximos_lote([], k=-1),
+            lambda: self.geo.dentro_do_raio_lote([], -1),
+        ]
+        for chamada in chamadas:
+            with self.assertRaises(ValueError):
+                chamada()
+
+    def test_lote(self):
+        """Testar que os lotes dão os mesmos resultados, pela ordem."""
+        pontos = [(-8.58, 13.66), [-12.0, 17.0], (-8.83, 13.24)]
+        self.assertEqual(
+            list(self.geo.mais_proximos_lote(iter(pontos), k=3, nivel=None)),
+            [self.geo.mais_proximos(*p, k=3, nivel=None) for p in pontos],
+        )
+        self.assertEqual(
+            list(self.geo.dentro_do_raio_lote(iter(pontos), 40)),
+            [self.geo.dentro_do_raio(*p, 40) for p in pontos],
+        )
+
+    def test_backend_sqlite(self):
+        """Testar as consultas no backend SQLite."""
+        with tempfile.TemporaryDirectory() as pasta:
+            geo = AngolaGeo(backend="sqlite", caminho=exportar_sqlite(
+                os.path.join(pasta, "angola.db")
+            ))
+            self.assertEqual(geo.mais_proximos(-8.58, 13.66), self.geo.mais_proximos(-8.58, 13.66))
+            geo._pool.fechar()
+
+
+class TestFicheiroSedes(unittest.TestCase):
+    """Casos de teste para a validação de ficheiros de sedes."""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pasta.cleanup)
+
+    def geo(self, sedes):
+        caminho = os.path.join(self.pasta.name, "sedes.json")
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump({"metadata": {"datum": "WGS 84"}, "seats": sedes}, f)
+        return AngolaGeo(sedes=caminho)
+
+    def test_ficheiro_personalizado(self):
+        """Testar um ficheiro de sedes indicado no construtor."""
+        geo = self.geo([
+            {"code": "13.001", "name": "belas", "latitude": -9.0, "longitude": 13.2},
+            {"code": "13", "name": "Luanda", "latitude": -8.8, "longitude": 13.2},
+        ])
+        self.assertEqual(
+            [(s["nome"], s["latitude"]) for s in geo.mais_proximos(-8.9, 13.2, nivel=None)],
+            [("Luanda", -8.8), ("Belas", -9.0)],
+        )
+
+    def test_sedes_invalidas(self):
+        """Testar códigos inexistentes, nomes trocados, repetições e coordenadas."""
+        valida = {"code": "13.001", "name": "Belas", "latitude": -9.0, "longitude": 13.2}
+        invalidos = [
+            [dict(valida, code="13.999")],
+            [dict(valida, code="x")],
+            [dict(valida, name="Cacuaco")],
+            [valida, dict(valida, code="13.1")],
+            [dict(valida, latitude=-91)],
+        ]
+        for sedes in invalidos:
+            with self.assertRaises(DadosInvalidos):
+                self.geo(sedes).mais_proximos(-9.0, 13.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Testes unitários para o serviço HTTP de consultas.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from angola_geo import AngolaGeo
+from angola_geo.servidor import MAX_CORPO, ServicoConsultas, iniciar_servidor
+
+
+class TestServicoConsultas(unittest.TestCase):
+    """Casos de teste para o encaminhamento dos pedidos."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Configurar fixtures de teste."""
+        cls.geo = AngolaGeo()
+        cls.servico = ServicoConsultas(cls.geo)
+    
+    def pedir(self, alvo):
+        estado, corpo = self.servico.responder(alvo)
+        return estado, json.loads(corpo.decode("utf-8"))
+    
+    def test_rotas_estaticas(self):
+        """Testar que as rotas estáticas devolvem os mesmos dados que a API."""
+        self.assertEqual(self.pedir("/provincias"), (200, self.geo.listar_provincias(copiar=True)))
+        self.assertEqual(self.pedir("/metadados"), (200, self.geo.obter_metadados(copiar=True)))
+        self.assertEqual(self.pedir("/municipios/"), (200, self.geo.listar_municipios(copiar=True)))
+    
+    def test_corpos_pre_serializados(self):
+        """Testar que as rotas estáticas reutilizam os mesmos bytes."""
+        self.assertIs(self.servico.responder("/provincias")[1],
+                      self.servico.responder("/provincias")[1])
+        self.assertIs(self.servico.responder("/provincias/U%C3%ADge")[1],
+                      self.servico.responder("/provincias/uige")[1])
+    
+    def test_provincia(self):
+        """Testar a obtenção de uma província e dos seus municípios."""
+        estado, provincia = self.pedir("/provincias/Luanda")
+        self.assertEqual((estado, provincia["capital"]), (200, "Ingombota"))
+        
+        estado, municipios = self.pedir("/provincias/luanda/municipios")
+        self.assertEqual(estado, 200)
+        self.assertEqual(municipios, self.pedir("/municipios?provincia=Luanda")[1])
+        self.assertIn("Belas", [m["nome"] for m in municipios])
+    
+    def test_provincia_inexistente(self):
+        """Testar o 404 com sugestões."""
+        estado, corpo = self.pedir("/provincias/Huilla")
+        self.assertEqual(estado, 404)
+        self.assertEqual(corpo["sugestoes"], ["Huíla"])
+        self.assertEqual(self.pedir("/municipios?provincia=Huilla")[0], 404)
+    
+    def test_pesquisar(self):
+        """Testar a pesquisa e a validação do parâmetro q."""
+        estado, corpo = self.pedir("/pesquisar?q=bengo")
+        self.assertEqual(estado, 200)
+        self.assertEqual(corpo, json.loads(json.dumps(self.geo.pesquisar("bengo"))))
+        self.assertEqual(self.pedir("/pesquisar")[0], 400)
+    
+    def test_rota_inexistente(self):
+        """Testar rotas desconhecidas."""
+        self.assertEqual(self.pedir("/xyz")[0], 404)
+        self.assertEqual(self.pedir("/provincias/Luanda/comunas")[0], 404)
+
+
+class TestServidorHTTP(unittest.TestCase):
+    """Casos de teste do servidor sobre uma ligação real."""
+    
+    def executar(self, pedidos):
+        """Envia os pedidos numa única ligação e devolve as respostas em bruto."""
+        async def principal():
+            servidor = await iniciar_servidor(AngolaGeo(), "127.0.0.1", 0)
+            porta = servidor.sockets[0].getsockname()[1]
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            respostas = []
+            for pedido in pedidos:
+                escritor.write(pedido)
+                cabecalho = (await leitor.readuntil(b"\r\n\r\n")).decode("latin-1")
+                cabecalhos = dict(
+                    linha.lower().split(": ", 1) for linha in cabecalho.split("\r\n")[1:] if linha
+                )
+                tamanho = 0 if pedido.startswith(b"HEAD") else int(cabecalhos["content-length"])
+                corpo = await leitor.readexactly(tamanho)
+                respostas.append((cabecalho.split(" ")[1], cabecalhos, corpo))
+            fechada = await leitor.read() == b""
+            escritor.close()
+            servidor.close()
+            await servidor.wait_closed()
+            return respostas, fechada
+        
+        return asyncio.run(principal())
+    
+    def test_keep_alive_e_etag(self):
+        """Testar vários pedidos na mesma ligação, ETag e If-None-Match."""
+        etag = '"%s"' % AngolaGeo().obter_metadados()["data_version"]
+        respostas, fechada = self.executar([
+            b"GET /provincias/Luanda HTTP/1.1\r\nHost: x\r\n\r\n",
+            b"GET /provincias/Luanda HTTP/1.1\r\nIf-None-Match: " + etag.encode() + b"\r\n\r\n",
+            b"HEAD /metadados HTTP/1.1\r\n\r\n",
+            b"GET /metadados HTTP/1.1\r\nConnection: close\r\n\r\n",
+        ])
+        
+        (e1, c1, b1), (e2, c2, b2), (e3, c3, b3), (e4, c4, b4) = respostas
+        self.assertEqual((e1, c1["etag"], c1["connection"]), ("200", etag, "keep-alive"))
+        self.assertEqual(json.loads(b1)["nome"], "Luanda")
+        self.assertEqual((e2, b2), ("304", b""))
+        self.assertEqual((e3, b3), ("200", b""))
+        self.assertGreater(int(c3["content-length"]), 0)
+        self.assertEqual(b4[:1], b"{")
+        self.assertEqual(c4["connection"], "close")
+        self.assertTrue(fechada)
+    
+    def test_metodo_nao_permitido(self):
+        """Testar que métodos diferentes de GET/HEAD recebem 405."""
+        respostas, _ = self.executar([
+            b"POST /provincias HTTP/1.1\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}",
+        ])
+        self.assertEqual(respostas[0][0], "405")
+    
+    def test_corpo_demasiado_grande(self):
+        """Testar que um Content-Length acima do limite recebe 413 e fecha a ligação."""
+        respostas, fechada = self.executar([
+            b"GET /provincias HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_CORPO + 1),
+        ])
+        self.assertEqual(respostas[0][0], "413")
+        self.assertTrue(fechada)
+    
+    def test_corpo_em_falta(self):
+        """Testar que a ligação fecha se o corpo anunciado não chegar a tempo."""
+        async def principal():
+            servidor = await iniciar_servidor(AngolaGeo(), "127.0.0.1", 0)
+            porta = servidor.sockets[0].getsockname()[1]
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            escritor.write(b"GET /provincias HTTP/1.1\r\nContent-Length: 10\r\n\r\n")
+            resposta = await asyncio.wait_for(leitor.read(), 5)
+            escritor.close()
+            servidor.close()
+            await servidor.wait_closed()
+            return resposta
+        
+        with patch("angola_geo.servidor.TEMPO_INATIVIDADE", 0.05):
+            self.assertEqual(asyncio.run(principal()), b"")
+    
+    def test_content_length_invalido(self):
+        """Testar que um Content-Length negativo recebe 400."""
+        respostas, fechada = self.executar([
+            b"GET /provincias HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+        ])
+        self.assertEqual(respostas[0][0], "400")
+        self.assertTrue(fechada)
+
+
+if __name__ == '__main__':
+    unittest.main()